@@ -621,7 +621,7 @@ class MovieAdminPanel {
         try {
             this.log(`Searching for movies by director: ${directorName}`, 'info');
             
-            const response = await fetch(`${this.apiBase}/admin/scrape/director`, {
+            const response = await fetch(`${this.apiBase}/admin/scrape/director?stream=true`, {
                 method: 'POST',
                 headers: this.getAuthHeaders(),
                 body: JSON.stringify({ 
@@ -636,9 +636,24 @@ class MovieAdminPanel {
                 throw new Error(`HTTP ${response.status}: ${response.statusText}`);
             }
 
-            const data = await response.json();
-            this.displayScrapingResults(data.movies);
-            this.log(`Found ${data.movies.length} movies for ${directorName}`, 'success');
+            // Movies arrive one NDJSON line at a time as their credits are verified
+            const movies = [];
+            let lastRender = 0;
+            await this.readNdjson(response, (line) => {
+                if (line.error) {
+                    throw new Error(line.error);
+                }
+                if (line.movie) {
+                    movies.push(line.movie);
+                    if (Date.now() - lastRender > 250) {
+                        lastRender = Date.now();
+                        this.displayScrapingResults([...movies]);
+                    }
+                }
+            });
+            movies.sort((a, b) => (b.year || '0').localeCompare(a.year || '0') || b.title.localeCompare(a.title));
+            this.displayScrapingResults(movies);
+            this.log(`Found ${movies.length} movies for ${directorName}`, 'success');
             
         } catch (error) {
             this.log(`Failed to search director: ${error.message}`, 'error');
@@ -646,6 +661,23 @@ class MovieAdminPanel {
         }
     }
 
+    async readNdjson(response, onLine) {
+        // Calls onLine with every JSON line of a streamed response as it arrives
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { done, value } = await reader.read();
+            buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+            const lines = buffer.split('\n');
+            buffer = done ? '' : lines.pop();
+            lines.filter(line => line.trim()).forEach(line => onLine(JSON.parse(line)));
+            if (done) {
+                break;
+            }
+        }
+    }
+
     // Enrichment
     async enrichMovie(title) {
         try {
@@ -768,6 +800,61 @@ class MovieAdminPanel {
     }
 
     startEnrichmentPolling() {
+        // Live progress from the workers over server-sent events; interval polling where that is unavailable
+        if (window.EventSource && this.authToken) {
+            this.startEnrichmentEvents();
+            return;
+        }
+        this.startEnrichmentIntervalPolling();
+    }
+
+    startEnrichmentEvents() {
+        if (this.enrichmentEvents) {
+            return; // already streaming
+        }
+        const url = `${this.apiBase}/admin/events?token=${encodeURIComponent(this.authToken)}`;
+        const source = new EventSource(url);
+        this.enrichmentEvents = source;
+
+        const eventTypes = ['run_queued', 'stage_done', 'movie_done', 'job_retry', 'job_failed', 'job_lost',
+                            'run_saving', 'run_done', 'run_failed'];
+        eventTypes.forEach(type => {
+            source.addEventListener(type, (e) => {
+                try {
+                    this.handleEnrichmentEvent(JSON.parse(e.data));
+                } catch (error) {
+                    console.warn('Bad enrichment event:', e.data, error);
+                }
+            });
+        });
+
+        source.onerror = () => {
+            // EventSource reconnects by itself (resuming from Last-Event-ID) unless the server refused it
+            if (source.readyState === EventSource.CLOSED) {
+                this.log('Enrichment event stream closed, falling back to polling', 'warning');
+                this.enrichmentEvents = null;
+                this.startEnrichmentIntervalPolling();
+            }
+        };
+    }
+
+    handleEnrichmentEvent(event) {
+        // Per-stage progress only refreshes the counters; everything else is shown as activity
+        if (event.type !== 'stage_done') {
+            this.enrichmentActivity = [...(this.enrichmentActivity || []), event].slice(-10);
+            this.displayEnrichmentActivity(this.enrichmentActivity);
+        }
+
+        // Refresh the pipeline counters at most once a second
+        if (!this.pipelineRefreshTimer) {
+            this.pipelineRefreshTimer = setTimeout(() => {
+                this.pipelineRefreshTimer = null;
+                this.loadPipelineStatus();
+            }, 1000);
+        }
+    }
+
+    startEnrichmentIntervalPolling() {
         // Clear any existing polling
         if (this.enrichmentPollingInterval) {
             clearInterval(this.enrichmentPollingInterval);
@@ -794,6 +881,14 @@ class MovieAdminPanel {
     }
 
     stopEnrichmentPolling() {
+        if (this.enrichmentEvents) {
+            this.enrichmentEvents.close();
+            this.enrichmentEvents = null;
+        }
+        if (this.pipelineRefreshTimer) {
+            clearTimeout(this.pipelineRefreshTimer);
+            this.pipelineRefreshTimer = null;
+        }
         if (this.enrichmentPollingInterval) {
             clearInterval(this.enrichmentPollingInterval);
             this.enrichmentPollingInterval = null;
@@ -910,6 +1005,7 @@ class MovieAdminPanel {
 
             // Display enrichment activity
             this.log(`Found ${enrichmentLogs.length} enrichment-related logs`, 'info');
+            this.enrichmentActivity = enrichmentLogs; // live events are appended to these
             this.displayEnrichmentActivity(enrichmentLogs);
             
         } catch (error) {
@@ -1628,7 +1724,7 @@ class MovieAdminPanel {
                 method: 'POST',
                 headers: this.getAuthHeaders(),
                 body: JSON.stringify({
-                    director_name: directorName
+                    director: directorName
                 })
             });
 
@@ -1866,74 +1962,20 @@ let themeSettings = {};
 async function loadThemesFromData() {
     try {
         console.log('🔄 Loading themes from movie data...');
-        const response = await fetch('http://localhost:8004/movie_profiles_merged.json');
-        const data = await response.json();
-        
-        console.log('📊 Raw data type:', typeof data);
-        console.log('📊 Data keys:', Object.keys(data));
-        
-        // Handle different data structures
-        let movies = [];
-        if (Array.isArray(data)) {
-            movies = data;
-        } else if (data.movies && Array.isArray(data.movies)) {
-            movies = data.movies;
-        } else if (data.data && Array.isArray(data.data)) {
-            movies = data.data;
-        } else if (typeof data === 'object' && !Array.isArray(data)) {
-            // Handle object where keys are movie titles
-            movies = Object.values(data);
-            console.log('📊 Detected object structure with', movies.length, 'movies');
-        } else {
-            console.warn('⚠️ Unexpected data structure, using fallback themes');
-            throw new Error('Unexpected data structure');
+        // Counts come from the server-side theme index; no need to download the catalog
+        const base = (adminPanel && adminPanel.apiBase) || (window.location.origin + '/api');
+        const response = await fetch(`${base}/themes?top_n=0&min_count=10`);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
         }
+        const data = await response.json();
         
-        console.log('🎬 Movies loaded:', movies.length);
-        
-        // Extract all unique themes from movies
-        const themeMap = new Map();
-        
-        movies.forEach(movie => {
-            // Extract themes from primary_theme and secondary_theme fields
-            const themes = [];
-            
-            if (movie.primary_theme) {
-                themes.push(movie.primary_theme);
-            }
-            if (movie.secondary_theme) {
-                themes.push(movie.secondary_theme);
-            }
-            
-            // Also check for themes array if it exists
-            if (movie.themes && Array.isArray(movie.themes)) {
-                themes.push(...movie.themes);
-            }
-            
-            themes.forEach(theme => {
-                if (theme && typeof theme === 'string') {
-                    // Convert theme to readable format
-                    const readableTheme = theme.replace(/_/g, ' ').replace(/\b\w/g, l => l.toUpperCase());
-                    const themeId = theme.toLowerCase().replace(/_/g, '-');
-                    
-                    if (themeMap.has(themeId)) {
-                        themeMap.get(themeId).count++;
-                    } else {
-                        themeMap.set(themeId, {
-                            id: themeId,
-                            name: readableTheme,
-                            count: 1
-                        });
-                    }
-                }
-            });
-        });
-        
-        // Convert to array and sort by count (most movies first)
-        // Only include themes with 10+ movies
-        AVAILABLE_THEMES = Array.from(themeMap.values())
-            .filter(theme => theme.count >= 10)
-            .sort((a, b) => b.count - a.count);
+        // Themes arrive sorted by count (most movies first), only those with 10+ movies
+        AVAILABLE_THEMES = (data.themes || []).map(theme => ({
+            id: theme.id,
+            name: theme.title,
+            count: theme.count
+        }));
         
         console.log('🎭 Loaded themes from data (10+ movies):', AVAILABLE_THEMES);
         
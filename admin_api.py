@@ -2,63 +2,78 @@
 Admin API endpoints for movie database management
 """
 
+import io
 import json
 import os
-import shutil
-import glob
 import uuid
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import requests
 
 from admin_auth import (
-    authenticate_admin, create_access_token, get_current_admin,
+    authenticate_admin, create_access_token, get_current_admin, get_current_admin_from_query,
     LoginRequest, LoginResponse, AuthStatus, check_auth_status
 )
 
 from fetch_movies import (
-    get_movie_details_and_credits, hydrate_from_tmdb_list, hydrate_from_csv, 
-    hydrate_from_wikipedia, hydrate_from_bfi, hydrate_from_letterboxd,
-    tmdb_search_movie, session_with_api_key
+    fetch_tmdb_movie, normalize_tmdb_movie, hydrate_tmdb_movie, hydrate_from_tmdb_list, hydrate_seeds,
+    hydrate_from_wikipedia, hydrate_from_bfi, hydrate_from_letterboxd, iter_hydrate_from_tmdb_list,
+    iter_hydrate_from_wikipedia, iter_hydrate_from_bfi, iter_hydrate_from_letterboxd, iter_movies, csv_seeds,
+    tmdb_get, tmdb_search_movie, session_with_api_key, hydration_session
 )
 from main import MovieRecommender
 from merge_image_data import merge_image_data
+from catalog_backup import get_backup_store
+from catalog_store import get_catalog_store
+from hidden_store import get_hidden_movies
+from job_queue import get_job_queue
+from http_cache import get_http_cache
+from rate_limit import limiter_stats
+from state_store import get_state_backend
+from port_config import API_URL
 
-def reload_api_data():
-    """Helper function to reload API data with multiple fallback methods"""
+# Set by api.py when this router runs inside the API process (register_api_reloader); other processes
+# (the enrichment drainer, scripts) must not import api, which would load a private copy of the catalog
+_api_reloader: Optional[Callable[..., bool]] = None
+# Where processes other than the API ask it to reload
+API_RELOAD_URL = os.getenv("API_RELOAD_URL") or f"{API_URL}/reload"
+
+
+def register_api_reloader(fn: Callable[..., bool]) -> None:
+    """Called by api.py with its reload_movie_data(titles=...)"""
+    global _api_reloader
+    _api_reloader = fn
+
+
+def reload_api_data(titles: Optional[List[str]] = None):
+    """Ask the API to reload its data: in-process when this is the API, otherwise via POST /reload.
+
+    With titles (added, changed or removed) only those movies are re-indexed.
+    """
     try:
-        import time
-        
-        # Add a small delay to ensure the file write is complete
-        time.sleep(1)
-        
-        # Try direct reload first (more reliable than HTTP request)
-        try:
-            from api import reload_movie_data
-            success = reload_movie_data()
-            if success:
-                log_admin_operation("api_reload", "Successfully reloaded API data directly", "success")
-                return True
-            else:
-                log_admin_operation("api_reload", "Direct reload failed, trying HTTP request", "warning")
-                raise Exception("Direct reload failed")
-        except Exception as direct_error:
-            # Fallback to HTTP request
-            import requests
-            response = requests.post("http://127.0.0.1:8003/reload", timeout=30)
-            if response.status_code == 200:
-                result = response.json()
-                log_admin_operation("api_reload", f"Successfully reloaded API data via HTTP: {result.get('count', 'unknown')} movies", "success")
-                return True
-            else:
-                log_admin_operation("api_reload", f"Failed to reload API data: HTTP {response.status_code} - {response.text}", "warning")
-                return False
-                
+        if _api_reloader is not None:
+            # Only schedules a background rebuild; searches keep using the current generation until it is swapped in
+            success = _api_reloader(titles=titles)
+            log_admin_operation("api_reload", "Scheduled API data reload" if success else "API data reload failed",
+                                "success" if success else "warning")
+            return success
+        body = None if titles is None else {"changed": list(titles)}
+        response = requests.post(API_RELOAD_URL, json=body, timeout=30)
+        if response.status_code == 200:
+            result = response.json()
+            log_admin_operation("api_reload", f"Successfully reloaded API data via HTTP: {result.get('count', 'unknown')} movies", "success")
+            return True
+        else:
+            log_admin_operation("api_reload", f"Failed to reload API data: HTTP {response.status_code} - {response.text}", "warning")
+            return False
+
     except requests.exceptions.ConnectionError as e:
         log_admin_operation("api_reload", f"Failed to connect to API for reload: {e}", "warning")
         return False
@@ -118,6 +133,18 @@ def restart_static_server():
         log_admin_operation("static_server_restart", f"Failed to restart static server: {e}", "error")
         return False
 
+def sync_changed_movies(titles: List[str]):
+    """Delta sync after a pipeline changed some movies: re-index only those titles in the API.
+
+    The static server only serves the frontend files, so it does not need a restart for data changes.
+    """
+    if not titles:
+        return True
+    success = reload_api_data(titles=list(titles))
+    log_admin_operation("delta_sync", f"Delta reload of {len(titles)} movies: {'scheduled' if success else 'failed'}",
+                        "success" if success else "warning")
+    return success
+
 def full_sync_data():
     """Complete synchronization: reload API data and restart static server"""
     try:
@@ -141,17 +168,13 @@ def full_sync_data():
         return False
 
 # TMDB API helper functions for director scraping
+# Filmography credits looked up at once per director scrape (TMDB's rate limit still applies)
+DIRECTOR_SCRAPE_WORKERS = int(os.getenv("DIRECTOR_SCRAPE_WORKERS", "8"))
+
 def tmdb_search_person(sess: requests.Session, person_name: str) -> Optional[int]:
     """Search for a person by name and return their TMDB person ID"""
     try:
-        params = {
-            "query": person_name,
-            "include_adult": "false"
-        }
-        
-        response = sess.get("https://api.themoviedb.org/3/search/person", params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = tmdb_get(sess, "/search/person", {"query": person_name, "include_adult": "false"})
         
         results = data.get("results", [])
         if not results:
@@ -174,19 +197,10 @@ def tmdb_search_person(sess: requests.Session, person_name: str) -> Optional[int
 def get_person_movies(sess: requests.Session, person_id: int) -> List[Dict[str, Any]]:
     """Get all movies directed by a person"""
     try:
-        response = sess.get(f"https://api.themoviedb.org/3/person/{person_id}/movie_credits")
-        response.raise_for_status()
-        data = response.json()
-        
-        crew_credits = data.get("crew", [])
+        data = tmdb_get(sess, f"/person/{person_id}/movie_credits", {})
         
         # Filter for directing credits only
-        directed_movies = []
-        for credit in crew_credits:
-            if credit.get("job") == "Director":
-                directed_movies.append(credit)
-                
-        return directed_movies
+        return [credit for credit in data.get("crew", []) if credit.get("job") == "Director"]
         
     except Exception as e:
         print(f"Error fetching movies for person {person_id}: {e}")
@@ -195,12 +209,9 @@ def get_person_movies(sess: requests.Session, person_id: int) -> List[Dict[str,
 def get_movie_director(sess: requests.Session, tmdb_id: int) -> Optional[str]:
     """Get the actual director of a specific movie"""
     try:
-        response = sess.get(f"https://api.themoviedb.org/3/movie/{tmdb_id}/credits")
-        response.raise_for_status()
-        data = response.json()
+        data = tmdb_get(sess, f"/movie/{tmdb_id}/credits", {})
         
-        crew = data.get("crew", [])
-        for person in crew:
+        for person in data.get("crew", []):
             if person.get("job") == "Director":
                 return person.get("name", "")
                 
@@ -253,12 +264,22 @@ class ThemeProposalResponse(BaseModel):
 class ThemeApprovalRequest(BaseModel):
     proposal_id: str
 
-# Global state for admin operations
-admin_state = {
-    'pipeline': [],
-    'staging': [],
-    'hidden_movies': set(),
-    'operation_logs': []
+# Admin state (staging area, operation log) lives in the shared state backend, so every API worker
+# sees the same values; the hidden list is the file-backed set from hidden_store. Movies being enriched
+# are in the job queue (job_queue.py).
+admin_state = get_state_backend()
+STAGING = "admin:staging"
+OPERATION_LOGS = "admin:operation_logs"
+MAX_OPERATION_LOGS = 1000
+
+# Enrichment run kinds: (operation name in the admin log, stages, run options for enrichment_worker.py)
+ENRICHMENT_RUNS: Dict[str, Tuple[str, List[str], Dict[str, Any]]] = {
+    'enrichment': ('enrichment_pipeline', ['metadata', 'images', 'profile'], {'backup': True, 'keep_failed': True}),
+    'metadata': ('metadata_enrichment', ['metadata'], {'backup': True}),
+    'images': ('image_enrichment', ['images'], {'backup': True}),
+    'profiles': ('profile_enrichment', ['profile'], {}),
+    'generate_profiles': ('profile_generation', ['profile'], {}),
+    'complete': ('complete_enrichment', ['metadata', 'images', 'profile'], {'backup': True}),
 }
 
 def log_admin_operation(operation: str, details: str, level: str = "info"):
@@ -270,33 +291,24 @@ def log_admin_operation(operation: str, details: str, level: str = "info"):
         'details': details,
         'level': level
     }
-    admin_state['operation_logs'].append(log_entry)
-    
-    # Keep only last 1000 logs
-    if len(admin_state['operation_logs']) > 1000:
-        admin_state['operation_logs'] = admin_state['operation_logs'][-1000:]
+    try:
+        admin_state.append_event(OPERATION_LOGS, log_entry, MAX_OPERATION_LOGS)
+    except Exception as e:
+        print(f"[admin] failed to record log entry: {e}")
 
 def load_hidden_movies():
     """Load list of hidden movies from file"""
-    hidden_file = Path("hidden_movies.json")
-    if hidden_file.exists():
-        try:
-            with open(hidden_file, 'r') as f:
-                data = json.load(f)
-                admin_state['hidden_movies'] = set(data.get('hidden', []))
-        except Exception as e:
-            log_admin_operation("load_hidden", f"Failed to load hidden movies: {e}", "error")
+    try:
+        get_hidden_movies().load()
+    except Exception as e:
+        log_admin_operation("load_hidden", f"Failed to load hidden movies: {e}", "error")
 
 def save_hidden_movies():
     """Save list of hidden movies to file"""
-    hidden_file = Path("hidden_movies.json")
+    hidden = get_hidden_movies()
     try:
-        print(f"SAVING {len(admin_state['hidden_movies'])} hidden movies to {hidden_file}")
-        print(f"Hidden movies list: {list(admin_state['hidden_movies'])}")
-        with open(hidden_file, 'w') as f:
-            json.dump({'hidden': list(admin_state['hidden_movies'])}, f, indent=2)
-        print(f"Successfully wrote to {hidden_file}")
-        log_admin_operation("save_hidden", f"Saved {len(admin_state['hidden_movies'])} hidden movies")
+        hidden.save()
+        log_admin_operation("save_hidden", f"Saved {len(hidden.titles)} hidden movies")
     except Exception as e:
         print(f"ERROR saving hidden movies: {e}")
         log_admin_operation("save_hidden", f"Failed to save hidden movies: {e}", "error")
@@ -304,57 +316,82 @@ def save_hidden_movies():
 def get_movie_data() -> Dict[str, Any]:
     """Load current movie data"""
     try:
-        with open("movie_profiles_merged.json", 'r') as f:
-            return json.load(f)
+        return get_catalog_store().all()
     except Exception as e:
         log_admin_operation("load_movies", f"Failed to load movie data: {e}", "error")
         return {}
 
+def get_movie(title: str) -> Optional[Dict[str, Any]]:
+    """Load a single movie by title"""
+    try:
+        return get_catalog_store().get(title)
+    except Exception as e:
+        log_admin_operation("load_movies", f"Failed to load movie {title}: {e}", "error")
+        return None
+
+def create_catalog_backup(label: str = "") -> str:
+    """Back up the current catalog (only movies changed since the last backup are stored) and prune old backups"""
+    backup = get_backup_store().create(get_catalog_store(), label=label)
+    cleanup_old_backups()
+    return backup["id"]
+
 def cleanup_old_backups(keep_count: int = 5):
-    """Clean up old backup files, keeping only the most recent ones"""
+    """Drop all but the most recent backups and the chunks only they referenced"""
     try:
-        # Ensure backups directory exists
-        os.makedirs("backups", exist_ok=True)
-        
-        backup_files = glob.glob("backups/movie_profiles_merged_backup_*.json")
-        if len(backup_files) > keep_count:
-            # Sort by modification time (newest first)
-            backup_files.sort(key=os.path.getmtime, reverse=True)
-            
-            # Remove old backups
-            for old_backup in backup_files[keep_count:]:
-                os.remove(old_backup)
-                log_admin_operation("cleanup", f"Removed old backup: {old_backup}")
-                
-            log_admin_operation("cleanup", f"Cleaned up {len(backup_files) - keep_count} old backup files")
+        removed = get_backup_store().prune(keep_count)
+        if removed["manifests"]:
+            log_admin_operation("cleanup", f"Removed {removed['manifests']} old backups and {removed['chunks']} unreferenced chunks")
     except Exception as e:
         log_admin_operation("cleanup", f"Failed to cleanup old backups: {e}", "error")
 
 def save_movie_data(data: Dict[str, Any], create_backup: bool = False):
-    """Save movie data with optional backup"""
+    """Replace the whole catalog with optional backup"""
     try:
+        store = get_catalog_store()
         # Create backup only if requested
         if create_backup:
-            # Ensure backups directory exists
-            os.makedirs("backups", exist_ok=True)
-            
-            backup_file = f"backups/movie_profiles_merged_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            shutil.copy("movie_profiles_merged.json", backup_file)
+            backup_file = create_catalog_backup("save_movies")
             log_admin_operation("save_movies", f"Saved {len(data)} movies with backup {backup_file}")
-            
-            # Clean up old backups after creating a new one
-            cleanup_old_backups()
         else:
             log_admin_operation("save_movies", f"Saved {len(data)} movies")
         
-        # Save new data
-        with open("movie_profiles_merged.json", 'w') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # a whole-catalog replace rewrites the JSON snapshot and clears its journal
+        store.replace_all(data)
+        
+    except Exception as e:
+        log_admin_operation("save_movies", f"Failed to save movie data: {e}", "error")
+        raise HTTPException(status_code=500, detail=f"Failed to save movie data: {e}")
+
+def upsert_movie_data(updates: Dict[str, Any], create_backup: bool = False, export: bool = True):
+    """Insert or update only the given movies (one transaction), with optional backup.
+
+    Each call appends only these movies to the catalog journal. export=False skips
+    the compaction check; callers writing one movie at a time should call
+    export_movie_data() once when their batch is done.
+    """
+    try:
+        store = get_catalog_store()
+        if create_backup:
+            backup_file = create_catalog_backup("upsert_movies")
+            log_admin_operation("save_movies", f"Updated {len(updates)} movies with backup {backup_file}")
+        else:
+            log_admin_operation("save_movies", f"Updated {len(updates)} movies")
+        
+        store.put_many(updates)
+        if export:
+            store.compact()
         
     except Exception as e:
         log_admin_operation("save_movies", f"Failed to save movie data: {e}", "error")
         raise HTTPException(status_code=500, detail=f"Failed to save movie data: {e}")
 
+def export_movie_data():
+    """Fold the catalog journal into movie_profiles_merged.json once it has grown large enough"""
+    try:
+        get_catalog_store().compact()
+    except Exception as e:
+        log_admin_operation("save_movies", f"Failed to export movie data: {e}", "error")
+
 # Theme Proposal Management Functions
 def load_theme_proposals() -> Dict[str, Any]:
     """Load theme proposals from JSON file"""
@@ -469,10 +506,10 @@ async def get_dashboard_stats(current_admin: dict = Depends(get_current_admin)):
     """Get dashboard statistics"""
     try:
         movies = get_movie_data()
-        # Don't reload hidden movies - trust the in-memory state
+        hidden = get_hidden_movies().refresh()
         
         total_movies = len(movies)
-        hidden_movies = len(admin_state['hidden_movies'])
+        hidden_movies = len(hidden)
         visible_movies = total_movies - hidden_movies
         
         # Calculate completeness metrics
@@ -481,7 +518,7 @@ async def get_dashboard_stats(current_admin: dict = Depends(get_current_admin)):
         metadata_complete = 0
         
         for title, movie in movies.items():
-            if title in admin_state['hidden_movies']:
+            if title in hidden:
                 continue
                 
             # Check profile completeness
@@ -519,15 +556,15 @@ async def get_movies(current_admin: dict = Depends(get_current_admin)):
     """Get all movies with admin metadata"""
     try:
         movies = get_movie_data()
-        # Don't reload hidden movies - trust the in-memory state
+        hidden = get_hidden_movies().refresh()
         
-        print(f"get_movies: Loaded {len(movies)} movies, {len(admin_state['hidden_movies'])} hidden")
+        print(f"get_movies: Loaded {len(movies)} movies, {len(hidden)} hidden")
         
         movie_list = []
         hidden_count = 0
         for title, movie in movies.items():
             movie_data = movie.copy()
-            is_hidden = title in admin_state['hidden_movies']
+            is_hidden = title in hidden
             movie_data['hidden'] = is_hidden
             movie_data['title'] = title  # Ensure title is set
             movie_list.append(movie_data)
@@ -545,23 +582,11 @@ async def get_movies(current_admin: dict = Depends(get_current_admin)):
 async def hide_movies(request: MovieVisibilityRequest, current_admin: dict = Depends(get_current_admin)):
     """Hide selected movies"""
     try:
-        # Debug logging
-        print(f"Hide request received: {request.titles}")
-        print(f"Admin state before hiding: {len(admin_state['hidden_movies'])} hidden movies")
-        
-        # Don't reload - trust the in-memory state
-        # load_hidden_movies()
-        
-        for title in request.titles:
-            print(f"Adding '{title}' to hidden movies")
-            admin_state['hidden_movies'].add(title)
-        
-        print(f"Admin state after adding: {len(admin_state['hidden_movies'])} hidden movies")
-        
-        save_hidden_movies()
+        # Updates the in-memory set (seen by /search, /movies and /themes) and writes the file
+        hidden_count = get_hidden_movies().hide(request.titles)
         log_admin_operation("hide_movies", f"Hidden {len(request.titles)} movies: {request.titles}")
         
-        return {'message': f'Successfully hid {len(request.titles)} movies', 'hidden_count': len(admin_state['hidden_movies'])}
+        return {'message': f'Successfully hid {len(request.titles)} movies', 'hidden_count': hidden_count}
         
     except Exception as e:
         log_admin_operation("hide_movies", f"Failed to hide movies: {e}", "error")
@@ -571,23 +596,10 @@ async def hide_movies(request: MovieVisibilityRequest, current_admin: dict = Dep
 async def show_movies(request: MovieVisibilityRequest, current_admin: dict = Depends(get_current_admin)):
     """Show selected movies"""
     try:
-        # Debug logging
-        print(f"Show request received: {request.titles}")
-        print(f"Admin state before showing: {len(admin_state['hidden_movies'])} hidden movies")
-        
-        # Don't reload - trust the in-memory state
-        # load_hidden_movies()
-        
-        for title in request.titles:
-            print(f"Removing '{title}' from hidden movies")
-            admin_state['hidden_movies'].discard(title)
-        
-        print(f"Admin state after removing: {len(admin_state['hidden_movies'])} hidden movies")
-        
-        save_hidden_movies()
+        hidden_count = get_hidden_movies().show(request.titles)
         log_admin_operation("show_movies", f"Showed {len(request.titles)} movies: {request.titles}")
         
-        return {'message': f'Successfully showed {len(request.titles)} movies', 'hidden_count': len(admin_state['hidden_movies'])}
+        return {'message': f'Successfully showed {len(request.titles)} movies', 'hidden_count': hidden_count}
         
     except Exception as e:
         log_admin_operation("show_movies", f"Failed to show movies: {e}", "error")
@@ -597,10 +609,8 @@ async def show_movies(request: MovieVisibilityRequest, current_admin: dict = Dep
 async def preview_movie(request: MoviePreviewRequest, current_admin: dict = Depends(get_current_admin)):
     """Get detailed movie information for preview"""
     try:
-        movies = get_movie_data()
-        
         # First, try to find the movie in our existing database
-        movie = movies.get(request.title)
+        movie = get_movie(request.title)
         
         if movie:
             # Movie exists in our database, return it
@@ -612,39 +622,31 @@ async def preview_movie(request: MoviePreviewRequest, current_admin: dict = Depe
             try:
                 tmdb_api_key = os.environ.get("TMDB_API_KEY")
                 if tmdb_api_key:
-                    sess = requests.Session()
-                    sess.params = {'api_key': tmdb_api_key}
-                    
-                    # Get detailed movie information from TMDB
-                    response = sess.get(f"https://api.themoviedb.org/3/movie/{request.tmdb_id}")
-                    if response.status_code == 200:
-                        tmdb_data = response.json()
-                        
-                        # Get movie credits for director information
-                        credits_response = sess.get(f"https://api.themoviedb.org/3/movie/{request.tmdb_id}/credits")
-                        director = "Unknown"
-                        if credits_response.status_code == 200:
-                            credits_data = credits_response.json()
-                            crew = credits_data.get('crew', [])
-                            for person in crew:
-                                if person.get('job') == 'Director':
-                                    director = person.get('name', 'Unknown')
-                                    break
+                    # Details, credits and images in one TMDB request
+                    with session_with_api_key(tmdb_api_key) as sess:
+                        tmdb_data = fetch_tmdb_movie(sess, request.tmdb_id)
+                    if tmdb_data:
+                        record = normalize_tmdb_movie(tmdb_data, request.tmdb_id)
                         
                         # Format the movie data for preview
                         movie_data = {
-                            'title': tmdb_data.get('title', request.title),
-                            'year': tmdb_data.get('release_date', '')[:4] if tmdb_data.get('release_date') else '',
-                            'director': director,
+                            'title': record['title'] or request.title,
+                            'year': record['year'] if tmdb_data.get('release_date') else '',
+                            'director': record['director'] or 'Unknown',
                             'tmdb_id': request.tmdb_id,
                             'overview': tmdb_data.get('overview', ''),
-                            'plot_summary': tmdb_data.get('overview', ''),
-                            'runtime': tmdb_data.get('runtime'),
-                            'vote_average': tmdb_data.get('vote_average'),
-                            'vote_count': tmdb_data.get('vote_count'),
+                            'plot_summary': record['plot_summary'],
+                            'runtime': record['runtime'],
+                            'vote_average': record['vote_average'],
+                            'vote_count': record['vote_count'],
                             'poster_path': tmdb_data.get('poster_path'),
                             'backdrop_path': tmdb_data.get('backdrop_path'),
+                            'poster_url': record['poster_url'],
+                            'backdrop_url': record['backdrop_url'],
                             'genre_ids': tmdb_data.get('genre_ids', []),
+                            'genre_tags': record['genre_tags'],
+                            'keywords': record['keywords'],
+                            'imdb_id': record['imdb_id'],
                             'adult': tmdb_data.get('adult', False),
                             'original_language': tmdb_data.get('original_language'),
                             'original_title': tmdb_data.get('original_title'),
@@ -654,14 +656,6 @@ async def preview_movie(request: MoviePreviewRequest, current_admin: dict = Depe
                             'spoken_languages': tmdb_data.get('spoken_languages', [])
                         }
                         
-                        # Add poster URL if available
-                        if movie_data.get('poster_path'):
-                            movie_data['poster_url'] = f"https://image.tmdb.org/t/p/w500{movie_data['poster_path']}"
-                        
-                        # Add backdrop URL if available
-                        if movie_data.get('backdrop_path'):
-                            movie_data['backdrop_url'] = f"https://image.tmdb.org/t/p/w1280{movie_data['backdrop_path']}"
-                        
                         log_admin_operation("preview_movie", f"Retrieved fresh TMDB data for: {request.title}")
                         return movie_data
                         
@@ -690,146 +684,209 @@ async def preview_movie(request: MoviePreviewRequest, current_admin: dict = Depe
         log_admin_operation("preview_movie", f"Failed to preview movie {request.title}: {e}", "error")
         raise HTTPException(status_code=500, detail=str(e))
 
-@admin_router.post("/scrape/director")
-async def scrape_director_movies(request: DirectorScrapeRequest, current_admin: dict = Depends(get_current_admin)):
-    """Scrape movies by director from TMDB"""
-    try:
-        tmdb_api_key = os.environ.get("TMDB_API_KEY")
-        if not tmdb_api_key:
-            raise HTTPException(status_code=500, detail="TMDB_API_KEY not configured")
-        
-        sess = requests.Session()
-        sess.params = {'api_key': tmdb_api_key}
+def filter_director_credits(movies: List[Dict[str, Any]], request: DirectorScrapeRequest) -> List[Dict[str, Any]]:
+    """Apply the scrape options to a filmography and drop duplicate (title, year) credits"""
+    filtered_movies = []
+    seen_movies = set()  # Track seen movies by (title, year) tuple
+    
+    for movie in movies:
+        # Get movie details to determine if it's a short, TV movie, or documentary
+        title = movie.get('title', '').strip()
+        year = movie.get('release_date', '')[:4] if movie.get('release_date') else ''
+        
+        # Skip movies with empty titles
+        if not title:
+            continue
+        
+        # Apply filtering based on user preferences
+        # Note: TMDB credits don't always include detailed genre/media_type info
+        # So we'll use heuristics and be more permissive
+        
+        # Check if this might be a short film (runtime < 60 minutes)
+        runtime = movie.get('runtime', 0)
+        if runtime > 0 and not request.includeShorts and runtime < 60:
+            continue
+        
+        # Check if this might be a TV movie or documentary based on title patterns
+        title_lower = title.lower()
+        
+        # Skip TV movies if not included
+        if not request.includeTV:
+            tv_indicators = ['tv movie', 'made for tv', 'television movie', 'tv special']
+            if any(indicator in title_lower for indicator in tv_indicators):
+                continue
         
-        # Search for director
-        person_id = tmdb_search_person(sess, request.director)
-        if not person_id:
-            raise HTTPException(status_code=404, detail=f"Director '{request.director}' not found")
+        # Skip documentaries if not included
+        if not request.includeDocumentaries:
+            doc_indicators = ['documentary', 'doc', 'making of', 'behind the scenes', 'tribute', 'biography']
+            if any(indicator in title_lower for indicator in doc_indicators):
+                continue
         
-        # Get director's movies
-        movies = get_person_movies(sess, person_id)
-        print(f"Found {len(movies)} movies in filmography for {request.director}")
+        # Create a normalized key for deduplication (case-insensitive, trimmed)
+        movie_key = (title.lower().strip(), year)
         
-        # Filter based on options and deduplicate
-        filtered_movies = []
-        seen_movies = set()  # Track seen movies by (title, year) tuple
+        # Skip if we've already seen this movie
+        if movie_key in seen_movies:
+            continue
         
-        for movie in movies:
-            # Get movie details to determine if it's a short, TV movie, or documentary
-            title = movie.get('title', '').strip()
-            year = movie.get('release_date', '')[:4] if movie.get('release_date') else ''
-            
-            # Skip movies with empty titles
-            if not title:
-                continue
-            
-            # Apply filtering based on user preferences
-            # Note: TMDB credits don't always include detailed genre/media_type info
-            # So we'll use heuristics and be more permissive
-            
-            # Check if this might be a short film (runtime < 60 minutes)
-            runtime = movie.get('runtime', 0)
-            if runtime > 0 and not request.includeShorts and runtime < 60:
-                continue
-            
-            # Check if this might be a TV movie or documentary based on title patterns
-            title_lower = title.lower()
-            
-            # Skip TV movies if not included
-            if not request.includeTV:
-                tv_indicators = ['tv movie', 'made for tv', 'television movie', 'tv special']
-                if any(indicator in title_lower for indicator in tv_indicators):
-                    continue
-            
-            # Skip documentaries if not included
-            if not request.includeDocumentaries:
-                doc_indicators = ['documentary', 'doc', 'making of', 'behind the scenes', 'tribute', 'biography']
-                if any(indicator in title_lower for indicator in doc_indicators):
-                    continue
-            
-            # Create a normalized key for deduplication (case-insensitive, trimmed)
-            movie_key = (title.lower().strip(), year)
-            
-            # Skip if we've already seen this movie
-            if movie_key in seen_movies:
-                continue
-            
-            seen_movies.add(movie_key)
-            
-            # Get actual director information for this movie (for verification)
-            actual_director = get_movie_director(sess, movie.get('id'))
-            
-            # Since we're getting movies from the person's filmography where job="Director",
-            # we should trust TMDB's data more. Only skip if we get a completely different director.
-            should_include = True
-            verification_note = ""
-            
-            if actual_director:
-                # Try exact match first
-                if actual_director.lower() == request.director.lower():
-                    verification_note = f"✅ Exact match: {actual_director}"
-                else:
-                    # Try flexible matching for name variations
-                    searched_name_parts = request.director.lower().replace(' ', '').replace('.', '').replace('-', '')
-                    actual_name_parts = actual_director.lower().replace(' ', '').replace('.', '').replace('-', '')
-                    
-                    if searched_name_parts == actual_name_parts:
-                        verification_note = f"✅ Name variation match: {actual_director}"
-                    elif (searched_name_parts in actual_name_parts or 
-                          actual_name_parts in searched_name_parts):
-                        verification_note = f"✅ Partial name match: {actual_director}"
-                    else:
-                        # Only exclude if the director names are completely different
-                        # and the actual director is clearly not the searched person
-                        if len(actual_director.split()) > 1 and len(request.director.split()) > 1:
-                            # Both have multiple names, check if any part matches
-                            searched_parts = set(request.director.lower().split())
-                            actual_parts = set(actual_director.lower().split())
-                            if not searched_parts.intersection(actual_parts):
-                                should_include = False
-                                verification_note = f"❌ Completely different director: {actual_director}"
-                            else:
-                                verification_note = f"⚠️  Name overlap, including: {actual_director}"
-                        else:
-                            # Single names or unclear cases - be more permissive
-                            verification_note = f"⚠️  Different director but including: {actual_director}"
-            else:
-                verification_note = "⚠️  No director info, including based on filmography"
+        seen_movies.add(movie_key)
+        filtered_movies.append({**movie, 'title': title, 'year': year})
+    
+    return filtered_movies
+
+def verify_director_credit(movie: Dict[str, Any], actual_director: Optional[str],
+                           director: str) -> Optional[Dict[str, Any]]:
+    """Movie info for a filmography credit, or None when TMDB names a completely different director"""
+    title = movie['title']
+    
+    # Since we're getting movies from the person's filmography where job="Director",
+    # we should trust TMDB's data more. Only skip if we get a completely different director.
+    should_include = True
+    verification_note = ""
+    
+    if actual_director:
+        # Try exact match first
+        if actual_director.lower() == director.lower():
+            verification_note = f"✅ Exact match: {actual_director}"
+        else:
+            # Try flexible matching for name variations
+            searched_name_parts = director.lower().replace(' ', '').replace('.', '').replace('-', '')
+            actual_name_parts = actual_director.lower().replace(' ', '').replace('.', '').replace('-', '')
             
-            if should_include:
-                # Add basic movie info
-                movie_info = {
-                    'title': title,
-                    'year': year,
-                    'tmdb_id': movie.get('id'),
-                    'director': actual_director or request.director,  # Use actual if available, fallback to searched
-                    'overview': movie.get('overview', ''),
-                    'poster_path': movie.get('poster_path'),
-                    'backdrop_path': movie.get('backdrop_path'),
-                    'genre_ids': movie.get('genre_ids', []),
-                    'vote_average': movie.get('vote_average'),
-                    'vote_count': movie.get('vote_count')
-                }
-                filtered_movies.append(movie_info)
-                print(f"Including {title} - {verification_note}")
+            if searched_name_parts == actual_name_parts:
+                verification_note = f"✅ Name variation match: {actual_director}"
+            elif (searched_name_parts in actual_name_parts or 
+                  actual_name_parts in searched_name_parts):
+                verification_note = f"✅ Partial name match: {actual_director}"
             else:
-                print(f"Skipping {title} - {verification_note}")
-                continue
+                # Only exclude if the director names are completely different
+                # and the actual director is clearly not the searched person
+                if len(actual_director.split()) > 1 and len(director.split()) > 1:
+                    # Both have multiple names, check if any part matches
+                    searched_parts = set(director.lower().split())
+                    actual_parts = set(actual_director.lower().split())
+                    if not searched_parts.intersection(actual_parts):
+                        should_include = False
+                        verification_note = f"❌ Completely different director: {actual_director}"
+                    else:
+                        verification_note = f"⚠️  Name overlap, including: {actual_director}"
+                else:
+                    # Single names or unclear cases - be more permissive
+                    verification_note = f"⚠️  Different director but including: {actual_director}"
+    else:
+        verification_note = "⚠️  No director info, including based on filmography"
+    
+    if not should_include:
+        print(f"Skipping {title} - {verification_note}")
+        return None
+    
+    print(f"Including {title} - {verification_note}")
+    # Add basic movie info
+    return {
+        'title': title,
+        'year': movie['year'],
+        'tmdb_id': movie.get('id'),
+        'director': actual_director or director,  # Use actual if available, fallback to searched
+        'overview': movie.get('overview', ''),
+        'poster_path': movie.get('poster_path'),
+        'backdrop_path': movie.get('backdrop_path'),
+        'genre_ids': movie.get('genre_ids', []),
+        'vote_average': movie.get('vote_average'),
+        'vote_count': movie.get('vote_count')
+    }
+
+def iter_director_movies(sess: requests.Session, movies: List[Dict[str, Any]],
+                         director: str) -> Iterator[Dict[str, Any]]:
+    """Verify the director of every credit on a bounded pool; yields movie info as lookups finish"""
+    pool = ThreadPoolExecutor(max_workers=max(1, DIRECTOR_SCRAPE_WORKERS), thread_name_prefix="director-scrape")
+    try:
+        futures = {pool.submit(get_movie_director, sess, movie.get('id')): movie for movie in movies}
+        for future in as_completed(futures):
+            movie_info = verify_director_credit(futures[future], future.result(), director)
+            if movie_info:
+                yield movie_info
+    finally:
+        # also reached when a streaming client goes away: drop the lookups not started yet
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def ndjson_stream(lines: Iterator[Dict[str, Any]]) -> StreamingResponse:
+    """One JSON document per line, sent as each is produced (the iterator runs in a worker thread)"""
+    return StreamingResponse((json.dumps(line) + "\n" for line in lines), media_type="application/x-ndjson",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def stream_scraped_movies(movies: Iterator[Dict[str, Any]], operation: str, summary: Callable[[int], str],
+                          failure: str) -> StreamingResponse:
+    """NDJSON response of a scrape: {"movie": ...} per movie as it is ready, then {"done": true, "count": n}
+    (or {"error": ...} if the scrape fails part way)"""
+    def lines():
+        count = 0
+        try:
+            for movie in movies:
+                count += 1
+                yield {'movie': movie}
+        except Exception as e:
+            log_admin_operation(operation, f"{failure}: {e}", "error")
+            yield {'error': str(e), 'count': count}
+            return
+        log_admin_operation(operation, summary(count))
+        yield {'done': True, 'count': count}
+    
+    return ndjson_stream(lines())
+
+def _find_director_filmography(request: DirectorScrapeRequest) -> Tuple[requests.Session, List[Dict[str, Any]]]:
+    tmdb_api_key = os.environ.get("TMDB_API_KEY")
+    if not tmdb_api_key:
+        raise HTTPException(status_code=500, detail="TMDB_API_KEY not configured")
+    
+    sess = session_with_api_key(tmdb_api_key, pool_maxsize=max(10, DIRECTOR_SCRAPE_WORKERS))
+    
+    # Search for director
+    person_id = tmdb_search_person(sess, request.director)
+    if not person_id:
+        raise HTTPException(status_code=404, detail=f"Director '{request.director}' not found")
+    
+    # Get director's movies
+    movies = get_person_movies(sess, person_id)
+    print(f"Found {len(movies)} movies in filmography for {request.director}")
+    return sess, filter_director_credits(movies, request)
+
+@admin_router.post("/scrape/director")
+async def scrape_director_movies(request: DirectorScrapeRequest, stream: bool = False,
+                                 current_admin: dict = Depends(get_current_admin)):
+    """Scrape movies by director from TMDB.
+
+    With ?stream=true the movies come back as NDJSON lines ({"movie": ...}) as their credits are verified,
+    followed by {"done": true, "count": n}.
+    """
+    options = f"shorts: {request.includeShorts}, TV: {request.includeTV}, docs: {request.includeDocumentaries}"
+    try:
+        sess, candidates = await run_in_threadpool(_find_director_filmography, request)
+        
+        if stream:
+            return stream_scraped_movies(
+                iter_director_movies(sess, candidates, request.director), "scrape_director",
+                lambda count: f"Scraped {count} unique movies for {request.director} ({options})",
+                "Failed to scrape director")
+        
+        filtered_movies = await run_in_threadpool(lambda: list(iter_director_movies(sess, candidates, request.director)))
         
         # Sort by year (newest first) and then by title
         filtered_movies.sort(key=lambda x: (x['year'] or '0', x['title']), reverse=True)
         
-        log_admin_operation("scrape_director", f"Scraped {len(filtered_movies)} unique movies for {request.director} (shorts: {request.includeShorts}, TV: {request.includeTV}, docs: {request.includeDocumentaries})")
+        log_admin_operation("scrape_director", f"Scraped {len(filtered_movies)} unique movies for {request.director} ({options})")
         
         return {'movies': filtered_movies}
         
+    except HTTPException:
+        raise
     except Exception as e:
         log_admin_operation("scrape_director", f"Failed to scrape director: {e}", "error")
         raise HTTPException(status_code=500, detail=str(e))
 
 @admin_router.post("/scrape/tmdb-list")
-async def scrape_tmdb_list(request: TMDBListRequest, current_admin: dict = Depends(get_current_admin)):
-    """Scrape movies from TMDB list"""
+async def scrape_tmdb_list(request: TMDBListRequest, stream: bool = False,
+                           current_admin: dict = Depends(get_current_admin)):
+    """Scrape movies from TMDB list (?stream=true: NDJSON lines as movies are hydrated, see stream_scraped_movies)"""
     try:
         tmdb_api_key = os.environ.get("TMDB_API_KEY")
         omdb_api_key = os.environ.get("OMDB_API_KEY")
@@ -837,23 +894,30 @@ async def scrape_tmdb_list(request: TMDBListRequest, current_admin: dict = Depen
         if not tmdb_api_key:
             raise HTTPException(status_code=500, detail="TMDB_API_KEY not configured")
         
-        sess = requests.Session()
-        sess.params = {'api_key': tmdb_api_key}
+        sess = hydration_session(tmdb_api_key)
         
-        # Hydrate from TMDB list
-        movies = hydrate_from_tmdb_list(sess, request.list_id, omdb_api_key)
+        if stream:
+            return stream_scraped_movies(
+                iter_hydrate_from_tmdb_list(sess, request.list_id, omdb_api_key), "scrape_tmdb_list",
+                lambda count: f"Scraped {count} movies from list {request.list_id}", "Failed to scrape TMDB list")
+        
+        # Hydrate from TMDB list (blocking; keep it off the event loop)
+        movies = await run_in_threadpool(hydrate_from_tmdb_list, sess, request.list_id, omdb_api_key)
         
         log_admin_operation("scrape_tmdb_list", f"Scraped {len(movies)} movies from list {request.list_id}")
         
         return {'movies': movies}
         
+    except HTTPException:
+        raise
     except Exception as e:
         log_admin_operation("scrape_tmdb_list", f"Failed to scrape TMDB list: {e}", "error")
         raise HTTPException(status_code=500, detail=str(e))
 
 @admin_router.post("/scrape/custom")
-async def scrape_custom_collection(request: CustomCollectionRequest, current_admin: dict = Depends(get_current_admin)):
-    """Scrape movies from custom source"""
+async def scrape_custom_collection(request: CustomCollectionRequest, stream: bool = False,
+                                   current_admin: dict = Depends(get_current_admin)):
+    """Scrape movies from custom source (?stream=true: NDJSON lines as movies are hydrated, see stream_scraped_movies)"""
     try:
         tmdb_api_key = os.environ.get("TMDB_API_KEY")
         omdb_api_key = os.environ.get("OMDB_API_KEY")
@@ -861,103 +925,121 @@ async def scrape_custom_collection(request: CustomCollectionRequest, current_adm
         if not tmdb_api_key:
             raise HTTPException(status_code=500, detail="TMDB_API_KEY not configured")
         
-        sess = requests.Session()
-        sess.params = {'api_key': tmdb_api_key}
+        sess = hydration_session(tmdb_api_key)
+        
+        if stream:
+            # Generators: list pages are fetched as hydration needs more seeds, in the response's worker thread
+            streams = {
+                'wikipedia': lambda: iter_hydrate_from_wikipedia(sess, request.data, omdb_api_key),
+                'letterboxd': lambda: iter_hydrate_from_letterboxd(sess, request.data, omdb_api_key),
+                'bfi': lambda: iter_hydrate_from_bfi(sess, request.data, omdb_api_key),
+                'csv': lambda: iter_movies(sess, csv_seeds(io.StringIO(request.data)), omdb_api_key),
+            }
+            return stream_scraped_movies(
+                streams.get(request.source, lambda: iter(()))(), "scrape_custom",
+                lambda count: f"Scraped {count} movies from {request.source}", "Failed to scrape custom collection")
         
         movies = []
         
+        # Scraping and hydration block; keep them off the event loop
         if request.source == 'wikipedia':
-            movies = hydrate_from_wikipedia(sess, request.data, omdb_api_key)
+            movies = await run_in_threadpool(hydrate_from_wikipedia, sess, request.data, omdb_api_key)
         elif request.source == 'letterboxd':
-            movies = hydrate_from_letterboxd(sess, request.data, omdb_api_key)
+            movies = await run_in_threadpool(hydrate_from_letterboxd, sess, request.data, omdb_api_key)
         elif request.source == 'bfi':
-            movies = hydrate_from_bfi(sess, request.data, omdb_api_key)
+            movies = await run_in_threadpool(hydrate_from_bfi, sess, request.data, omdb_api_key)
         elif request.source == 'csv':
-            # Save CSV data to temp file
-            temp_csv = Path("temp_collection.csv")
-            with open(temp_csv, 'w') as f:
-                f.write(request.data)
-            movies = hydrate_from_csv(sess, str(temp_csv), omdb_api_key)
-            temp_csv.unlink()  # Clean up
+            # CSV text is parsed in memory, no temp file
+            movies = await run_in_threadpool(hydrate_seeds, sess, csv_seeds(io.StringIO(request.data)), omdb_api_key)
         
         log_admin_operation("scrape_custom", f"Scraped {len(movies)} movies from {request.source}")
         
         return {'movies': movies}
         
+    except HTTPException:
+        raise
     except Exception as e:
         log_admin_operation("scrape_custom", f"Failed to scrape custom collection: {e}", "error")
         raise HTTPException(status_code=500, detail=str(e))
 
+def enqueue_enrichment(kind: str, movies: List[Dict[str, Any]], provider: str = "openai") -> int:
+    """Queue a run of `movies` through the stages of `kind` and make sure a worker drains it; returns the run ID"""
+    operation, steps, options = ENRICHMENT_RUNS[kind]
+    run_id = get_job_queue().create_run(kind, movies, steps, {**options, 'operation': operation, 'provider': provider})
+    log_admin_operation(operation, f"Queued run {run_id}: {len(movies)} movies through {', '.join(steps)}")
+    from enrichment_worker import ensure_background_worker
+    ensure_background_worker()
+    return run_id
+
+def enqueue_staged(kind: str) -> Tuple[int, int]:
+    """Move the staging area into a new run; returns (run ID, movie count)"""
+    movies = admin_state.pop_list(STAGING)
+    if not movies:
+        raise HTTPException(status_code=400, detail="No movies in staging area")
+    try:
+        return enqueue_enrichment(kind, movies), len(movies)
+    except Exception:
+        admin_state.extend_list(STAGING, movies)  # nothing was queued; keep them staged
+        raise
+
 @admin_router.post("/enrichment/start")
-async def start_enrichment_pipeline(background_tasks: BackgroundTasks, current_admin: dict = Depends(get_current_admin)):
-    """Start enrichment pipeline for movies in staging"""
+async def start_enrichment_pipeline(current_admin: dict = Depends(get_current_admin)):
+    """Queue the movies in staging for full enrichment"""
     try:
-        if not admin_state['staging']:
-            raise HTTPException(status_code=400, detail="No movies in staging area")
-        
-        background_tasks.add_task(run_enrichment_pipeline)
+        run_id, staged = enqueue_staged('enrichment')
         
-        log_admin_operation("enrichment_start", f"Started enrichment pipeline for {len(admin_state['staging'])} movies")
+        log_admin_operation("enrichment_start", f"Started enrichment pipeline for {staged} movies")
         
-        return {'message': 'Enrichment pipeline started'}
+        return {'message': 'Enrichment pipeline started', 'run_id': run_id, 'count': staged}
         
     except Exception as e:
         log_admin_operation("enrichment_start", f"Failed to start enrichment: {e}", "error")
         raise HTTPException(status_code=500, detail=str(e))
 
 @admin_router.post("/enrichment/metadata")
-async def start_metadata_enrichment(background_tasks: BackgroundTasks, current_admin: dict = Depends(get_current_admin)):
-    """Start metadata enrichment for movies in staging"""
+async def start_metadata_enrichment(current_admin: dict = Depends(get_current_admin)):
+    """Queue the movies in staging for metadata enrichment"""
     try:
-        if not admin_state['staging']:
-            raise HTTPException(status_code=400, detail="No movies in staging area")
-        
-        background_tasks.add_task(run_metadata_enrichment_pipeline)
+        run_id, staged = enqueue_staged('metadata')
         
-        log_admin_operation("metadata_enrichment", f"Started metadata enrichment for {len(admin_state['staging'])} movies")
+        log_admin_operation("metadata_enrichment", f"Started metadata enrichment for {staged} movies")
         
-        return {'message': 'Metadata enrichment started'}
+        return {'message': 'Metadata enrichment started', 'run_id': run_id, 'count': staged}
         
     except Exception as e:
         log_admin_operation("metadata_enrichment", f"Failed to start metadata enrichment: {e}", "error")
         raise HTTPException(status_code=500, detail=str(e))
 
 @admin_router.post("/enrichment/images")
-async def start_image_enrichment(background_tasks: BackgroundTasks, current_admin: dict = Depends(get_current_admin)):
-    """Start image enrichment for movies in staging"""
+async def start_image_enrichment(current_admin: dict = Depends(get_current_admin)):
+    """Queue the movies in staging for image enrichment"""
     try:
-        if not admin_state['staging']:
-            raise HTTPException(status_code=400, detail="No movies in staging area")
+        run_id, staged = enqueue_staged('images')
         
-        background_tasks.add_task(run_image_enrichment_pipeline)
+        log_admin_operation("image_enrichment", f"Started image enrichment for {staged} movies")
         
-        log_admin_operation("image_enrichment", f"Started image enrichment for {len(admin_state['staging'])} movies")
-        
-        return {'message': 'Image enrichment started'}
+        return {'message': 'Image enrichment started', 'run_id': run_id, 'count': staged}
         
     except Exception as e:
         log_admin_operation("image_enrichment", f"Failed to start image enrichment: {e}", "error")
         raise HTTPException(status_code=500, detail=str(e))
 
 @admin_router.post("/enrichment/profiles")
-async def start_profile_enrichment(background_tasks: BackgroundTasks, current_admin: dict = Depends(get_current_admin)):
-    """Start profile generation for movies in staging"""
+async def start_profile_enrichment(current_admin: dict = Depends(get_current_admin)):
+    """Queue the movies in staging for profile generation"""
     try:
-        if not admin_state['staging']:
-            raise HTTPException(status_code=400, detail="No movies in staging area")
-        
-        background_tasks.add_task(run_profile_enrichment_pipeline)
+        run_id, staged = enqueue_staged('profiles')
         
-        log_admin_operation("profile_enrichment", f"Started profile generation for {len(admin_state['staging'])} movies")
+        log_admin_operation("profile_enrichment", f"Started profile generation for {staged} movies")
         
-        return {'message': 'Profile generation started'}
+        return {'message': 'Profile generation started', 'run_id': run_id, 'count': staged}
         
     except Exception as e:
         log_admin_operation("profile_enrichment", f"Failed to start profile generation: {e}", "error")
         raise HTTPException(status_code=500, detail=str(e))
 
 @admin_router.post("/enrichment/generate-profiles")
-async def generate_profiles_for_movies(background_tasks: BackgroundTasks, current_admin: dict = Depends(get_current_admin)):
+async def generate_profiles_for_movies(current_admin: dict = Depends(get_current_admin)):
     """Generate profiles for movies that don't have them yet"""
     try:
         movies = get_movie_data()
@@ -971,255 +1053,114 @@ async def generate_profiles_for_movies(background_tasks: BackgroundTasks, curren
         if not movies_needing_profiles:
             return {'message': 'No movies need profile generation', 'count': 0}
         
-        # Add to staging and start profile generation
-        admin_state['staging'] = movies_needing_profiles
-        background_tasks.add_task(run_profile_generation_pipeline)
+        # Queue them directly; the staging area is left alone
+        run_id = enqueue_enrichment('generate_profiles', movies_needing_profiles)
         
         log_admin_operation("profile_generation", f"Started profile generation for {len(movies_needing_profiles)} movies")
         
-        return {'message': f'Profile generation started for {len(movies_needing_profiles)} movies', 'count': len(movies_needing_profiles)}
+        return {'message': f'Profile generation started for {len(movies_needing_profiles)} movies',
+                'count': len(movies_needing_profiles), 'run_id': run_id}
         
     except Exception as e:
         log_admin_operation("profile_generation", f"Failed to start profile generation: {e}", "error")
         raise HTTPException(status_code=500, detail=str(e))
 
-async def run_profile_generation_pipeline():
-    """Run profile generation for movies without profiles"""
-    try:
-        log_admin_operation("profile_generation", "Starting profile generation pipeline", "info")
-        
-        # Move movies from staging to pipeline
-        admin_state['pipeline'] = admin_state['staging'].copy()
-        admin_state['staging'] = []
-        
-        # Import and initialize the enrichment pipeline
-        from enrichment_pipeline import EnrichmentPipeline
-        pipeline = EnrichmentPipeline("openai")
-        
-        # Process each movie through profile generation only
-        for i, movie in enumerate(admin_state['pipeline']):
-            try:
-                log_admin_operation("profile_generation", f"Generating profile for {movie['title']} ({i+1}/{len(admin_state['pipeline'])})", "info")
-                
-                # Run only profile generation
-                enriched_movie = pipeline.process_movie(movie, steps=['profile'])
-                
-                # Update movie in database
-                movies = get_movie_data()
-                movies[movie['title']] = enriched_movie
-                save_movie_data(movies)
-                
-                log_admin_operation("profile_generation", f"Successfully generated profile for {movie['title']}", "success")
-                
-            except Exception as e:
-                log_admin_operation("profile_generation", f"Failed to generate profile for {movie['title']}: {e}", "error")
-        
-        admin_state['pipeline'] = []
-        log_admin_operation("profile_generation", "Profile generation pipeline completed", "success")
-        
-    except Exception as e:
-        log_admin_operation("profile_generation", f"Profile generation pipeline failed: {e}", "error")
-
-async def run_enrichment_pipeline():
-    """Run the enrichment pipeline in background with optimized file I/O"""
-    try:
-        log_admin_operation("enrichment_pipeline", "Starting enrichment pipeline", "info")
-        
-        # Move movies from staging to pipeline
-        admin_state['pipeline'] = admin_state['staging'].copy()
-        admin_state['staging'] = []
-        
-        # Import and initialize the proper enrichment pipeline
-        from enrichment_pipeline import EnrichmentPipeline
-        
-        # Initialize pipeline with OpenAI (you can make this configurable)
-        pipeline = EnrichmentPipeline("openai")
-        
-        # OPTIMIZATION: Load the database ONCE at the start
-        log_admin_operation("enrichment_pipeline", "Loading movie database for batch processing", "info")
-        movies = get_movie_data()
-        
-        # Process each movie through the full enrichment pipeline
-        for i, movie in enumerate(admin_state['pipeline']):
-            try:
-                log_admin_operation("enrichment_pipeline", f"Processing {movie['title']} ({i+1}/{len(admin_state['pipeline'])})", "info")
-                
-                # Run full enrichment: metadata + images + profile generation
-                enriched_movie = pipeline.process_movie(movie, steps=['metadata', 'images', 'profile'])
-                
-                # Add enriched movie to in-memory database (no file I/O yet)
-                movies[movie['title']] = enriched_movie
-                
-                log_admin_operation("enrichment_pipeline", f"Successfully processed {movie['title']}", "success")
-                
-            except Exception as e:
-                log_admin_operation("enrichment_pipeline", f"Failed to process {movie['title']}: {e}", "error")
-                # Still add the original movie to database even if enrichment fails
-                movies[movie['title']] = movie
-        
-        admin_state['pipeline'] = []
-        
-        # OPTIMIZATION: Save the entire database ONCE at the end
-        log_admin_operation("enrichment_pipeline", "Saving enriched movies to database", "info")
-        save_movie_data(movies, create_backup=True)
-        
-        log_admin_operation("enrichment_pipeline", "Enrichment pipeline completed", "success")
-        
-        # Full sync to include new movies (API reload + server restart)
-        full_sync_data()
-        
-    except Exception as e:
-        log_admin_operation("enrichment_pipeline", f"Enrichment pipeline failed: {e}", "error")
+@admin_router.get("/enrichment/runs")
+async def list_enrichment_runs(active: bool = False, limit: int = 20, current_admin: dict = Depends(get_current_admin)):
+    """Recent enrichment runs (newest first) with per-run progress"""
+    return {'runs': get_job_queue().list_runs(limit=limit, active_only=active)}
+
+@admin_router.get("/enrichment/runs/{run_id}")
+async def get_enrichment_run(run_id: int, current_admin: dict = Depends(get_current_admin)):
+    """Status of one enrichment run: job counts per stage and the jobs that failed"""
+    run = get_job_queue().get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    return run
+
+@admin_router.post("/enrichment/runs/{run_id}/retry")
+async def retry_enrichment_run(run_id: int, current_admin: dict = Depends(get_current_admin)):
+    """Retry the failed jobs of a run"""
+    retried = get_job_queue().retry_failed(run_id)
+    if retried:
+        from enrichment_worker import ensure_background_worker
+        ensure_background_worker()
+    log_admin_operation("enrichment_retry", f"Retrying {retried} failed jobs of run {run_id}")
+    return {'message': f'Retrying {retried} failed jobs', 'retried': retried}
+
+@admin_router.post("/enrichment/runs/{run_id}/cancel")
+async def cancel_enrichment_run(run_id: int, current_admin: dict = Depends(get_current_admin)):
+    """Cancel the jobs of a run that have not started; finished movies are still saved"""
+    cancelled = get_job_queue().cancel_run(run_id)
+    log_admin_operation("enrichment_cancel", f"Cancelled {cancelled} queued jobs of run {run_id}")
+    return {'message': f'Cancelled {cancelled} queued jobs', 'cancelled': cancelled}
+
+# Seconds between polls of the event table, and between keepalive comments on an idle stream
+EVENT_POLL_SECONDS = 0.5
+EVENT_KEEPALIVE_SECONDS = 15
+
+@admin_router.get("/events")
+async def stream_events(request: Request, after: Optional[int] = None,
+                        last_event_id: Optional[str] = Header(default=None),
+                        current_admin: dict = Depends(get_current_admin_from_query)):
+    """Server-sent events with the progress of enrichment runs, written by the workers to the job queue.
+
+    Starts after `after` (or the Last-Event-ID a reconnecting EventSource sends); by default only new events.
+    """
+    queue = get_job_queue()
+    if last_event_id and last_event_id.isdigit():
+        after = int(last_event_id)
+    if after is None:
+        after = await run_in_threadpool(queue.last_event_seq)
+
+    async def events():
+        seq, idle = after, 0.0
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            batch = await run_in_threadpool(queue.events_since, seq)
+            for event in batch:
+                seq = event["seq"]
+                yield f"id: {seq}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            if batch:
+                idle = 0.0
+                continue
+            idle += EVENT_POLL_SECONDS
+            if idle >= EVENT_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keepalive\n\n"
+            await asyncio.sleep(EVENT_POLL_SECONDS)
 
-async def run_metadata_enrichment_pipeline():
-    """Run metadata enrichment for movies in staging with optimized file I/O"""
-    try:
-        log_admin_operation("metadata_enrichment", "Starting metadata enrichment pipeline", "info")
-        
-        # Move movies from staging to pipeline
-        admin_state['pipeline'] = admin_state['staging'].copy()
-        admin_state['staging'] = []
-        
-        # Import and initialize the enrichment pipeline
-        from enrichment_pipeline import EnrichmentPipeline
-        pipeline = EnrichmentPipeline("openai")
-        
-        # OPTIMIZATION: Load the database ONCE at the start
-        log_admin_operation("metadata_enrichment", "Loading movie database for batch processing", "info")
-        movies = get_movie_data()
-        
-        # Process each movie through metadata enrichment only
-        for i, movie in enumerate(admin_state['pipeline']):
-            try:
-                log_admin_operation("metadata_enrichment", f"Enriching metadata for {movie['title']} ({i+1}/{len(admin_state['pipeline'])})", "info")
-                
-                # Run only metadata enrichment
-                enriched_movie = pipeline.process_movie(movie, steps=['metadata'])
-                
-                # Update movie in in-memory database (no file I/O yet)
-                movies[movie['title']] = enriched_movie
-                
-                log_admin_operation("metadata_enrichment", f"Successfully enriched metadata for {movie['title']}", "success")
-                
-            except Exception as e:
-                log_admin_operation("metadata_enrichment", f"Failed to enrich metadata for {movie['title']}: {e}", "error")
-        
-        admin_state['pipeline'] = []
-        
-        # OPTIMIZATION: Save the entire database ONCE at the end
-        log_admin_operation("metadata_enrichment", "Saving enriched movies to database", "info")
-        save_movie_data(movies, create_backup=True)
-        
-        log_admin_operation("metadata_enrichment", "Metadata enrichment pipeline completed", "success")
-        
-        # Full sync to include new movies (API reload + server restart)
-        full_sync_data()
-        
-    except Exception as e:
-        log_admin_operation("metadata_enrichment", f"Metadata enrichment pipeline failed: {e}", "error")
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
-async def run_image_enrichment_pipeline():
-    """Run image enrichment for movies in staging with optimized file I/O"""
-    try:
-        log_admin_operation("image_enrichment", "Starting image enrichment pipeline", "info")
-        
-        # Move movies from staging to pipeline
-        admin_state['pipeline'] = admin_state['staging'].copy()
-        admin_state['staging'] = []
-        
-        # Import and initialize the enrichment pipeline
-        from enrichment_pipeline import EnrichmentPipeline
-        pipeline = EnrichmentPipeline("openai")
-        
-        # OPTIMIZATION: Load the database ONCE at the start
-        log_admin_operation("image_enrichment", "Loading movie database for batch processing", "info")
-        movies = get_movie_data()
-        
-        # Process each movie through image enrichment only
-        for i, movie in enumerate(admin_state['pipeline']):
-            try:
-                log_admin_operation("image_enrichment", f"Adding images for {movie['title']} ({i+1}/{len(admin_state['pipeline'])})", "info")
-                
-                # Run only image enrichment
-                enriched_movie = pipeline.process_movie(movie, steps=['images'])
-                
-                # Update movie in in-memory database (no file I/O yet)
-                movies[movie['title']] = enriched_movie
-                
-                log_admin_operation("image_enrichment", f"Successfully added images for {movie['title']}", "success")
-                
-            except Exception as e:
-                log_admin_operation("image_enrichment", f"Failed to add images for {movie['title']}: {e}", "error")
-        
-        admin_state['pipeline'] = []
-        
-        # OPTIMIZATION: Save the entire database ONCE at the end
-        log_admin_operation("image_enrichment", "Saving enriched movies to database", "info")
-        save_movie_data(movies, create_backup=True)
-        
-        log_admin_operation("image_enrichment", "Image enrichment pipeline completed", "success")
-        
-        # Full sync to include new movies (API reload + server restart)
-        full_sync_data()
-        
-    except Exception as e:
-        log_admin_operation("image_enrichment", f"Image enrichment pipeline failed: {e}", "error")
+def resume_enrichment_runs():
+    """Pick up runs left unfinished by a previous process (their expired leases are claimed again)"""
+    if get_job_queue().list_runs(limit=1, active_only=True):
+        from enrichment_worker import ensure_background_worker
+        if ensure_background_worker():
+            print("[admin] resuming unfinished enrichment runs")
 
-async def run_profile_enrichment_pipeline():
-    """Run profile generation for movies in staging"""
-    try:
-        log_admin_operation("profile_enrichment", "Starting profile generation pipeline", "info")
-        
-        # Move movies from staging to pipeline
-        admin_state['pipeline'] = admin_state['staging'].copy()
-        admin_state['staging'] = []
-        
-        # Import and initialize the enrichment pipeline
-        from enrichment_pipeline import EnrichmentPipeline
-        pipeline = EnrichmentPipeline("openai")
-        
-        # Process each movie through profile generation only
-        for i, movie in enumerate(admin_state['pipeline']):
-            try:
-                log_admin_operation("profile_enrichment", f"Generating profile for {movie['title']} ({i+1}/{len(admin_state['pipeline'])})", "info")
-                
-                # Run only profile generation
-                enriched_movie = pipeline.process_movie(movie, steps=['profile'])
-                
-                # Update movie in database
-                movies = get_movie_data()
-                movies[movie['title']] = enriched_movie
-                save_movie_data(movies)
-                
-                log_admin_operation("profile_enrichment", f"Successfully generated profile for {movie['title']}", "success")
-                
-            except Exception as e:
-                log_admin_operation("profile_enrichment", f"Failed to generate profile for {movie['title']}: {e}", "error")
-        
-        admin_state['pipeline'] = []
-        log_admin_operation("profile_enrichment", "Profile generation pipeline completed", "success")
-        
-        # Full sync to include new movies (API reload + server restart)
-        full_sync_data()
-        
-    except Exception as e:
-        log_admin_operation("profile_enrichment", f"Profile generation pipeline failed: {e}", "error")
+admin_router.add_event_handler("startup", resume_enrichment_runs)
 
 @admin_router.get("/pipeline")
 async def get_pipeline_status(current_admin: dict = Depends(get_current_admin)):
     """Get current pipeline status"""
+    queue = get_job_queue()
+    pipeline = queue.active_movies()
+    staging = admin_state.get_list(STAGING)
     return {
-        'pipeline': admin_state['pipeline'],
-        'staging': admin_state['staging'],
-        'pipelineCount': len(admin_state['pipeline']),
-        'stagingCount': len(admin_state['staging'])
+        'pipeline': pipeline,
+        'staging': staging,
+        'pipelineCount': len(pipeline),
+        'stagingCount': len(staging),
+        'runs': queue.list_runs(active_only=True)
     }
 
 @admin_router.post("/pipeline/add")
 async def add_to_pipeline(movies: List[Dict[str, Any]], current_admin: dict = Depends(get_current_admin)):
     """Add movies to staging area"""
     try:
-        admin_state['staging'].extend(movies)
+        admin_state.extend_list(STAGING, movies)
         
         log_admin_operation("pipeline_add", f"Added {len(movies)} movies to staging")
         
@@ -1232,22 +1173,13 @@ async def add_to_pipeline(movies: List[Dict[str, Any]], current_admin: dict = De
 @admin_router.get("/logs")
 async def get_admin_logs(current_admin: dict = Depends(get_current_admin)):
     """Get admin operation logs"""
-    return {'logs': admin_state['operation_logs']}
+    return {'logs': admin_state.recent_events(OPERATION_LOGS)}
 
 @admin_router.post("/backup")
 async def create_backup(current_admin: dict = Depends(get_current_admin)):
     """Create backup of current database"""
     try:
-        # Ensure backups directory exists
-        os.makedirs("backups", exist_ok=True)
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_file = f"backups/movie_profiles_merged_backup_{timestamp}.json"
-        
-        shutil.copy("movie_profiles_merged.json", backup_file)
-        
-        # Clean up old backups after creating a new one
-        cleanup_old_backups()
+        backup_file = create_catalog_backup("manual")
         
         log_admin_operation("backup", f"Created backup: {backup_file}")
         
@@ -1268,6 +1200,26 @@ async def cleanup_backups(current_admin: dict = Depends(get_current_admin)):
         log_admin_operation("cleanup", f"Failed to cleanup backups: {e}", "error")
         raise HTTPException(status_code=500, detail=f"Failed to cleanup backups: {e}")
 
+@admin_router.get("/http-cache")
+async def http_cache_stats(current_admin: dict = Depends(get_current_admin)):
+    """TMDB/OMDb response cache statistics and upstream rate limiter state"""
+    cache = get_http_cache()
+    return {
+        'enabled': cache is not None,
+        'cache': cache.stats() if cache else None,
+        'rateLimits': limiter_stats()
+    }
+
+@admin_router.post("/http-cache/clear")
+async def clear_http_cache(current_admin: dict = Depends(get_current_admin)):
+    """Drop every cached TMDB/OMDb response"""
+    cache = get_http_cache()
+    if cache is None:
+        raise HTTPException(status_code=400, detail="HTTP cache is disabled (HTTP_CACHE=0)")
+    removed = cache.clear()
+    log_admin_operation("http_cache_clear", f"Cleared {removed} cached responses")
+    return {'message': f'Cleared {removed} cached responses', 'removed': removed}
+
 @admin_router.get("/health")
 async def health_check(current_admin: dict = Depends(get_current_admin)):
     """Health check endpoint"""
@@ -1279,9 +1231,9 @@ async def health_check(current_admin: dict = Depends(get_current_admin)):
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
             'movieCount': len(movies),
-            'hiddenCount': len(admin_state['hidden_movies']),
-            'pipelineCount': len(admin_state['pipeline']),
-            'stagingCount': len(admin_state['staging'])
+            'hiddenCount': len(get_hidden_movies().refresh()),
+            'pipelineCount': len(get_job_queue().active_movies()),
+            'stagingCount': admin_state.list_len(STAGING)
         }
         
     except Exception as e:
@@ -1328,148 +1280,49 @@ async def manual_full_sync(current_admin: dict = Depends(get_current_admin)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @admin_router.post("/director/add-complete")
-async def add_director_complete(request: DirectorScrapeRequest, background_tasks: BackgroundTasks, current_admin: dict = Depends(get_current_admin)):
+async def add_director_complete(request: DirectorScrapeRequest, current_admin: dict = Depends(get_current_admin)):
     """One-click director addition: scrape, enrich, and sync automatically"""
     try:
-        tmdb_api_key = os.environ.get("TMDB_API_KEY")
-        if not tmdb_api_key:
-            raise HTTPException(status_code=500, detail="TMDB_API_KEY not configured")
-        
-        log_admin_operation("director_add_complete", f"Starting complete director addition for {request.director_name}", "info")
+        log_admin_operation("director_add_complete", f"Starting complete director addition for {request.director}", "info")
         
-        # Step 1: Scrape director movies (reuse existing logic)
-        with session_with_api_key(tmdb_api_key) as sess:
-            person_id = tmdb_search_person(sess, request.director_name)
-            if not person_id:
-                raise HTTPException(status_code=404, detail=f"Director '{request.director_name}' not found in TMDB")
+        # Step 1: Find the director's movies (same lookup and options as /scrape/director; blocking, off the event loop)
+        sess, directed = await run_in_threadpool(_find_director_filmography, request)
+        with sess:
+            if not directed:
+                raise HTTPException(status_code=404, detail=f"No movies found for director '{request.director}'")
             
-            # Get director movies
-            movies = get_person_movies(sess, person_id)
-            if not movies:
-                raise HTTPException(status_code=404, detail=f"No movies found for director '{request.director_name}'")
-            
-            # Filter and process movies
-            filtered_movies = []
-            for movie in movies:
-                if movie.get('job') == 'Director':  # Only include movies where they were the director
-                    movie_data = get_movie_details_and_credits(sess, movie['id'])
-                    if movie_data:
-                        filtered_movies.append(movie_data)
+            # Hydrate the directed movies on a bounded pool
+            with ThreadPoolExecutor(max_workers=max(1, DIRECTOR_SCRAPE_WORKERS)) as pool:
+                hydrated = await run_in_threadpool(
+                    lambda: list(pool.map(lambda movie: hydrate_tmdb_movie(sess, movie['id']), directed)))
+            filtered_movies = [movie_data for movie_data in hydrated if movie_data]
             
             if not filtered_movies:
-                raise HTTPException(status_code=404, detail=f"No directed movies found for '{request.director_name}'")
+                raise HTTPException(status_code=404, detail=f"No directed movies found for '{request.director}'")
         
-        log_admin_operation("director_add_complete", f"Scraped {len(filtered_movies)} movies for {request.director_name}", "info")
+        log_admin_operation("director_add_complete", f"Scraped {len(filtered_movies)} movies for {request.director}", "info")
         
-        # Step 2: Add to staging and start enrichment
-        admin_state['staging'].extend(filtered_movies)
+        # Step 2: Add to staging, then queue everything staged for the complete pipeline
+        admin_state.extend_list(STAGING, filtered_movies)
         log_admin_operation("director_add_complete", f"Added {len(filtered_movies)} movies to staging", "info")
         
-        # Step 3: Start enrichment pipeline in background
-        background_tasks.add_task(run_complete_enrichment_pipeline)
+        # Step 3: The worker enriches, saves and syncs them (see enrichment_worker.py)
+        run_id, queued = enqueue_staged('complete')
         
         return {
-            'message': f'Successfully initiated complete director addition for {request.director_name}',
+            'message': f'Successfully initiated complete director addition for {request.director}',
             'movies_scraped': len(filtered_movies),
-            'director_name': request.director_name,
-            'status': 'enrichment_started'
+            'director_name': request.director,
+            'status': 'enrichment_started',
+            'run_id': run_id
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         log_admin_operation("director_add_complete", f"Complete director addition failed: {e}", "error")
         raise HTTPException(status_code=500, detail=str(e))
 
-async def run_complete_enrichment_pipeline():
-    """Complete enrichment pipeline with automatic sync"""
-    try:
-        log_admin_operation("complete_enrichment", "Starting complete enrichment pipeline with auto-sync", "info")
-        
-        if not admin_state['staging']:
-            log_admin_operation("complete_enrichment", "No movies in staging area", "warning")
-            return
-        
-        # Move movies from staging to pipeline
-        admin_state['pipeline'].extend(admin_state['staging'])
-        movies_to_process = admin_state['staging'].copy()
-        admin_state['staging'].clear()
-        
-        log_admin_operation("complete_enrichment", f"Processing {len(movies_to_process)} movies through complete pipeline", "info")
-        
-        # Process movies through all enrichment steps
-        from enrichment_pipeline import EnrichmentPipeline
-        pipeline = EnrichmentPipeline()
-        
-        enriched_movies = []
-        for i, movie in enumerate(movies_to_process):
-            try:
-                log_admin_operation("complete_enrichment", f"Processing movie {i+1}/{len(movies_to_process)}: {movie.get('title', 'Unknown')}", "info")
-                
-                # Process through all enrichment steps
-                enriched_movie = pipeline.process_movie(movie, steps=['metadata', 'images', 'profile'])
-                enriched_movies.append(enriched_movie)
-                
-                # Update progress
-                admin_state['pipeline'] = [m for m in admin_state['pipeline'] if m.get('tmdb_id') != movie.get('tmdb_id')]
-                
-            except Exception as e:
-                log_admin_operation("complete_enrichment", f"Failed to process movie {movie.get('title', 'Unknown')}: {e}", "error")
-                continue
-        
-        # Save enriched movies to database
-        if enriched_movies:
-            movies = get_movie_data()
-            for movie in enriched_movies:
-                if movie.get('title'):
-                    movies[movie['title']] = movie
-            
-            save_movie_data(movies, create_backup=True)
-            log_admin_operation("complete_enrichment", f"Saved {len(enriched_movies)} enriched movies to database", "info")
-            
-            # Clear pipeline
-            admin_state['pipeline'].clear()
-            
-            # Automatic full sync
-            log_admin_operation("complete_enrichment", "Starting automatic synchronization", "info")
-            sync_success = full_sync_data()
-            
-            if sync_success:
-                log_admin_operation("complete_enrichment", "Complete enrichment pipeline finished successfully with auto-sync", "success")
-            else:
-                log_admin_operation("complete_enrichment", "Enrichment completed but sync failed - manual sync required", "warning")
-        else:
-            log_admin_operation("complete_enrichment", "No movies were successfully enriched", "error")
-        
-    except Exception as e:
-        log_admin_operation("complete_enrichment", f"Complete enrichment pipeline failed: {e}", "error")
-
-# Helper functions for director scraping
-def tmdb_search_person(sess: requests.Session, name: str) -> Optional[int]:
-    """Search for a person by name in TMDB"""
-    try:
-        response = sess.get(f"https://api.themoviedb.org/3/search/person", params={
-            'query': name,
-            'include_adult': False
-        })
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get('results', [])
-            if results:
-                return results[0]['id']
-        return None
-    except Exception:
-        return None
-
-def get_person_movies(sess: requests.Session, person_id: int) -> List[Dict[str, Any]]:
-    """Get movies for a person from TMDB"""
-    try:
-        response = sess.get(f"https://api.themoviedb.org/3/person/{person_id}/movie_credits")
-        if response.status_code == 200:
-            data = response.json()
-            return data.get('cast', []) + data.get('crew', [])
-        return []
-    except Exception:
-        return []
-
 # Theme Management API Endpoints
 
 @admin_router.post("/themes/propose")
@@ -1622,13 +1475,17 @@ async def get_current_themes(current_admin: dict = Depends(get_current_admin)):
     try:
         from main import THEME_CATEGORIES
         
+        # Movie counts per theme come from the store's theme table, not a scan of the catalog
+        counts = get_catalog_store().theme_counts()
+        
         # Format themes for frontend
         themes = []
         for theme in THEME_CATEGORIES:
             themes.append({
                 "name": theme,
                 "display_name": theme.replace("_", " ").title(),
-                "description": ""  # Could add descriptions if needed
+                "description": "",  # Could add descriptions if needed
+                "movie_count": counts.get(theme, 0)
             })
         
         return {
@@ -1903,7 +1760,3 @@ async def delete_theme_proposal(proposal_id: str, current_admin: dict = Depends(
     except Exception as e:
         log_admin_operation("delete_theme_proposal", f"Failed to delete theme proposal: {e}", "error")
         raise HTTPException(status_code=500, detail=f"Failed to delete theme proposal: {e}")
-
-# Initialize hidden movies on startup
-load_hidden_movies()
-
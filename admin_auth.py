@@ -11,11 +11,16 @@ from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 
+from state_store import get_state_backend
+
 # Simple in-memory session storage (use Redis or database in production)
 admin_sessions = {}
 
-# JWT settings
-JWT_SECRET = os.environ.get("ADMIN_JWT_SECRET", secrets.token_urlsafe(32))
+# JWT settings. Without ADMIN_JWT_SECRET a random secret is generated once and kept in the shared
+# state backend, so tokens issued by one API worker are accepted by the others
+JWT_SECRET = os.environ.get("ADMIN_JWT_SECRET") or get_state_backend().setdefault_value(
+    "admin_jwt_secret", secrets.token_urlsafe(32)
+)
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
 
@@ -73,6 +78,18 @@ def get_current_admin(credentials: HTTPAuthorizationCredentials = Depends(securi
     
     return payload
 
+def get_current_admin_from_query(token: Optional[str] = None) -> Dict[str, Any]:
+    """Authenticated admin from a ?token= query parameter (EventSource cannot send an Authorization header)"""
+    payload = verify_access_token(token) if token else None
+    
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+        )
+    
+    return payload
+
 def require_admin_auth():
     """Dependency to require admin authentication"""
     return Depends(get_current_admin)
@@ -1,20 +1,35 @@
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Iterable, Optional, List, Set, Tuple
 
+import asyncio
+import gc
+import gzip
+import hashlib
 import json
 import re
 import sqlite3
+import threading
 import time
 import os
 from datetime import datetime, timezone
-from collections import deque
 import uuid
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
+import numpy as np
 
 from user_taste_profile import generate_llm_taste_profile, resolve_liked_movies
-from admin_api import admin_router, load_hidden_movies
+from admin_api import admin_router, register_api_reloader
+from catalog_generation import CatalogGeneration, GenerationBuilder
+from catalog_index import DEFAULT_PAGE_SIZE, CatalogIndex, ThemeIndex, decode_cursor, parse_fields, sync_theme_index
+from catalog_snapshot import DEFAULT_PATH as DEFAULT_SNAPSHOT_PATH, open_snapshot, write_snapshot
+from catalog_store import get_catalog_store
+from hidden_store import get_hidden_movies
+from state_store import EventWriter, JsonlEventLog, get_state_backend
+from search_fusion import DEFAULT_RRF_K, FUSION_STRATEGIES, fuse
+from search_rerank import extract_features, facet_matches, load_reranker, mmr_rerank
+from search_timing import LatencyHistograms, StageTimer
 
 # Load environment variables from .env file if it exists
 def load_env_file():
@@ -33,10 +48,10 @@ load_env_file()
 
 ROOT = Path(__file__).parent
 
-# Use only the merged dataset which contains all movie profiles
-SOURCES = [
-    ROOT / "movie_profiles_merged.json",
-]
+# Movie profiles come from the indexed catalog store (imported from movie_profiles_merged.json)
+catalog = get_catalog_store()
+# In-memory hidden list; /admin/movies/hide|show update it in place
+hidden_movies = get_hidden_movies()
 
 
 def _to_list(v):
@@ -141,46 +156,91 @@ def _normalize(obj: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _load_all_profiles() -> Dict[str, Any]:
+def _merge_catalog_rows(data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+    """Normalize catalog rows and merge those with the same search id (lowercased title).
+
+    Returns (search id -> profile, search id -> the catalog keys merged into it).
+    """
     merged: Dict[str, Any] = {}
-    for path in SOURCES:
-        try:
-            if not path.exists():
-                continue
-            data = json.loads(path.read_text(encoding="utf-8"))
-            for obj in data.values():
-                m = _normalize(obj)
-                key = (m["title"] or "").strip().lower()
-                if key in merged:
-                    merged[key] = _merge_profiles(merged[key], m)
-                else:
-                    merged[key] = m
-        except Exception:
-            # skip bad source but continue others
-            continue
+    keys: Dict[str, List[str]] = {}
+    for ckey, obj in data.items():
+        m = _normalize(obj)
+        key = (m["title"] or "").strip().lower()
+        if key in merged:
+            merged[key] = _merge_profiles(merged[key], m)
+        else:
+            merged[key] = m
+        keys.setdefault(key, []).append(ckey)
+    return merged, keys
+
+
+def _load_catalog_profiles() -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+    try:
+        data = catalog.all()
+    except Exception as e:
+        print(f"[api] failed to read catalog: {e}")
+        data = {}
+    return _merge_catalog_rows(data)
+
+
+def _load_all_profiles() -> Dict[str, Any]:
+    merged, _ = _load_catalog_profiles()
     # Reindex as title->profile mapping to align with user_taste_profile expectations
     return {v["title"]: v for v in merged.values()}
 
 
+# Delta builds (derive) keep the full-build base segment of the FTS engine and the vector index as it is,
+# shared with earlier generations, and add a small delta segment plus tombstones for base rows that were
+# changed or removed. Once delta rows + tombstones exceed this fraction of the base (and SEGMENT_COMPACT_MIN),
+# the next delta build folds them into a fresh base.
+SEGMENT_COMPACT_FRACTION = float(os.getenv("SEGMENT_COMPACT_FRACTION", "0.1"))
+SEGMENT_COMPACT_MIN = 256
+
+
+def _segments_need_compaction(base_rows: int, delta_rows: int, dead_rows: int) -> bool:
+    return delta_rows + dead_rows > max(SEGMENT_COMPACT_MIN, base_rows * SEGMENT_COMPACT_FRACTION)
+
+
 # -----------------
 # Stage 1 search (MVP): In-memory SQLite FTS5 over profile text
 # -----------------
+def _fts_connection() -> sqlite3.Connection:
+    # Do not attempt to enable or load SQLite extensions; many Python builds (e.g., macOS system Python)
+    # disable extension loading. FTS5 is available in standard builds and works without enabling extensions.
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(id, title, tags, text, tokenize='porter')")
+    conn.commit()
+    return conn
+
+
+class _FtsSegment:
+    """One FTS database with its ids in position order (FTS rowid = position + 1)"""
+
+    def __init__(self, conn: sqlite3.Connection, ids: List[str], titles: List[str], pos: Dict[str, int]):
+        self.conn, self.ids, self.titles, self.pos = conn, ids, titles, pos
+        # hidden-list bitmap over the positions, cached per hidden-list version; shared by every engine
+        # holding this segment
+        self.hidden_key: Any = None
+        self.hidden_bits = np.zeros(0, dtype=bool)
+
+    def hidden_bitmap(self, hidden: Set[str], version: Any) -> np.ndarray:
+        if self.hidden_key != version:
+            self.hidden_bits = np.fromiter((t in hidden for t in self.titles), dtype=bool, count=len(self.titles))
+            self.hidden_key = version
+        return self.hidden_bits
+
+
 class SearchEngine:
+    """FTS5 keyword search: a base segment from the last full build, plus (after derive) a delta segment
+    holding changed profiles and tombstones for the base rows they replace or remove"""
+
     def __init__(self, profiles: Dict[str, Any]):
-        self.conn = sqlite3.connect(":memory:")
-        # Do not attempt to enable or load SQLite extensions; many Python builds (e.g., macOS system Python)
-        # disable extension loading. FTS5 is available in standard builds and works without enabling extensions.
-        self._init_schema()
+        # built on the generation builder thread, read by request handlers
+        self.conn = _fts_connection()
         self._index_profiles(profiles)
-
-    def _init_schema(self):
-        c = self.conn.cursor()
-        c.execute(
-            "CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5("
-            "id, title, tags, text, tokenize='porter'"
-            ")"
-        )
-        self.conn.commit()
+        self.base = _FtsSegment(self.conn, self.ids, self.titles, self.pos)
+        self.delta: Optional[_FtsSegment] = None
+        self.dead: Set[str] = set()
 
     @staticmethod
     def _build_tags(p: Dict[str, Any]) -> str:
@@ -199,22 +259,102 @@ class SearchEngine:
     def _index_profiles(self, profiles: Dict[str, Any]):
         c = self.conn.cursor()
         c.execute("DELETE FROM movies_fts")
+        # position of every id, so per-id flags (e.g. hidden) can live in aligned numpy arrays
+        self.ids: List[str] = []
+        self.titles: List[str] = []
+        self.pos: Dict[str, int] = {}
         for title, p in profiles.items():
-            pid = title.strip().lower()
-            tags = self._build_tags(p)
-            text = "\n".join([
-                p.get("title") or "",
-                tags,
-                p.get("visual_aesthetic") or "",
-                p.get("target_audience") or "",
-                p.get("profile_text") or "",
-            ])
-            c.execute(
-                "INSERT INTO movies_fts(id, title, tags, text) VALUES (?,?,?,?)",
-                (pid, p.get("title") or title, tags, text),
-            )
+            self._insert(c, title, p)
         self.conn.commit()
 
+    def _insert(self, c: sqlite3.Cursor, title: str, p: Dict[str, Any]) -> None:
+        _insert_fts(c, self, title, p)
+
+    @classmethod
+    def from_snapshot(cls, fts_db: bytes, ids: List[str], titles: List[str]) -> "SearchEngine":
+        """Engine over a serialized FTS database (no re-tokenizing)"""
+        new = cls.__new__(cls)
+        new.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        new.conn.deserialize(fts_db)
+        new.ids, new.titles = ids, titles
+        new.pos = {pid: i for i, pid in enumerate(ids)}
+        new.base = _FtsSegment(new.conn, ids, titles, new.pos)
+        new.delta, new.dead = None, set()
+        return new
+
+    def derive(self, upserts: Dict[str, Any], removed: Iterable[str]) -> "SearchEngine":
+        """Engine with `upserts` (title -> profile) re-indexed and `removed` ids dropped, sharing this one's base.
+
+        Only the delta segment is copied and written (cost proportional to the delta, not the catalog);
+        base rows of changed or removed ids become tombstones. Requests still using this engine are
+        unaffected. See needs_compaction().
+        """
+        changed = {title.strip().lower() for title in upserts} | set(removed)
+        new = SearchEngine.__new__(SearchEngine)
+        new.conn, new.ids, new.titles, new.pos, new.base = self.conn, self.ids, self.titles, self.pos, self.base
+        new.dead = self.dead | {pid for pid in changed if pid in self.pos}
+        new.delta = _FtsSegment(_fts_connection(), [], [], {})
+        c = new.delta.conn.cursor()
+        if self.delta is not None:
+            _copy_fts_rows(self.delta, c, new.delta, changed)
+        for title, p in upserts.items():
+            _insert_fts(c, new.delta, title, p)
+        new.delta.conn.commit()
+        if _segments_need_compaction(len(new.ids), len(new.delta.ids), len(new.dead)):
+            return new.compacted()
+        return new
+
+    def compacted(self) -> "SearchEngine":
+        """Engine with the delta segment and tombstones folded into a single base (self if there are none).
+
+        Copies the stored rows (FTS re-tokenizes them, O(catalog)); derive() only does this once the delta
+        passes SEGMENT_COMPACT_FRACTION of the base.
+        """
+        if self.delta is None and not self.dead:
+            return self
+        new = SearchEngine.__new__(SearchEngine)
+        new.conn = _fts_connection()
+        new.ids, new.titles, new.pos = [], [], {}
+        new.base = _FtsSegment(new.conn, new.ids, new.titles, new.pos)
+        c = new.conn.cursor()
+        _copy_fts_rows(self.base, c, new.base, self.dead)
+        if self.delta is not None:
+            _copy_fts_rows(self.delta, c, new.base, set())
+        new.conn.commit()
+        new.delta, new.dead = None, set()
+        return new
+
+    def _segment_of(self, pid: str) -> Optional[_FtsSegment]:
+        if self.delta is not None and pid in self.delta.pos:
+            return self.delta
+        if pid in self.pos and pid not in self.dead:
+            return self.base
+        return None
+
+    def cursor_for(self, pid: str) -> Optional[sqlite3.Cursor]:
+        """Cursor on the segment holding the live row of `pid` (None when it is not indexed)"""
+        segment = self._segment_of(pid)
+        return segment.conn.cursor() if segment is not None else None
+
+    def hidden_bitmap(self, hidden: Set[str], version: Any) -> np.ndarray:
+        """Boolean array aligned with the base ids, True where the title is hidden (cached per hidden-list version)"""
+        return self.base.hidden_bitmap(hidden, version)
+
+    def visible(self, cands: List[str], hidden: Set[str], version: Any) -> List[str]:
+        """Drop hidden candidates with one vectorized mask lookup (unknown ids are kept)"""
+        if not hidden or not cands:
+            return cands
+        bits = self.hidden_bitmap(hidden, version)
+        fresh = self.delta.pos if self.delta is not None else {}
+        pos = np.fromiter((-1 if pid in fresh else self.pos.get(pid, -1) for pid in cands),
+                          dtype=np.int64, count=len(cands))
+        keep = (pos < 0) | ~bits[np.maximum(pos, 0)]
+        if fresh:
+            fresh_hidden = self.delta.hidden_bitmap(hidden, version)
+            keep &= np.fromiter((pid not in fresh or not fresh_hidden[fresh[pid]] for pid in cands),
+                                dtype=bool, count=len(cands))
+        return [pid for pid, k in zip(cands, keep) if k]
+
     def parse_intent(self, q: str) -> Dict[str, Any]:
         ql = (q or "").lower()
         # basic synonyms for vibes/genres
@@ -331,23 +471,35 @@ class SearchEngine:
         intent["applied_filters"] = af
         return intent
 
-    def search(self, q: str, limit: int = 20) -> List[Dict[str, Any]]:
-        intent = self.parse_intent(q)
-        c = self.conn.cursor()
-        query = intent.get("expanded_query") or q
+    @staticmethod
+    def _segment_rows(c: sqlite3.Cursor, query: str, n: int) -> List[Tuple[Any, ...]]:
         try:
-            rows = c.execute(
+            return c.execute(
                 "SELECT id, title, tags, snippet(movies_fts, 'text', '[', ']', ' … ', 8) AS snip, bm25(movies_fts) AS score "
                 "FROM movies_fts WHERE movies_fts MATCH ? ORDER BY score LIMIT ?",
-                (query, int(limit * 3)),  # fetch more then post-filter
+                (query, n),
             ).fetchall()
         except Exception:
-            rows = c.execute(
+            return c.execute(
                 "SELECT id, title, tags, substr(text,1,200) AS snip, 0 as score FROM movies_fts LIMIT ?",
-                (int(limit * 3),),
+                (n,),
             ).fetchall()
+
+    def search(self, q: str, limit: int = 20) -> List[Dict[str, Any]]:
+        intent = self.parse_intent(q)
+        query = intent.get("expanded_query") or q
+        n = int(limit * 3)  # fetch more then post-filter
+        # base rows over-fetched by the tombstones among them; delta rows merged in by bm25 (lower is better).
+        # Each segment scores with its own term statistics, so the merged order is approximate until compaction.
+        base_c = self.conn.cursor()
+        rows = [(base_c, *r) for r in self._segment_rows(base_c, query, n + len(self.dead)) if r[0] not in self.dead]
+        if self.delta is not None and self.delta.ids:
+            delta_c = self.delta.conn.cursor()
+            rows += [(delta_c, *r) for r in self._segment_rows(delta_c, query, n)]
+            rows.sort(key=lambda r: r[5])
+        rows = rows[:n]
         results: List[Dict[str, Any]] = []
-        for pid, title, tags, snip, score in rows:
+        for c, pid, title, tags, snip, score in rows:
             # basic exclusion filter by terms in tags/text
             if intent["exclude_terms"]:
                 exq = " OR ".join(intent["exclude_terms"])  # simple OR
@@ -407,41 +559,46 @@ class SearchEngine:
         return results
 
 
-# Load profiles once
-movie_profiles: Dict[str, Any] = _load_all_profiles()
+def _copy_fts_rows(src: _FtsSegment, c: sqlite3.Cursor, dst: _FtsSegment, skip: Set[str]) -> None:
+    """Append the rows of `src` (except ids in `skip`) to `dst` in position order, without rebuilding their text"""
+    rows = src.conn.execute("SELECT rowid, id, title, tags, text FROM movies_fts ORDER BY rowid").fetchall()
+    for rowid, pid, title, tags, text in rows:
+        if pid in skip:
+            continue
+        dst.pos[pid] = len(dst.ids)
+        dst.ids.append(pid)
+        dst.titles.append(src.titles[rowid - 1])
+        c.execute("INSERT INTO movies_fts(rowid, id, title, tags, text) VALUES (?,?,?,?,?)",
+                  (len(dst.ids), pid, title, tags, text))
+
+
+def _insert_fts(c: sqlite3.Cursor, segment: Any, title: str, p: Dict[str, Any]) -> None:
+    """Index one profile in `segment` (ids/titles/pos); its FTS rowid is its position + 1, so it can be
+    replaced without a scan"""
+    pid = title.strip().lower()
+    if pid in segment.pos:
+        c.execute("DELETE FROM movies_fts WHERE rowid = ?", (segment.pos[pid] + 1,))
+    else:
+        segment.pos[pid] = len(segment.ids)
+        segment.ids.append(pid)
+        segment.titles.append(title)
+    tags = SearchEngine._build_tags(p)
+    text = "\n".join([
+        p.get("title") or "",
+        tags,
+        p.get("visual_aesthetic") or "",
+        p.get("target_audience") or "",
+        p.get("profile_text") or "",
+    ])
+    c.execute(
+        "INSERT INTO movies_fts(rowid, id, title, tags, text) VALUES (?,?,?,?,?)",
+        (segment.pos[pid] + 1, pid, p.get("title") or title, tags, text),
+    )
 
-def reload_movie_data():
-    """Reload movie data from JSON files"""
-    global movie_profiles, search_engine, semantic_index
-    try:
-        movie_profiles = _load_all_profiles()
-        
-        # Rebuild search engine with new data
-        search_engine = SearchEngine(movie_profiles)
-        
-        # Rebuild semantic index with new data
-        try:
-            docs: List[VectorDoc] = []
-            for title, p in (movie_profiles or {}).items():
-                pid = (title or "").strip().lower()
-                text = build_search_text(p)
-                if text:
-                    docs.append(VectorDoc(id=pid, title=title, text=text))
-            if docs:
-                semantic_index = EmbeddingIndex(docs)
-                print(f"[semantic] rebuilt FAISS index for {len(docs)} docs")
-            else:
-                print("[semantic] no docs to index")
-                semantic_index = None
-        except Exception as e:
-            print(f"[semantic] failed to rebuild index: {e}")
-            semantic_index = None
-            
-        print(f"[api] reloaded {len(movie_profiles)} movie profiles")
-        return True
-    except Exception as e:
-        print(f"[api] failed to reload movie data: {e}")
-        return False
+
+# Optional click-trained reranker (train_reranker.py); rerank is disabled when the artifact is missing
+RERANKER_PATH = Path(os.getenv("RERANKER_PATH") or (ROOT / "models" / "reranker.json"))
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "10"))
 
 # -------------
 # Semantic search (optional, Stage 2)
@@ -481,16 +638,90 @@ class VectorDoc:
     text: str
 
 
+# Precomputed nearest neighbours per document for MMR diversification. Off by default: building the table
+# searches every document against the whole index (O(N^2) with a flat index); without it MMR compares the
+# diversified candidates' own vectors, which costs the same at any catalog size.
+NEIGHBORS_K = int(os.getenv("EMB_NEIGHBORS_K", "0"))
+# Upper bound for diversity_top_n (candidates compared pairwise per request)
+DIVERSITY_MAX_TOP_N = 200
+
+
+def _neighbor_rows(rows: np.ndarray, D: np.ndarray, I: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-k neighbour positions/similarities from a k+1 search of `rows`, without the row itself or
+    padding (-1); vectorized over the whole batch"""
+    valid = (I != rows[:, None]) & (I != -1)
+    order = np.argsort(~valid, axis=1, kind="stable")[:, :k]
+    keep = np.take_along_axis(valid, order, axis=1)
+    idx = np.where(keep, np.take_along_axis(I, order, axis=1), -1).astype("int32")
+    sim = np.where(keep, np.take_along_axis(D, order, axis=1), 0.0).astype("float32")
+    return idx, sim
+
+
 class EmbeddingIndex:
+    """Vector search: a FAISS base segment from the last full build, plus (after derive) a small delta
+    segment of changed docs scored with numpy, and tombstones for the base rows they replace or remove"""
+
     def __init__(self, docs: List[VectorDoc]):
         if faiss is None:
             raise RuntimeError("faiss not installed; pip install faiss-cpu")
         self.ids: List[str] = [d.id for d in docs]
         self.texts: List[str] = [d.text for d in docs]
+        self.pos: Dict[str, int] = {pid: i for i, pid in enumerate(self.ids)}
         self.dim: Optional[int] = None
         self.index = None
+        self.neighbor_idx = None  # (N, NEIGHBORS_K) int positions, -1 padded
+        self.neighbor_sim = None  # (N, NEIGHBORS_K) cosine similarities
         self.embed = self._init_embedder()
         self._build_index()
+        self._build_neighbors()
+        self._clear_delta()
+
+    def _clear_delta(self) -> None:
+        self.dead: Set[str] = set()  # base ids superseded or removed since the last full build / compaction
+        self.delta_ids: List[str] = []
+        self.delta_texts: List[str] = []
+        self.delta_pos: Dict[str, int] = {}
+        self.delta_vecs = np.zeros((0, self.dim or 0), dtype="float32")
+
+    @classmethod
+    def from_snapshot(cls, ids: List[str], texts: List[str], index_bytes: np.ndarray,
+                      neighbor_idx: Optional[np.ndarray], neighbor_sim: Optional[np.ndarray]) -> "EmbeddingIndex":
+        """Index from a saved FAISS index (faiss.serialize_index); the embedding model is loaded in the
+        background, not before serving"""
+        if faiss is None:
+            raise RuntimeError("faiss not installed; pip install faiss-cpu")
+        new = cls.__new__(cls)
+        new.ids, new.texts = ids, texts
+        new.pos = {pid: i for i, pid in enumerate(ids)}
+        new.index = faiss.deserialize_index(np.asarray(index_bytes, dtype="uint8"))
+        new.dim = int(new.index.d)
+        if new.index.ntotal != len(ids):
+            raise ValueError(f"snapshot index has {new.index.ntotal} vectors for {len(ids)} ids")
+        new.neighbor_idx, new.neighbor_sim = neighbor_idx, neighbor_sim
+        new.embed = new._lazy_embedder()
+        new._clear_delta()
+        return new
+
+    def _lazy_embedder(self) -> Callable[[List[str]], List[List[float]]]:
+        """Embedder that initializes on first use; a warm-up thread starts loading it right away"""
+        lock = threading.Lock()
+        loaded: Dict[str, Callable[[List[str]], List[List[float]]]] = {}
+
+        def _embed(batch: List[str]) -> List[List[float]]:
+            if "fn" not in loaded:
+                with lock:
+                    if "fn" not in loaded:
+                        loaded["fn"] = self._init_embedder()
+            return loaded["fn"](batch)
+
+        def _warm_up() -> None:
+            try:
+                _embed(["warm up"])
+            except Exception as e:
+                print(f"[semantic] embedder warm-up failed: {e}")
+
+        threading.Thread(target=_warm_up, name="embedder-warm-up", daemon=True).start()
+        return _embed
 
     def _init_embedder(self) -> Callable[[List[str]], List[List[float]]]:
         provider = (os.getenv("EMB_PROVIDER", "local").lower() or "local").strip()
@@ -506,6 +737,24 @@ class EmbeddingIndex:
                 resp = openai.embeddings.create(model=model, input=batch)
                 return [d.embedding for d in resp.data]
 
+            return _embed
+        elif provider == "hash":
+            # Deterministic feature-hashing stand-in (no model download); for benchmarks and offline tests
+            import hashlib
+            import numpy as np  # type: ignore
+
+            dim = int(os.getenv("EMB_HASH_DIM", "256"))
+
+            def _embed(batch: List[str]) -> List[List[float]]:
+                out = np.zeros((len(batch), dim), dtype="float32")
+                for row, text in enumerate(batch):
+                    for tok in re.findall(r"[a-z0-9]+", (text or "").lower()):
+                        h = int.from_bytes(hashlib.blake2b(tok.encode("utf-8"), digest_size=8).digest(), "little")
+                        out[row, h % dim] += 1.0 if (h >> 63) == 0 else -1.0
+                norms = np.linalg.norm(out, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                return (out / norms).tolist()
+
             return _embed
         else:
             from sentence_transformers import SentenceTransformer  # type: ignore
@@ -531,40 +780,462 @@ class EmbeddingIndex:
         self.index = faiss.IndexFlatIP(self.dim)
         self.index.add(mat)
 
-    def search(self, query: str, k: int = 50) -> List[Tuple[str, float]]:
+    def _build_neighbors(self, B: int = 1024):
+        """Precompute top-K item-item cosine neighbours (EMB_NEIGHBORS_K > 0 only; see NEIGHBORS_K)"""
+        n = len(self.ids)
+        k = min(NEIGHBORS_K, n - 1)
+        if k <= 0:
+            return
+        mat = self.index.reconstruct_n(0, n)
+        nbr_idx = np.full((n, k), -1, dtype="int32")
+        nbr_sim = np.zeros((n, k), dtype="float32")
+        for start in range(0, n, B):
+            D, I = self.index.search(mat[start : start + B], k + 1)
+            rows = np.arange(start, start + len(I))
+            nbr_idx[rows], nbr_sim[rows] = _neighbor_rows(rows, D, I, k)
+        self.neighbor_idx = nbr_idx
+        self.neighbor_sim = nbr_sim
+
+    def derive(self, docs: List[VectorDoc], removed: Iterable[str]) -> "EmbeddingIndex":
+        """Index with `docs` (new or changed) embedded and `removed` ids dropped, sharing this one's base.
+
+        Only the given docs are embedded and only the delta segment is copied, so the cost follows the
+        size of the change; base rows of changed or removed ids become tombstones. Once delta + tombstones
+        pass SEGMENT_COMPACT_FRACTION of the base they are folded into a fresh base (see compacted()).
+        Requests still using this index are unaffected.
+        """
+        changed = {d.id for d in docs} | set(removed)
+        new = EmbeddingIndex.__new__(EmbeddingIndex)
+        new.embed, new.dim, new.index = self.embed, self.dim, self.index
+        new.ids, new.texts, new.pos = self.ids, self.texts, self.pos
+        new.neighbor_idx, new.neighbor_sim = self.neighbor_idx, self.neighbor_sim
+        new.dead = self.dead | {pid for pid in changed if pid in self.pos}
+        kept = [i for i, pid in enumerate(self.delta_ids) if pid not in changed]
+        fresh: List[List[float]] = []
+        B = 256
+        for i in range(0, len(docs), B):
+            fresh.extend(self.embed([d.text for d in docs[i : i + B]]))
+        new.delta_ids = [self.delta_ids[i] for i in kept] + [d.id for d in docs]
+        new.delta_texts = [self.delta_texts[i] for i in kept] + [d.text for d in docs]
+        new.delta_pos = {pid: i for i, pid in enumerate(new.delta_ids)}
+        new.delta_vecs = np.concatenate([
+            self.delta_vecs[kept],
+            np.array(fresh, dtype="float32").reshape(len(docs), self.delta_vecs.shape[1]),
+        ])
+        if _segments_need_compaction(len(new.ids), len(new.delta_ids), len(new.dead)):
+            return new.compacted()
+        return new
+
+    def compacted(self) -> "EmbeddingIndex":
+        """Index with the delta segment and tombstones folded into a single base (self if there are none).
+
+        Reuses the stored vectors (nothing is re-embedded); the neighbour table, when enabled, is rebuilt.
+        """
+        if not self.delta_ids and not self.dead:
+            return self
+        live = [i for i, pid in enumerate(self.ids) if pid not in self.dead]
+        base = self.index.reconstruct_batch(np.array(live, dtype="int64")) if live else self.delta_vecs[:0]
+        new = EmbeddingIndex.__new__(EmbeddingIndex)
+        new.embed, new.dim = self.embed, self.dim
+        new.ids = [self.ids[i] for i in live] + self.delta_ids
+        new.texts = [self.texts[i] for i in live] + self.delta_texts
+        new.pos = {pid: i for i, pid in enumerate(new.ids)}
+        new.index = faiss.IndexFlatIP(new.dim)
+        new.index.add(np.ascontiguousarray(np.concatenate([base, self.delta_vecs]), dtype="float32"))
+        new.neighbor_idx = new.neighbor_sim = None
+        new._build_neighbors()
+        new._clear_delta()
+        return new
+
+    def vectors(self, ids: List[str]) -> Tuple[List[str], np.ndarray]:
+        """(found ids, their vectors) for the live docs among `ids`, from whichever segment holds them"""
+        found: List[str] = []
+        rows: List[np.ndarray] = []
+        for pid in dict.fromkeys(ids):
+            if pid in self.delta_pos:
+                rows.append(self.delta_vecs[self.delta_pos[pid]])
+            elif pid in self.pos and pid not in self.dead:
+                rows.append(self.index.reconstruct(self.pos[pid]))
+            else:
+                continue
+            found.append(pid)
+        return found, (np.stack(rows) if rows else np.zeros((0, self.dim or 0), dtype="float32"))
+
+    def similarity_lookup(self, ids: List[str]) -> Callable[[str, str], float]:
+        """Pairwise cosine lookup restricted to `ids`.
+
+        Computed from the vectors of `ids` (len(ids)^2 dot products); with a precomputed neighbour table,
+        pairs of base docs outside each other's neighbour lists count as 0 instead (pairs involving a doc
+        changed since the table was built are always computed exactly).
+        """
+        found, vecs = self.vectors(ids)
+        at = {pid: i for i, pid in enumerate(found)}
+        sims = vecs @ vecs.T
+
+        def _pair(a: str, b: str) -> float:
+            i, j = at.get(a), at.get(b)
+            return float(sims[i, j]) if i is not None and j is not None else 0.0
+
+        if self.neighbor_idx is None:
+            return _pair
+        table: Dict[Tuple[str, str], float] = {}
+        wanted = {self.pos[pid]: pid for pid in found if pid not in self.delta_pos}
+        for i, pid in wanted.items():
+            for j, sim in zip(self.neighbor_idx[i].tolist(), self.neighbor_sim[i].tolist()):
+                other = wanted.get(j)
+                if other is not None:
+                    best = max(sim, table.get((pid, other), sim))
+                    table[(pid, other)] = table[(other, pid)] = best
+
+        def _sim(a: str, b: str) -> float:
+            if a in self.delta_pos or b in self.delta_pos:
+                return _pair(a, b)
+            return table.get((a, b), 0.0)
+
+        return _sim
+
+    def search(self, query: str, k: int = 50, timer: Optional[StageTimer] = None) -> List[Tuple[str, float]]:
         if not query:
             return []
         import numpy as np  # type: ignore
 
+        t0 = time.perf_counter()
         [qv] = self.embed([query])
         qv = np.array([qv], dtype="float32")
-        D, I = self.index.search(qv, k)
+        t1 = time.perf_counter()
+        # over-fetch by the tombstones so k live base hits can still come back
+        D, I = self.index.search(qv, k + len(self.dead))
         hits: List[Tuple[str, float]] = []
         for score, idx in zip(D[0].tolist(), I[0].tolist()):
-            if idx == -1:
+            if idx == -1 or self.ids[idx] in self.dead:
                 continue
             hits.append((self.ids[idx], float(score)))
+            if len(hits) >= k:
+                break
+        if self.delta_ids:
+            scores = self.delta_vecs @ qv[0]
+            hits.extend(zip(self.delta_ids, scores.tolist()))
+            hits = sorted(hits, key=lambda h: -h[1])[:k]
+        if timer is not None:
+            timer.add("query_embed", t1 - t0)
+            timer.add("faiss_search", time.perf_counter() - t1)
         return hits
 
 
-semantic_index = None
-try:
+def build_vector_docs(profiles: Dict[str, Any]) -> List[VectorDoc]:
     docs: List[VectorDoc] = []
-    for title, p in (movie_profiles or {}).items():
+    for title, p in (profiles or {}).items():
         pid = (title or "").strip().lower()
         text = build_search_text(p)
         if text:
             docs.append(VectorDoc(id=pid, title=title, text=text))
-    if docs:
-        semantic_index = EmbeddingIndex(docs)
-        print(f"[semantic] built FAISS index for {len(docs)} docs")
-    else:
-        print("[semantic] no docs to index")
-except Exception as _e:
-    print(f"[semantic] disabled: {_e}")
+    return docs
+
+
+# -------------
+# Catalog generations
+# -------------
+def build_generation(number: int) -> CatalogGeneration:
+    """Load profiles and build every search structure for a new, self-contained generation"""
+    timings: Dict[str, float] = {}
+    t0 = time.perf_counter()
+    version = catalog.version
+    by_id, keys_by_id = _load_catalog_profiles()
+    profiles = {p["title"]: p for p in by_id.values()}
+    timings["load"] = round(time.perf_counter() - t0, 3)
+
+    t0 = time.perf_counter()
+    engine = SearchEngine(profiles)
+    timings["fts_index"] = round(time.perf_counter() - t0, 3)
+
+    t0 = time.perf_counter()
+    index = None
+    try:
+        docs = build_vector_docs(profiles)
+        if docs:
+            index = EmbeddingIndex(docs)
+            print(f"[semantic] built FAISS index for {len(docs)} docs")
+        else:
+            print("[semantic] no docs to index")
+    except Exception as e:
+        print(f"[semantic] disabled: {e}")
+    timings["embedding_index"] = round(time.perf_counter() - t0, 3)
+
+    return CatalogGeneration(
+        number=number,
+        catalog_version=version,
+        profiles=profiles,
+        profile_by_id=by_id,
+        keys_by_id=keys_by_id,
+        id_by_key={k: pid for pid, keys in keys_by_id.items() for k in keys},
+        search_engine=engine,
+        semantic_index=index,
+        reranker=load_reranker(RERANKER_PATH),
+        built_at=datetime.now(timezone.utc).isoformat(),
+        build_timings_s=timings,
+    )
+
+
+# A delta touching more than this fraction of the catalog is built as a full generation instead
+DELTA_MAX_FRACTION = 0.2
+
+
+def derive_generation(base: CatalogGeneration, titles: Set[str], number: int) -> CatalogGeneration:
+    """New generation from `base` with only `titles` (catalog keys) re-read, re-indexed and re-embedded.
+
+    Profiles are keyed by search id (lowercased data title), which several catalog keys can merge into
+    and a rename moves; every search id a changed key maps to, before or after the change, is re-merged
+    from all of its catalog keys.
+    """
+    timings: Dict[str, float] = {}
+    t0 = time.perf_counter()
+    version = catalog.version
+    rows = catalog.get_many(titles)
+    ids = {base.id_by_key[k] for k in titles if k in base.id_by_key}
+    ids |= {(_normalize(obj)["title"] or "").strip().lower() for obj in rows.values()}
+    siblings = {k for pid in ids for k in base.keys_by_id.get(pid, ())} - set(titles)
+    if siblings:
+        rows.update(catalog.get_many(siblings))
+    merged, merged_keys = _merge_catalog_rows(rows)
+
+    profiles = dict(base.profiles)
+    by_id = dict(base.profile_by_id)
+    keys_by_id = dict(base.keys_by_id)
+    id_by_key = dict(base.id_by_key)
+    for pid in ids:
+        old = by_id.pop(pid, None)
+        if old is not None:
+            profiles.pop(old["title"], None)
+        for k in keys_by_id.pop(pid, ()):
+            id_by_key.pop(k, None)
+    upserts: Dict[str, Any] = {}
+    for pid, m in merged.items():
+        profiles[m["title"]] = by_id[pid] = upserts[m["title"]] = m
+        keys_by_id[pid] = merged_keys[pid]
+        id_by_key.update((k, pid) for k in merged_keys[pid])
+    # only ids that were indexed before count as removed
+    removed = [pid for pid in ids if pid not in merged and pid in base.profile_by_id]
+    timings["load"] = round(time.perf_counter() - t0, 3)
+
+    t0 = time.perf_counter()
+    engine = base.search_engine.derive(upserts, removed)
+    timings["fts_index"] = round(time.perf_counter() - t0, 3)
+
+    t0 = time.perf_counter()
+    index = base.semantic_index
+    if index is not None:
+        index = index.derive(build_vector_docs(upserts), removed)
+    timings["embedding_index"] = round(time.perf_counter() - t0, 3)
+    print(f"[api] patched {len(upserts)} profiles, removed {len(removed)} (generation {base.number} -> {number})")
+
+    return CatalogGeneration(
+        number=number,
+        catalog_version=version,
+        profiles=profiles,
+        profile_by_id=by_id,
+        keys_by_id=keys_by_id,
+        id_by_key=id_by_key,
+        search_engine=engine,
+        semantic_index=index,
+        reranker=base.reranker,
+        built_at=datetime.now(timezone.utc).isoformat(),
+        build_timings_s=timings,
+        derived_from=base.number,
+        changed_titles=len(titles),
+    )
+
+
+def build_next_generation(titles: Optional[Set[str]] = None) -> CatalogGeneration:
+    """Next generation: a delta over the current one when the changes are known and small, else a full build.
+
+    Titles the catalog change log reports since the current generation's version are always
+    included, so a delta also covers writes nobody asked to reload.
+    """
+    base = generation
+    number = (base.number if base else 0) + 1
+    if titles is None or base is None:
+        return build_generation(number)
+    logged = catalog.changed_since(base.catalog_version)
+    if logged is None:
+        return build_generation(number)
+    titles = set(titles) | set(logged)
+    if len(titles) > max(1, len(base.profiles)) * DELTA_MAX_FRACTION:
+        return build_generation(number)
+    return derive_generation(base, titles, number)
+
+
+# -------------
+# Startup snapshot
+# -------------
+SNAPSHOT_PATH = Path(os.getenv("CATALOG_SNAPSHOT_PATH") or DEFAULT_SNAPSHOT_PATH)
+# Bump when _normalize/_merge_profiles or the index layout change, so old snapshots are rebuilt
+SNAPSHOT_SCHEMA = 3
+# Write a fresh snapshot in the background when startup had to build from the catalog
+SNAPSHOT_AUTOSAVE = os.getenv("CATALOG_SNAPSHOT_AUTOSAVE", "1").strip().lower() not in ("0", "false", "no")
+# Path the startup generation was loaded from (None = built from the catalog)
+startup_snapshot: Optional[Path] = None
+_snapshot_themes: Optional[Dict[str, Any]] = None
+
+
+def embedding_config() -> str:
+    """Identity of the embedding model; vectors from a different model cannot be reused"""
+    provider = (os.getenv("EMB_PROVIDER", "local").lower() or "local").strip()
+    if provider == "openai":
+        return f"openai:{os.getenv('OPENAI_EMB_MODEL', 'text-embedding-3-small')}"
+    if provider == "hash":
+        return f"hash:{os.getenv('EMB_HASH_DIM', '256')}"
+    return f"local:{os.getenv('EMB_LOCAL_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')}"
+
+
+def snapshot_source_hash(version: Optional[int] = None) -> str:
+    """What a snapshot must have been built from to be usable: this catalog database at this version
+    (default: the current one), schema and embedding model. Every catalog write bumps the version, and a
+    rebuilt database gets a new catalog_id, so no catalog rows need to be read."""
+    version = catalog.version if version is None else version
+    key = f"{catalog.catalog_id}|v={version}|schema={SNAPSHOT_SCHEMA}|emb={embedding_config()}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _json_blob(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def save_generation_snapshot(gen: CatalogGeneration, path: Path = SNAPSHOT_PATH) -> int:
+    """Write `gen` (built from the current catalog; delta segments are folded in) and the theme postings
+    as a startup snapshot"""
+    engine = gen.search_engine.compacted()
+    index = gen.semantic_index.compacted() if gen.semantic_index is not None else None
+    state = {
+        "profile_by_id": gen.profile_by_id,
+        "keys_by_id": gen.keys_by_id,
+        "fts": {"ids": engine.ids, "titles": engine.titles},
+        "semantic": None if index is None else {"ids": index.ids, "texts": index.texts},
+    }
+    blobs = {
+        "state": _json_blob(state),
+        "fts_db": engine.conn.serialize(),
+        "themes": _json_blob(ThemeIndex(catalog.all()).state()),
+    }
+    # themes are read from the catalog now, so it must still be at the generation's version
+    if catalog.version != gen.catalog_version:
+        raise RuntimeError(f"catalog changed while building (v{gen.catalog_version} -> v{catalog.version}); retry")
+    arrays: Dict[str, np.ndarray] = {}
+    if index is not None:
+        arrays["faiss_index"] = faiss.serialize_index(index.index)
+        if index.neighbor_idx is not None:
+            arrays["neighbor_idx"] = index.neighbor_idx
+            arrays["neighbor_sim"] = index.neighbor_sim
+    meta = {"catalog_version": gen.catalog_version, "profiles": len(gen.profiles), "embedding": embedding_config()}
+    return write_snapshot(path, snapshot_source_hash(gen.catalog_version), blobs, arrays, meta)
+
+
+def load_generation_snapshot(path: Path = SNAPSHOT_PATH) -> Optional[CatalogGeneration]:
+    """Generation 1 from the snapshot at `path` when it matches the catalog, else None"""
+    global startup_snapshot, _snapshot_themes
+    t0 = time.perf_counter()
+    catalog.sync_from_json()  # pick up JSON edits made while no process was running, so the version is current
+    version = catalog.version
+    snap = open_snapshot(path, snapshot_source_hash(version))
+    if snap is None:
+        return None
+    gc.disable()  # decoding creates many containers; collection passes meanwhile would double the load time
+    try:
+        state = json.loads(snap.blob("state"))
+        fts = state["fts"]
+        engine = SearchEngine.from_snapshot(snap.blob("fts_db"), fts["ids"], fts["titles"])
+        index = None
+        sem = state["semantic"]
+        if sem is not None:
+            try:
+                has_nbrs = snap.has("neighbor_idx")
+                index = EmbeddingIndex.from_snapshot(
+                    sem["ids"], sem["texts"], snap.array("faiss_index"),
+                    snap.array("neighbor_idx") if has_nbrs else None,
+                    snap.array("neighbor_sim") if has_nbrs else None,
+                )
+            except Exception as e:
+                print(f"[semantic] disabled: {e}")
+        _snapshot_themes = json.loads(snap.blob("themes"))
+    except Exception as e:
+        print(f"[snapshot] failed to load {path}, rebuilding: {e}")
+        return None
+    finally:
+        gc.enable()
+    startup_snapshot = Path(path)
+    by_id = state["profile_by_id"]
+    keys_by_id = state["keys_by_id"]
+    elapsed = round(time.perf_counter() - t0, 3)
+    print(f"[snapshot] loaded {len(by_id)} profiles from {path} in {elapsed}s")
+    return CatalogGeneration(
+        number=1,
+        catalog_version=version,
+        profiles={p["title"]: p for p in by_id.values()},
+        profile_by_id=by_id,
+        keys_by_id=keys_by_id,
+        id_by_key={k: pid for pid, keys in keys_by_id.items() for k in keys},
+        search_engine=engine,
+        semantic_index=index,
+        reranker=load_reranker(RERANKER_PATH),
+        built_at=datetime.now(timezone.utc).isoformat(),
+        build_timings_s={"snapshot_load": elapsed},
+    )
+
+
+def publish_generation(gen: CatalogGeneration) -> None:
+    """Make `gen` current with one reference swap; in-flight requests keep the generation they started with"""
+    global generation
+    generation = gen
+    print(f"[api] published generation {gen.number}: {len(gen.profiles)} profiles (catalog v{gen.catalog_version})")
+
+
+# The first generation is loaded from the startup snapshot when it matches the catalog, otherwise built
+# synchronously (nothing to serve before it exists); reloads build in the background
+def _startup_generation() -> CatalogGeneration:
+    gen = load_generation_snapshot()
+    if gen is not None:
+        return gen
+    gen = build_generation(1)
+    if SNAPSHOT_AUTOSAVE:
+        def _save() -> None:
+            try:
+                size = save_generation_snapshot(gen)
+                print(f"[snapshot] wrote {SNAPSHOT_PATH} ({size / 1e6:.1f} MB) for the next start")
+            except Exception as e:
+                print(f"[snapshot] not written: {e}")
+
+        threading.Thread(target=_save, name="snapshot-writer", daemon=True).start()
+    return gen
+
+
+generation: CatalogGeneration = _startup_generation()
+generation_builder = GenerationBuilder(build_next_generation, publish_generation)
+
+
+def reload_movie_data(wait: bool = False, timeout: Optional[float] = None,
+                      titles: Optional[Iterable[str]] = None) -> bool:
+    """Schedule a background rebuild of the catalog generation.
+
+    With titles (added, changed or removed catalog titles) only those are re-indexed.
+    Returns immediately with True; with wait=True blocks until the rebuild has finished and
+    returns whether it succeeded.
+    """
+    ticket = generation_builder.request(titles)
+    if not wait:
+        return True
+    return generation_builder.wait(ticket, timeout) and generation_builder.last_error is None
+
+
+register_api_reloader(reload_movie_data)
+
+
+def follow_catalog() -> None:
+    """Bring this worker's derived indexes up to the shared catalog version when another worker or
+    process wrote it: schedules a delta build of the generation and patches the theme index.
+    Cheap when nothing changed."""
+    if catalog.version > generation.catalog_version and not generation_builder.building:
+        generation_builder.request(())
+    current_theme_index()
 
-# Create the keyword search engine from loaded profiles
-search_engine = SearchEngine(movie_profiles)
 
 app = FastAPI()
 app.add_middleware(
@@ -579,113 +1250,161 @@ app.add_middleware(
 app.include_router(admin_router)
 
 @app.post("/reload")
-async def reload_data():
-    """Reload movie data from JSON files"""
-    success = reload_movie_data()
-    if success:
-        return {"message": f"Successfully reloaded {len(movie_profiles)} movie profiles", "count": len(movie_profiles)}
-    else:
-        return {"error": "Failed to reload movie data"}
+async def reload_data(payload: Optional[Dict[str, Any]] = None, wait: bool = False):
+    """Rebuild the catalog generation in the background and swap it in when complete.
+
+    Searches keep using the current generation meanwhile. wait=true returns only after the swap.
+    Optional JSON body for a delta reload that re-indexes just some titles:
+    {"changed": [...], "added": [...], "removed": [...]} and/or {"since_version": N} (every title
+    changed after catalog version N, e.g. the catalog_version of an earlier reload response).
+    Without a body the whole catalog is rebuilt.
+    """
+    payload = payload or {}
+    titles: Optional[Set[str]] = None
+    if any(k in payload for k in ("changed", "added", "removed", "since_version")):
+        titles = set()
+        for key in ("changed", "added", "removed"):
+            values = payload.get(key) or []
+            if not isinstance(values, list):
+                raise HTTPException(status_code=400, detail=f"{key} must be a list of titles")
+            titles.update(str(t) for t in values)
+        if payload.get("since_version") is not None:
+            try:
+                since = int(payload["since_version"])
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="since_version must be an integer")
+            changed = catalog.changed_since(since)
+            titles = None if changed is None else titles | set(changed)
+    mode = "full" if titles is None else "delta"
+    ticket = generation_builder.request(titles)
+    if wait:
+        await asyncio.to_thread(generation_builder.wait, ticket, 600)
+        if generation_builder.last_error:
+            return {"error": f"Failed to reload movie data: {generation_builder.last_error}"}
+        gen = generation
+        return {"message": f"Successfully reloaded {len(gen.profiles)} movie profiles",
+                "count": len(gen.profiles), "generation": gen.number,
+                "mode": "full" if gen.derived_from is None else "delta",
+                "catalog_version": gen.catalog_version, "build_timings_s": gen.build_timings_s}
+    return {"message": "Reload scheduled", "generation": generation.number, "count": len(generation.profiles),
+            "mode": mode, "titles": None if titles is None else len(titles), "catalog_version": catalog.version}
 
 # Static files are served by a separate server on port 8002
 
-# In-memory observability buffers (simple ring buffers)
-RECENT_REQUESTS = deque(maxlen=500)
-CLICK_EVENTS = deque(maxlen=1000)
+# Observability ring buffers, kept in the shared state backend so the dashboard sees every worker's traffic.
+# Handlers only queue events; obs_writer appends them in batches off the event loop.
+shared_state = get_state_backend()
+obs_writer = EventWriter(shared_state)
+RECENT_REQUESTS = "obs:recent_requests"
+RECENT_REQUESTS_MAX = 500
+CLICK_EVENTS = "obs:clicks"
+CLICK_EVENTS_MAX = 1000
+# Per-stage /search latency histograms since this worker's start (see /observability/timings)
+STAGE_HISTOGRAMS = LatencyHistograms()
+
+# With OBS_PERSIST=1, search requests (including the raw query text) and clicks are also appended to
+# JSONL files so they survive restarts and can be replayed offline (see evaluate_fusion.py). Off by
+# default. Files rotate at OBS_LOG_MAX_BYTES, keeping OBS_LOG_BACKUPS older files; writes happen on
+# a background thread like the ring buffers above.
+OBS_LOG_DIR = Path(os.getenv("OBS_LOG_DIR") or (ROOT / "logs"))
+OBS_PERSIST = os.getenv("OBS_PERSIST", "0").strip().lower() in ("1", "true", "yes")
+OBS_LOG_MAX_BYTES = int(os.getenv("OBS_LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+OBS_LOG_BACKUPS = int(os.getenv("OBS_LOG_BACKUPS", "5"))
+obs_log_writer = (EventWriter(JsonlEventLog(OBS_LOG_DIR, OBS_LOG_MAX_BYTES, OBS_LOG_BACKUPS))
+                  if OBS_PERSIST else None)
+
+
+def _append_obs_log(name: str, event: Dict[str, Any]) -> None:
+    if obs_log_writer is not None:
+        obs_log_writer.submit(name, event, 0)
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "profiles": len(movie_profiles), "semantic_enabled": bool(semantic_index)}
+    gen = generation
+    return {"status": "ok", "profiles": len(gen.profiles), "semantic_enabled": bool(gen.semantic_index),
+            "catalog_version": catalog.version, "generation": gen.number,
+            "generation_catalog_version": gen.catalog_version, "reload": generation_builder.status()}
 
 
-def rrf_fuse(lists: List[List[Tuple[str, float]]], k: int = 60, K: float = 60.0) -> List[str]:
-    from collections import defaultdict
-    scores = defaultdict(float)
-    for lst in lists:
-        for rank, (pid, _s) in enumerate(lst, start=1):
-            scores[pid] += 1.0 / (K + rank)
-    return [pid for pid, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True)][:k]
+def rrf_fuse(lists: List[List[Tuple[str, float]]], k: int = 60, K: float = DEFAULT_RRF_K) -> List[str]:
+    return [pid for pid, _ in fuse("rrf", lists, k=k, rrf_k=K)]
 
 
-def keyword_retrieve(q: str, k: int) -> List[Tuple[str, float]]:
-    rows = search_engine.search(q, limit=k)
-    return [(r["id"], float(r.get("score") or 0.0)) for r in rows]
+def fusion_inputs(kw_hits: List[Tuple[str, float]], vec_hits: List[Tuple[str, float]]) -> List[List[Tuple[str, float]]]:
+    """Orient retriever scores so higher is better (FTS5 bm25 is more negative for better matches)."""
+    return [[(pid, -float(s)) for pid, s in kw_hits], [(pid, float(s)) for pid, s in vec_hits]]
 
 
-def vector_retrieve(q: str, k: int) -> List[Tuple[str, float]]:
-    if semantic_index is None:
-        return []
-    return semantic_index.search(q, k=k)
+def rerank_features(pid: str, rank: int, intent: Dict[str, Any], kw_score: Dict[str, float],
+                    vec_score: Dict[str, float], popularity: Dict[str, float],
+                    gen: Optional[CatalogGeneration] = None) -> List[float]:
+    """Reranker feature row for one candidate (logged per result as /search "candidates")"""
+    profile = (gen or generation).profile_by_id.get(pid) or {}
+    return extract_features(rank, kw_score.get(pid), vec_score.get(pid), profile, intent, popularity.get(pid, 0.0))
 
 
-def load_hidden_movies():
-    """Load list of hidden movies from file"""
-    try:
-        from admin_api import admin_state
-        admin_state['hidden_movies'] = set()
-        hidden_file = Path("hidden_movies.json")
-        if hidden_file.exists():
-            with open(hidden_file, 'r') as f:
-                data = json.load(f)
-                admin_state['hidden_movies'] = set(data.get('hidden', []))
-    except Exception as e:
-        print(f"Error loading hidden movies: {e}")
+def build_vector_query(q: str, intent: Dict[str, Any]) -> str:
+    """Soft-expanded query for vectors: natural phrase + mood/genres, excluding overly generic 'drama'."""
+    expanded_for_vectors = q
+    if intent.get("mood_terms"):
+        expanded_for_vectors = (expanded_for_vectors + " " + " ".join(intent["mood_terms"])) if expanded_for_vectors else " ".join(intent["mood_terms"])
+    if intent.get("genres"):
+        vg = [g for g in intent["genres"] if g != "drama"]
+        if vg:
+            expanded_for_vectors = (expanded_for_vectors + " " + " ".join(vg)) if expanded_for_vectors else " ".join(vg)
+    return expanded_for_vectors
 
 
-@app.get("/movies")
-async def get_movies():
-    """Get all movies with hidden movies filtered out."""
-    try:
-        # Load movie data
-        with open("movie_profiles_merged.json", 'r') as f:
-            movies_data = json.load(f)
-        
-        # Load hidden movies
-        load_hidden_movies()
-        from admin_api import admin_state
-        hidden_titles = admin_state['hidden_movies']
-        
-        # Filter out hidden movies
-        filtered_movies = {}
-        for title, movie_data in movies_data.items():
-            if title not in hidden_titles:
-                filtered_movies[title] = movie_data
-        
-        return filtered_movies
-        
-    except Exception as e:
-        print(f"Error loading movies: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+def keyword_retrieve(q: str, k: int, gen: Optional[CatalogGeneration] = None) -> List[Tuple[str, float]]:
+    rows = (gen or generation).search_engine.search(q, limit=k)
+    return [(r["id"], float(r.get("score") or 0.0)) for r in rows]
+
+
+def vector_retrieve(q: str, k: int, timer: Optional[StageTimer] = None,
+                    gen: Optional[CatalogGeneration] = None) -> List[Tuple[str, float]]:
+    index = (gen or generation).semantic_index
+    if index is None:
+        return []
+    return index.search(q, k=k, timer=timer)
+
 
 @app.get("/search")
-async def search(q: str, limit: int = 20, mode: str = "hybrid", k: int = 60):
+async def search(q: str, limit: int = 20, mode: str = "hybrid", k: int = 60,
+                 fusion: str = "rrf", rrf_k: float = DEFAULT_RRF_K, w_kw: float = 1.0, w_vec: float = 1.0,
+                 rerank: bool = False, rerank_top_n: int = 50, diversity: float = 0.0, diversity_top_n: int = 50):
     """Stage 2 search over movie profiles.
     - mode: 'keyword' | 'vector' | 'hybrid' (default)
     - k: candidate pool per retriever (hybrid)
+    - fusion: 'rrf' (default) | 'minmax' | 'zscore' | 'combmnz' (hybrid)
+    - rrf_k, w_kw, w_vec: RRF damping constant and per-retriever fusion weights
+    - rerank: reorder the top rerank_top_n candidates with the click-trained model (RERANK_BUDGET_MS budget)
+    - diversity: 0 (off) .. 1, MMR diversification of the top diversity_top_n candidates
     Returns: list of {id, title, score, snippet, badges, why, debug} and applied_filters.
     """
-    intent = search_engine.parse_intent(q)
-    expanded = intent.get("expanded_query") or q
-
-    # Build a soft-expanded query for vectors (natural phrase + mood/genres, excluding overly generic 'drama')
-    expanded_for_vectors = q
-    if intent.get("mood_terms"):
-        expanded_for_vectors = (expanded_for_vectors + " " + " ".join(intent["mood_terms"])) if expanded_for_vectors else " ".join(intent["mood_terms"])
-    if intent.get("genres"):
-        vg = [g for g in intent["genres"] if g != "drama"]
-        if vg:
-            expanded_for_vectors = (expanded_for_vectors + " " + " ".join(vg)) if expanded_for_vectors else " ".join(vg)
+    fusion = (fusion or "rrf").strip().lower()
+    if fusion not in FUSION_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unknown fusion '{fusion}'; expected one of {sorted(FUSION_STRATEGIES)}")
+    # one generation for the whole request, even if a reload swaps in a new one meanwhile
+    gen = generation
+    search_engine, semantic_index, click_reranker = gen.search_engine, gen.semantic_index, gen.reranker
+    timer = StageTimer()
+    with timer.span("intent_parse"):
+        intent = search_engine.parse_intent(q)
+        expanded = intent.get("expanded_query") or q
+        expanded_for_vectors = build_vector_query(q, intent)
 
     # Retrieve candidates
-    kw_hits = keyword_retrieve(expanded, k if mode != "vector" else limit) if mode != "vector" else []
-    vec_hits = vector_retrieve(expanded_for_vectors, k if mode != "keyword" else 0) if mode != "keyword" else []
+    with timer.span("keyword_retrieve"):
+        kw_hits = keyword_retrieve(expanded, k if mode != "vector" else limit, gen) if mode != "vector" else []
+    vec_hits = vector_retrieve(expanded_for_vectors, k if mode != "keyword" else 0, timer=timer, gen=gen) if mode != "keyword" else []
 
     # Precompute ranks/scores for provenance
     kw_rank = {pid: i + 1 for i, (pid, _s) in enumerate(kw_hits)}
     vec_rank = {pid: i + 1 for i, (pid, _s) in enumerate(vec_hits)}
     kw_score = {pid: float(s) for pid, s in kw_hits}
     vec_score = {pid: float(s) for pid, s in vec_hits}
+    fused_score: Dict[str, float] = {}
 
     # Candidate IDs per mode
     if mode == "keyword":
@@ -693,31 +1412,52 @@ async def search(q: str, limit: int = 20, mode: str = "hybrid", k: int = 60):
     elif mode == "vector":
         cands = [pid for pid, _ in vec_hits]
     else:
-        fused = rrf_fuse([kw_hits, vec_hits], k=max(k, limit))
-        cands = fused
+        with timer.span("fusion"):
+            fused = fuse(fusion, fusion_inputs(kw_hits, vec_hits), k=max(k, limit), weights=[w_kw, w_vec], rrf_k=rrf_k)
+            fused_score = {pid: s for pid, s in fused}
+            cands = [pid for pid, _s in fused]
+    # rank before rerank/diversity: the reranker's fused_rank feature, logged per result for training
+    fused_rank = {pid: i + 1 for i, pid in enumerate(cands)}
+
+    # Optional learned rerank; keeps the fused order if the model is missing or over budget
+    rerank_status = None
+    if rerank:
+        if click_reranker is None:
+            rerank_status = "unavailable"
+        else:
+            popularity = click_reranker.popularity
+            with timer.span("rerank"):
+                cands, rerank_status = click_reranker.rerank(
+                    cands,
+                    lambda pid, rank: rerank_features(pid, rank, intent, kw_score, vec_score, popularity, gen),
+                    top_n=rerank_top_n,
+                    budget_ms=RERANK_BUDGET_MS,
+                )
+
+    # Optional MMR diversification over item-item similarities of the top candidates
+    diversity_status = None
+    if diversity > 0:
+        if semantic_index is None:
+            diversity_status = "unavailable"
+        else:
+            with timer.span("diversity"):
+                top_n = max(0, min(diversity_top_n, DIVERSITY_MAX_TOP_N))
+                head = cands[:top_n]
+                cands = mmr_rerank(head, semantic_index.similarity_lookup(head), diversity) + cands[top_n:]
+            diversity_status = "applied"
 
     # Filter out hidden movies
-    load_hidden_movies()
-    from admin_api import admin_state
-    hidden_titles = admin_state['hidden_movies']
-    if hidden_titles:
-        # Get movie titles for the candidate IDs and filter out hidden ones
-        c = search_engine.conn.cursor()
-        visible_cands = []
-        for pid in cands:
-            try:
-                row = c.execute("SELECT title FROM movies_fts WHERE id = ?", (pid,)).fetchone()
-                if row and row[0] not in hidden_titles:
-                    visible_cands.append(pid)
-            except Exception:
-                # If we can't check the title, include it to be safe
-                visible_cands.append(pid)
-        cands = visible_cands
+    timer.switch("hidden_filter")
+    cands = search_engine.visible(cands, hidden_movies.refresh(), hidden_movies.version)
 
     # Build results applying filters/gates via FTS
-    c = search_engine.conn.cursor()
     results: List[Dict[str, Any]] = []
     for pid in cands:
+        timer.switch("gating")
+        # the row of pid lives in the engine's base or delta segment
+        c = search_engine.cursor_for(pid)
+        if c is None:
+            continue
         # Exclusions
         if intent["exclude_terms"]:
             exq = " OR ".join(intent["exclude_terms"])  # simple OR
@@ -744,6 +1484,7 @@ async def search(q: str, limit: int = 20, mode: str = "hybrid", k: int = 60):
             except Exception:
                 pass
         # Fetch presentation fields with MATCH so snippet highlights query terms
+        timer.switch("snippet_fetch")
         try:
             row = c.execute(
                 """
@@ -758,7 +1499,7 @@ async def search(q: str, limit: int = 20, mode: str = "hybrid", k: int = 60):
             ).fetchone()
         except Exception:
             row = c.execute(
-                "SELECT title, tags, substr(text,1,200) AS snip_text, substr(tags,1,200) AS snip_tags, 0.0 as score FROM movies_fts WHERE id=\?",
+                "SELECT title, tags, substr(text,1,200) AS snip_text, substr(tags,1,200) AS snip_tags, 0.0 as score FROM movies_fts WHERE id=?",
                 (pid,),
             ).fetchone()
         if not row:
@@ -797,6 +1538,7 @@ async def search(q: str, limit: int = 20, mode: str = "hybrid", k: int = 60):
                 snip = manual
                 snip_source = "tags" if manual == manual_tag else "text"
         # badges from tag tokens intersecting query terms (filter stopwords/short tokens)
+        timer.switch("explanation")
         stop = {
             "the","a","an","for","and","or","of","to","in","on","with","about","by","at","from","as","is","it","its","film","films","movie","movies"
         }
@@ -871,7 +1613,7 @@ async def search(q: str, limit: int = 20, mode: str = "hybrid", k: int = 60):
             return txt
         pretty_snip = _pretty_snip(clean_snip, snip_source)
         # 3) Pull a couple of themes/moods from the underlying profile if available
-        p = movie_profiles.get(title) or {}
+        p = gen.profiles.get(title) or {}
         themes = p.get("themes") or []
         moods = p.get("emotional_tone") or []
         # prefer themes that match the query (case-insensitive, handle coming-of-age variants)
@@ -981,16 +1723,24 @@ async def search(q: str, limit: int = 20, mode: str = "hybrid", k: int = 60):
                 "vec_rank": vec_rank.get(pid),
                 "kw_score": kw_score.get(pid),
                 "vec_score": vec_score.get(pid),
+                "fused_score": fused_score.get(pid),
             },
         })
         if len(results) >= limit:
             break
+    timer.stop()
+    timings_ms = timer.as_ms()
+    STAGE_HISTOGRAMS.observe(timings_ms)
 
     # Build response
     _dbg = {
         "semantic_enabled": bool(semantic_index),
         "kw_candidates": len(kw_hits) if isinstance(kw_hits, list) else 0,
         "vec_candidates": len(vec_hits) if isinstance(vec_hits, list) else 0,
+        "fusion": fusion if mode == "hybrid" else None,
+        "rerank": rerank_status,
+        "diversity": diversity_status,
+        "timings_ms": timings_ms,
     }
     # Attach a request id for observability linking
     request_id = uuid.uuid4().hex
@@ -1017,18 +1767,33 @@ async def search(q: str, limit: int = 20, mode: str = "hybrid", k: int = 60):
                 "vec_score": d.get("vec_score"),
                 "why": r.get("why_pretty") or r.get("why") or r.get("why_sentence") or r.get("why_details"),
             })
-        RECENT_REQUESTS.appendleft({
+        event = {
             "request_id": request_id,
             "ts": datetime.now(timezone.utc).isoformat(),
             "q": q,
             "mode": mode,
+            "k": k,
+            "limit": limit,
+            "fusion": fusion if mode == "hybrid" else None,
+            "rrf_k": rrf_k if mode == "hybrid" else None,
+            "weights": [w_kw, w_vec] if mode == "hybrid" else None,
+            "rerank": rerank_status,
+            "diversity": diversity if diversity_status == "applied" else None,
             "applied_filters": intent.get("applied_filters", {}),
             "kw_candidates": len(kw_hits) if isinstance(kw_hits, list) else 0,
             "vec_candidates": len(vec_hits) if isinstance(vec_hits, list) else 0,
             "fused_count": len(cands) if isinstance(cands, list) else None,
             "result_count": len(results),
+            "result_ids": [r.get("id") for r in results],
+            # reranker inputs of every shown result as served (train_reranker.py learns from these)
+            "candidates": [{"id": r["id"], "rank": fused_rank.get(r["id"]), "kw_score": kw_score.get(r["id"]),
+                            "vec_score": vec_score.get(r["id"]),
+                            "facets": facet_matches(gen.profile_by_id.get(r["id"]) or {}, intent)} for r in results],
             "top_results": top,
-        })
+            "timings_ms": timings_ms,
+        }
+        obs_writer.submit(RECENT_REQUESTS, event, RECENT_REQUESTS_MAX)
+        _append_obs_log("requests.jsonl", event)
     except Exception:
         # don't fail the request if observability buffer append fails
         pass
@@ -1049,6 +1814,7 @@ async def taste_profile(payload: Dict[str, Any]):
     provider: str = (payload.get("provider") or "openai").strip()
     model: Optional[str] = payload.get("model")
 
+    movie_profiles = generation.profiles
     used, skipped = resolve_liked_movies(movie_profiles, liked)
     if not used:
         return {
@@ -1084,30 +1850,192 @@ async def taste_profile(payload: Dict[str, Any]):
 # -----------------
 # Movie data endpoints
 # -----------------
+# Responses smaller than this are not worth gzipping
+GZIP_MIN_BYTES = 1024
+
+# Visible catalog, serialized and gzipped once per (catalog version, hidden list version)
+_movies_cache: Dict[str, Any] = {"key": None}
+_movies_cache_lock = threading.Lock()
+
+
+def _movies_payload() -> Dict[str, Any]:
+    """Prebuilt /movies response bytes; rebuilt only when the catalog or hidden list changes"""
+    global _movies_cache
+    hidden_titles = hidden_movies.refresh()
+    key = (catalog.version, hidden_movies.version)
+    cached = _movies_cache
+    if cached["key"] == key:
+        return cached
+    with _movies_cache_lock:
+        if _movies_cache["key"] == key:
+            return _movies_cache
+        visible = {title: m for title, m in catalog.all().items() if title not in hidden_titles}
+        body = json.dumps(visible, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        _movies_cache = {
+            "key": key,
+            "body": body,
+            "gzip": gzip.compress(body, compresslevel=6),
+            "digest": hashlib.sha256(body).hexdigest()[:32],
+            "count": len(visible),
+            "index": CatalogIndex(visible),
+        }
+        print(f"[api] built /movies payload: {len(visible)} movies, {len(body)} bytes ({len(_movies_cache['gzip'])} gzipped)")
+        return _movies_cache
+
+
+def _etag_matches(if_none_match: Optional[str], digest: str) -> bool:
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.strip('"').split("-")[0] == digest:
+            return True
+    return False
+
+
+def cached_json_response(request: Request, payload: Dict[str, Any]) -> Response:
+    """Serve prebuilt JSON bytes with a strong ETag, 304 revalidation and gzip when accepted"""
+    use_gzip = "gzip" in (request.headers.get("accept-encoding") or "") and len(payload["body"]) >= GZIP_MIN_BYTES
+    etag = f'"{payload["digest"]}-gz"' if use_gzip else f'"{payload["digest"]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if _etag_matches(request.headers.get("if-none-match"), payload["digest"]):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=payload["gzip"], media_type="application/json", headers=headers)
+    return Response(content=payload["body"], media_type="application/json", headers=headers)
+
+
+def _csv(v: Optional[str]) -> List[str]:
+    return [x.strip() for x in (v or "").split(",") if x.strip()]
+
+
+# Query parameters that select the paged /movies response; others (e.g. a ?v= cache-buster) are ignored
+MOVIES_PAGE_PARAMS = frozenset({"fields", "offset", "limit", "cursor", "theme", "tone", "director",
+                                "year_min", "year_max"})
+
+
 @app.get("/movies")
-async def get_movies():
-    """Get all movies with hidden movies filtered out."""
+async def get_movies(request: Request, fields: Optional[str] = None, offset: Optional[int] = None,
+                     limit: Optional[int] = None, cursor: Optional[str] = None, theme: Optional[str] = None,
+                     tone: Optional[str] = None, director: Optional[str] = None,
+                     year_min: Optional[int] = None, year_max: Optional[int] = None):
+    """Get movies with hidden movies filtered out.
+
+    Without any of the parameters below returns the full {title: movie} catalog (cached; supports
+    If-None-Match); other query parameters are ignored. With any of them returns a page
+    {total, offset, limit, items, next_cursor}:
+    - fields: comma-separated projection ('card' = card fields); title is always included
+    - offset/limit or cursor (from next_cursor): pagination, limit defaults to 50 (max 500)
+    - theme, tone, director: comma-separated values, OR-ed within a filter and AND-ed across filters
+    - year_min, year_max: inclusive release year range
+    """
     try:
-        # Load movie data
-        with open("movie_profiles_merged.json", 'r') as f:
-            movies_data = json.load(f)
-        
-        # Load hidden movies
-        load_hidden_movies()
-        from admin_api import admin_state
-        hidden_titles = admin_state['hidden_movies']
-        
-        # Filter out hidden movies
-        filtered_movies = {}
-        for title, movie_data in movies_data.items():
-            if title not in hidden_titles:
-                filtered_movies[title] = movie_data
-        
-        return filtered_movies
-        
+        # a rebuild after a catalog change reads, serializes and compresses the whole catalog: off the event loop
+        payload = await run_in_threadpool(_movies_payload)
     except Exception as e:
         print(f"Error loading movies: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    page_params = [(k, v) for k, v in request.query_params.multi_items() if k in MOVIES_PAGE_PARAMS]
+    if not page_params:
+        return cached_json_response(request, payload)
+
+    if cursor:
+        try:
+            offset = decode_cursor(cursor)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    # The page is a pure function of the catalog payload and the query, so it can be revalidated without building it
+    query_key = "&".join(f"{k}={v}" for k, v in sorted(page_params))
+    digest = hashlib.sha256(f"{payload['digest']}?{query_key}".encode("utf-8")).hexdigest()[:32]
+    if _etag_matches(request.headers.get("if-none-match"), digest):
+        return Response(status_code=304, headers={"ETag": f'"{digest}"', "Cache-Control": "no-cache", "Vary": "Accept-Encoding"})
+
+    index: CatalogIndex = payload["index"]
+    positions = index.filter(themes=_csv(theme), tones=_csv(tone), directors=_csv(director),
+                             year_min=year_min, year_max=year_max)
+    page = index.page(positions, offset or 0, limit or DEFAULT_PAGE_SIZE, parse_fields(fields))
+    body = json.dumps(page, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    gz = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else body
+    return cached_json_response(request, {"body": body, "gzip": gz, "digest": digest})
+
+
+# -----------------
+# Theme carousels
+# -----------------
+THEMES_DEFAULT_TOP_N = 10
+THEMES_MAX_TOP_N = 50
+
+# theme -> ordered titles, built once at load time and then patched per title. It follows the shared
+# catalog version (any process's writes, via the store's change log), and hide/show through set_hidden()
+theme_index = ThemeIndex()
+# catalog_version: the catalog version theme_index reflects (None = rebuild from the whole catalog)
+_theme_state: Dict[str, Any] = {"catalog_version": None, "hidden_version": None}
+_theme_lock = threading.Lock()
+_themes_cache: Dict[Tuple[int, int, int], Dict[str, Any]] = {}
+
+if _snapshot_themes is not None:
+    # postings saved with the startup snapshot at the first generation's version; hidden titles are applied on first use
+    theme_index.restore(_snapshot_themes)
+    _theme_state["catalog_version"] = generation.catalog_version
+    _snapshot_themes = None
+
+
+def current_theme_index() -> ThemeIndex:
+    """Theme index in sync with the catalog and the hidden list"""
+    hidden = hidden_movies.refresh()
+    version = hidden_movies.version
+    with _theme_lock:
+        _theme_state["catalog_version"] = sync_theme_index(theme_index, catalog, _theme_state["catalog_version"], hidden)
+        if _theme_state["hidden_version"] != version:
+            theme_index.set_hidden(hidden)
+        _theme_state["hidden_version"] = version
+    return theme_index
+
+
+current_theme_index()
+
+# Picking up other writers' JSON changes (which may replay or re-import) and following the catalog
+# version happen on a background thread, never on the event loop
+catalog.start_background_sync(on_tick=follow_catalog)
+
+
+def _themes_payload(top_n: int, min_count: int) -> Dict[str, Any]:
+    """Prebuilt /themes response bytes for the current theme index revision"""
+    index = current_theme_index()
+    key = (index.revision, top_n, min_count)
+    payload = _themes_cache.get(key)
+    if payload is None:
+        themes = index.themes(top_n=top_n, min_count=min_count)
+        body = json.dumps({"themes": themes, "count": len(themes)}, ensure_ascii=False,
+                          separators=(",", ":")).encode("utf-8")
+        payload = {
+            "body": body,
+            "gzip": gzip.compress(body, compresslevel=6),
+            "digest": hashlib.sha256(body).hexdigest()[:32],
+        }
+        # requests build payloads on pool threads concurrently
+        with _theme_lock:
+            if len(_themes_cache) >= 16 or any(k[0] != key[0] for k in _themes_cache):
+                _themes_cache.clear()
+            _themes_cache[key] = payload
+    return payload
+
+
+@app.get("/themes")
+async def get_themes(request: Request, top_n: int = THEMES_DEFAULT_TOP_N, min_count: int = 1):
+    """Themes of visible movies by count (desc), each with its first top_n movies as card fields.
+
+    Primary-theme matches come before secondary ones. Supports If-None-Match.
+    """
+    top_n = max(0, min(THEMES_MAX_TOP_N, top_n))
+    # catching up with the catalog (a full rebuild when the change log cannot tell) runs off the event loop
+    payload = await run_in_threadpool(_themes_payload, top_n, min_count)
+    return cached_json_response(request, payload)
 
 # -----------------
 # Observability endpoints
@@ -1115,23 +2043,35 @@ async def get_movies():
 @app.get("/observability/recent")
 async def observability_recent(limit: int = 100) -> Dict[str, Any]:
     """Return recent search requests and click events for the dashboard."""
-    # Requests are stored newest-first in deque (left appends)
-    reqs = list(RECENT_REQUESTS)[:max(1, min(1000, limit))]
-    clks = list(CLICK_EVENTS)[-max(1, min(1000, limit)) :]
+    limit = max(1, min(1000, limit))
+    # requests newest-first, clicks oldest-first
+    reqs = (await run_in_threadpool(shared_state.recent_events, RECENT_REQUESTS, limit))[::-1]
+    clks = await run_in_threadpool(shared_state.recent_events, CLICK_EVENTS, limit)
     return {"requests": reqs, "clicks": clks}
 
 
+@app.get("/observability/timings")
+async def observability_timings(reset: bool = False) -> Dict[str, Any]:
+    """Per-stage /search latency histograms (p50/p95/p99) and the stage dominating p99."""
+    snap = STAGE_HISTOGRAMS.snapshot()
+    if reset:
+        STAGE_HISTOGRAMS.reset()
+    return snap
+
+
 @app.post("/observability/click")
 async def observability_click(payload: Dict[str, Any]) -> Dict[str, Any]:
     rid = (payload or {}).get("request_id")
     movie_id = (payload or {}).get("movie_id")
     position = (payload or {}).get("position")
     dwell_ms = (payload or {}).get("dwell_ms")
-    CLICK_EVENTS.append({
+    event = {
         "ts": datetime.now(timezone.utc).isoformat(),
         "request_id": rid,
         "movie_id": movie_id,
         "position": position,
         "dwell_ms": dwell_ms,
-    })
+    }
+    obs_writer.submit(CLICK_EVENTS, event, CLICK_EVENTS_MAX)
+    _append_obs_log("clicks.jsonl", event)
     return {"ok": True}
@@ -3,9 +3,9 @@ function getSources() {
   // Always use the API endpoint which filters out hidden movies
   // Use the current domain for the API
   const staticBase = window.location.origin;
-  // Add cache-busting parameter to prevent browser caching
-  const timestamp = Date.now();
-  return [`${staticBase}/api/movies?v=${timestamp}`];
+  // No cache-buster: the API sends an ETag with Cache-Control: no-cache, so the
+  // browser revalidates and gets a cheap 304 while the catalog is unchanged
+  return [`${staticBase}/api/movies`];
 }
 
 // No longer needed - image data is now merged into the main profile file
@@ -270,58 +270,22 @@ function loadFeaturedTheme() {
 async function loadThemesFromData() {
   try {
     console.log('🔄 Loading themes from movie data for main app...');
-    // Add cache-busting parameter to prevent browser caching
-    const timestamp = Date.now();
-    const response = await fetch(`/api/movies?v=${timestamp}`);
-    const data = await response.json();
-    
-    // Handle object structure where keys are movie titles
-    let movies = [];
-    if (Array.isArray(data)) {
-      movies = data;
-    } else if (typeof data === 'object' && !Array.isArray(data)) {
-      movies = Object.values(data);
+    // One small request: theme counts plus the first cards of each theme from the server-side index
+    const response = await fetch('/api/themes?top_n=30&min_count=10');
+    if (!response.ok) {
+      throw new Error(`HTTP ${response.status}`);
     }
+    const data = await response.json();
     
-    console.log('🎬 Movies loaded for themes:', movies.length);
-    
-    // Extract all unique themes from movies
-    const themeMap = new Map();
-    
-    movies.forEach(movie => {
-      const themes = [];
-      
-      if (movie.primary_theme) {
-        themes.push(movie.primary_theme);
-      }
-      if (movie.secondary_theme) {
-        themes.push(movie.secondary_theme);
-      }
-      
-      themes.forEach(theme => {
-        if (theme && typeof theme === 'string' && theme !== 'none') {
-          const readableTheme = theme.replace(/_/g, ' ').replace(/\b\w/g, l => l.toUpperCase());
-          const themeId = theme.toLowerCase().replace(/_/g, '-');
-          
-          if (themeMap.has(themeId)) {
-            themeMap.get(themeId).count++;
-          } else {
-            themeMap.set(themeId, {
-              id: themeId,
-              title: readableTheme,
-              theme: readableTheme,
-              count: 1,
-              limit: 10
-            });
-          }
-        }
-      });
-    });
-    
-    // Convert to array and filter themes with 10+ movies
-    THEMED_CAROUSELS = Array.from(themeMap.values())
-      .filter(theme => theme.count >= 10)
-      .sort((a, b) => b.count - a.count);
+    // Themes arrive sorted by count (most movies first), only those with 10+ movies
+    THEMED_CAROUSELS = (data.themes || []).map(theme => ({
+      id: theme.id,
+      title: theme.title,
+      theme: theme.title,
+      count: theme.count,
+      limit: 10,
+      movies: theme.movies || []
+    }));
     
     console.log('🎭 Loaded themes for main app:', THEMED_CAROUSELS);
     return THEMED_CAROUSELS;
@@ -556,6 +520,16 @@ function randomizeCarouselMovies(theme) {
 
 // Get movies by theme
 function getMoviesByTheme(theme, limit) {
+  // Prefer the cards served with the theme list; use full profiles when they are already loaded
+  const carousel = THEMED_CAROUSELS.find(c => c.theme === theme);
+  if (carousel && carousel.movies && carousel.movies.length > 0) {
+    const byTitle = new Map(state.data.map(movie => [movie.title, movie]));
+    return carousel.movies
+      .map(card => byTitle.get(card.title) || card)
+      .sort(() => Math.random() - 0.5)
+      .slice(0, limit);
+  }
+  
   const matchingMovies = state.data.filter(movie => {
     // Helper function to normalize theme for comparison
     const normalizeTheme = (themeStr) => {
@@ -2889,8 +2863,9 @@ document.addEventListener('DOMContentLoaded', async () => {
   console.log('🎭 THEMED_CAROUSELS after loading:', THEMED_CAROUSELS);
   console.log('📊 State data length:', state.data.length);
   
-  // Re-render carousels with loaded themes (only if not searching)
-  if (state.data.length > 0 && shouldRenderCarousels()) {
+  // Re-render carousels with loaded themes (only if not searching); theme cards do not need the full catalog
+  const haveThemeCards = THEMED_CAROUSELS.some(c => c.movies && c.movies.length > 0);
+  if ((state.data.length > 0 || haveThemeCards) && shouldRenderCarousels()) {
     console.log('🔄 Re-rendering carousels after theme loading...');
     renderThemedCarousels();
   } else if (state.search) {
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Enrichment benchmark against a local stub of TMDB, OMDb and an OpenAI-compatible LLM.
+
+The stub answers every upstream call after a fixed latency and enforces a
+per-upstream quota (requests per second), answering 429 with Retry-After when
+it is exceeded, the way the real providers do. The pipeline is pointed at it
+through TMDB_API_BASE, OMDB_API_BASE and OPENAI_BASE_URL, and the same movies
+are then run through EnrichmentPipeline.process_batch once per concurrency
+level: the worker threads of every stage (1 = one movie per stage at a time;
+0 = the per-stage defaults of ENRICH_STAGE_WORKERS).
+Client rate limits (RATE_LIMIT_*) are set to the stub's quotas unless
+--no-client-limit, so throughput should approach the quota bound.
+
+Usage:
+    python bench_enrichment.py                                   # 200 movies, concurrency 1, 16 and per-stage defaults
+    python bench_enrichment.py --movies 200 --concurrency 1,8,32 --out benchmarks/results/enrichment.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Must be set before the pipeline is imported: no snapshot/state files from the API modules
+os.environ.setdefault("STATE_BACKEND", "memory")
+# Every run must reach the stub; HTTP_CACHE=1 HTTP_CACHE_PATH=... measures warm-cache runs instead
+os.environ.setdefault("HTTP_CACHE", "0")
+
+STUB_PROFILE = """PRIMARY_EMOTIONAL_TONE: melancholic
+SECONDARY_EMOTIONAL_TONE: uplifting
+PRIMARY_THEME: found_family
+SECONDARY_THEME: grief_loss
+INTENSITY_LEVEL: 5
+PACING_STYLE: deliberate
+VISUAL_AESTHETIC: naturalistic
+TARGET_AUDIENCE: cinephiles
+SIMILAR_FILMS: Columbus, Aftersun
+CULTURAL_CONTEXT: small-town life
+NARRATIVE_STRUCTURE: linear
+ENERGY_LEVEL: low
+DISCUSSION_TOPICS: family, memory
+CARD_DESCRIPTION: A quiet stub film.
+
+PROFILE_SUMMARY:
+A stub profile returned by the benchmark server.
+"""
+
+
+class Quota:
+    """Server-side requests-per-second quota (non-blocking token bucket)"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class StubServer:
+    """TMDB (/3/...), OMDb (/omdb/) and OpenAI chat completions (/v1/...) on 127.0.0.1"""
+
+    def __init__(self, latency_s: float, llm_latency_s: float, quotas: Dict[str, float]):
+        self.latency_s = latency_s
+        self.llm_latency_s = llm_latency_s
+        self.quotas = {name: Quota(rate) for name, rate in quotas.items()}
+        self.counts: Dict[str, int] = {}
+        self.throttled: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self) -> None:
+                url = urlparse(self.path)
+                upstream = "llm" if url.path.startswith("/v1/") else "omdb" if url.path.startswith("/omdb") else "tmdb"
+                if self.headers.get("Content-Length"):
+                    self.rfile.read(int(self.headers["Content-Length"]))
+                with stub.lock:
+                    stub.counts[upstream] = stub.counts.get(upstream, 0) + 1
+                if not stub.quotas[upstream].take():
+                    with stub.lock:
+                        stub.throttled[upstream] = stub.throttled.get(upstream, 0) + 1
+                    self._send(429, {"status_message": "rate limited"}, {"Retry-After": "1"})
+                    return
+                time.sleep(stub.llm_latency_s if upstream == "llm" else stub.latency_s)
+                self._send(200, stub.respond(upstream, url.path, parse_qs(url.query)))
+
+            do_GET = _handle
+            do_POST = _handle
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def respond(self, upstream: str, path: str, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        if upstream == "llm":
+            return {"id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": STUB_PROFILE}}]}
+        if upstream == "omdb":
+            return {"Response": "True", "Plot": "A longer plot from the OMDb stub. " * 3, "Director": "Stub Director",
+                    "Genre": "Drama", "imdbID": (query.get("i") or ["tt0"])[0]}
+        m = re.match(r"/3/movie/(\d+)(/\w+)?", path)
+        tmdb_id = int(m.group(1)) if m else 0
+        parts = {
+            "credits": {"crew": [{"job": "Director", "name": f"Director {tmdb_id % 50}"}], "cast": []},
+            "images": {"posters": [{"iso_639_1": "en", "vote_average": 5, "file_path": f"/p{tmdb_id}.jpg"}],
+                       "backdrops": [{"iso_639_1": "en", "vote_average": 5, "file_path": f"/b{tmdb_id}.jpg"}]},
+            "keywords": {"keywords": [{"id": 1, "name": "stub"}]},
+            "external_ids": {"imdb_id": f"tt{tmdb_id:07d}"},
+        }
+        if m and m.group(2):
+            return parts.get(m.group(2)[1:], {})
+        details = {"id": tmdb_id, "title": f"Stub Movie {tmdb_id}", "release_date": "2001-01-01",
+                   "overview": f"Plot of stub movie {tmdb_id}.", "genres": [{"name": "Drama"}],
+                   "imdb_id": f"tt{tmdb_id:07d}", "poster_path": f"/p{tmdb_id}.jpg"}
+        for name in (query.get("append_to_response") or [""])[0].split(","):
+            if name in parts:
+                details[name] = parts[name]
+        return details
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def take_counts(self) -> Dict[str, Dict[str, int]]:
+        with self.lock:
+            out = {"requests": dict(self.counts), "throttled": dict(self.throttled)}
+            self.counts, self.throttled = {}, {}
+        return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent enrichment against a local stub server")
+    parser.add_argument("--movies", type=int, default=200, help="Movies to enrich per run")
+    parser.add_argument("--concurrency", type=str, default="1,16,0",
+                        help="Comma-separated worker threads per stage (0 = ENRICH_STAGE_WORKERS defaults)")
+    parser.add_argument("--steps", type=str, default="metadata,images,profile", help="Comma-separated pipeline steps")
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="Stub latency of TMDB/OMDb calls")
+    parser.add_argument("--llm-latency-ms", type=float, default=150.0, help="Stub latency of LLM calls")
+    parser.add_argument("--tmdb-rps", type=float, default=50.0, help="Stub TMDB quota (requests/s)")
+    parser.add_argument("--omdb-rps", type=float, default=20.0, help="Stub OMDb quota (requests/s)")
+    parser.add_argument("--llm-rps", type=float, default=20.0, help="Stub LLM quota (requests/s)")
+    parser.add_argument("--no-client-limit", action="store_true", help="Do not set RATE_LIMIT_* (rely on 429 handling)")
+    parser.add_argument("--out", type=Path, default=None, help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+    steps = [s.strip() for s in args.steps.split(",") if s.strip()]
+    quotas = {"tmdb": args.tmdb_rps, "omdb": args.omdb_rps, "llm": args.llm_rps}
+
+    with StubServer(args.latency_ms / 1000, args.llm_latency_ms / 1000, quotas) as stub:
+        base = f"http://127.0.0.1:{stub.port}"
+        os.environ.update({
+            "TMDB_API_KEY": "stub", "OMDB_API_KEY": "stub", "OPENAI_API_KEY": "stub",
+            "TMDB_API_BASE": f"{base}/3", "OMDB_API_BASE": f"{base}/omdb/", "OPENAI_BASE_URL": f"{base}/v1",
+        })
+        if not args.no_client_limit:
+            os.environ["RATE_LIMIT_TMDB"] = f"{args.tmdb_rps}/{int(args.tmdb_rps)}"
+            os.environ["RATE_LIMIT_OMDB"] = f"{args.omdb_rps}/{int(args.omdb_rps)}"
+            os.environ["RATE_LIMIT_OPENAI"] = f"{args.llm_rps}/{int(args.llm_rps)}"
+
+        import rate_limit
+        from enrichment_pipeline import EnrichmentPipeline
+
+        pipeline = EnrichmentPipeline("openai")
+        movies = [{"title": f"Stub Movie {i}", "tmdb_id": 100 + i} for i in range(args.movies)]
+        # the slowest quota bounds throughput: calls per movie / requests per second
+        calls = {"tmdb": int("metadata" in steps or "images" in steps), "omdb": int("metadata" in steps),
+                 "llm": int("profile" in steps)}
+        bound_s = max((args.movies * n / quotas[u] for u, n in calls.items() if n), default=0.0)
+
+        report: Dict[str, Any] = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {**vars(args), "out": str(args.out) if args.out else None, "quota_bound_s": round(bound_s, 2)},
+            "results": [],
+        }
+        for level in levels:
+            rate_limit._limiters.clear()  # fresh buckets (and stats) per run
+            print(f"[bench] {args.movies} movies, concurrency {level} ...", file=sys.stderr)
+            t0 = time.perf_counter()
+            out = pipeline.process_batch(movies, steps, concurrency=level or None)
+            elapsed = time.perf_counter() - t0
+            ok = sum(1 for m in out if m.get("director") and (m.get("profile_text") or "profile" not in steps))
+            row = {
+                "concurrency": level,
+                "seconds": round(elapsed, 2),
+                "movies_per_s": round(args.movies / elapsed, 2),
+                "enriched": ok,
+                "server": stub.take_counts(),
+                "client_limiters": rate_limit.limiter_stats(),
+            }
+            report["results"].append(row)
+            print(f"[bench] concurrency {level}: {row['seconds']}s ({row['movies_per_s']} movies/s), "
+                  f"429s={row['server']['throttled']}", file=sys.stderr)
+        if len(report["results"]) > 1:
+            first, last = report["results"][0], report["results"][-1]
+            report["speedup"] = round(first["seconds"] / last["seconds"], 2)
+            print(f"[bench] speedup x{report['speedup']} (quota bound {bound_s:.1f}s)", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(text, encoding="utf-8")
+        print(f"[bench] wrote {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
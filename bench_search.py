@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Search benchmark: synthetic catalogs + query replay through /search.
+
+For each catalog size a deterministic synthetic catalog is written in the
+movie_profiles_merged.json schema, loaded through the API's normal loader, and
+indexed with SearchEngine (FTS5) and EmbeddingIndex (FAISS) using the hash
+embedder (EMB_PROVIDER=hash), so runs are reproducible without a model download.
+A query set is then replayed through the /search handler in keyword, vector
+and hybrid modes. Build time, memory and latency percentiles are written as JSON
+so perf changes can be compared against a baseline run.
+
+Usage:
+    python bench_search.py                                  # 1k,10k,100k with benchmarks/queries.json
+    python bench_search.py --sizes 1000,10000 --out benchmarks/results/baseline.json
+    python bench_search.py --requests logs/requests.jsonl   # replay logged queries instead
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Must be set before api is imported: deterministic embeddings, no log files, no startup snapshot,
+# observability buffers in memory
+os.environ["EMB_PROVIDER"] = "hash"
+os.environ.setdefault("OBS_PERSIST", "0")
+os.environ.setdefault("CATALOG_SNAPSHOT_AUTOSAVE", "0")
+os.environ.setdefault("STATE_BACKEND", "memory")
+
+from catalog_store import CatalogStore
+from evaluate_fusion import load_jsonl, percentile
+
+ROOT = Path(__file__).parent
+DEFAULT_QUERIES = ROOT / "benchmarks" / "queries.json"
+MODES = ["keyword", "vector", "hybrid"]
+
+# Vocabulary for synthetic profiles (theme/tone slugs follow the profile generator's style)
+THEMES = [
+    "coming_of_age", "found_family", "grief_loss", "redemption", "identity_crisis", "revenge", "survival",
+    "forbidden_love", "class_struggle", "political_conspiracy", "self_discovery", "isolation", "obsession",
+    "sacrifice", "friendship", "betrayal", "immigrant_experience", "war_trauma", "mother_daughter", "rebellion",
+]
+TONES = [
+    "uplifting", "melancholic", "tense", "comedic", "dark", "romantic", "bittersweet", "whimsical",
+    "unsettling", "heartwarming", "meditative", "suspenseful",
+]
+GENRES = ["Drama", "Comedy", "Horror", "Sci-Fi", "Romance", "Thriller", "Animation", "Crime", "War", "Documentary"]
+PACING = ["slow burn", "brisk", "episodic", "deliberate", "frenetic"]
+VISUALS = ["neon noir", "naturalistic", "pastel", "desaturated", "handheld", "lush widescreen", "gothic"]
+AUDIENCES = ["families", "cinephiles", "teens", "adults", "genre fans"]
+NOUNS = [
+    "house", "road", "summer", "town", "heist", "ship", "war", "school", "city", "island", "band", "farm",
+    "hospital", "desert", "winter", "wedding", "prison", "forest", "studio", "village",
+]
+PEOPLE = [
+    "a widowed father", "two estranged sisters", "a young artist", "an aging boxer", "a runaway teen",
+    "a disgraced detective", "an immigrant family", "a small-town nurse", "a lonely astronaut", "a jazz pianist",
+]
+VERBS = ["confronts", "escapes", "rebuilds", "uncovers", "protects", "betrays", "searches for", "returns to"]
+
+
+def _slug_words(slug: str) -> str:
+    return slug.replace("_", " ")
+
+
+def synthetic_catalog(n: int, seed: int = 7) -> Dict[str, Any]:
+    """n deterministic profiles keyed by title, in the movie_profiles_merged.json schema"""
+    rng = random.Random(seed)
+    out: Dict[str, Any] = {}
+    for i in range(n):
+        title = f"{rng.choice(NOUNS).title()} of {rng.choice(NOUNS).title()} {i}"
+        t1, t2 = rng.sample(THEMES, 2)
+        tone1, tone2 = rng.sample(TONES, 2)
+        who, verb, where = rng.choice(PEOPLE), rng.choice(VERBS), rng.choice(NOUNS)
+        plot = f"{who.capitalize()} {verb} the {where} and faces {_slug_words(t1)} while {_slug_words(t2)} looms."
+        out[title] = {
+            "title": title,
+            "year": str(1940 + rng.randrange(85)),
+            "director": f"Director {rng.randrange(max(1, n // 8))}",
+            "genre_tags": rng.sample(GENRES, 2),
+            "plot_summary": plot,
+            "primary_theme": t1,
+            "secondary_theme": t2 if rng.random() > 0.2 else "none",
+            "primary_emotional_tone": tone1,
+            "secondary_emotional_tone": tone2 if rng.random() > 0.2 else "none",
+            "intensity_level": rng.randint(1, 10),
+            "pacing_style": rng.choice(PACING),
+            "visual_aesthetic": rng.choice(VISUALS),
+            "target_audience": rng.choice(AUDIENCES),
+            "narrative_structure": rng.choice(["linear", "nonlinear", "anthology", "frame story"]),
+            "energy_level": rng.choice(["low", "medium", "high"]),
+            "profile_text": (
+                f"A {tone1} {rng.choice(GENRES).lower()} about {_slug_words(t1)} and {_slug_words(t2)}. "
+                f"{plot} {rng.choice(PACING).capitalize()} and {tone2}, with a {rng.choice(VISUALS)} look "
+                f"that suits {rng.choice(AUDIENCES)}."
+            ),
+            "card_description": plot,
+            "poster_url": f"https://image.tmdb.org/t/p/w500/synthetic_{i}.jpg",
+            "tmdb_id": 1_000_000 + i,
+            "imdb_id": f"tt{9_000_000 + i}",
+        }
+    return out
+
+
+def load_queries(requests_path: Optional[Path], queries_path: Path, max_queries: int) -> List[str]:
+    """Distinct logged queries when a request log is given, otherwise the checked-in fixture"""
+    queries: List[str] = []
+    if requests_path:
+        seen = set()
+        for r in load_jsonl(requests_path):
+            q = (r.get("q") or "").strip()
+            if q and q.lower() not in seen:
+                seen.add(q.lower())
+                queries.append(q)
+    if not queries:
+        queries = json.loads(queries_path.read_text(encoding="utf-8"))["queries"]
+    return queries[:max_queries] if max_queries else queries
+
+
+def rss_mb() -> float:
+    """Current resident set size (falls back to peak RSS where /proc is unavailable)"""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except Exception:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "n": len(samples),
+        "mean_ms": round(sum(samples) / len(samples), 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "max_ms": round(max(samples), 3) if samples else 0.0,
+    }
+
+
+def bench_size(api, n: int, queries: List[str], args, workdir: Path) -> Dict[str, Any]:
+    # Release the previous catalog generation before measuring this one
+    api.generation = None
+    gc.collect()
+    rss0 = rss_mb()
+
+    path = workdir / f"catalog_{n}.json"
+    t0 = time.perf_counter()
+    path.write_text(json.dumps(synthetic_catalog(n, seed=args.seed)), encoding="utf-8")
+    generate_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    api.catalog = CatalogStore(workdir / f"catalog_{n}.db", json_path=path)
+    import_s = time.perf_counter() - t0
+
+    gen = api.build_generation(n)
+    api.publish_generation(gen)
+    gc.collect()
+    rss1 = rss_mb()
+
+    idx = gen.semantic_index
+    faiss_mb = idx.index.ntotal * idx.dim * 4 / 1e6
+    nbr_mb = (idx.neighbor_idx.nbytes + idx.neighbor_sim.nbytes) / 1e6 if idx.neighbor_idx is not None else 0.0
+
+    latency: Dict[str, Any] = {}
+    for mode in MODES:
+        for q in queries[: args.warmup]:
+            asyncio.run(api.search(q=q, mode=mode, limit=args.limit, k=args.k))
+        totals: List[float] = []
+        stages: Dict[str, List[float]] = {}
+        for _ in range(args.repeat):
+            for q in queries:
+                t0 = time.perf_counter()
+                resp = asyncio.run(api.search(q=q, mode=mode, limit=args.limit, k=args.k))
+                totals.append((time.perf_counter() - t0) * 1000.0)
+                for stage, ms in (resp["debug"].get("timings_ms") or {}).items():
+                    if stage != "total":
+                        stages.setdefault(stage, []).append(ms)
+        row = summarize(totals)
+        row["stages_p99_ms"] = {s: round(percentile(v, 99), 3) for s, v in stages.items()}
+        latency[mode] = row
+
+    api.catalog.close()
+    if not args.keep_catalogs:
+        for f in workdir.glob(f"catalog_{n}.*"):
+            f.unlink()
+    return {
+        "size": n,
+        "profiles": len(gen.profiles),
+        "build_s": {
+            "generate": round(generate_s, 3),
+            "catalog_import": round(import_s, 3),
+            **gen.build_timings_s,
+        },
+        "memory_mb": {
+            "rss": round(rss1, 1),
+            "rss_delta": round(rss1 - rss0, 1),
+            "faiss_vectors": round(faiss_mb, 1),
+            "neighbor_table": round(nbr_mb, 1),
+        },
+        "latency": latency,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /search build time, memory and latency on synthetic catalogs")
+    parser.add_argument("--sizes", type=str, default="1000,10000,100000", help="Comma-separated catalog sizes")
+    parser.add_argument("--requests", type=Path, default=None, help="Replay distinct queries from a logged requests.jsonl")
+    parser.add_argument("--queries", type=Path, default=DEFAULT_QUERIES, help="Query fixture (JSON with a 'queries' list)")
+    parser.add_argument("--max-queries", type=int, default=0, help="Cap the number of replayed queries (0 = all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Replays of the query set per mode")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed warmup queries per mode")
+    parser.add_argument("--limit", type=int, default=20, help="/search limit")
+    parser.add_argument("--k", type=int, default=60, help="/search candidate pool per retriever")
+    parser.add_argument("--neighbors-k", type=int, default=None, help="Override EMB_NEIGHBORS_K for the index build")
+    parser.add_argument("--seed", type=int, default=7, help="Synthetic catalog seed")
+    parser.add_argument("--keep-catalogs", type=Path, default=None, help="Keep generated catalogs in this directory")
+    parser.add_argument("--out", type=Path, default=None, help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    queries = load_queries(args.requests, args.queries, args.max_queries)
+
+    import api
+
+    if args.neighbors_k is not None:
+        api.NEIGHBORS_K = args.neighbors_k
+
+    report: Dict[str, Any] = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "sizes": sizes,
+            "queries": len(queries),
+            "query_source": str(args.requests) if args.requests else str(args.queries),
+            "repeat": args.repeat,
+            "limit": args.limit,
+            "k": args.k,
+            "embedder": "hash",
+            "emb_dim": int(os.getenv("EMB_HASH_DIM", "256")),
+            "neighbors_k": api.NEIGHBORS_K,
+            "seed": args.seed,
+        },
+        "results": [],
+    }
+    if args.keep_catalogs:
+        args.keep_catalogs.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.keep_catalogs or Path(tmp)
+        for n in sizes:
+            print(f"[bench] {n} titles ...", file=sys.stderr)
+            row = bench_size(api, n, queries, args, workdir)
+            lat = row["latency"]
+            print(f"[bench] {n}: build fts={row['build_s']['fts_index']}s emb={row['build_s']['embedding_index']}s "
+                  f"rss={row['memory_mb']['rss']}MB p99 " + " ".join(f"{m}={lat[m]['p99_ms']}ms" for m in MODES),
+                  file=sys.stderr)
+            report["results"].append(row)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(text, encoding="utf-8")
+        print(f"[bench] wrote {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
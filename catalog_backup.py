@@ -0,0 +1,381 @@
+"""
+Content-addressed, compressed incremental catalog backups.
+
+A backup is a small manifest that points at per-movie chunks:
+- chunks/<h[:2]>/<h>.gz: one movie's stored JSON, gzip-compressed and named by
+  the sha256 of that JSON. A chunk is written only if no backup has it yet, so
+  unchanged movies cost nothing.
+- manifests/<id>.json.gz: a full manifest lists every {title: chunk hash};
+  an incremental one names its parent and only the titles that changed since
+  (hash, or null = deleted). Every FULL_EVERY-th manifest is full again, which
+  bounds how many manifests a restore has to read.
+
+With a CatalogStore the changed titles come from its change log
+(changed_since), so a backup after a small edit reads, hashes and writes only
+those movies: milliseconds and a few KB. When the log cannot tell (first
+backup, a wholesale replace, a rebuilt database) every row is hashed instead.
+
+Manifest ids are UTC timestamps, so listing the manifests directory in name
+order is listing backups oldest first. prune() drops old manifests and then
+deletes the chunks no remaining manifest references.
+
+  python catalog_backup.py create [--label TEXT]
+  python catalog_backup.py list
+  python catalog_backup.py restore <id|latest|file.json> [--out catalog.json]
+  python catalog_backup.py prune [--keep 5]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl  # type: ignore
+except Exception:
+    fcntl = None  # no cross-process locking (e.g. Windows); in-process lock only
+
+ROOT = Path(__file__).parent
+DEFAULT_DIR = ROOT / "backups"
+FORMAT_VERSION = 1
+# An incremental manifest chain is at most this long before the next backup is a full manifest
+FULL_EVERY = 50
+DEFAULT_KEEP = 5
+
+Rows = List[Tuple[str, Optional[str]]]
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class BackupStore:
+    """Chunk + manifest backups under one directory. Safe to share between threads and processes."""
+
+    def __init__(self, root: Path = DEFAULT_DIR):
+        self.root = Path(root)
+        self.chunks_dir = self.root / "chunks"
+        self.manifests_dir = self.root / "manifests"
+        self._lock = threading.RLock()
+        # manifest id -> parsed manifest; manifests never change once written
+        self._manifests: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Serializes backup writers and pruning across processes"""
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / ".lock", "a+") as f:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    # ---- chunks -------------------------------------------------------
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunks_dir / digest[:2] / f"{digest}.gz"
+
+    def _put_chunk(self, data: str) -> Tuple[str, int]:
+        """Store one movie's JSON; returns its hash and the bytes written (0 if already stored)"""
+        raw = data.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._chunk_path(digest)
+        if path.exists():
+            return digest, 0
+        blob = gzip.compress(raw, mtime=0)
+        _atomic_write(path, blob)
+        return digest, len(blob)
+
+    def _get_chunk(self, digest: str) -> Dict[str, Any]:
+        with open(self._chunk_path(digest), "rb") as f:
+            return json.loads(gzip.decompress(f.read()))
+
+    # ---- manifests ----------------------------------------------------
+    def manifest_ids(self) -> List[str]:
+        """Backup ids, oldest first"""
+        if not self.manifests_dir.exists():
+            return []
+        return sorted(n[: -len(".json.gz")] for n in os.listdir(self.manifests_dir) if n.endswith(".json.gz"))
+
+    def manifest(self, backup_id: str) -> Dict[str, Any]:
+        with self._lock:
+            m = self._manifests.get(backup_id)
+        if m is None:
+            with open(self.manifests_dir / f"{backup_id}.json.gz", "rb") as f:
+                m = json.loads(gzip.decompress(f.read()))
+            with self._lock:
+                self._manifests[backup_id] = m
+        return m
+
+    def _new_id(self) -> str:
+        ids = self.manifest_ids()
+        while True:
+            backup_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+            if not ids or backup_id > ids[-1]:
+                return backup_id
+            time.sleep(0.001)
+
+    def state(self, backup_id: str) -> Dict[str, str]:
+        """{title: chunk hash} of a backup, in catalog order"""
+        chain = []
+        m = self.manifest(backup_id)
+        while "movies" not in m:
+            chain.append(m)
+            m = self.manifest(m["parent"])
+        state = dict(m["movies"])
+        for m in reversed(chain):
+            for title, digest in m["changes"].items():
+                if digest is None:
+                    state.pop(title, None)
+                else:
+                    state[title] = digest
+        return state
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        body = gzip.compress(json.dumps(manifest, ensure_ascii=False).encode("utf-8"), mtime=0)
+        _atomic_write(self.manifests_dir / f"{manifest['id']}.json.gz", body)
+        with self._lock:
+            self._manifests[manifest["id"]] = manifest
+        return self.summary(manifest, len(body))
+
+    @staticmethod
+    def summary(m: Dict[str, Any], size: Optional[int] = None) -> Dict[str, Any]:
+        out = {
+            "id": m["id"],
+            "created_at": m["created_at"],
+            "label": m.get("label", ""),
+            "count": m["count"],
+            "full": "movies" in m,
+            "changed": len(m["movies"] if "movies" in m else m["changes"]),
+        }
+        if size is not None:
+            out["manifest_bytes"] = size
+        return out
+
+    # ---- backup -------------------------------------------------------
+    def create(self, store: Any, label: str = "") -> Dict[str, Any]:
+        """Back up a CatalogStore, reading only the movies changed since the previous backup when possible"""
+        t0 = time.perf_counter()
+        with self._file_lock():
+            ids = self.manifest_ids()
+            parent = self.manifest(ids[-1]) if ids else None
+            catalog_id = store.catalog_id
+            rows: Optional[Rows] = None
+            if parent is not None and parent.get("catalog_id") == catalog_id and parent.get("catalog_version") is not None:
+                version, rows = store.raw_rows(since=parent["catalog_version"])
+            if rows is None:
+                version, rows = store.raw_rows()
+                result = self._write_full(parent, rows, label, catalog_id, version)
+            else:
+                result = self._write_changes(parent, rows, label, catalog_id, version)
+        return self._report(result, t0)
+
+    def create_from_movies(self, movies: Dict[str, Any], label: str = "") -> Dict[str, Any]:
+        """Back up a {title: movie} dict (e.g. a catalog JSON file); every movie is hashed"""
+        t0 = time.perf_counter()
+        rows = [(title, json.dumps(movie, ensure_ascii=False)) for title, movie in movies.items()]
+        with self._file_lock():
+            ids = self.manifest_ids()
+            parent = self.manifest(ids[-1]) if ids else None
+            result = self._write_full(parent, rows, label, None, None)
+        return self._report(result, t0)
+
+    @staticmethod
+    def _report(result: Dict[str, Any], t0: float) -> Dict[str, Any]:
+        result["seconds"] = round(time.perf_counter() - t0, 4)
+        print(f"[backup] {result['id']}: {result['changed']} changed of {result['count']} movies, "
+              f"{result['bytes_written']} bytes in {result['seconds'] * 1000:.0f}ms")
+        return result
+
+    def _write_changes(self, parent: Dict[str, Any], rows: Rows, label: str, catalog_id: str,
+                       version: int) -> Dict[str, Any]:
+        """Backup from the rows changed since the parent backup"""
+        prev = self.state(parent["id"])
+        state = dict(prev)
+        changes: Dict[str, Optional[str]] = {}
+        written = 0
+        for title, data in rows:
+            if data is None:
+                if state.pop(title, None) is not None:
+                    changes[title] = None
+                continue
+            digest, n = self._put_chunk(data)
+            written += n
+            if prev.get(title) != digest:
+                changes[title] = state[title] = digest
+        return self._commit(parent, changes, state, written, label, catalog_id, version)
+
+    def _write_full(self, parent: Optional[Dict[str, Any]], rows: Rows, label: str, catalog_id: Optional[str],
+                    version: Optional[int]) -> Dict[str, Any]:
+        """Backup from every row, diffed against the parent backup"""
+        state: Dict[str, str] = {}
+        written = 0
+        for title, data in rows:
+            state[title], n = self._put_chunk(data)
+            written += n
+        changes: Optional[Dict[str, Optional[str]]] = None
+        if parent is not None:
+            prev = self.state(parent["id"])
+            # a diff can only append new titles, so a reordered catalog gets a full manifest
+            if [t for t in prev if t in state] == [t for t in state if t in prev]:
+                changes = {t: None for t in prev if t not in state}
+                changes.update((t, d) for t, d in state.items() if prev.get(t) != d)
+        return self._commit(parent, changes, state, written, label, catalog_id, version)
+
+    def _commit(self, parent: Optional[Dict[str, Any]], changes: Optional[Dict[str, Optional[str]]],
+                state: Dict[str, str], written: int, label: str, catalog_id: Optional[str],
+                version: Optional[int]) -> Dict[str, Any]:
+        """Write the manifest: incremental unless there is no usable parent or the chain is FULL_EVERY long"""
+        base = {
+            "format": FORMAT_VERSION,
+            "id": self._new_id(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "label": label,
+            "parent": parent["id"] if parent else None,
+            "catalog_id": catalog_id,
+            "catalog_version": version,
+            "count": len(state),
+        }
+        if parent is not None and changes is not None and not changes:
+            # the catalog matches the last backup, which therefore still describes it
+            return {**self.summary(parent), "changed": 0, "bytes_written": written, "reused": True}
+        depth = parent.get("depth", 0) + 1 if parent is not None and changes is not None else FULL_EVERY
+        if depth < FULL_EVERY:
+            manifest = {**base, "depth": depth, "changes": changes}
+        else:
+            manifest = {**base, "depth": 0, "movies": state}
+        result = self._write_manifest(manifest)
+        result["bytes_written"] = written + result["manifest_bytes"]
+        return result
+
+    # ---- restore ------------------------------------------------------
+    def resolve_id(self, backup_id: str) -> str:
+        ids = self.manifest_ids()
+        if backup_id == "latest":
+            if not ids:
+                raise FileNotFoundError(f"no backups in {self.root}")
+            return ids[-1]
+        if backup_id in ids:
+            return backup_id
+        matches = [i for i in ids if i.startswith(backup_id)]
+        if len(matches) != 1:
+            raise FileNotFoundError(f"backup {backup_id!r} not found ({len(matches)} matches) in {self.root}")
+        return matches[0]
+
+    def load(self, backup_id: str) -> Dict[str, Any]:
+        """The catalog {title: movie} as of a backup"""
+        return {title: self._get_chunk(digest) for title, digest in self.state(self.resolve_id(backup_id)).items()}
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Summaries of all backups, newest first"""
+        return [self.summary(self.manifest(i)) for i in reversed(self.manifest_ids())]
+
+    # ---- retention ----------------------------------------------------
+    def prune(self, keep: int = DEFAULT_KEEP) -> Dict[str, int]:
+        """Keep the newest `keep` backups (plus the manifests they build on) and delete unreferenced chunks"""
+        with self._file_lock():
+            ids = self.manifest_ids()
+            needed: Set[str] = set()
+            for backup_id in ids[-keep:] if keep > 0 else []:
+                while backup_id and backup_id not in needed:
+                    needed.add(backup_id)
+                    backup_id = self.manifest(backup_id)["parent"] if "movies" not in self.manifest(backup_id) else None
+            dropped = [i for i in ids if i not in needed]
+            if not dropped:
+                return {"manifests": 0, "chunks": 0}
+            candidates: Set[str] = set()
+            for backup_id in dropped:
+                m = self.manifest(backup_id)
+                candidates.update(d for d in (m["movies"] if "movies" in m else m["changes"]).values() if d)
+            for backup_id in needed:
+                m = self.manifest(backup_id)
+                candidates.difference_update((m["movies"] if "movies" in m else m["changes"]).values())
+            for backup_id in dropped:
+                (self.manifests_dir / f"{backup_id}.json.gz").unlink(missing_ok=True)
+                with self._lock:
+                    self._manifests.pop(backup_id, None)
+            for digest in candidates:
+                self._chunk_path(digest).unlink(missing_ok=True)
+        print(f"[backup] pruned {len(dropped)} manifests and {len(candidates)} chunks")
+        return {"manifests": len(dropped), "chunks": len(candidates)}
+
+
+_backups: Optional[BackupStore] = None
+_backups_lock = threading.Lock()
+
+
+def get_backup_store() -> BackupStore:
+    """Process-wide backup store (CATALOG_BACKUP_DIR overrides the backups/ directory)"""
+    global _backups
+    with _backups_lock:
+        if _backups is None:
+            _backups = BackupStore(Path(os.getenv("CATALOG_BACKUP_DIR") or DEFAULT_DIR))
+        return _backups
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Create, list, restore and prune catalog backups")
+    sub = ap.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("create", help="Back up the current catalog")
+    p.add_argument("--label", default="cli")
+    sub.add_parser("list", help="List backups, newest first")
+    p = sub.add_parser("restore", help="Restore the catalog from a backup")
+    p.add_argument("backup", help="Backup id (or unique prefix), 'latest', or a legacy backup JSON file")
+    p.add_argument("--out", help="Write the restored catalog to this JSON file instead of the catalog store")
+    p = sub.add_parser("prune", help="Drop old backups and unreferenced chunks")
+    p.add_argument("--keep", type=int, default=DEFAULT_KEEP)
+    args = ap.parse_args()
+
+    backups = get_backup_store()
+    if args.command == "list":
+        for b in backups.list():
+            kind = "full" if b["full"] else "incr"
+            print(f"{b['id']}  {kind}  {b['count']:>6} movies  {b['changed']:>6} changed  {b['label']}")
+        return
+    if args.command == "prune":
+        backups.prune(args.keep)
+        return
+
+    from catalog_store import get_catalog_store
+    store = get_catalog_store()
+    if args.command == "create":
+        backups.create(store, label=args.label)
+        return
+
+    if args.backup.endswith(".json") and Path(args.backup).exists():
+        with open(args.backup, "r", encoding="utf-8") as f:
+            movies = json.load(f)
+    else:
+        movies = backups.load(args.backup)
+    if args.out:
+        out = Path(args.out)
+        tmp = out.with_name(out.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(movies, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, out)
+        print(f"[backup] wrote {len(movies)} movies to {out}")
+        return
+    # keep the state being replaced restorable too
+    backups.create(store, label=f"before restore of {args.backup}")
+    store.replace_all(movies)
+    print(f"[backup] restored {len(movies)} movies from {args.backup} into {store.db_path}")
+    print("[backup] a running API picks this up on its next /search or /health (or POST /reload)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Immutable catalog generations for non-blocking hot reload.
+
+A CatalogGeneration bundles everything /search reads (profiles, the FTS engine,
+the vector index and the reranker) for one catalog state. Request handlers take
+a single reference to the current generation and use it throughout, so a
+reload can never show them new profiles with an old index.
+
+GenerationBuilder builds new generations on one background thread and
+publishes each finished generation with a single reference assignment.
+Reload requests that arrive while a build is running are coalesced into one
+follow-up build; a failed build leaves the previous generation in place.
+
+A reload may name the titles that changed. Such a delta build derives the new
+generation from the current one, re-indexing only those titles; any request
+without titles makes the coalesced build a full one.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+
+@dataclass(frozen=True)
+class CatalogGeneration:
+    number: int
+    catalog_version: int
+    profiles: Dict[str, Any]
+    # same profiles keyed by search id (lowercased title)
+    profile_by_id: Dict[str, Any]
+    search_engine: Any
+    semantic_index: Optional[Any]
+    reranker: Optional[Any]
+    built_at: str
+    build_timings_s: Dict[str, float] = field(default_factory=dict)
+    # catalog keys merged into each search id, and the reverse; what a delta build re-reads
+    keys_by_id: Dict[str, List[str]] = field(default_factory=dict)
+    id_by_key: Dict[str, str] = field(default_factory=dict)
+    # number of the generation this one was patched from (None = full build) and how many titles changed
+    derived_from: Optional[int] = None
+    changed_titles: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "number": self.number,
+            "catalog_version": self.catalog_version,
+            "profiles": len(self.profiles),
+            "semantic_enabled": self.semantic_index is not None,
+            "built_at": self.built_at,
+            "build_timings_s": self.build_timings_s,
+            "derived_from": self.derived_from,
+            "changed_titles": self.changed_titles,
+        }
+
+
+class GenerationBuilder:
+    """Runs build(titles) on a background thread and hands each result to publish().
+
+    titles is the set of changed titles for a delta build, or None for a full rebuild.
+    """
+
+    def __init__(self, build: Callable[[Optional[Set[str]]], CatalogGeneration],
+                 publish: Callable[[CatalogGeneration], None]):
+        self._build = build
+        self._publish = publish
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._requested = 0
+        self._completed = 0
+        # what the next build has to cover: everything, or just these titles
+        self._full = False
+        self._titles: Set[str] = set()
+        self.building = False
+        self.last_error: Optional[str] = None
+        self.last_build_s: Optional[float] = None
+
+    def request(self, titles: Optional[Iterable[str]] = None) -> int:
+        """Ask for a rebuild (titles = only these changed); returns a ticket for wait(). Never blocks on the build."""
+        with self._cond:
+            if titles is None:
+                self._full = True
+            else:
+                self._titles.update(titles)
+            self._requested += 1
+            ticket = self._requested
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="catalog-generation", daemon=True)
+                self._thread.start()
+            return ticket
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._completed >= self._requested:
+                    self._thread = None
+                    return
+                target = self._requested
+                titles = None if self._full else set(self._titles)
+                self._full, self._titles = False, set()
+                self.building = True
+            t0 = time.perf_counter()
+            error = None
+            try:
+                self._publish(self._build(titles))
+            except Exception as e:
+                error = str(e)
+                print(f"[generation] rebuild failed, keeping the current generation: {e}")
+            with self._cond:
+                self._completed = target
+                self.building = False
+                self.last_error = error
+                self.last_build_s = round(time.perf_counter() - t0, 3)
+                self._cond.notify_all()
+
+    def wait(self, ticket: int, timeout: Optional[float] = None) -> bool:
+        """True once the build covering `ticket` has finished (successfully or not)"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._completed >= ticket, timeout)
+
+    def status(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "building": self.building,
+                "pending": self._requested > self._completed + (1 if self.building else 0),
+                "last_error": self.last_error,
+                "last_build_s": self.last_build_s,
+            }
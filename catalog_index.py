@@ -0,0 +1,311 @@
+"""
+In-memory secondary indexes over the visible catalog for /movies queries.
+
+CatalogIndex assigns every movie a position in catalog order and keeps
+posting lists (sorted positions) per theme, emotional tone and director, plus
+a year-sorted list for range queries. Filters intersect posting lists, so a
+filtered page costs O(matches) rather than a scan of every profile.
+
+ThemeIndex backs /themes: theme -> ordered titles with visible counts, patched
+per movie as the catalog and the hidden list change. sync_theme_index() brings
+it up to the catalog store's version from the store's change log, so writes by
+other processes and workers reach it too.
+"""
+
+import base64
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Fields returned by /movies when fields=card is requested
+CARD_FIELDS = [
+    "title", "year", "director", "poster_url", "backdrop_url", "card_description",
+    "primary_theme", "secondary_theme", "primary_emotional_tone", "secondary_emotional_tone",
+]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _year(v: Any) -> Optional[int]:
+    m = re.match(r"\s*(\d{4})", str(v or ""))
+    return int(m.group(1)) if m else None
+
+
+def _norm(v: Any) -> str:
+    return str(v or "").strip().lower()
+
+
+def _values(movie: Dict[str, Any], primary: str, secondary: str) -> List[str]:
+    out = [_norm(movie.get(primary)), _norm(movie.get(secondary))]
+    return list(dict.fromkeys(v for v in out if v and v != "none"))
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"o:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Offset stored in an opaque cursor; raises ValueError when malformed"""
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    if not raw.startswith("o:"):
+        raise ValueError("bad cursor")
+    return max(0, int(raw[2:]))
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """fields=a,b,c -> list (title always included); 'card' expands to CARD_FIELDS; None = all fields"""
+    if not fields:
+        return None
+    out: List[str] = []
+    for f in fields.split(","):
+        f = f.strip()
+        if not f:
+            continue
+        out.extend(CARD_FIELDS if f == "card" else [f])
+    if "title" not in out:
+        out.insert(0, "title")
+    return list(dict.fromkeys(out))
+
+
+class CatalogIndex:
+    """Posting-list indexes over an ordered {title: movie} mapping"""
+
+    def __init__(self, movies: Dict[str, Dict[str, Any]]):
+        self.titles: List[str] = list(movies.keys())
+        self.movies: List[Dict[str, Any]] = list(movies.values())
+        self.by_theme: Dict[str, List[int]] = {}
+        self.by_tone: Dict[str, List[int]] = {}
+        self.by_director: Dict[str, List[int]] = {}
+        years: List[Tuple[int, int]] = []
+        for pos, movie in enumerate(self.movies):
+            for theme in _values(movie, "primary_theme", "secondary_theme"):
+                self.by_theme.setdefault(theme, []).append(pos)
+            for tone in _values(movie, "primary_emotional_tone", "secondary_emotional_tone"):
+                self.by_tone.setdefault(tone, []).append(pos)
+            director = _norm(movie.get("director"))
+            if director:
+                self.by_director.setdefault(director, []).append(pos)
+            y = _year(movie.get("year"))
+            if y is not None:
+                years.append((y, pos))
+        years.sort()
+        self._years = [y for y, _pos in years]
+        self._year_pos = [pos for _y, pos in years]
+
+    def __len__(self) -> int:
+        return len(self.movies)
+
+    @staticmethod
+    def _union(index: Dict[str, List[int]], keys: Iterable[str]) -> Set[int]:
+        out: Set[int] = set()
+        for k in keys:
+            out.update(index.get(_norm(k), ()))
+        return out
+
+    def _year_range(self, year_min: Optional[int], year_max: Optional[int]) -> Set[int]:
+        lo = bisect_left(self._years, year_min) if year_min is not None else 0
+        hi = bisect_right(self._years, year_max) if year_max is not None else len(self._years)
+        return set(self._year_pos[lo:hi])
+
+    def filter(self, themes: Sequence[str] = (), tones: Sequence[str] = (), directors: Sequence[str] = (),
+               year_min: Optional[int] = None, year_max: Optional[int] = None) -> Optional[List[int]]:
+        """Matching positions in catalog order; None when no filter is active (all movies).
+
+        Values within one filter are OR-ed; different filters are AND-ed.
+        """
+        sets: List[Set[int]] = []
+        if themes:
+            sets.append(self._union(self.by_theme, themes))
+        if tones:
+            sets.append(self._union(self.by_tone, tones))
+        if directors:
+            sets.append(self._union(self.by_director, directors))
+        if year_min is not None or year_max is not None:
+            sets.append(self._year_range(year_min, year_max))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        hits = set(sets[0])
+        for s in sets[1:]:
+            hits &= s
+            if not hits:
+                break
+        return sorted(hits)
+
+    def page(self, positions: Optional[List[int]], offset: int, limit: int,
+             fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        total = len(self.movies) if positions is None else len(positions)
+        offset = max(0, offset)
+        limit = max(1, min(MAX_PAGE_SIZE, limit))
+        window = range(offset, min(total, offset + limit))
+        picked = list(window) if positions is None else [positions[i] for i in window]
+        items = []
+        for pos in picked:
+            movie = self.movies[pos]
+            if fields is None:
+                items.append(movie)
+            else:
+                items.append({f: (self.titles[pos] if f == "title" else movie.get(f)) for f in fields})
+        end = offset + len(items)
+        return {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "items": items,
+            "next_cursor": encode_cursor(end) if end < total else None,
+        }
+
+
+def theme_label(theme: str) -> str:
+    """'coming_of_age' -> 'Coming Of Age' (same as the carousel titles in app.js)"""
+    return re.sub(r"\b\w", lambda m: m.group(0).upper(), theme.replace("_", " "))
+
+
+class ThemeIndex:
+    """Inverted index theme -> titles, ordered primary-theme matches first, then catalog order.
+
+    Only card fields are kept per movie. Hidden titles stay in the postings but are
+    excluded from counts and results, so hiding/showing is a per-title update.
+    """
+
+    def __init__(self, movies: Optional[Dict[str, Dict[str, Any]]] = None, hidden: Iterable[str] = ()):
+        self._lock = threading.RLock()
+        self.rebuild(movies or {}, hidden)
+
+    def rebuild(self, movies: Dict[str, Dict[str, Any]], hidden: Iterable[str] = ()) -> None:
+        with self._lock:
+            self.cards: Dict[str, Dict[str, Any]] = {}
+            self._seq: Dict[str, int] = {}
+            self._keys: Dict[str, List[Tuple[str, Tuple[int, int, str]]]] = {}
+            self.by_theme: Dict[str, List[Tuple[int, int, str]]] = {}
+            self.visible: Dict[str, int] = {}
+            self.hidden: Set[str] = set()
+            # revision keeps counting across rebuilds so it never repeats an earlier state's value
+            self.revision = getattr(self, "revision", 0) + 1
+            for title, movie in movies.items():
+                self.upsert(title, movie)
+            self.set_hidden(hidden)
+
+    def state(self) -> Dict[str, Any]:
+        """JSON-serializable postings and cards, ignoring the hidden list (for the startup snapshot)"""
+        with self._lock:
+            return {"cards": self.cards, "seq": self._seq, "by_theme": self.by_theme}
+
+    def restore(self, state: Dict[str, Any], hidden: Iterable[str] = ()) -> None:
+        """Load postings saved by state() (posting keys may come back as JSON lists), then apply the
+        current hidden list"""
+        with self._lock:
+            self.cards, self._seq = state["cards"], state["seq"]
+            self.by_theme = {theme: [tuple(key) for key in posting] for theme, posting in state["by_theme"].items()}
+            self._keys = {}
+            for theme, posting in self.by_theme.items():
+                for key in posting:
+                    self._keys.setdefault(key[2], []).append((theme, key))
+            self.visible = {theme: len(posting) for theme, posting in self.by_theme.items()}
+            self.hidden = set()
+            self.revision += 1
+            self.set_hidden(hidden)
+
+    @staticmethod
+    def _themes(movie: Dict[str, Any]) -> List[Tuple[str, int]]:
+        out = []
+        for rank, field in enumerate(("primary_theme", "secondary_theme")):
+            t = str(movie.get(field) or "").strip()
+            if t and t != "none" and t not in (x for x, _r in out):
+                out.append((t, rank))
+        return out
+
+    def _count(self, title: str, delta: int) -> None:
+        for theme, _key in self._keys.get(title, ()):
+            self.visible[theme] = self.visible.get(theme, 0) + delta
+
+    def upsert(self, title: str, movie: Dict[str, Any]) -> None:
+        with self._lock:
+            self.remove(title)
+            seq = self._seq.setdefault(title, len(self._seq))
+            keys = []
+            for theme, rank in self._themes(movie):
+                key = (rank, seq, title)
+                insort(self.by_theme.setdefault(theme, []), key)
+                keys.append((theme, key))
+            self._keys[title] = keys
+            self.cards[title] = {f: (title if f == "title" else movie.get(f)) for f in CARD_FIELDS}
+            if title not in self.hidden:
+                self._count(title, 1)
+            self.revision += 1
+
+    def remove(self, title: str) -> None:
+        with self._lock:
+            if title not in self._keys:
+                return
+            if title not in self.hidden:
+                self._count(title, -1)
+            for theme, key in self._keys.pop(title):
+                posting = self.by_theme[theme]
+                i = bisect_left(posting, key)
+                if i < len(posting) and posting[i] == key:
+                    posting.pop(i)
+                if not posting:
+                    del self.by_theme[theme]
+                    self.visible.pop(theme, None)
+            self.cards.pop(title, None)
+            self.revision += 1
+
+    def set_hidden(self, hidden: Iterable[str]) -> None:
+        """Apply the current hidden list; only titles whose state changed are touched"""
+        with self._lock:
+            hidden = set(hidden)
+            for title in hidden - self.hidden:
+                self._count(title, -1)
+            for title in self.hidden - hidden:
+                self._count(title, 1)
+            if hidden != self.hidden:
+                self.hidden = hidden
+                self.revision += 1
+
+    def themes(self, top_n: int = 10, min_count: int = 1) -> List[Dict[str, Any]]:
+        """Themes by visible count (desc) with the first top_n visible cards of each"""
+        with self._lock:
+            ranked = sorted((t for t, n in self.visible.items() if n >= min_count),
+                            key=lambda t: (-self.visible[t], t))
+            out = []
+            for theme in ranked:
+                cards = []
+                for _rank, _seq, title in self.by_theme[theme]:
+                    if len(cards) >= top_n:
+                        break
+                    if title not in self.hidden:
+                        cards.append(self.cards[title])
+                out.append({
+                    "theme": theme,
+                    "id": theme.lower().replace("_", "-"),
+                    "title": theme_label(theme),
+                    "count": self.visible[theme],
+                    "movies": cards,
+                })
+            return out
+
+
+def sync_theme_index(index: ThemeIndex, store: Any, version: Optional[int], hidden: Iterable[str] = ()) -> int:
+    """Bring `index` from catalog `version` (None = unknown) to the store's current version and return it.
+
+    Only the titles in the store's change log since `version` are re-read; the whole catalog is
+    re-read when the log cannot tell (wholesale replace, log pruned, unknown version).
+    """
+    current = store.version
+    if version is not None and version >= current:
+        return version
+    changed = None if version is None else store.changed_since(version)
+    if changed is None:
+        index.rebuild(store.all(), hidden)
+        print(f"[themes] rebuilt theme index at catalog v{current}: {len(index.visible)} themes over {len(index.cards)} movies")
+        return current
+    movies = store.get_many(changed)
+    for title in changed:
+        if title in movies:
+            index.upsert(title, movies[title])
+        else:
+            index.remove(title)
+    return current
@@ -0,0 +1,244 @@
+"""
+Append-only change journal for movie_profiles_merged.json.
+
+The catalog on disk is the JSON snapshot plus `<snapshot>.journal`, a JSON-lines
+file of per-movie changes: {"op": "put", "title", "movie"}, {"op": "del",
+"title"} or {"op": "patch", "title", "fields"} (merge the given fields into the
+movie, so a script updating one field cannot clobber concurrent edits of
+others). A write appends only the changed movies; compaction folds the
+journal into the snapshot (atomic replace) and truncates it once the journal
+grows past a fraction of the snapshot. A compaction leaves
+`<snapshot>.compacted` behind, recording which snapshot mtime and journal
+offset the new snapshot folds, so a consumer already at that position knows
+it only has to move to the new snapshot instead of re-importing it.
+
+Writers from different processes (the API's catalog store, enrichment and the
+batch scripts) serialize on an exclusive lock on `<snapshot>.lock`. Readers use
+load_catalog(), which replays the journal over the snapshot. A torn last line
+left by a crash mid-append is ignored on read and cut off before the next append.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl  # type: ignore
+except Exception:
+    fcntl = None  # no cross-process locking (e.g. Windows); in-process lock only
+
+# Compact when the journal is larger than this fraction of the snapshot (and at least COMPACT_MIN_BYTES)
+COMPACT_RATIO = 0.25
+COMPACT_MIN_BYTES = 1 << 20
+
+Changes = Dict[str, Optional[Dict[str, Any]]]
+
+
+def apply_entries(data: Dict[str, Any], entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply journal entries to a {title: movie} dict in place"""
+    for e in entries:
+        if e.get("op") == "del":
+            data.pop(e["title"], None)
+        elif e.get("op") == "patch":
+            data.setdefault(e["title"], {}).update(e["fields"])
+        else:
+            data[e["title"]] = e["movie"]
+    return data
+
+
+class CatalogJournal:
+    """Snapshot + journal pair for one catalog JSON file"""
+
+    def __init__(self, snapshot_path: Path):
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = self.snapshot_path.with_name(self.snapshot_path.name + ".journal")
+        self.lock_path = self.snapshot_path.with_name(self.snapshot_path.name + ".lock")
+        self.marker_path = self.snapshot_path.with_name(self.snapshot_path.name + ".compacted")
+        self._tlock = threading.RLock()
+        self._depth = 0
+        self._lock_file = None
+
+    # ---- locking ------------------------------------------------------
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Exclusive writer lock shared with other processes; re-entrant within a process"""
+        with self._tlock:
+            if self._depth == 0:
+                self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+                self._lock_file = open(self.lock_path, "a+")
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    if fcntl is not None:
+                        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    # ---- state --------------------------------------------------------
+    def snapshot_mtime(self) -> Optional[int]:
+        try:
+            return self.snapshot_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def journal_size(self) -> int:
+        try:
+            return self.journal_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def exists(self) -> bool:
+        return self.snapshot_path.exists() or self.journal_path.exists()
+
+    def needs_compaction(self) -> bool:
+        size = self.journal_size()
+        try:
+            snapshot = self.snapshot_path.stat().st_size
+        except FileNotFoundError:
+            snapshot = 0
+        return size >= COMPACT_MIN_BYTES and size >= snapshot * COMPACT_RATIO
+
+    def compaction_marker(self) -> Optional[Dict[str, Any]]:
+        """{"mtime", "from_mtime", "from_offset"} when the current snapshot came from a compaction, else None"""
+        try:
+            with open(self.marker_path, "r", encoding="utf-8") as f:
+                marker = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        return marker if marker.get("mtime") == self.snapshot_mtime() else None
+
+    # ---- reads --------------------------------------------------------
+    def read_snapshot(self) -> Dict[str, Any]:
+        if not self.snapshot_path.exists():
+            return {}
+        with open(self.snapshot_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def read_entries(self, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Complete entries after byte offset, and the offset just past the last complete one"""
+        if not self.journal_path.exists():
+            return [], 0
+        entries: List[Dict[str, Any]] = []
+        with open(self.journal_path, "rb") as f:
+            f.seek(offset)
+            end = offset
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write from a crash; ignored
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+                end += len(line)
+        return entries, end
+
+    def load(self) -> Tuple[Dict[str, Any], int]:
+        """Snapshot with the journal replayed, and the journal offset it reflects"""
+        with self.lock():
+            data = self.read_snapshot()
+            entries, end = self.read_entries()
+        return apply_entries(data, entries), end
+
+    # ---- writes -------------------------------------------------------
+    def _valid_end(self) -> int:
+        """Offset just past the last newline (the journal size unless the tail is torn)"""
+        size = self.journal_size()
+        if not size:
+            return 0
+        with open(self.journal_path, "rb") as f:
+            pos = size
+            while pos > 0:
+                step = min(1 << 16, pos)
+                f.seek(pos - step)
+                i = f.read(step).rfind(b"\n")
+                if i >= 0:
+                    return pos - step + i + 1
+                pos -= step
+        return 0
+
+    def append_entries(self, entries: List[Dict[str, Any]]) -> int:
+        """Durably append raw entries; returns the new journal offset"""
+        with self.lock():
+            end = self._valid_end()
+            with open(self.journal_path, "ab") as f:
+                if f.tell() != end:
+                    f.truncate(end)  # drop a torn tail before appending
+                    f.seek(end)
+                for entry in entries:
+                    f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+                return f.tell()
+
+    def append(self, changes: Changes) -> int:
+        """Append one entry per changed movie (None = deleted)"""
+        return self.append_entries([
+            {"op": "del", "title": title} if movie is None else {"op": "put", "title": title, "movie": movie}
+            for title, movie in changes.items()
+        ])
+
+    def patch(self, patches: Dict[str, Dict[str, Any]]) -> int:
+        """Append field-level updates {title: {field: value}}"""
+        return self.append_entries([
+            {"op": "patch", "title": title, "fields": fields} for title, fields in patches.items() if fields
+        ])
+
+    def write_snapshot(self, data: Dict[str, Any], compacted_from: Optional[Tuple[Any, int]] = None) -> None:
+        """Replace the snapshot with `data` and empty the journal.
+
+        compacted_from is the (snapshot mtime, journal offset) whose state `data` is, when this is a compaction.
+        """
+        with self.lock():
+            if self.marker_path.exists():
+                self.marker_path.unlink()
+            tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            if compacted_from is not None:
+                marker = {"mtime": self.snapshot_mtime(), "from_mtime": compacted_from[0],
+                          "from_offset": compacted_from[1]}
+                with open(self.marker_path, "w", encoding="utf-8") as f:
+                    json.dump(marker, f)
+
+    def compact(self) -> bool:
+        """Fold the journal into the snapshot; False when there was nothing to fold"""
+        with self.lock():
+            if not self.journal_size():
+                return False
+            folded = self.snapshot_mtime()
+            data, end = self.load()
+            self.write_snapshot(data, compacted_from=(folded, end))
+        print(f"[journal] compacted {self.journal_path.name} into {self.snapshot_path.name} ({len(data)} movies)")
+        return True
+
+
+_journals: Dict[str, CatalogJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(snapshot_path: Path) -> CatalogJournal:
+    """Shared journal per file, so nested lock() calls within one process never self-deadlock on flock"""
+    key = str(Path(snapshot_path).resolve())
+    with _journals_lock:
+        if key not in _journals:
+            _journals[key] = CatalogJournal(Path(snapshot_path))
+        return _journals[key]
+
+
+def load_catalog(path: Path) -> Dict[str, Any]:
+    """Read a catalog JSON file including changes still in its journal"""
+    data, _end = get_journal(path).load()
+    return data
@@ -0,0 +1,171 @@
+"""
+Single-file startup snapshot of a catalog generation.
+
+Layout: MAGIC, an 8-byte little-endian header length, a JSON header, then the
+sections the header lists, each aligned to ALIGN bytes:
+- blobs: opaque bytes (JSON state, the serialized FTS database, ...)
+- arrays: raw numpy arrays (vectors, the serialized FAISS index, ...),
+  memory-mapped read-only on load
+
+Nothing in a snapshot is unpickled or otherwise executed on load. The header
+records FORMAT_VERSION and the source hash of the catalog the snapshot was
+built from; open_snapshot() returns None unless both match, so a stale
+snapshot is never used. Files are written to a temp path and renamed
+into place, so a reader never sees a half-written snapshot.
+
+Build (or refresh) the snapshot used by api.py:
+  python catalog_snapshot.py [--out catalog.snapshot] [--force]
+"""
+
+import argparse
+import json
+import os
+import struct
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+ROOT = Path(__file__).parent
+DEFAULT_PATH = ROOT / "catalog.snapshot"
+MAGIC = b"SUBPLOT-SNAPSHOT\n"
+FORMAT_VERSION = 1
+ALIGN = 64
+
+
+def _pad(f, align: int = ALIGN) -> None:
+    f.write(b"\0" * (-f.tell() % align))
+
+
+def write_snapshot(path: Path, source_hash: str, blobs: Dict[str, bytes], arrays: Dict[str, np.ndarray],
+                   meta: Optional[Dict[str, Any]] = None) -> int:
+    """Write a snapshot file atomically; returns its size in bytes"""
+    path = Path(path)
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+    # Section offsets are relative to the end of the header, so they can be laid out before the header is sized
+    sections: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, data in blobs.items():
+        sections[name] = {"kind": "blob", "offset": offset, "length": len(data)}
+        offset += len(data) + (-len(data) % ALIGN)
+    for name, a in arrays.items():
+        sections[name] = {"kind": "array", "offset": offset, "length": a.nbytes,
+                          "dtype": a.dtype.str, "shape": list(a.shape)}
+        offset += a.nbytes + (-a.nbytes % ALIGN)
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "source_hash": source_hash,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "meta": meta or {},
+        "sections": sections,
+    }).encode("utf-8")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")  # several API workers may write at once
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        _pad(f)
+        for data in blobs.values():
+            f.write(data)
+            _pad(f)
+        for a in arrays.values():
+            f.write(a.tobytes())
+            _pad(f)
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    os.replace(tmp, path)
+    return size
+
+
+class Snapshot:
+    """Read side of a snapshot file; only the header is read up front"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a catalog snapshot")
+            (n,) = struct.unpack("<Q", f.read(8))
+            self.header: Dict[str, Any] = json.loads(f.read(n))
+        base = len(MAGIC) + 8 + n
+        self._base = base + (-base % ALIGN)
+
+    @property
+    def source_hash(self) -> str:
+        return self.header.get("source_hash") or ""
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self.header.get("meta") or {}
+
+    def _section(self, name: str, kind: str) -> Dict[str, Any]:
+        s = self.header["sections"].get(name)
+        if s is None or s["kind"] != kind:
+            raise KeyError(f"snapshot has no {kind} section {name!r}")
+        return s
+
+    def has(self, name: str) -> bool:
+        return name in self.header["sections"]
+
+    def blob(self, name: str) -> bytes:
+        s = self._section(name, "blob")
+        with open(self.path, "rb") as f:
+            f.seek(self._base + s["offset"])
+            return f.read(s["length"])
+
+    def array(self, name: str) -> np.ndarray:
+        """Read-only memory map of an array section"""
+        s = self._section(name, "array")
+        shape = tuple(s["shape"])
+        if not s["length"]:
+            return np.zeros(shape, dtype=np.dtype(s["dtype"]))
+        return np.memmap(self.path, dtype=np.dtype(s["dtype"]), mode="r", offset=self._base + s["offset"], shape=shape)
+
+
+def open_snapshot(path: Path, source_hash: str) -> Optional[Snapshot]:
+    """The snapshot at `path` if it exists, is readable and was built from `source_hash`; else None"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        snap = Snapshot(path)
+    except Exception as e:
+        print(f"[snapshot] ignoring unreadable {path}: {e}")
+        return None
+    if snap.header.get("format") != FORMAT_VERSION:
+        print(f"[snapshot] ignoring {path}: format {snap.header.get('format')} != {FORMAT_VERSION}")
+        return None
+    if snap.source_hash != source_hash:
+        print(f"[snapshot] {path} is stale (catalog changed since it was built)")
+        return None
+    return snap
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Build the catalog startup snapshot used by api.py")
+    ap.add_argument("--out", default=None, help="Snapshot path (default: CATALOG_SNAPSHOT_PATH or catalog.snapshot)")
+    ap.add_argument("--force", action="store_true", help="Rebuild even if the existing snapshot is current")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    os.environ["CATALOG_SNAPSHOT_AUTOSAVE"] = "0"  # written below, not by api's startup thread
+    import api  # loads the current snapshot when it matches, otherwise builds a generation
+
+    out = Path(args.out) if args.out else api.SNAPSHOT_PATH
+    loaded = api.startup_snapshot
+    if not args.force and loaded is not None and loaded.resolve() == out.resolve():
+        print(f"[snapshot] {out} is up to date")
+        return
+    # the startup generation is a fresh full build unless it came from a (different) snapshot
+    gen = api.generation if loaded is None and not args.force else api.build_generation(api.generation.number)
+    size = api.save_generation_snapshot(gen, out)
+    print(f"[snapshot] wrote {out} ({size / 1e6:.1f} MB, {len(gen.profiles)} profiles) in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,538 @@
+"""
+Indexed local catalog store (SQLite, WAL mode).
+
+Movies are stored one row per title as JSON, with indexed tmdb_id / imdb_id
+columns and a movie_themes table (primary + secondary theme) so single-movie
+reads and writes, id lookups and theme lookups do not touch the whole catalog.
+
+movie_profiles_merged.json stays the compatibility format, kept as a snapshot
+plus an append-only journal (see catalog_journal.py). Every committed write
+appends only the changed movies to the journal, under the journal's file lock,
+so writers in other processes (enrichment, batch scripts) serialize with the
+API instead of clobbering each other. Before each write, and at most once per
+JSON_CHECK_INTERVAL on reads, the store replays journal entries written by
+others; a rewritten snapshot triggers a full re-import. The journal is folded
+into the snapshot by compact().
+
+The position in the JSON state the database reflects (snapshot mtime, journal
+offset) is kept in its meta table and re-read inside every transaction, so
+processes sharing one database never replay entries another process already
+applied. A compaction the database already reflects (see
+CatalogJournal.compaction_marker) only resets that position.
+
+Every committed change bumps a version counter that callers can use as a cache
+key. The titles changed by each version are logged, so changed_since(version)
+can tell a consumer in any process what to patch since the version it last saw
+instead of rebuilding its in-memory indexes.
+
+Each database also gets a random catalog_id on creation, so a consumer holding
+a version number can tell when it belongs to a different (rebuilt) database.
+
+Reading `version` never syncs or waits for a writer (it uses its own read
+connection), so request handlers can poll it. A long-running process can move
+the JSON sync off its request path with start_background_sync().
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from catalog_journal import get_journal
+
+ROOT = Path(__file__).parent
+DEFAULT_JSON_PATH = ROOT / "movie_profiles_merged.json"
+DEFAULT_DB_PATH = ROOT / "catalog.db"
+# Minimum seconds between checks for changes other processes made to the JSON snapshot/journal
+JSON_CHECK_INTERVAL = 1.0
+# Versions kept in the change log behind changed_since()
+CHANGE_LOG_VERSIONS = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS movies (
+    title TEXT PRIMARY KEY,
+    tmdb_id TEXT,
+    imdb_id TEXT,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_movies_tmdb_id ON movies(tmdb_id);
+CREATE INDEX IF NOT EXISTS idx_movies_imdb_id ON movies(imdb_id);
+CREATE TABLE IF NOT EXISTS movie_themes (
+    theme TEXT NOT NULL,
+    title TEXT NOT NULL,
+    PRIMARY KEY (theme, title)
+);
+CREATE INDEX IF NOT EXISTS idx_movie_themes_title ON movie_themes(title);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS changes (
+    version INTEGER NOT NULL,
+    title TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_changes_version ON changes(version);
+"""
+
+
+def movie_themes(movie: Dict[str, Any]) -> List[str]:
+    """Theme slugs of a profile (new primary/secondary fields, falling back to the legacy list)"""
+    themes = [movie.get("primary_theme"), movie.get("secondary_theme")]
+    out = [str(t) for t in themes if t and t != "none"]
+    if not out:
+        out = [str(t) for t in (movie.get("themes") or []) if t and t != "none"]
+    return list(dict.fromkeys(out))
+
+
+def _id(v: Any) -> Optional[str]:
+    return str(v) if v not in (None, "") else None
+
+
+class CatalogStore:
+    """Repository over the SQLite catalog. Safe to share between threads."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, json_path: Optional[Path] = DEFAULT_JSON_PATH):
+        self.db_path = Path(db_path)
+        self.json_path = Path(json_path) if json_path else None
+        self.journal = get_journal(self.json_path) if self.json_path else None
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._last_json_check = 0.0
+        # changes of the open transaction: title -> movie (None = deleted); _pending_all after replace_all
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._pending_all = False
+        # changes of the open transaction not yet in the journal (replayed changes are already there)
+        self._unjournaled: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._unjournaled_all = False
+        self._replaying = False
+        # set by compact() / sync_from_json(force=True) for the next transaction
+        self._compacting = False
+        self._force_import = False
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES('catalog_id', ?)", (uuid.uuid4().hex,))
+        # separate connection for `version`: WAL readers are not blocked by a write in progress on self.conn
+        self._version_conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._version_lock = threading.Lock()
+        self._sync_thread: Optional[threading.Thread] = None
+        self.sync_from_json()
+
+    # ---- transactions -------------------------------------------------
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Atomic write block; nested blocks join the outer transaction.
+
+        The outer block holds the journal lock, first replays changes other writers
+        journaled, and appends its own changes to the journal before committing.
+        The version is bumped once on commit if anything changed.
+        """
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self.conn
+                finally:
+                    self._depth -= 1
+                return
+            with self.journal.lock() if self.journal else nullcontext():
+                self.conn.execute("BEGIN IMMEDIATE")
+                self._depth = 1
+                try:
+                    self._catch_up()
+                    yield self.conn
+                    self._write_journal()
+                    if self._pending or self._pending_all:
+                        self.conn.execute(
+                            "INSERT INTO meta(key, value) VALUES('version', '1') "
+                            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+                        )
+                        self._log_changes()
+                    self.conn.execute("COMMIT")
+                except BaseException:
+                    self.conn.execute("ROLLBACK")
+                    self._pending, self._pending_all = {}, False
+                    self._unjournaled, self._unjournaled_all = {}, False
+                    raise
+                finally:
+                    self._depth = 0
+                    self._compacting = self._force_import = False
+            self._pending, self._pending_all = {}, False
+
+    def _log_changes(self) -> None:
+        """Record which titles the version being committed changed (one NULL row for a full replace)"""
+        version = int(self._meta("version"))
+        titles = [None] if self._pending_all else list(self._pending)
+        self.conn.executemany("INSERT INTO changes(version, title) VALUES(?, ?)", [(version, t) for t in titles])
+        self.conn.execute("DELETE FROM changes WHERE version <= ?", (version - CHANGE_LOG_VERSIONS,))
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self.conn.execute(
+            "INSERT INTO meta(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+
+    # ---- reads --------------------------------------------------------
+    @property
+    def version(self) -> int:
+        """Last committed version; does not pick up JSON changes of other writers (see _maybe_sync)"""
+        with self._version_lock:
+            row = self._version_conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return int(row[0]) if row else 0
+
+    @property
+    def catalog_id(self) -> str:
+        """Random id of this database; versions are only comparable between equal ids"""
+        with self._lock:
+            return self._meta("catalog_id") or ""
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """Consistent read of several statements (a WAL read transaction unless already in a write)"""
+        with self._lock:
+            if self._depth:
+                yield self.conn
+                return
+            self.conn.execute("BEGIN")
+            try:
+                yield self.conn
+            finally:
+                self.conn.execute("COMMIT")
+
+    def changed_since(self, version: int) -> Optional[List[str]]:
+        """Titles added, updated or deleted after `version`; None when only a full reload can catch up
+        (the catalog was replaced wholesale since, or `version` is older than the change log)"""
+        self._maybe_sync()
+        current = self.version
+        with self._lock:
+            return self._changed_between(version, current)
+
+    def _changed_between(self, version: int, current: int) -> Optional[List[str]]:
+        if version >= current:
+            return []
+        oldest = self.conn.execute("SELECT MIN(version) FROM changes").fetchone()[0]
+        if oldest is None or oldest > version + 1:
+            return None
+        rows = self.conn.execute("SELECT DISTINCT title FROM changes WHERE version > ?", (version,)).fetchall()
+        if any(title is None for title, in rows):
+            return None
+        return [title for title, in rows]
+
+    def _maybe_sync(self) -> None:
+        if self._sync_thread is not None:
+            return  # the background thread keeps up with the JSON files
+        now = time.monotonic()
+        if now - self._last_json_check >= JSON_CHECK_INTERVAL:
+            self._last_json_check = now
+            self.sync_from_json()
+
+    def start_background_sync(self, on_tick: Optional[Callable[[], None]] = None,
+                              interval: float = JSON_CHECK_INTERVAL) -> None:
+        """Check for JSON changes of other writers every `interval` seconds on a daemon thread instead of
+        on reads; on_tick runs after every check (e.g. to follow the new version)"""
+        with self._lock:
+            if self._sync_thread is not None:
+                return
+
+            def loop() -> None:
+                while True:
+                    time.sleep(interval)
+                    try:
+                        self.sync_from_json()
+                        if on_tick is not None:
+                            on_tick()
+                    except Exception as e:
+                        print(f"[catalog] background sync failed: {e}")
+
+            self._sync_thread = threading.Thread(target=loop, name="catalog-sync", daemon=True)
+            self._sync_thread.start()
+
+    def count(self) -> int:
+        self._maybe_sync()
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+
+    def titles(self) -> List[str]:
+        self._maybe_sync()
+        with self._lock:
+            return [r[0] for r in self.conn.execute("SELECT title FROM movies ORDER BY rowid")]
+
+    def get(self, title: str) -> Optional[Dict[str, Any]]:
+        self._maybe_sync()
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM movies WHERE title = ?", (title,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, titles: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        wanted = list(dict.fromkeys(titles))
+        self._maybe_sync()
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for i in range(0, len(wanted), 500):
+                chunk = wanted[i : i + 500]
+                marks = ",".join("?" * len(chunk))
+                for title, data in self.conn.execute(f"SELECT title, data FROM movies WHERE title IN ({marks})", chunk):
+                    out[title] = json.loads(data)
+        return {t: out[t] for t in wanted if t in out}
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        """Whole catalog as {title: movie}, in insertion order"""
+        self._maybe_sync()
+        with self._lock:
+            return self._all_rows()
+
+    def raw_rows(self, since: Optional[int] = None) -> Tuple[int, Optional[List[Tuple[str, Optional[str]]]]]:
+        """Current version and (title, stored JSON) rows as of that version, in catalog order.
+
+        With `since`, only the titles changed after that version (JSON None = deleted), or
+        None for the rows when changed_since(since) could not tell what changed.
+        """
+        self._maybe_sync()
+        with self._read() as conn:
+            version = int(self._meta("version") or 0)
+            if since is None:
+                return version, conn.execute("SELECT title, data FROM movies ORDER BY rowid").fetchall()
+            titles = self._changed_between(since, version)
+            if titles is None:
+                return version, None
+            found: Dict[str, str] = {}
+            for i in range(0, len(titles), 500):
+                chunk = titles[i : i + 500]
+                marks = ",".join("?" * len(chunk))
+                found.update(conn.execute(f"SELECT title, data FROM movies WHERE title IN ({marks})", chunk).fetchall())
+        return version, [(t, found.get(t)) for t in titles]
+
+    def find_by_tmdb_id(self, tmdb_id: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM movies WHERE tmdb_id = ? LIMIT 1", (_id(tmdb_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_by_imdb_id(self, imdb_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM movies WHERE imdb_id = ? LIMIT 1", (_id(imdb_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def titles_with_theme(self, theme: str) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self.conn.execute("SELECT title FROM movie_themes WHERE theme = ? ORDER BY title", (theme,))]
+
+    def theme_counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self.conn.execute("SELECT theme, COUNT(*) FROM movie_themes GROUP BY theme ORDER BY COUNT(*) DESC").fetchall()
+        return {theme: n for theme, n in rows}
+
+    # ---- writes -------------------------------------------------------
+    def _upsert(self, title: str, movie: Dict[str, Any], now: str) -> None:
+        self.conn.execute(
+            """
+            INSERT INTO movies(title, tmdb_id, imdb_id, data, updated_at) VALUES(?, ?, ?, ?, ?)
+            ON CONFLICT(title) DO UPDATE SET
+                tmdb_id = excluded.tmdb_id, imdb_id = excluded.imdb_id,
+                data = excluded.data, updated_at = excluded.updated_at
+            """,
+            (title, _id(movie.get("tmdb_id")), _id(movie.get("imdb_id")), json.dumps(movie, ensure_ascii=False), now),
+        )
+        self.conn.execute("DELETE FROM movie_themes WHERE title = ?", (title,))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO movie_themes(theme, title) VALUES(?, ?)",
+            [(theme, title) for theme in movie_themes(movie)],
+        )
+        self._pending[title] = movie
+        if not self._replaying:
+            self._unjournaled[title] = movie
+
+    def put(self, title: str, movie: Dict[str, Any]) -> None:
+        self.put_many({title: movie})
+
+    def put_many(self, movies: Dict[str, Dict[str, Any]]) -> int:
+        """Insert or update several movies in one transaction"""
+        if not movies:
+            return 0
+        now = datetime.now(timezone.utc).isoformat()
+        with self.transaction():
+            for title, movie in movies.items():
+                self._upsert(title, movie, now)
+        return len(movies)
+
+    def _delete(self, title: str) -> bool:
+        cur = self.conn.execute("DELETE FROM movies WHERE title = ?", (title,))
+        self.conn.execute("DELETE FROM movie_themes WHERE title = ?", (title,))
+        self._pending[title] = None
+        if not self._replaying:
+            self._unjournaled[title] = None
+        return cur.rowcount > 0
+
+    def delete(self, title: str) -> bool:
+        with self.transaction():
+            return self._delete(title)
+
+    def replace_all(self, movies: Dict[str, Dict[str, Any]]) -> int:
+        """Replace the whole catalog atomically"""
+        now = datetime.now(timezone.utc).isoformat()
+        with self.transaction():
+            self.conn.execute("DELETE FROM movies")
+            self.conn.execute("DELETE FROM movie_themes")
+            self._pending_all = True
+            if not self._replaying:
+                self._unjournaled_all = True
+            for title, movie in movies.items():
+                self._upsert(title, movie, now)
+        return len(movies)
+
+    # ---- JSON snapshot + journal ------------------------------------
+    def _stored_pos(self) -> Optional[Tuple[str, int]]:
+        """(snapshot mtime, journal offset) of the JSON state this database reflects.
+
+        Always read from the database: other processes sharing it move the position when they write.
+        """
+        mtime = self._meta("json_mtime_ns")
+        if mtime is None:
+            return None
+        return mtime, int(self._meta("journal_offset") or 0)
+
+    def _set_pos(self, mtime: Optional[int], offset: int) -> None:
+        self._set_meta("json_mtime_ns", mtime)
+        self._set_meta("journal_offset", offset)
+
+    def _in_sync(self) -> bool:
+        if self.journal is None or not self.journal.exists():
+            return True
+        with self._lock:
+            pos = self._stored_pos()
+        return pos == (str(self.journal.snapshot_mtime()), self.journal.journal_size())
+
+    def _catch_up(self) -> None:
+        """Apply what other writers put in the snapshot/journal (called with the journal lock held)"""
+        if self.journal is None or not self.journal.exists():
+            return
+        pos = None if self._force_import else self._stored_pos()
+        mtime = self.journal.snapshot_mtime()
+        size = self.journal.journal_size()
+        if pos == (str(mtime), size):
+            return
+        if pos is not None and pos[0] != str(mtime):
+            marker = self.journal.compaction_marker()
+            if marker and marker["mtime"] == mtime and (str(marker["from_mtime"]), marker["from_offset"]) == pos:
+                # the new snapshot is the state this database already has; only the position moves
+                pos = (str(mtime), 0)
+        self._replaying = True
+        try:
+            if pos is None or pos[0] != str(mtime) or size < pos[1]:
+                data, end = self.journal.load()
+                self.replace_all(data)
+                print(f"[catalog] imported {len(data)} movies from {self.json_path}")
+            else:
+                entries, end = self.journal.read_entries(pos[1])
+                now = datetime.now(timezone.utc).isoformat()
+                for e in entries:
+                    if e.get("op") == "del":
+                        self._delete(e["title"])
+                    elif e.get("op") == "patch":
+                        row = self.conn.execute("SELECT data FROM movies WHERE title = ?", (e["title"],)).fetchone()
+                        movie = json.loads(row[0]) if row else {}
+                        movie.update(e["fields"])
+                        self._upsert(e["title"], movie, now)
+                    else:
+                        self._upsert(e["title"], e["movie"], now)
+                if entries:
+                    print(f"[catalog] replayed {len(entries)} journal entries from {self.journal.journal_path.name}")
+        finally:
+            self._replaying = False
+        self._set_pos(mtime, end)
+
+    def _write_journal(self) -> None:
+        """Journal this transaction's own changes (called before COMMIT, journal lock held)"""
+        if self.journal is None:
+            self._unjournaled, self._unjournaled_all = {}, False
+            return
+        if self._unjournaled_all:
+            # a compaction writes the state at the (caught up) stored position
+            folded = self._stored_pos() if self._compacting else None
+            self.journal.write_snapshot(self._all_rows(), compacted_from=folded)
+            self._set_pos(self.journal.snapshot_mtime(), 0)
+        elif self._unjournaled:
+            end = self.journal.append(self._unjournaled)
+            self._set_pos(self.journal.snapshot_mtime(), end)
+        self._unjournaled, self._unjournaled_all = {}, False
+
+    def sync_from_json(self, force: bool = False) -> bool:
+        """Pick up changes other processes made to the JSON snapshot or its journal; force re-imports everything"""
+        if self.journal is None or not self.journal.exists():
+            return False
+        with self._lock:
+            if not force and self._in_sync():
+                return False
+            self._force_import = force
+            with self.transaction():
+                pass  # the transaction catches up before running its body
+        return True
+
+    def compact(self, force: bool = False) -> bool:
+        """Fold the journal into the JSON snapshot (only once it is large enough unless force)"""
+        if self.journal is None:
+            return False
+        with self.transaction():
+            if not self.journal.journal_size() or not (force or self.journal.needs_compaction()):
+                return False
+            self._unjournaled_all = self._compacting = True
+        print(f"[catalog] compacted journal into {self.json_path}")
+        return True
+
+    def _all_rows(self) -> Dict[str, Dict[str, Any]]:
+        rows = self.conn.execute("SELECT title, data FROM movies ORDER BY rowid").fetchall()
+        return {title: json.loads(data) for title, data in rows}
+
+    def export_json(self, path: Optional[Path] = None) -> Path:
+        """Write the full catalog in movie_profiles_merged.json format to `path` (atomic replace).
+
+        Without a path (or with the store's own JSON path) this compacts the journal instead.
+        """
+        target = Path(path) if path else self.json_path
+        if target is None:
+            raise ValueError("no JSON path configured for export")
+        if self.json_path is not None and target.resolve() == self.json_path.resolve():
+            self.compact(force=True)
+            return target
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        with self._lock:
+            data = self.all()
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, target)
+        return target
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+        with self._version_lock:
+            self._version_conn.close()
+
+
+_store: Optional[CatalogStore] = None
+_store_lock = threading.Lock()
+
+
+def get_catalog_store() -> CatalogStore:
+    """Process-wide store opened on first use (CATALOG_DB_PATH / CATALOG_JSON_PATH override the defaults)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CatalogStore(
+                Path(os.getenv("CATALOG_DB_PATH") or DEFAULT_DB_PATH),
+                Path(os.getenv("CATALOG_JSON_PATH") or DEFAULT_JSON_PATH),
+            )
+        return _store
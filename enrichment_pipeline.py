@@ -2,19 +2,48 @@
 """
 Enrichment Pipeline for Movie Database
 Handles the processing of scraped movies through enrichment and profile generation
+
+Batches stream through the metadata -> images -> profile stages
+(stage_pipeline.py): each stage has its own worker threads (ENRICH_STAGE_WORKERS)
+and bounded queues between them, so TMDB/OMDb fetches for the next movies
+overlap the LLM call of earlier ones while memory stays bounded. Request
+pacing comes from the per-upstream token buckets in rate_limit.py, so
+throughput is bounded by the TMDB/OMDb/LLM quotas rather than by latency.
 """
 
 import json
 import os
 import asyncio
-from pathlib import Path
-from typing import Dict, List, Any, Optional
-import requests
-from datetime import datetime
+from concurrent.futures import Future
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 
 from main import MovieRecommender
-from fetch_movies import get_movie_details_and_credits, enrich_with_omdb
+from fetch_movies import hydrate_tmdb_movie, enrich_with_omdb, session_with_api_key
 from merge_image_data import merge_image_data
+from catalog_backup import get_backup_store
+from catalog_store import get_catalog_store
+
+from stage_pipeline import DEFAULT_QUEUE_SIZE, Stage, stream_stages
+
+STAGES = ('metadata', 'images', 'profile')
+# Worker threads per stage, sized for each stage's bottleneck: metadata makes a TMDB and an OMDb request,
+# images one TMDB request (usually an HTTP cache hit), profile one LLM call that takes seconds, so it needs
+# the most threads to keep the LLM quota busy. ENRICH_CONCURRENCY sets every stage at once;
+# ENRICH_STAGE_WORKERS="metadata=8,profile=16" sets single stages.
+DEFAULT_STAGE_WORKERS = {'metadata': 8, 'images': 4, 'profile': 12}
+# Movies waiting between two stages
+STAGE_QUEUE_SIZE = int(os.getenv("ENRICH_STAGE_QUEUE", str(DEFAULT_QUEUE_SIZE)))
+
+def stage_workers() -> Dict[str, int]:
+    workers = dict(DEFAULT_STAGE_WORKERS)
+    if os.getenv("ENRICH_CONCURRENCY"):
+        workers = {name: max(1, int(os.environ["ENRICH_CONCURRENCY"])) for name in workers}
+    for part in (os.getenv("ENRICH_STAGE_WORKERS") or "").split(","):
+        if "=" in part:
+            name, n = part.split("=", 1)
+            if name.strip() in workers:
+                workers[name.strip()] = max(1, int(n))
+    return workers
 
 class EnrichmentPipeline:
     def __init__(self, llm_provider="openai"):
@@ -25,43 +54,29 @@ class EnrichmentPipeline:
         if not self.tmdb_api_key:
             raise ValueError("TMDB_API_KEY environment variable is required")
         
-        self.session = requests.Session()
-        self.session.params = {'api_key': self.tmdb_api_key}
+        # cached + rate-limited, with one pooled connection per thread that talks to TMDB
+        workers = stage_workers()
+        self.session = session_with_api_key(self.tmdb_api_key, pool_maxsize=max(
+            10, workers['metadata'] + workers['images']))
         
         self.recommender = MovieRecommender(llm_provider)
         
-    def enrich_movie_metadata(self, movie: Dict[str, Any]) -> Dict[str, Any]:
-        """Enrich movie with additional metadata from TMDB and OMDb"""
+    def hydrate(self, movie: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The movie's normalized TMDB record (one request), or None without a TMDB ID"""
+        tmdb_id = movie.get('tmdb_id')
+        if not tmdb_id:
+            print(f"⚠️  No TMDB ID for {movie.get('title', 'Unknown')}")
+            return None
+        return hydrate_tmdb_movie(self.session, tmdb_id)
+    
+    def enrich_movie_metadata(self, movie: Dict[str, Any], tmdb: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Enrich movie with additional metadata from TMDB and OMDb (tmdb = an already fetched TMDB record)"""
         try:
-            tmdb_id = movie.get('tmdb_id')
-            if not tmdb_id:
-                print(f"⚠️  No TMDB ID for {movie.get('title', 'Unknown')}")
+            detailed_movie = tmdb or self.hydrate(movie)
+            if not detailed_movie:
                 return movie
             
-            # Get detailed movie information from TMDB
-            detailed_movie = get_movie_details_and_credits(self.session, tmdb_id)
-            
-            # Merge the data
-            enriched_movie = movie.copy()
-            enriched_movie.update({
-                'title': detailed_movie.get('title', movie.get('title', '')),
-                'year': detailed_movie.get('year', movie.get('year', '')),
-                'director': detailed_movie.get('director', movie.get('director', '')),
-                'genre_tags': detailed_movie.get('genre_tags', movie.get('genre_tags', [])),
-                'plot_summary': detailed_movie.get('plot_summary', movie.get('plot_summary', '')),
-                'imdb_id': detailed_movie.get('imdb_id', movie.get('imdb_id')),
-                'tmdb_id': tmdb_id,
-                'poster_url': detailed_movie.get('poster_url', movie.get('poster_url')),
-                'backdrop_url': detailed_movie.get('backdrop_url', movie.get('backdrop_url')),
-                'runtime': detailed_movie.get('runtime', movie.get('runtime')),
-                'vote_average': detailed_movie.get('vote_average', movie.get('vote_average')),
-                'vote_count': detailed_movie.get('vote_count', movie.get('vote_count'))
-            })
-            
-            # Enrich with OMDb if available
-            if self.omdb_api_key:
-                enriched_movie = enrich_with_omdb(enriched_movie, self.omdb_api_key)
-            
+            enriched_movie = self._merge_metadata(movie, detailed_movie)
             print(f"✅ Enriched metadata for {enriched_movie['title']}")
             return enriched_movie
             
@@ -69,49 +84,15 @@ class EnrichmentPipeline:
             print(f"❌ Failed to enrich metadata for {movie.get('title', 'Unknown')}: {e}")
             return movie
     
-    def add_movie_images(self, movie: Dict[str, Any]) -> Dict[str, Any]:
-        """Add poster and backdrop images from TMDB"""
+    def add_movie_images(self, movie: Dict[str, Any], tmdb: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Add poster and backdrop images from TMDB (best English image by votes; tmdb = an already fetched record)"""
         try:
-            tmdb_id = movie.get('tmdb_id')
-            if not tmdb_id:
-                print(f"⚠️  No TMDB ID for {movie.get('title', 'Unknown')}")
+            record = tmdb or self.hydrate(movie)
+            if not record:
                 return movie
             
-            # Get images from TMDB
-            images_url = f"https://api.themoviedb.org/3/movie/{tmdb_id}/images"
-            response = self.session.get(images_url)
-            
-            if response.status_code == 200:
-                images_data = response.json()
-                
-                # Get best poster
-                posters = images_data.get('posters', [])
-                if posters:
-                    # Prefer English posters, then highest vote average
-                    english_posters = [p for p in posters if p.get('iso_639_1') == 'en']
-                    if english_posters:
-                        best_poster = max(english_posters, key=lambda x: x.get('vote_average', 0))
-                    else:
-                        best_poster = max(posters, key=lambda x: x.get('vote_average', 0))
-                    
-                    movie['poster_url'] = f"https://image.tmdb.org/t/p/w500{best_poster['file_path']}"
-                
-                # Get best backdrop
-                backdrops = images_data.get('backdrops', [])
-                if backdrops:
-                    # Prefer English backdrops, then highest vote average
-                    english_backdrops = [b for b in backdrops if b.get('iso_639_1') == 'en']
-                    if english_backdrops:
-                        best_backdrop = max(english_backdrops, key=lambda x: x.get('vote_average', 0))
-                    else:
-                        best_backdrop = max(backdrops, key=lambda x: x.get('vote_average', 0))
-                    
-                    movie['backdrop_url'] = f"https://image.tmdb.org/t/p/w1280{best_backdrop['file_path']}"
-                
-                print(f"✅ Added images for {movie['title']}")
-            else:
-                print(f"⚠️  Failed to get images for {movie.get('title', 'Unknown')}: HTTP {response.status_code}")
-            
+            movie = self._merge_images(movie, record)
+            print(f"✅ Added images for {movie['title']}")
             return movie
             
         except Exception as e:
@@ -125,32 +106,7 @@ class EnrichmentPipeline:
                 print(f"⚠️  No plot summary for {movie.get('title', 'Unknown')}, skipping profile generation")
                 return movie
             
-            # Generate profile using the existing system
-            profile = self.recommender.profile_generator.generate_profile(movie)
-            
-            # Convert profile to dictionary and merge with movie data
-            profile_dict = {
-                'primary_emotional_tone': profile.primary_emotional_tone,
-                'secondary_emotional_tone': profile.secondary_emotional_tone,
-                'primary_theme': profile.primary_theme,
-                'secondary_theme': profile.secondary_theme,
-                'intensity_level': profile.intensity_level,
-                'pacing_style': profile.pacing_style,
-                'visual_aesthetic': profile.visual_aesthetic,
-                'target_audience': profile.target_audience,
-                'similar_films': profile.similar_films,
-                'cultural_context': profile.cultural_context,
-                'narrative_structure': profile.narrative_structure,
-                'energy_level': profile.energy_level,
-                'discussion_topics': profile.discussion_topics,
-                'card_description': profile.card_description,
-                'profile_text': profile.profile_text
-            }
-            
-            # Merge profile with movie data
-            enriched_movie = movie.copy()
-            enriched_movie.update(profile_dict)
-            
+            enriched_movie = self._with_profile(movie)
             print(f"✅ Generated profile for {enriched_movie['title']}")
             return enriched_movie
             
@@ -158,6 +114,73 @@ class EnrichmentPipeline:
             print(f"❌ Failed to generate profile for {movie.get('title', 'Unknown')}: {e}")
             return movie
     
+    def _merge_metadata(self, movie: Dict[str, Any], tmdb: Dict[str, Any]) -> Dict[str, Any]:
+        # Merge the data; fields TMDB has no value for keep the movie's own
+        enriched_movie = movie.copy()
+        enriched_movie['tmdb_id'] = tmdb['tmdb_id']
+        for field in ('title', 'year', 'director', 'genre_tags', 'plot_summary', 'imdb_id', 'poster_url',
+                      'backdrop_url', 'runtime', 'vote_average', 'vote_count', 'keywords'):
+            if tmdb.get(field) not in (None, '', []):
+                enriched_movie[field] = tmdb[field]
+        
+        # Enrich with OMDb if available
+        if self.omdb_api_key:
+            enriched_movie = enrich_with_omdb(enriched_movie, self.omdb_api_key)
+        return enriched_movie
+    
+    def _merge_images(self, movie: Dict[str, Any], tmdb: Dict[str, Any]) -> Dict[str, Any]:
+        movie = movie.copy()
+        if tmdb.get('poster_url'):
+            movie['poster_url'] = tmdb['poster_url']
+        if tmdb.get('backdrop_url'):
+            movie['backdrop_url'] = tmdb['backdrop_url']
+        return movie
+    
+    def _with_profile(self, movie: Dict[str, Any]) -> Dict[str, Any]:
+        # Generate profile using the existing system
+        profile = self.recommender.profile_generator.generate_profile(movie)
+        
+        # Convert profile to dictionary and merge with movie data
+        profile_dict = {
+            'primary_emotional_tone': profile.primary_emotional_tone,
+            'secondary_emotional_tone': profile.secondary_emotional_tone,
+            'primary_theme': profile.primary_theme,
+            'secondary_theme': profile.secondary_theme,
+            'intensity_level': profile.intensity_level,
+            'pacing_style': profile.pacing_style,
+            'visual_aesthetic': profile.visual_aesthetic,
+            'target_audience': profile.target_audience,
+            'similar_films': profile.similar_films,
+            'cultural_context': profile.cultural_context,
+            'narrative_structure': profile.narrative_structure,
+            'energy_level': profile.energy_level,
+            'discussion_topics': profile.discussion_topics,
+            'card_description': profile.card_description,
+            'profile_text': profile.profile_text
+        }
+        
+        # Merge profile with movie data
+        enriched_movie = movie.copy()
+        enriched_movie.update(profile_dict)
+        return enriched_movie
+    
+    def run_stage(self, movie: Dict[str, Any], stage: str) -> Dict[str, Any]:
+        """Run one stage for a job queue worker (job_queue.py).
+        
+        Unlike process_movie, upstream errors are raised, so the job can be retried.
+        """
+        if stage in ('metadata', 'images'):
+            tmdb = self.hydrate(movie)  # the second stage's request is served by the HTTP cache
+            if not tmdb:
+                return movie.copy()
+            return self._merge_metadata(movie, tmdb) if stage == 'metadata' else self._merge_images(movie, tmdb)
+        if stage == 'profile':
+            if not movie.get('plot_summary'):
+                print(f"⚠️  No plot summary for {movie.get('title', 'Unknown')}, skipping profile generation")
+                return movie.copy()
+            return self._with_profile(movie)
+        raise ValueError(f"unknown enrichment stage {stage!r}")
+    
     def process_movie(self, movie: Dict[str, Any], steps: List[str] = None) -> Dict[str, Any]:
         """Process a single movie through the enrichment pipeline"""
         if steps is None:
@@ -167,75 +190,110 @@ class EnrichmentPipeline:
         
         processed_movie = movie.copy()
         
+        # metadata and images share one TMDB request
+        tmdb = None
+        if ('metadata' in steps or 'images' in steps) and movie.get('tmdb_id'):
+            try:
+                tmdb = self.hydrate(movie)
+            except Exception as e:
+                print(f"❌ Failed to fetch TMDB data for {movie.get('title', 'Unknown')}: {e}")
+        
         if 'metadata' in steps:
-            processed_movie = self.enrich_movie_metadata(processed_movie)
+            processed_movie = self.enrich_movie_metadata(processed_movie, tmdb)
         
         if 'images' in steps:
-            processed_movie = self.add_movie_images(processed_movie)
+            processed_movie = self.add_movie_images(processed_movie, tmdb)
         
         if 'profile' in steps:
             processed_movie = self.generate_movie_profile(processed_movie)
         
         return processed_movie
     
-    def process_batch(self, movies: List[Dict[str, Any]], steps: List[str] = None) -> List[Dict[str, Any]]:
-        """Process a batch of movies through the enrichment pipeline"""
-        print(f"\n🚀 Starting batch processing of {len(movies)} movies")
+    # ---- streaming stages ----------------------------------------------
+    # Items passed between stages: {'index', 'input', 'movie', 'tmdb'}; metadata and images share 'tmdb'
+    
+    def _hydrate_once(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if 'tmdb' not in item:
+            item['tmdb'] = None
+            if item['movie'].get('tmdb_id'):
+                try:
+                    item['tmdb'] = self.hydrate(item['movie'])
+                except Exception as e:
+                    print(f"❌ Failed to fetch TMDB data for {item['movie'].get('title', 'Unknown')}: {e}")
+        return item['tmdb']
+    
+    def _metadata_stage(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        item['movie'] = self.enrich_movie_metadata(item['movie'], self._hydrate_once(item))
+        return item
+    
+    def _images_stage(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        item['movie'] = self.add_movie_images(item['movie'].copy(), self._hydrate_once(item))
+        return item
+    
+    def _profile_stage(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        item.pop('tmdb', None)  # not needed any more; keep queued items small
+        item['movie'] = self.generate_movie_profile(item['movie'])
+        return item
+    
+    def _stages(self, steps: Optional[List[str]], concurrency: Optional[int]) -> List[Stage]:
+        steps = steps or list(STAGES)
+        workers = stage_workers()
+        fns = {'metadata': self._metadata_stage, 'images': self._images_stage, 'profile': self._profile_stage}
+        return [Stage(name, fns[name], concurrency or workers[name]) for name in STAGES if name in steps]
+    
+    def _stream(self, movies: Iterable[Dict[str, Any]], steps: Optional[List[str]],
+                concurrency: Optional[int]) -> Iterator[Tuple[Dict[str, Any], Any, Optional[BaseException]]]:
+        items = ({'index': i, 'input': movie, 'movie': movie.copy()} for i, movie in enumerate(movies))
+        return stream_stages(items, self._stages(steps, concurrency), STAGE_QUEUE_SIZE)
+    
+    def iter_process(self, movies: Iterable[Dict[str, Any]], steps: List[str] = None,
+                     concurrency: Optional[int] = None) -> Iterator[Tuple[Dict[str, Any], "Future[Dict[str, Any]]"]]:
+        """Stream movies through the stages, yielding (movie, future) as each one finishes.
         
-        processed_movies = []
+        `movies` may be a generator; it is consumed only as fast as the first stage takes movies, so
+        memory stays bounded. `concurrency` overrides the worker count of every stage.
+        future.result() is the processed movie (or raises what a stage raised).
+        """
+        for item, result, error in self._stream(movies, steps, concurrency):
+            future: "Future[Dict[str, Any]]" = Future()
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result['movie'])
+            yield item['input'], future
+
+    def process_batch(self, movies: List[Dict[str, Any]], steps: List[str] = None,
+                      concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Process a batch of movies through the enrichment pipeline; results keep the input order"""
+        print(f"\n🚀 Starting batch processing of {len(movies)} movies")
         
-        for i, movie in enumerate(movies, 1):
-            print(f"\n[{i}/{len(movies)}] Processing: {movie.get('title', 'Unknown')}")
-            
-            try:
-                processed_movie = self.process_movie(movie, steps)
-                processed_movies.append(processed_movie)
-                
-                # Add delay to be respectful to APIs
-                if i < len(movies):
-                    import time
-                    time.sleep(0.5)
-                    
-            except Exception as e:
-                print(f"❌ Failed to process {movie.get('title', 'Unknown')}: {e}")
-                processed_movies.append(movie)  # Keep original if processing fails
+        processed: List[Dict[str, Any]] = list(movies)  # Keep original if processing fails
+        for done, (item, result, error) in enumerate(self._stream(movies, steps, concurrency), 1):
+            if error is not None:
+                print(f"❌ Failed to process {item['input'].get('title', 'Unknown')}: {error}")
+            else:
+                processed[item['index']] = result['movie']
+            if done % 10 == 0 or done == len(movies):
+                print(f"[{done}/{len(movies)}] movies finished")
         
-        print(f"\n✅ Batch processing completed: {len(processed_movies)} movies processed")
-        return processed_movies
+        print(f"\n✅ Batch processing completed: {len(processed)} movies processed")
+        return processed
     
     def merge_to_main_database(self, new_movies: List[Dict[str, Any]], backup: bool = True) -> int:
         """Merge processed movies into the main database"""
         try:
-            # Load current database
-            db_file = Path("movie_profiles_merged.json")
-            if not db_file.exists():
-                print("❌ Main database file not found")
-                return 0
+            store = get_catalog_store()
             
-            with open(db_file, 'r') as f:
-                current_db = json.load(f)
-            
-            # Create backup if requested (disabled by default to prevent excessive backups)
+            # Create backup if requested
             if backup:
-                # Ensure backups directory exists
-                os.makedirs("backups", exist_ok=True)
-                
-                backup_file = f"backups/movie_profiles_merged_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                with open(backup_file, 'w') as f:
-                    json.dump(current_db, f, indent=2, ensure_ascii=False)
-                print(f"💾 Created backup: {backup_file}")
-            
-            # Merge new movies
-            merged_count = 0
-            for movie in new_movies:
-                title = movie.get('title', '')
-                if title:
-                    current_db[title] = movie
-                    merged_count += 1
+                backup_id = get_backup_store().create(store, label="enrichment_merge")["id"]
+                print(f"💾 Created backup: {backup_id}")
             
-            # Save updated database
-            with open(db_file, 'w') as f:
-                json.dump(current_db, f, indent=2, ensure_ascii=False)
+            # Merge new movies in a single transaction, touching only their rows;
+            # the JSON snapshot gets them through its journal (compacted when large)
+            updates = {movie['title']: movie for movie in new_movies if movie.get('title')}
+            merged_count = store.put_many(updates)
+            store.compact()
             
             print(f"✅ Merged {merged_count} movies into main database")
             return merged_count
@@ -254,6 +312,8 @@ def main():
     parser.add_argument('--steps', nargs='+', choices=['metadata', 'images', 'profile'], 
                        default=['metadata', 'images', 'profile'], help='Enrichment steps to run')
     parser.add_argument('--merge', action='store_true', help='Merge results to main database')
+    parser.add_argument('--concurrency', type=int, default=None,
+                       help='Worker threads per stage (default: ENRICH_STAGE_WORKERS)')
     parser.add_argument('--provider', default='openai', choices=['openai', 'anthropic', 'ollama'],
                        help='LLM provider for profile generation')
     
@@ -273,7 +333,7 @@ def main():
     pipeline = EnrichmentPipeline(args.provider)
     
     # Process movies
-    processed_movies = pipeline.process_batch(movies, args.steps)
+    processed_movies = pipeline.process_batch(movies, args.steps, args.concurrency)
     
     # Save results
     output_file = args.output or args.input.replace('.json', '_enriched.json')
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Enrichment worker: drains the durable job queue (job_queue.py).
+
+Jobs are claimed per stage and run with EnrichmentPipeline.run_stage, each
+stage with its own number of worker threads (ENRICH_STAGE_WORKERS, see
+enrichment_pipeline.py): while profile jobs wait on the LLM, metadata and
+image jobs of other movies keep running, and the queue itself holds the
+movies waiting between stages. A failed stage is retried with backoff by the
+queue. When all jobs of a run are finished the worker finalizes it: the
+results are upserted into the catalog in one transaction (with a backup when
+the run asks for one) and the API is asked (POST /reload) to re-index only
+those movies.
+
+Several workers can drain the queue at once; leases keep them from running
+the same job, and jobs of a crashed worker are picked up again once their
+lease expires. Progress goes to the admin log and to the queue's events
+table, which /admin/events streams to the UI.
+
+The admin API never runs enrichment itself (ENRICH_WORKER):
+- process (default): after enqueueing it starts `enrichment_worker.py
+  --drain` unless a drainer is already running; that process exits once
+  every run is finished
+- thread: a background thread of the API process drains the queue
+- external: the API only enqueues; workers are started separately
+
+  python enrichment_worker.py [--concurrency N] [--once | --drain]
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO
+
+from enrichment_pipeline import EnrichmentPipeline, stage_workers
+from job_queue import JobQueue, get_job_queue
+
+try:
+    import fcntl  # type: ignore
+except Exception:
+    fcntl = None  # no cross-process drain lock (e.g. Windows); ENRICH_WORKER=process falls back to a thread
+
+ROOT = Path(__file__).parent
+
+# Seconds between queue polls while waiting on backoffs or other workers
+POLL_SECONDS = 1.0
+
+
+def _log(operation: str, details: str, level: str = "info") -> None:
+    # admin_api imports this module lazily, so import it lazily here too
+    from admin_api import log_admin_operation
+    log_admin_operation(operation, details, level)
+
+
+class EnrichmentWorker:
+    """Claims jobs from a JobQueue and runs them; one instance per worker thread or process"""
+
+    def __init__(self, queue: Optional[JobQueue] = None, concurrency: Optional[int] = None,
+                 worker_id: Optional[str] = None):
+        self.queue = queue or get_job_queue()
+        # jobs run at once per stage; `concurrency` gives every stage the same number
+        self.workers = {stage: max(1, concurrency or n) for stage, n in stage_workers().items()}
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.stop_event = threading.Event()
+        self._pipelines: Dict[str, EnrichmentPipeline] = {}
+        self._runs: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _pipeline(self, provider: str) -> EnrichmentPipeline:
+        with self._lock:
+            if provider not in self._pipelines:
+                self._pipelines[provider] = EnrichmentPipeline(provider)
+            return self._pipelines[provider]
+
+    def _run_info(self, run_id: int) -> Dict[str, Any]:
+        with self._lock:
+            run = self._runs.get(run_id)
+        if run is None:
+            run = self.queue.get_run(run_id) or {"kind": "enrichment", "steps": [], "options": {}, "total": 0}
+            with self._lock:
+                self._runs[run_id] = run
+        return run
+
+    def _report(self, run: Dict[str, Any], type: str, details: str, level: str = "info", **data: Any) -> None:
+        """Admin log entry plus a progress event for /admin/events"""
+        operation = run["options"].get("operation", run["kind"])
+        _log(operation, details, level)
+        try:
+            self.queue.add_event(run.get("id"), type, details, level, {"operation": operation, **data})
+        except Exception as e:
+            print(f"[worker] failed to record event: {e}")
+
+    def run_job(self, job: Dict[str, Any]) -> None:
+        run = self._run_info(job["run_id"])
+        options = run["options"]
+        title = job.get("title") or "Unknown"
+        info = {"title": title, "stage": job["stage"], "attempts": job["attempts"]}
+        try:
+            output = self._pipeline(options.get("provider", "openai")).run_stage(job["input"], job["stage"])
+        except Exception as e:
+            status = self.queue.fail(job["id"], self.worker_id, str(e))
+            if status == "pending":
+                self._report(run, "job_retry", f"{job['stage']} failed for {title} (attempt {job['attempts']}/"
+                                               f"{job['max_attempts']}), retrying: {e}", "warning", **info)
+            elif status == "failed":
+                self._report(run, "job_failed", f"Failed to process {title} ({job['stage']}): {e}", "error",
+                             **info, **self.queue.run_progress(job["run_id"]), total=run["total"])
+            return
+        if not self.queue.complete(job["id"], self.worker_id, output):
+            self._report(run, "job_lost", f"Lease on {title} ({job['stage']}) expired before it finished; "
+                                          "result dropped", "warning", **info)
+            return
+        progress = {**self.queue.run_progress(job["run_id"]), "total": run["total"]}
+        if job["seq"] == len(run["steps"]) - 1:
+            self._report(run, "movie_done", f"Successfully processed {title} ({progress['done']}/{run['total']})",
+                         "success", **info, **progress)
+        else:
+            # stage progress goes to the event stream only, not the admin log
+            self.queue.add_event(job["run_id"], "stage_done", f"{job['stage']} done for {title}", "info",
+                                 {"operation": options.get("operation", run["kind"]), **info, **progress})
+
+    def finalize(self, run: Dict[str, Any]) -> None:
+        """Write a finished run's results to the catalog and re-index them"""
+        from admin_api import sync_changed_movies, upsert_movie_data
+
+        options = run["options"]
+        try:
+            results = self.queue.run_results(run["id"])
+            movies: Dict[str, Any] = {}
+            for r in results:
+                # the latest stage that succeeded; a movie whose first stage failed is kept as it came in
+                # when the run asks for it (the full enrichment pipeline always saved every movie)
+                movie = r["movie"] or (r["input"] if options.get("keep_failed") and not r["cancelled"] else None)
+                if movie and movie.get("title"):
+                    movies[movie["title"]] = movie
+            if movies:
+                self._report(run, "run_saving", f"Saving {len(movies)} enriched movies to database")
+                upsert_movie_data(movies, create_backup=bool(options.get("backup")))
+            # POST /reload to the API (this process never loads the API's indexes itself); when the API is
+            # unreachable its workers still notice the new catalog version on their own
+            synced = sync_changed_movies(list(movies))
+            self.queue.finish_run(run["id"], "done")
+            failed = sum(1 for r in results if not r["ok"] and not r["cancelled"])
+            summary = f"Run {run['id']} completed: {len(movies)} movies saved, {failed} with a failed stage"
+            self._report(run, "run_done", f"{summary}; API not notified, it picks the changes up on its next catalog check" if not synced else summary,
+                         "success" if synced else "warning", saved=len(movies), failed=failed, synced=synced)
+        except Exception as e:
+            self.queue.finish_run(run["id"], "failed", str(e))
+            self._report(run, "run_failed", f"Run {run['id']} failed while saving results: {e}", "error")
+        finally:
+            with self._lock:
+                self._runs.pop(run["id"], None)
+
+    def run(self, until_idle: bool = False) -> None:
+        """Claim and run jobs until stopped (or, with until_idle, until nothing is left to pick up)"""
+        in_flight: Dict[Future, str] = {}
+        busy = {stage: 0 for stage in self.workers}
+        with ThreadPoolExecutor(max_workers=sum(self.workers.values()), thread_name_prefix="enrich-job") as pool:
+            while not self.stop_event.is_set():
+                run = self.queue.claim_finished_run(self.worker_id)
+                if run is not None:
+                    self.finalize(run)
+                    continue
+                for stage, limit in self.workers.items():
+                    for job in self.queue.claim(self.worker_id, limit=limit - busy[stage], stages=[stage]):
+                        in_flight[pool.submit(self.run_job, job)] = stage
+                        busy[stage] += 1
+                if in_flight:
+                    done, _pending = wait(list(in_flight), timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        busy[in_flight.pop(future)] -= 1
+                        if future.exception():
+                            print(f"[worker] job crashed: {future.exception()}")
+                    continue
+                if until_idle and not self.queue.has_work():
+                    return
+                # only backed-off jobs, other workers' leases or a run being finalized are left
+                time.sleep(POLL_SECONDS)
+
+
+# ---------------------------
+# Draining on behalf of the admin API (ENRICH_WORKER=process | thread)
+# ---------------------------
+
+def _drain_lock_path(queue: JobQueue) -> Path:
+    return queue.db_path.with_name(queue.db_path.name + ".drain.lock")
+
+
+def _try_lock(f: TextIO) -> bool:
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def drain_exclusive(worker: EnrichmentWorker) -> None:
+    """Drain the queue unless another drainer holds the drain lock; exits once every run is finished.
+
+    The lock is released before the final check for work, so a run enqueued while this drainer stops is
+    either seen here or finds the lock free and starts a new drainer.
+    """
+    with open(_drain_lock_path(worker.queue), "a+") as lock:
+        if not _try_lock(lock):
+            print("[worker] another drainer is running")
+            return
+        while True:
+            worker.run(until_idle=True)
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            if not worker.queue.has_work() or not _try_lock(lock):
+                return
+
+
+_thread: Optional[threading.Thread] = None
+_process: Optional[subprocess.Popen] = None
+_start_lock = threading.Lock()
+
+
+def _drain_thread() -> None:
+    global _thread
+    worker = EnrichmentWorker()
+    while True:
+        try:
+            worker.run(until_idle=True)
+        except Exception as e:
+            print(f"[worker] background worker stopped: {e}")
+            time.sleep(POLL_SECONDS)
+        # re-checked under the lock, so work enqueued while stopping is never left behind
+        with _start_lock:
+            if not worker.queue.has_work():
+                _thread = None
+                return
+
+
+def _ensure_thread() -> None:
+    global _thread
+    with _start_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_drain_thread, daemon=True, name="enrichment-worker")
+            _thread.start()
+
+
+def _ensure_process() -> None:
+    global _process
+    queue = get_job_queue()
+    with _start_lock:
+        if _process is not None:
+            _process.poll()  # reap a finished drainer
+        with open(_drain_lock_path(queue), "a+") as lock:
+            if not _try_lock(lock):
+                return  # a drainer holds the lock; it checks for new work before it exits
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        _process = subprocess.Popen([sys.executable, str(ROOT / "enrichment_worker.py"), "--drain"], cwd=str(ROOT),
+                                    start_new_session=True)
+        print(f"[worker] started drainer process {_process.pid}")
+
+
+def ensure_background_worker() -> bool:
+    """Make sure something drains the queue (see ENRICH_WORKER); False when that is left to external workers"""
+    mode = (os.getenv("ENRICH_WORKER") or "process").strip().lower()
+    if mode == "process" and fcntl is not None:
+        _ensure_process()
+    elif mode in ("process", "thread"):
+        _ensure_thread()
+    else:
+        return False
+    return True
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Drain the enrichment job queue")
+    ap.add_argument("--concurrency", type=int, default=None,
+                    help="Jobs run at once per stage (default: ENRICH_STAGE_WORKERS)")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument("--once", action="store_true", help="Exit when no run is left instead of waiting for work")
+    mode.add_argument("--drain", action="store_true",
+                      help="Like --once, but only one drainer runs at a time (started by the admin API)")
+    args = ap.parse_args()
+
+    worker = EnrichmentWorker(concurrency=args.concurrency)
+    print(f"[worker] {worker.worker_id} draining {worker.queue.db_path} (workers per stage: {worker.workers})")
+    try:
+        if args.drain and fcntl is not None:
+            drain_exclusive(worker)
+        else:
+            worker.run(until_idle=args.once or args.drain)
+    except KeyboardInterrupt:
+        # jobs already running were finished by the pool; nothing is left leased
+        print("[worker] stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Offline evaluation harness for hybrid search fusion strategies.
+
+Replays logged /search queries against the current keyword and vector indexes and
+scores every fusion strategy against the logged clicks with NDCG, MRR and latency,
+across several candidate pool sizes.
+
+Usage:
+    python evaluate_fusion.py                         # reads logs/requests.jsonl + logs/clicks.jsonl (API run with OBS_PERSIST=1)
+    python evaluate_fusion.py --recent recent.json    # a saved /observability/recent response
+    python evaluate_fusion.py --pools 10,20,40,60 --strategies rrf,combmnz --out fusion_report.json
+"""
+
+import argparse
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from search_fusion import DEFAULT_RRF_K, FUSION_STRATEGIES, fuse
+from state_store import rotated_paths
+
+ROOT = Path(__file__).parent
+DEFAULT_LOG_DIR = ROOT / "logs"
+
+# Clicks with at least this much dwell time count as strongly relevant (gain 2 instead of 1)
+LONG_DWELL_MS = 10000
+
+
+def load_jsonl(path: Path) -> List[Dict[str, Any]]:
+    """Read a JSONL file and its rotations (path.1, path.2, ... oldest first), skipping blank or malformed lines"""
+    events: List[Dict[str, Any]] = []
+    for part in rotated_paths(path):
+        with open(part, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return events
+
+
+def load_events(requests_path: Path, clicks_path: Path, recent_path: Optional[Path] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Load logged search requests and clicks from JSONL logs and/or an /observability/recent dump"""
+    reqs = load_jsonl(requests_path)
+    clicks = load_jsonl(clicks_path)
+    if recent_path and recent_path.exists():
+        data = json.loads(recent_path.read_text(encoding="utf-8"))
+        reqs.extend(data.get("requests") or [])
+        clicks.extend(data.get("clicks") or [])
+    return reqs, clicks
+
+
+def click_gain(click: Dict[str, Any]) -> int:
+    try:
+        dwell = float(click.get("dwell_ms") or 0)
+    except (TypeError, ValueError):
+        dwell = 0.0
+    return 2 if dwell >= LONG_DWELL_MS else 1
+
+
+def build_judgments(reqs: Iterable[Dict[str, Any]], clicks: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Group clicks by normalized query text into graded relevance judgments {movie_id: gain}"""
+    query_by_rid: Dict[str, str] = {}
+    for r in reqs:
+        rid = r.get("request_id")
+        q = (r.get("q") or "").strip()
+        if rid and q:
+            query_by_rid[rid] = q
+    judged: Dict[str, Dict[str, Any]] = {}
+    for c in clicks:
+        q = query_by_rid.get(c.get("request_id"))
+        movie_id = c.get("movie_id")
+        if not q or not movie_id:
+            continue
+        key = q.lower()
+        j = judged.setdefault(key, {"q": q, "relevance": {}, "clicks": 0})
+        j["relevance"][movie_id] = max(j["relevance"].get(movie_id, 0), click_gain(c))
+        j["clicks"] += 1
+    return list(judged.values())
+
+
+def dcg(gains: List[int]) -> float:
+    return sum((2 ** g - 1) / math.log2(i + 2) for i, g in enumerate(gains))
+
+
+def ndcg_at(ranked: List[str], relevance: Dict[str, int], n: int) -> float:
+    ideal = dcg(sorted(relevance.values(), reverse=True)[:n])
+    if ideal == 0:
+        return 0.0
+    return dcg([relevance.get(pid, 0) for pid in ranked[:n]]) / ideal
+
+
+def reciprocal_rank(ranked: List[str], relevance: Dict[str, int]) -> float:
+    for i, pid in enumerate(ranked, start=1):
+        if relevance.get(pid):
+            return 1.0 / i
+    return 0.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list"""
+    if not values:
+        return 0.0
+    vals = sorted(values)
+    idx = max(0, min(len(vals) - 1, int(math.ceil(pct / 100.0 * len(vals))) - 1))
+    return vals[idx]
+
+
+def evaluate(judgments: List[Dict[str, Any]], strategies: List[str], pools: List[int], limit: int = 10,
+             weights: Optional[List[float]] = None, rrf_k: float = DEFAULT_RRF_K) -> Dict[str, Any]:
+    """Replay judged queries for each (pool size, strategy) pair and aggregate quality and latency"""
+    # Importing api builds the keyword and vector indexes from the current catalog
+    import api
+
+    rows: List[Dict[str, Any]] = []
+    for pool in pools:
+        per_strategy: Dict[str, Dict[str, List[float]]] = {
+            s: {"ndcg": [], "mrr": [], "recall": [], "fusion_ms": []} for s in strategies
+        }
+        retrieval_ms: List[float] = []
+        for j in judgments:
+            q = j["q"]
+            intent = api.generation.search_engine.parse_intent(q)
+            t0 = time.perf_counter()
+            kw_hits = api.keyword_retrieve(intent.get("expanded_query") or q, pool)
+            vec_hits = api.vector_retrieve(api.build_vector_query(q, intent), pool)
+            retrieval_ms.append((time.perf_counter() - t0) * 1000.0)
+            inputs = api.fusion_inputs(kw_hits, vec_hits)
+            relevant = j["relevance"]
+            for s in strategies:
+                t1 = time.perf_counter()
+                fused = fuse(s, inputs, k=max(pool, limit), weights=weights, rrf_k=rrf_k)
+                per_strategy[s]["fusion_ms"].append((time.perf_counter() - t1) * 1000.0)
+                ranked = [pid for pid, _s in fused][:limit]
+                per_strategy[s]["ndcg"].append(ndcg_at(ranked, relevant, limit))
+                per_strategy[s]["mrr"].append(reciprocal_rank(ranked, relevant))
+                per_strategy[s]["recall"].append(len(set(ranked) & set(relevant)) / len(relevant))
+        n = max(1, len(judgments))
+        for s in strategies:
+            m = per_strategy[s]
+            rows.append({
+                "strategy": s,
+                "pool": pool,
+                "queries": len(judgments),
+                f"ndcg@{limit}": round(sum(m["ndcg"]) / n, 4),
+                "mrr": round(sum(m["mrr"]) / n, 4),
+                f"recall@{limit}": round(sum(m["recall"]) / n, 4),
+                "fusion_ms_mean": round(sum(m["fusion_ms"]) / n, 4),
+                "fusion_ms_p95": round(percentile(m["fusion_ms"], 95), 4),
+                "retrieval_ms_mean": round(sum(retrieval_ms) / n, 3),
+                "retrieval_ms_p95": round(percentile(retrieval_ms, 95), 3),
+            })
+    return {"limit": limit, "rrf_k": rrf_k, "weights": weights, "rows": rows}
+
+
+def recommend(report: Dict[str, Any], tolerance: float = 0.01) -> List[Dict[str, Any]]:
+    """For each strategy, the smallest pool whose NDCG is within `tolerance` of that strategy's best"""
+    metric = f"ndcg@{report['limit']}"
+    picks: List[Dict[str, Any]] = []
+    by_strategy: Dict[str, List[Dict[str, Any]]] = {}
+    for row in report["rows"]:
+        by_strategy.setdefault(row["strategy"], []).append(row)
+    for s, rows in by_strategy.items():
+        best = max(r[metric] for r in rows)
+        ok = sorted((r for r in rows if r[metric] >= best - tolerance), key=lambda r: r["pool"])
+        picks.append({"strategy": s, "pool": ok[0]["pool"], metric: ok[0][metric], "mrr": ok[0]["mrr"]})
+    picks.sort(key=lambda p: (-p[metric], p["pool"]))
+    return picks
+
+
+def print_report(report: Dict[str, Any], picks: List[Dict[str, Any]]) -> None:
+    metric = f"ndcg@{report['limit']}"
+    print(f"{'strategy':<10} {'pool':>5} {metric:>9} {'mrr':>7} {'fuse ms':>8} {'p95':>7} {'retr ms':>8}")
+    for r in report["rows"]:
+        print(f"{r['strategy']:<10} {r['pool']:>5} {r[metric]:>9.4f} {r['mrr']:>7.4f} "
+              f"{r['fusion_ms_mean']:>8.3f} {r['fusion_ms_p95']:>7.3f} {r['retrieval_ms_mean']:>8.2f}")
+    print("\nRecommended (smallest pool within tolerance of each strategy's best):")
+    for p in picks:
+        print(f"  {p['strategy']:<10} pool={p['pool']:<5} {metric}={p[metric]:.4f} mrr={p['mrr']:.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate hybrid search fusion strategies against logged clicks")
+    parser.add_argument("--requests", type=Path, default=DEFAULT_LOG_DIR / "requests.jsonl", help="Logged /search requests (JSONL)")
+    parser.add_argument("--clicks", type=Path, default=DEFAULT_LOG_DIR / "clicks.jsonl", help="Logged click events (JSONL)")
+    parser.add_argument("--recent", type=Path, default=None, help="Optional saved /observability/recent JSON response")
+    parser.add_argument("--strategies", type=str, default=",".join(FUSION_STRATEGIES), help="Comma-separated fusion strategies")
+    parser.add_argument("--pools", type=str, default="10,20,40,60,100", help="Comma-separated candidate pool sizes per retriever")
+    parser.add_argument("--limit", type=int, default=10, help="Cutoff for NDCG/recall")
+    parser.add_argument("--w-kw", type=float, default=1.0, help="Keyword retriever weight")
+    parser.add_argument("--w-vec", type=float, default=1.0, help="Vector retriever weight")
+    parser.add_argument("--rrf-k", type=float, default=DEFAULT_RRF_K, help="RRF damping constant")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="NDCG tolerance when recommending a pool size")
+    parser.add_argument("--out", type=Path, default=None, help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    strategies = [s.strip().lower() for s in args.strategies.split(",") if s.strip()]
+    unknown = [s for s in strategies if s not in FUSION_STRATEGIES]
+    if unknown:
+        raise SystemExit(f"Unknown strategies: {unknown}; expected {sorted(FUSION_STRATEGIES)}")
+    pools = sorted({int(x) for x in args.pools.split(",") if x.strip()})
+
+    reqs, clicks = load_events(args.requests, args.clicks, args.recent)
+    judgments = build_judgments(reqs, clicks)
+    if not judgments:
+        raise SystemExit(f"No clicked queries found ({len(reqs)} requests, {len(clicks)} clicks)")
+    print(f"Replaying {len(judgments)} judged queries from {len(reqs)} requests / {len(clicks)} clicks")
+
+    report = evaluate(judgments, strategies, pools, limit=args.limit, weights=[args.w_kw, args.w_vec], rrf_k=args.rrf_k)
+    picks = recommend(report, tolerance=args.tolerance)
+    report["recommended"] = picks
+    print_report(report, picks)
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nWrote report to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
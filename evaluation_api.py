@@ -5,13 +5,14 @@ Provides REST API endpoints for the movie profile evaluation frontend.
 """
 
 from flask import Flask, jsonify, request, render_template
-import json
 import os
 from typing import Dict, Any, List
 from llm_movie_evaluator import LLMJudge, GroundTruthGenerator, AutomatedEvaluationPipeline
 from llm_validation_system import ValidationPipeline
 import traceback
 
+from catalog_store import get_catalog_store
+
 
 app = Flask(__name__)
 
@@ -23,11 +24,10 @@ movie_profiles = {}
 
 
 def load_movie_profiles():
-    """Load movie profiles from JSON file"""
+    """Load movie profiles from the catalog store"""
     global movie_profiles
     try:
-        with open('movie_profiles_merged.json', 'r') as f:
-            movie_profiles = json.load(f)
+        movie_profiles = get_catalog_store().all()
         print(f"Loaded {len(movie_profiles)} movie profiles")
         return True
     except Exception as e:
@@ -135,19 +135,14 @@ def get_movies():
 def get_movie_profile(movie_title):
     """Get detailed profile for a specific movie"""
     try:
-        # Ensure movie profiles are loaded
-        global movie_profiles
-        if not movie_profiles:
-            load_movie_profiles()
-            
-        if movie_title not in movie_profiles:
+        # Single-movie read from the catalog store
+        movie_data = get_catalog_store().get(movie_title)
+        if movie_data is None:
             return jsonify({
                 'success': False,
                 'error': f'Movie "{movie_title}" not found'
             }), 404
         
-        movie_data = movie_profiles[movie_title]
-        
         # Extract and format the profile
         profile = {
             'title': movie_data.get('title', movie_title),
@@ -189,23 +184,19 @@ def get_movie_profile(movie_title):
 def evaluate_movie(movie_title):
     """Generate ground truth and evaluate a movie profile"""
     try:
-        # Ensure movie profiles are loaded
-        global movie_profiles, judge, ground_truth_generator
-        if not movie_profiles:
-            load_movie_profiles()
+        global judge, ground_truth_generator
         
         # Ensure evaluation components are initialized
         if not judge or not ground_truth_generator:
             initialize_evaluation_system()
             
-        if movie_title not in movie_profiles:
+        movie_data = get_catalog_store().get(movie_title)
+        if movie_data is None:
             return jsonify({
                 'success': False,
                 'error': f'Movie "{movie_title}" not found'
             }), 404
         
-        movie_data = movie_profiles[movie_title]
-        
         # Generate ground truth
         print(f"Generating ground truth for {movie_title}...")
         ground_truth = ground_truth_generator.generate_reference_profile(movie_data)
@@ -276,21 +267,21 @@ def batch_evaluate():
             }), 400
         
         results = []
-        # Ensure movie profiles are loaded
-        global movie_profiles, judge, ground_truth_generator
-        if not movie_profiles:
-            load_movie_profiles()
+        global judge, ground_truth_generator
         
         # Ensure evaluation components are initialized
         if not judge or not ground_truth_generator:
             initialize_evaluation_system()
+        
+        # Fetch only the requested movies from the catalog store
+        selected = get_catalog_store().get_many(movie_titles[:max_movies])
             
         for i, movie_title in enumerate(movie_titles[:max_movies]):
             try:
-                if movie_title not in movie_profiles:
+                if movie_title not in selected:
                     continue
                 
-                movie_data = movie_profiles[movie_title]
+                movie_data = selected[movie_title]
                 
                 # Generate ground truth
                 ground_truth = ground_truth_generator.generate_reference_profile(movie_data)
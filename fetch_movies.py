@@ -2,11 +2,21 @@
 import os
 import json
 import time
+import re
 import argparse
-from typing import Dict, List, Any, Optional
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple
 import requests
 
-TMDB_BASE = "https://api.themoviedb.org/3"
+from http_cache import CachingAdapter, get_http_cache
+from rate_limit import limited_request
+from stage_pipeline import Stage, stream_stages
+
+# Overridable so tests and benchmarks can point the hydrators at a local stub
+TMDB_BASE = os.getenv("TMDB_API_BASE", "https://api.themoviedb.org/3").rstrip("/")
+OMDB_BASE = os.getenv("OMDB_API_BASE", "https://www.omdbapi.com/")
 
 def load_env_from_dotenv(dotenv_path: str = ".env") -> None:
     """
@@ -25,21 +35,77 @@ def load_env_from_dotenv(dotenv_path: str = ".env") -> None:
             if k and v and k not in os.environ:
                 os.environ[k] = v
 
-def session_with_api_key(api_key: str) -> requests.Session:
+# --- HTTP: response cache + per-upstream rate limits ---
+
+DAY = 24 * 3600
+# Cache TTL per TMDB path (first match wins); details change rarely, search results more often
+TMDB_CACHE_TTLS = [
+    (re.compile(r"^/movie/\d+$"), 7 * DAY),
+    (re.compile(r"^/movie/\d+/credits$"), 7 * DAY),
+    (re.compile(r"^/person/\d+/movie_credits$"), 3 * DAY),
+    (re.compile(r"^/(search|discover)/"), 1 * DAY),
+    (re.compile(r"^/(movie/top_rated|list/)"), 1 * DAY),
+]
+TMDB_DEFAULT_TTL = 1 * DAY
+OMDB_CACHE_TTL = 30 * DAY
+
+def upstream_for(url: str) -> Optional[str]:
+    """Rate-limit bucket for a URL: "tmdb", "omdb", or None for anything else (scraped pages)"""
+    if url.startswith(TMDB_BASE):
+        return "tmdb"
+    if url.startswith(OMDB_BASE.rstrip("/")):
+        return "omdb"
+    return None
+
+def cache_ttl(url: str) -> Optional[float]:
+    """Seconds a TMDB/OMDb response may be served from the HTTP cache; None = never cached"""
+    upstream = upstream_for(url)
+    if upstream == "omdb":
+        return OMDB_CACHE_TTL
+    if upstream != "tmdb":
+        return None
+    path = url[len(TMDB_BASE):].split("?", 1)[0]
+    for pattern, ttl in TMDB_CACHE_TTLS:
+        if pattern.match(path):
+            return ttl
+    return TMDB_DEFAULT_TTL
+
+def _send_limited(request: requests.PreparedRequest, send) -> requests.Response:
+    # only real network sends take a token; cache hits are free
+    upstream = upstream_for(request.url)
+    return limited_request(upstream, send) if upstream else send()
+
+def cached_adapter(pool_maxsize: int = 10) -> CachingAdapter:
+    return CachingAdapter(get_http_cache(), cache_ttl, _send_limited, pool_maxsize=pool_maxsize)
+
+def cached_session(pool_maxsize: int = 10) -> requests.Session:
+    """Session whose TMDB/OMDb requests go through the HTTP cache and the per-upstream rate limits"""
     s = requests.Session()
-    s.params = {"api_key": api_key}
+    adapter = cached_adapter(pool_maxsize)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
     s.headers.update({"User-Agent": "movie-recommender/0.1"})
     return s
 
+def session_with_api_key(api_key: str, pool_maxsize: int = 10) -> requests.Session:
+    s = cached_session(pool_maxsize)
+    s.params = {"api_key": api_key}
+    return s
+
+_omdb_session: Optional[requests.Session] = None
+
+def omdb_session() -> requests.Session:
+    global _omdb_session
+    if _omdb_session is None:
+        _omdb_session = cached_session()
+    return _omdb_session
+
 def tmdb_get(sess: requests.Session, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
     url = f"{TMDB_BASE}{path}"
     for attempt in range(3):
         try:
+            # sessions from session_with_api_key cache responses and pace/retry 429s in their adapter
             resp = sess.get(url, params=params, timeout=20)
-            if resp.status_code == 429:
-                # Rate-limited — back off
-                time.sleep(1.5 * (attempt + 1))
-                continue
             resp.raise_for_status()
             return resp.json()
         except requests.RequestException:
@@ -83,36 +149,63 @@ def discover_indie_movies(
             time.sleep(0.25)  # be polite
     return movies
 
-def get_movie_details_and_credits(sess: requests.Session, tmdb_id: int) -> Dict[str, Any]:
-    details = tmdb_get(sess, f"/movie/{tmdb_id}", {"append_to_response": "keywords"})
-    credits = tmdb_get(sess, f"/movie/{tmdb_id}/credits", {})
+# Sub-resources fetched together with /movie/{id}, so hydrating a movie is one TMDB request
+TMDB_APPEND = "credits,keywords,images,external_ids"
+IMAGE_BASE = "https://image.tmdb.org/t/p"
+
+def fetch_tmdb_movie(sess: requests.Session, tmdb_id: int) -> Dict[str, Any]:
+    """Raw /movie/{id} response with credits, keywords, images and external_ids appended"""
+    # images are filtered by language when appended; keep English and language-less ones
+    return tmdb_get(sess, f"/movie/{tmdb_id}", {"append_to_response": TMDB_APPEND, "include_image_language": "en,null"})
+
+def _best_image(images: List[Dict[str, Any]]) -> Optional[str]:
+    """file_path of the highest-voted image, preferring English ones"""
+    if not images:
+        return None
+    english = [i for i in images if i.get("iso_639_1") == "en"]
+    return max(english or images, key=lambda i: i.get("vote_average", 0)).get("file_path")
+
+def normalize_tmdb_movie(details: Dict[str, Any], tmdb_id: Optional[int] = None) -> Dict[str, Any]:
+    """One normalized movie record from a fetch_tmdb_movie() response"""
     director = ""
-    for crew in credits.get("crew", []):
+    for crew in (details.get("credits") or {}).get("crew", []):
         if crew.get("job") == "Director":
             director = crew.get("name", "")
             break
-    genre_tags = [g["name"] for g in details.get("genres", [])]
-    plot_summary = details.get("overview") or ""
-    imdb_id = details.get("imdb_id")
-    year = (details.get("release_date") or "0000-00-00")[:4]
-    title = details.get("title", "")
-    
-    # Get poster URL
-    poster_path = details.get("poster_path")
-    poster_url = f"https://image.tmdb.org/t/p/w500{poster_path}" if poster_path else None
-    
+    images = details.get("images") or {}
+    poster_path = _best_image(images.get("posters", [])) or details.get("poster_path")
+    backdrop_path = _best_image(images.get("backdrops", [])) or details.get("backdrop_path")
+    keywords = (details.get("keywords") or {}).get("keywords", [])
     return {
-        "title": title,
-        "year": year,
+        "title": details.get("title", ""),
+        "year": (details.get("release_date") or "0000-00-00")[:4],
         "director": director,
-        "genre_tags": genre_tags,
-        "plot_summary": plot_summary,
+        "genre_tags": [g["name"] for g in details.get("genres", [])],
+        "plot_summary": details.get("overview") or "",
         "visual_style": "",
-        "imdb_id": imdb_id,
-        "tmdb_id": tmdb_id,
-        "poster_url": poster_url,
+        "imdb_id": details.get("imdb_id") or (details.get("external_ids") or {}).get("imdb_id"),
+        "tmdb_id": tmdb_id if tmdb_id is not None else details.get("id"),
+        "poster_url": f"{IMAGE_BASE}/w500{poster_path}" if poster_path else None,
+        "backdrop_url": f"{IMAGE_BASE}/w1280{backdrop_path}" if backdrop_path else None,
+        "runtime": details.get("runtime"),
+        "vote_average": details.get("vote_average"),
+        "vote_count": details.get("vote_count"),
+        "keywords": [k["name"] for k in keywords if k.get("name")],
     }
 
+def hydrate_tmdb_movie(sess: requests.Session, tmdb_id: int) -> Dict[str, Any]:
+    """Details, director, genres, keywords, best images and imdb_id of a movie in a single TMDB request"""
+    return normalize_tmdb_movie(fetch_tmdb_movie(sess, tmdb_id), tmdb_id)
+
+# Older names still imported by scripts (archive/processing_scripts/director_movie_collector.py)
+def get_movie_details_and_credits(sess: requests.Session, tmdb_id: int) -> Dict[str, Any]:
+    """Same as hydrate_tmdb_movie (the record now also includes keywords, backdrop and runtime)"""
+    return hydrate_tmdb_movie(sess, tmdb_id)
+
+def tmdb_external_ids(sess: requests.Session, tmdb_id: int) -> Dict[str, Any]:
+    """Raw /movie/{id}/external_ids; hydrate_tmdb_movie already fills imdb_id from it"""
+    return tmdb_get(sess, f"/movie/{tmdb_id}/external_ids", {})
+
 def _best(value: Optional[str]) -> Optional[str]:
     if not value or value == "N/A":
         return None
@@ -132,7 +225,7 @@ def enrich_with_omdb(core: Dict[str, Any], omdb_api_key: Optional[str]) -> Dict[
         else:
             return core
     try:
-        r = requests.get("https://www.omdbapi.com/", params=params, timeout=20)
+        r = omdb_session().get(OMDB_BASE, params=params, timeout=20)
         r.raise_for_status()
         data = r.json()
     except requests.RequestException:
@@ -232,26 +325,186 @@ def tmdb_search_movie(sess: requests.Session, title: str, year: Optional[str]) -
         return None
     return results[0].get("id")
 
-def tmdb_external_ids(sess: requests.Session, tmdb_id: int) -> Dict[str, Any]:
-    return tmdb_get(sess, f"/movie/{tmdb_id}/external_ids", {})
-
-def load_seeds_csv(csv_path: str) -> List[Dict[str, Optional[str]]]:
+def parse_seeds_csv(lines: Iterable[str]) -> Iterator[Dict[str, Optional[str]]]:
     """
     CSV columns supported: title,year,imdb_id,tmdb_id
-    Header required. Extra columns ignored.
+    Header required. Extra columns ignored. Rows are parsed as they are read.
     """
     import csv
-    rows: List[Dict[str, Optional[str]]] = []
+    for row in csv.DictReader(lines):
+        yield {
+            "title": (row.get("title") or "").strip(),
+            "year": (row.get("year") or "").strip(),
+            "imdb_id": (row.get("imdb_id") or "").strip(),
+            "tmdb_id": (row.get("tmdb_id") or "").strip(),
+        }
+
+def load_seeds_csv(csv_path: str) -> List[Dict[str, Optional[str]]]:
     with open(csv_path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            rows.append({
-                "title": (row.get("title") or "").strip(),
-                "year": (row.get("year") or "").strip(),
-                "imdb_id": (row.get("imdb_id") or "").strip(),
-                "tmdb_id": (row.get("tmdb_id") or "").strip(),
-            })
-    return rows
+        return list(parse_seeds_csv(f))
+
+# --- Concurrent list pages + seed hydration ---
+# List pages requested ahead of the one being parsed; the sites themselves are paced by their
+# rate_limit.py bucket (RATE_LIMIT_LETTERBOXD, RATE_LIMIT_BFI, RATE_LIMIT_WIKIPEDIA)
+SCRAPE_PAGE_PREFETCH = int(os.getenv("SCRAPE_PAGE_PREFETCH", "4"))
+# Seeds resolved and hydrated at once; TMDB and OMDb pacing comes from their rate_limit.py buckets
+HYDRATE_WORKERS = int(os.getenv("HYDRATE_WORKERS", "8"))
+# Finished movies held back (at most) so streamed imports come out in seed order (see iter_movies)
+HYDRATE_REORDER_WINDOW = int(os.getenv("HYDRATE_REORDER_WINDOW", "1000"))
+
+def hydration_session(api_key: str) -> requests.Session:
+    """TMDb session with a connection pool sized for the hydration workers"""
+    return session_with_api_key(api_key, pool_maxsize=max(10, 2 * HYDRATE_WORKERS))
+
+def polite_get(site: str, url: str, headers: Dict[str, str]) -> requests.Response:
+    """GET a list-site page under that site's politeness limit"""
+    return limited_request(site, lambda: requests.get(url, headers=headers, timeout=30))
+
+def iter_pages_ahead(fetch_page: Callable[[int], List[Dict[str, str]]], first_page: int = 2) -> Iterator[List[Dict[str, str]]]:
+    """
+    Seeds of pages first_page, first_page + 1, ... in page order, stopping at the first empty page.
+    SCRAPE_PAGE_PREFETCH pages are in flight at once, so at most that many requests go past the last page.
+    """
+    prefetch = max(1, SCRAPE_PAGE_PREFETCH)
+    pool = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="page-prefetch")
+    try:
+        ahead = deque(pool.submit(fetch_page, page) for page in range(first_page, first_page + prefetch))
+        next_page = first_page + prefetch
+        while ahead:
+            got = ahead.popleft().result()
+            if not got:
+                return
+            ahead.append(pool.submit(fetch_page, next_page))
+            next_page += 1
+            yield got
+    finally:
+        # also reached when the caller stops early (e.g. a page added nothing new)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _fallback_core(seed: Dict[str, Any]) -> Dict[str, Any]:
+    """Shell record for a seed TMDb search misses (some classic/older titles); OMDb may still fill it"""
+    return {
+        "title": seed["title"],
+        "year": seed["year"],
+        "director": "",
+        "genre_tags": [],
+        "plot_summary": "",
+        "visual_style": "",
+        "imdb_id": seed.get("imdb_id") or None,
+        "tmdb_id": None,
+    }
+
+def iter_hydrated_seeds(sess: requests.Session, seeds: Iterable[Dict[str, Any]],
+                        omdb_api_key: Optional[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Resolve seeds ({title, year, imdb_id?, tmdb_id?}) to TMDb, hydrate them and enrich them via OMDb,
+    each step on its own worker threads (stage_pipeline), so the import is bound by the TMDb/OMDb
+    rate limits rather than by request latency.
+    Seeds are deduplicated by title/year before anything is fetched and by TMDb id before hydration.
+    Yields (seed index, movie in the dataset schema) in completion order.
+    """
+    for index, movie in _hydrate_stream(sess, seeds, omdb_api_key, deque()):
+        if movie is not None:
+            yield index, movie
+
+def _hydrate_stream(sess: requests.Session, seeds: Iterable[Dict[str, Any]], omdb_api_key: Optional[str],
+                    fed: "deque[int]") -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """iter_hydrated_seeds() plus (index, None) for seeds that were fetched but dropped; the index of every
+    seed entering the pipeline is appended to `fed` first"""
+    seen_seeds: set = set()
+    resolved: set = set()
+    lock = threading.Lock()
+
+    def items() -> Iterator[Dict[str, Any]]:
+        for index, seed in enumerate(seeds):
+            title = (seed.get("title") or "").strip()
+            year = (seed.get("year") or "").strip()
+            tmdb_id = seed.get("tmdb_id") or None
+            if not title and not tmdb_id:
+                continue
+            key = f"tmdb:{tmdb_id}" if tmdb_id else f"title:{title.lower()}|year:{year}"
+            if key in seen_seeds:
+                continue
+            seen_seeds.add(key)
+            fed.append(index)
+            yield {"index": index, "seed": {**seed, "title": title, "year": year, "tmdb_id": tmdb_id}}
+
+    def resolve(item: Dict[str, Any]) -> Dict[str, Any]:
+        seed = item["seed"]
+        tmdb_id = seed["tmdb_id"] or tmdb_search_movie(sess, seed["title"], seed["year"])
+        if tmdb_id:
+            with lock:
+                item["duplicate"] = tmdb_id in resolved
+                resolved.add(tmdb_id)
+        item["tmdb_id"] = tmdb_id
+        return item
+
+    def hydrate(item: Dict[str, Any]) -> Dict[str, Any]:
+        if not item.get("duplicate"):
+            item["core"] = hydrate_tmdb_movie(sess, item["tmdb_id"]) if item["tmdb_id"] else _fallback_core(item["seed"])
+        return item
+
+    def enrich(item: Dict[str, Any]) -> Dict[str, Any]:
+        if not item.get("duplicate"):
+            core = item["core"]
+            core["critic_reviews"], core["user_reviews"] = [], []
+            # OMDb fills plot, director, genres; may also fix title/year if via imdbID
+            item["core"] = enrich_with_omdb(core, omdb_api_key)
+        return item
+
+    workers = max(1, HYDRATE_WORKERS)
+    stages = [Stage("resolve", resolve, workers), Stage("tmdb", hydrate, workers),
+              Stage("omdb", enrich, max(1, workers // 2))]
+    seen: set = set()
+    for item, result, error in stream_stages(items(), stages):
+        seed = item["seed"]
+        if error is not None:
+            print(f"[hydrate] skipped {seed['title'] or seed['tmdb_id']}: {error}")
+            yield item["index"], None
+            continue
+        if result.get("duplicate"):
+            yield item["index"], None
+            continue
+        core = result["core"]
+        uniq = core.get("imdb_id") or (f"tmdb:{core.get('tmdb_id')}" if core.get("tmdb_id")
+                                       else f"title:{seed['title']}|year:{seed['year']}")
+        # Only keep items with a title (OMDb may sometimes not return anything)
+        if uniq in seen or not core.get("title"):
+            yield item["index"], None
+            continue
+        seen.add(uniq)
+        yield item["index"], map_to_schema(core)
+
+def hydrate_seeds(sess: requests.Session, seeds: Iterable[Dict[str, Any]], omdb_api_key: Optional[str]) -> List[Dict[str, Any]]:
+    """iter_hydrated_seeds() collected in seed order"""
+    return [movie for _, movie in sorted(iter_hydrated_seeds(sess, seeds, omdb_api_key), key=lambda pair: pair[0])]
+
+def iter_movies(sess: requests.Session, seeds: Iterable[Dict[str, Any]], omdb_api_key: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming hydration in seed order, so ranked lists keep their rank. Seeds are consumed lazily and only
+    a bounded number is in flight; movies that finish ahead of an earlier seed wait in a reorder buffer of
+    at most HYDRATE_REORDER_WINDOW movies, so memory stays flat however long the list is. A seed still in
+    flight when the buffer is full is written once it finishes, out of order.
+    """
+    fed: "deque[int]" = deque()
+    done: Dict[int, Optional[Dict[str, Any]]] = {}
+    overtaken: set = set()
+    for index, movie in _hydrate_stream(sess, seeds, omdb_api_key, fed):
+        if index in overtaken:
+            overtaken.discard(index)
+            if movie is not None:
+                yield movie
+            continue
+        done[index] = movie
+        while fed and (fed[0] in done or len(done) > HYDRATE_REORDER_WINDOW):
+            head = fed.popleft()
+            if head not in done:
+                print(f"[hydrate] seed {head} is still in flight after {len(done)} later ones; writing it out of order")
+                overtaken.add(head)
+                continue
+            ready = done.pop(head)
+            if ready is not None:
+                yield ready
 
 # --- Wikipedia scraping helpers (no extra deps) ---
 import re
@@ -263,7 +516,7 @@ def fetch_wikipedia_html(url: str) -> str:
     Uses desktop HTML (not API) to keep it simple.
     """
     headers = {"User-Agent": "movie-recommender/0.1 (+https://example.com)"}
-    r = requests.get(url, headers=headers, timeout=30)
+    r = polite_get("wikipedia", url, headers)
     r.raise_for_status()
     return r.text
 
@@ -322,59 +575,13 @@ def hydrate_from_wikipedia(sess: requests.Session, url: str, omdb_api_key: Optio
     """
     Scrape a Wikipedia list page (like AFI Top 100), then resolve via TMDb + enrich via OMDb.
     """
-    seeds = scrape_wikipedia_movies(url)
-    results: List[Dict[str, Any]] = []
-    seen: set = set()
+    return hydrate_seeds(sess, scrape_wikipedia_movies(url), omdb_api_key)
 
-    for s in seeds:
-        title = s.get("title") or ""
-        year = s.get("year") or ""
-        if not title:
-            continue
+def iter_hydrate_from_wikipedia(sess: requests.Session, url: str, omdb_api_key: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """hydrate_from_wikipedia() yielding movies as they are hydrated"""
+    yield from iter_movies(sess, scrape_wikipedia_movies(url), omdb_api_key)
 
-        # Resolve to TMDb ID (title + year if possible)
-        tmdb_id = tmdb_search_movie(sess, title, year)
-        core: Dict[str, Any]
-
-        if tmdb_id:
-            core = get_movie_details_and_credits(sess, tmdb_id)
-            # Ensure imdb_id if missing
-            if not core.get("imdb_id"):
-                ext = tmdb_external_ids(sess, tmdb_id)
-                if ext.get("imdb_id"):
-                    core["imdb_id"] = ext["imdb_id"]
-        else:
-            # Fallback shell in case TMDb search misses some classic/older titles
-            core = {
-                "title": title,
-                "year": year,
-                "director": "",
-                "genre_tags": [],
-                "plot_summary": "",
-                "visual_style": "",
-                "imdb_id": None,
-                "tmdb_id": None,
-            }
-
-        core["critic_reviews"] = []
-        core["user_reviews"] = []
-
-        # OMDb enrichment (fills plot, director, genres; may also fix title/year if via imdbID)
-        core = enrich_with_omdb(core, omdb_api_key)
-
-        uniq = core.get("imdb_id") or (f"tmdb:{core.get('tmdb_id')}" if core.get("tmdb_id") else f"title:{title}|year:{year}")
-        if uniq in seen:
-            continue
-        seen.add(uniq)
-
-        # Only keep items with a title (OMDb may sometimes not return anything)
-        if core.get("title"):
-            results.append(map_to_schema(core))
-
-        time.sleep(0.2)  # be polite
-
-    return results
-def build_dataset(
+def dataset_seeds(
     pages: int,
     languages: List[str],
     since: str,
@@ -389,7 +596,11 @@ def build_dataset(
     wiki_url: Optional[str],
     bfi_url: Optional[str] = None,
     letterboxd_url: Optional[str] = None,
-) -> Dict[str, Any]:
+) -> Tuple[requests.Session, Iterable[Dict[str, Any]], Optional[str]]:
+    """
+    (TMDb session, seeds, OMDb key) for a source. Options are checked here; list sites are read lazily
+    as the seeds are consumed.
+    """
     load_env_from_dotenv()
     tmdb_api_key = os.environ.get("TMDB_API_KEY")
     omdb_api_key = os.environ.get("OMDB_API_KEY")
@@ -397,58 +608,39 @@ def build_dataset(
     if not tmdb_api_key:
         raise SystemExit("TMDB_API_KEY is not set in environment or .env")
 
-    sess = session_with_api_key(tmdb_api_key)
+    sess = hydration_session(tmdb_api_key)
 
     if source == "top_rated":
         discovered = fetch_top_rated(sess, count=count, region=region)
-        results = []
-        seen: set = set()
-        for m in discovered:
-            tmdb_id = m["id"]
-            core = get_movie_details_and_credits(sess, tmdb_id)
-            uniq = core.get("imdb_id") or f"tmdb:{tmdb_id}"
-            if uniq in seen:
-                continue
-            seen.add(uniq)
-            core["critic_reviews"] = []
-            core["user_reviews"] = []
-            core = enrich_with_omdb(core, omdb_api_key)
-            results.append(map_to_schema(core))
-            time.sleep(0.25)
-        return {"movies": results}
+        return sess, ({"tmdb_id": m["id"]} for m in discovered), omdb_api_key
 
     if source == "tmdb_list":
         if not list_id:
             raise SystemExit("--list-id is required for source=tmdb_list")
-        results = hydrate_from_tmdb_list(sess, list_id, omdb_api_key)
-        return {"movies": results}
+        return sess, tmdb_list_seeds(sess, list_id), omdb_api_key
 
     if source == "csv":
         if not csv_path:
             raise SystemExit("--csv-path is required for source=csv")
-        results = hydrate_from_csv(sess, csv_path, omdb_api_key)
-        return {"movies": results}
+        return sess, csv_file_seeds(csv_path), omdb_api_key
 
     if source == "wikipedia":
         if not wiki_url:
             raise SystemExit("--wiki-url is required for source=wikipedia")
-        results = hydrate_from_wikipedia(sess, wiki_url, omdb_api_key)
-        return {"movies": results}
+        return sess, scrape_wikipedia_movies(wiki_url), omdb_api_key
 
     if source == "bfi":
         # Prefer explicit --bfi-url, but allow repurposing --wiki-url for convenience
         url = bfi_url or wiki_url
         if not url:
             raise SystemExit("--bfi-url is required for source=bfi (or provide --wiki-url as the BFI URL)")
-        results = hydrate_from_bfi(sess, url, omdb_api_key)
-        return {"movies": results}
+        return sess, iter_bfi_seeds(url), omdb_api_key
 
     if source == "letterboxd":
         url = letterboxd_url
         if not url:
             raise SystemExit("--letterboxd-url is required for source=letterboxd")
-        results = hydrate_from_letterboxd(sess, url, omdb_api_key)
-        return {"movies": results}
+        return sess, iter_letterboxd_seeds(url), omdb_api_key
 
     # default: discover mode (indie-ish)
     indie_kw_id = find_keyword_id(sess, "independent film")
@@ -462,23 +654,37 @@ def build_dataset(
         min_vote_count=min_vote_count,
         include_adult=include_adult,
     )
+    return sess, ({"tmdb_id": m["id"]} for m in discovered), omdb_api_key
 
-    results = []
-    seen: set = set()
-    for m in discovered:
-        tmdb_id = m["id"]
-        core = get_movie_details_and_credits(sess, tmdb_id)
-        uniq = core.get("imdb_id") or f"tmdb:{tmdb_id}"
-        if uniq in seen:
-            continue
-        seen.add(uniq)
-        core["critic_reviews"] = []
-        core["user_reviews"] = []
-        core = enrich_with_omdb(core, omdb_api_key)
-        results.append(map_to_schema(core))
-        time.sleep(0.25)
+def build_dataset(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+    """{"movies": [...]} in source order; takes the arguments of dataset_seeds()"""
+    sess, seeds, omdb_api_key = dataset_seeds(*args, **kwargs)
+    return {"movies": hydrate_seeds(sess, seeds, omdb_api_key)}
+
+def iter_dataset(*args: Any, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    build_dataset() as a stream: movies are yielded in source order as they are hydrated, with memory
+    independent of the list size. Takes the arguments of dataset_seeds(); bad options fail on the call.
+    """
+    sess, seeds, omdb_api_key = dataset_seeds(*args, **kwargs)
+    return iter_movies(sess, seeds, omdb_api_key)
 
-    return {"movies": results}
+def write_movies_json(movies: Iterable[Dict[str, Any]], out_path: str, progress_every: int = 50) -> int:
+    """
+    Write {"movies": [...]} to out_path one movie at a time as they arrive (flushed, so the file grows
+    during a long import); returns the number written.
+    """
+    count = 0
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write('{\n  "movies": [')
+        for movie in movies:
+            f.write(("," if count else "") + "\n    " + json.dumps(movie, ensure_ascii=False))
+            f.flush()
+            count += 1
+            if count % progress_every == 0:
+                print(f"... {count} movies written")
+        f.write("\n  ]\n}\n")
+    return count
 
 def main():
     parser = argparse.ArgumentParser(description="Build movie dataset via TMDb + optional OMDb enrichment.")
@@ -512,7 +718,7 @@ def main():
     max_vote = None if args.max_vote_count == 0 else args.max_vote_count
     languages = [x.strip() for x in args.languages.split(",") if x.strip()]
 
-    dataset = build_dataset(
+    movies = iter_dataset(
         pages=args.pages,
         languages=languages,
         since=args.since,
@@ -529,9 +735,8 @@ def main():
         letterboxd_url=args.letterboxd_url,
     )
 
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(dataset, f, indent=2, ensure_ascii=False)
-    print(f"Wrote {len(dataset['movies'])} movies to {args.out}")
+    written = write_movies_json(movies, args.out)
+    print(f"Wrote {written} movies to {args.out}")
 
 # --- BFI Sight & Sound scraping helpers (site-specific, no extra deps) ---
 import re as _re
@@ -577,7 +782,7 @@ def fetch_bfi_html(url: str) -> str:
             "Connection": "close",
         }
         try:
-            r = requests.get(url, headers=headers, timeout=30)
+            r = polite_get("bfi", url, headers)
             # Some CDNs return 403 with a JavaScript challenge page — surface as error to try next UA
             if r.status_code >= 400:
                 r.raise_for_status()
@@ -599,7 +804,7 @@ def fetch_bfi_html(url: str) -> str:
             "Referer": BFI_BASE + "/sight-and-sound",
             "Connection": "close",
         }
-        r = requests.get(url, headers=headers, timeout=30)
+        r = polite_get("bfi", url, headers)
         r.raise_for_status()
         return r.text
     except Exception as e:
@@ -729,32 +934,41 @@ def parse_bfi_titles(html: str) -> List[Dict[str, str]]:
 
     return []
 
-def scrape_bfi_sight_and_sound(url: str) -> List[Dict[str, str]]:
+def iter_bfi_seeds(url: str) -> Iterator[Dict[str, str]]:
     """
-    Fetch the BFI page and aggregate titles. If the main page yields nothing,
-    try the AMP variant, and paginate both normal and AMP (?page=2,3,...).
+    Fetch the BFI page and yield its titles, then those of later pages as they arrive. If the main page
+    yields nothing, try the AMP variant, and paginate both normal and AMP (?page=2,3,...).
     If still empty, auto-discover candidate subpages from the hub page (e.g.,
     '/sight-and-sound/polls/...-100') and aggregate titles from those pages too.
     """
-    seeds: List[Dict[str, str]] = []
+    found: set = set()
+
+    def new_seeds(got: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        fresh = []
+        for g in got:
+            k = (g.get("title") or "", g.get("year") or "")
+            if k not in found:
+                found.add(k)
+                fresh.append(g)
+        return fresh
+
     try:
         html = fetch_bfi_html(url)
     except Exception:
-        return []
-    seeds.extend(parse_bfi_titles(html))
+        return
+    yield from new_seeds(parse_bfi_titles(html))
 
     # Fallback to AMP when nothing is found
-    if not seeds:
+    if not found:
         amp = url.rstrip("/") + "/amp"
         try:
             html_amp = fetch_bfi_html(amp)
-            seeds.extend(parse_bfi_titles(html_amp))
+            yield from new_seeds(parse_bfi_titles(html_amp))
         except Exception:
             pass
 
-    # Paginate normal and AMP variants
-    page = 2
-    while True:
+    # Paginate normal and AMP variants, a few pages ahead
+    def fetch_page(page: int) -> List[Dict[str, str]]:
         more: List[Dict[str, str]] = []
         paged = url + ("&" if "?" in url else "?") + f"page={page}"
         try:
@@ -767,22 +981,16 @@ def scrape_bfi_sight_and_sound(url: str) -> List[Dict[str, str]]:
                 more = parse_bfi_titles(fetch_bfi_html(paged_amp))
             except Exception:
                 more = []
-        if not more:
-            break
-        existing = {(s.get("title") or "", s.get("year") or "") for s in seeds}
-        added = 0
-        for m in more:
-            k = (m.get("title") or "", m.get("year") or "")
-            if k not in existing:
-                seeds.append(m)
-                added += 1
-        if added == 0:
+        return more
+
+    for more in iter_pages_ahead(fetch_page):
+        added = new_seeds(more)
+        if not added:
             break
-        page += 1
-        time.sleep(0.2)
+        yield from added
 
     # If still empty, auto-discover likely subpages (hub page case)
-    if not seeds and html:
+    if not found and html:
         # Find candidate links to poll/list pages and top-100 variants
         sub_links = []
         for am in _re.finditer(r'<a[^>]+href="(/sight-and-sound/[^"]+)"', html, flags=_re.I):
@@ -795,12 +1003,12 @@ def scrape_bfi_sight_and_sound(url: str) -> List[Dict[str, str]]:
                 absolute = href if href.startswith("http") else (BFI_BASE + href)
                 if absolute not in sub_links:
                     sub_links.append(absolute)
-        # Try a small set of most promising links first
-        for link in sub_links[:8]:
+
+        def fetch_subpage(link: str) -> List[Dict[str, str]]:
             try:
                 sub_html = fetch_bfi_html(link)
             except Exception:
-                continue
+                return []
             got = parse_bfi_titles(sub_html)
             if not got:
                 # try AMP of subpage too
@@ -809,17 +1017,16 @@ def scrape_bfi_sight_and_sound(url: str) -> List[Dict[str, str]]:
                     got = parse_bfi_titles(fetch_bfi_html(sub_amp))
                 except Exception:
                     got = []
-            if got:
-                existing = {(s.get("title") or "", s.get("year") or "") for s in seeds}
-                for g in got:
-                    k = (g.get("title") or "", g.get("year") or "")
-                    if k not in existing:
-                        seeds.append(g)
-                # No need to paginate subpages aggressively; lists are usually complete
-            time.sleep(0.15)
+            return got
+
+        # Try a small set of most promising links first, fetched together (merged in link order)
+        # No need to paginate subpages aggressively; lists are usually complete
+        with ThreadPoolExecutor(max_workers=max(1, SCRAPE_PAGE_PREFETCH)) as pool:
+            for got in pool.map(fetch_subpage, sub_links[:8]):
+                yield from new_seeds(got)
 
     # Deterministic fallbacks for common hub URL → specific poll list pages
-    if not seeds and ("/sight-and-sound/greatest-films-all-time" in url):
+    if not found and ("/sight-and-sound/greatest-films-all-time" in url):
         fallback_candidates = [
             BFI_BASE + "/sight-and-sound/polls/greatest-films-all-time-2022/top-100",
             BFI_BASE + "/sight-and-sound/polls/directors-100-greatest-films-all-time-2022",
@@ -837,15 +1044,11 @@ def scrape_bfi_sight_and_sound(url: str) -> List[Dict[str, str]]:
                 except Exception:
                     got = []
             if got:
-                existing = {(s.get("title") or "", s.get("year") or "") for s in seeds}
-                for g in got:
-                    k = (g.get("title") or "", g.get("year") or "")
-                    if k not in existing:
-                        seeds.append(g)
+                yield from new_seeds(got)
                 break  # stop at first working fallback
 
     # Final notice if still nothing
-    if not seeds:
+    if not found:
         print("[WARN] BFI scraper: found 0 titles for:", url)
         try:
             snippet = (html or "")[:600]
@@ -854,47 +1057,16 @@ def scrape_bfi_sight_and_sound(url: str) -> List[Dict[str, str]]:
         except Exception:
             pass
 
-    return seeds
+def scrape_bfi_sight_and_sound(url: str) -> List[Dict[str, str]]:
+    """All titles of a BFI Sight & Sound list (see iter_bfi_seeds)"""
+    return list(iter_bfi_seeds(url))
 
 def hydrate_from_bfi(sess: requests.Session, url: str, omdb_api_key: Optional[str]) -> List[Dict[str, Any]]:
-    seeds = scrape_bfi_sight_and_sound(url)
-    results: List[Dict[str, Any]] = []
-    seen: set = set()
+    return hydrate_seeds(sess, scrape_bfi_sight_and_sound(url), omdb_api_key)
 
-    for s in seeds:
-        title = s.get("title") or ""
-        year = s.get("year") or ""
-        if not title:
-            continue
-
-        tmdb_id = tmdb_search_movie(sess, title, year)
-        if tmdb_id:
-            core = get_movie_details_and_credits(sess, tmdb_id)
-            if not core.get("imdb_id"):
-                ext = tmdb_external_ids(sess, tmdb_id)
-                if ext.get("imdb_id"):
-                    core["imdb_id"] = ext["imdb_id"]
-        else:
-            core = {
-                "title": title,
-                "year": year,
-                "director": "",
-                "genre_tags": [],
-                "plot_summary": "",
-                "visual_style": "",
-                "imdb_id": None,
-                "tmdb_id": None,
-            }
-        core["critic_reviews"], core["user_reviews"] = [], []
-        core = enrich_with_omdb(core, omdb_api_key)
-        uniq = core.get("imdb_id") or (f"tmdb:{core.get('tmdb_id')}" if core.get("tmdb_id") else f"title:{title}|year:{year}")
-        if uniq in seen:
-            continue
-        seen.add(uniq)
-        if core.get("title"):
-            results.append(map_to_schema(core))
-        time.sleep(0.2)
-    return results
+def iter_hydrate_from_bfi(sess: requests.Session, url: str, omdb_api_key: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """hydrate_from_bfi() yielding movies as they are hydrated; hydration starts with the first page"""
+    yield from iter_movies(sess, iter_bfi_seeds(url), omdb_api_key)
 
 
 # --- Letterboxd list scraping helpers (no extra deps) ---
@@ -928,7 +1100,7 @@ def fetch_letterboxd_html(url: str) -> str:
             "Referer": LBOX_BASE,
         }
         try:
-            r = requests.get(url, headers=headers, timeout=30)
+            r = polite_get("letterboxd", url, headers)
             if r.status_code >= 400:
                 r.raise_for_status()
             text = r.text
@@ -985,12 +1157,12 @@ def parse_letterboxd_titles(html: str) -> List[Dict[str, str]]:
     return uniq
 
 
-def scrape_letterboxd_list(url: str) -> List[Dict[str, str]]:
-    """Fetch the Letterboxd list and follow pagination `/page/2/`, `/page/3/`, ... until empty."""
+def iter_letterboxd_seeds(url: str) -> Iterator[Dict[str, str]]:
+    """Titles of a Letterboxd list page by page, following `/page/2/`, `/page/3/`, ... (prefetched) until empty."""
     if not url.endswith('/'):
         url = url + '/'
 
-    seeds: List[Dict[str, str]] = []
+    found: set = set()
 
     def fetch_and_parse(u: str) -> List[Dict[str, str]]:
         try:
@@ -998,143 +1170,77 @@ def scrape_letterboxd_list(url: str) -> List[Dict[str, str]]:
         except Exception:
             return []
 
-    seeds.extend(fetch_and_parse(url))
-
-    page = 2
-    while True:
-        paged = url.rstrip('/') + f"/page/{page}/"
-        got = fetch_and_parse(paged)
-        if not got:
-            break
-        existing = {(s.get("title") or "", s.get("year") or "") for s in seeds}
-        added = 0
+    def new_seeds(got: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        fresh = []
         for g in got:
             k = (g.get("title") or "", g.get("year") or "")
-            if k not in existing:
-                seeds.append(g)
-                added += 1
-        if added == 0:
+            if k not in found:
+                found.add(k)
+                fresh.append(g)
+        return fresh
+
+    yield from new_seeds(fetch_and_parse(url))
+
+    # Later pages are requested a few at a time; stop at the first empty one
+    for got in iter_pages_ahead(lambda page: fetch_and_parse(url.rstrip('/') + f"/page/{page}/")):
+        added = new_seeds(got)
+        if not added:
             break
-        page += 1
-        time.sleep(0.2)
+        yield from added
 
-    if not seeds:
+    if not found:
         print("[WARN] Letterboxd scraper: found 0 titles for:", url)
-    return seeds
 
 
-def hydrate_from_letterboxd(sess: requests.Session, url: str, omdb_api_key: Optional[str]) -> List[Dict[str, Any]]:
-    seeds = scrape_letterboxd_list(url)
-    results: List[Dict[str, Any]] = []
-    seen: set = set()
+def scrape_letterboxd_list(url: str) -> List[Dict[str, str]]:
+    """All titles of a Letterboxd list (see iter_letterboxd_seeds)"""
+    return list(iter_letterboxd_seeds(url))
 
-    for s in seeds:
-        title = s.get("title") or ""
-        year = s.get("year") or ""
-        if not title:
-            continue
-        tmdb_id = tmdb_search_movie(sess, title, year)
-        uniq = f"tmdb:{tmdb_id}" if tmdb_id else f"title:{title.lower()}:{year}"
-        if uniq in seen:
-            continue
-        seen.add(uniq)
 
-        if tmdb_id:
-            core = get_movie_details_and_credits(sess, tmdb_id)
-            if not core.get("imdb_id"):
-                ext = tmdb_external_ids(sess, tmdb_id)
-                if ext.get("imdb_id"):
-                    core["imdb_id"] = ext["imdb_id"]
-        else:
-            core = {
-                "id": None,
-                "title": title,
-                "year": year,
-                "release_date": f"{year}-01-01" if year else None,
-                "imdb_id": None,
-                "genres": [],
-                "genre_tags": [],
-                "credits": {"cast": [], "crew": []},
-                "critic_reviews": [],
-                "user_reviews": [],
-                "tmdb_id": None,
-                "plot_summary": "",
-                "visual_style": "",
-                "director": "",
-            }
-        core["critic_reviews"] = []
-        core["user_reviews"] = []
-        core = enrich_with_omdb(core, omdb_api_key)
-        results.append(map_to_schema(core))
-        time.sleep(0.2)
+def hydrate_from_letterboxd(sess: requests.Session, url: str, omdb_api_key: Optional[str]) -> List[Dict[str, Any]]:
+    return hydrate_seeds(sess, scrape_letterboxd_list(url), omdb_api_key)
+
 
-    return results
+def iter_hydrate_from_letterboxd(sess: requests.Session, url: str, omdb_api_key: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """hydrate_from_letterboxd() yielding movies as they are hydrated; hydration starts with the first page"""
+    yield from iter_movies(sess, iter_letterboxd_seeds(url), omdb_api_key)
 
 
 # Minimal implementations to avoid unresolved references for other modes
 
+def tmdb_list_seeds(sess: requests.Session, list_id: str) -> Iterator[Dict[str, Any]]:
+    return ({"tmdb_id": it["id"]} for it in fetch_tmdb_list(sess, list_id) if it.get("id"))
+
+
 def hydrate_from_tmdb_list(sess: requests.Session, list_id: str, omdb_api_key: Optional[str]) -> List[Dict[str, Any]]:
-    items = fetch_tmdb_list(sess, list_id)
-    results: List[Dict[str, Any]] = []
-    seen: set = set()
-    for it in items:
-        tmdb_id = it.get("id")
-        if not tmdb_id:
-            continue
-        core = get_movie_details_and_credits(sess, tmdb_id)
-        uniq = core.get("imdb_id") or f"tmdb:{tmdb_id}"
-        if uniq in seen:
-            continue
-        seen.add(uniq)
-        core["critic_reviews"] = []
-        core["user_reviews"] = []
-        core = enrich_with_omdb(core, omdb_api_key)
-        results.append(map_to_schema(core))
-        time.sleep(0.2)
-    return results
+    return hydrate_seeds(sess, tmdb_list_seeds(sess, list_id), omdb_api_key)
+
+
+def iter_hydrate_from_tmdb_list(sess: requests.Session, list_id: str, omdb_api_key: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """hydrate_from_tmdb_list() yielding movies as they are hydrated"""
+    yield from iter_movies(sess, tmdb_list_seeds(sess, list_id), omdb_api_key)
+
+
+def csv_seeds(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Seeds from CSV lines (an open file, io.StringIO, ...) with tmdb_id as an int (or None)"""
+    for s in parse_seeds_csv(lines):
+        tmdb_id = (s.get("tmdb_id") or "").strip()
+        yield {**s, "tmdb_id": int(tmdb_id) if tmdb_id.isdigit() else None}
+
+
+def csv_file_seeds(csv_path: str) -> Iterator[Dict[str, Any]]:
+    """csv_seeds() of a file, read as the seeds are needed"""
+    with open(csv_path, "r", encoding="utf-8") as f:
+        yield from csv_seeds(f)
 
 
 def hydrate_from_csv(sess: requests.Session, csv_path: str, omdb_api_key: Optional[str]) -> List[Dict[str, Any]]:
-    seeds = load_seeds_csv(csv_path)
-    results: List[Dict[str, Any]] = []
-    seen: set = set()
-    for s in seeds:
-        title = (s.get("title") or "").strip()
-        year = (s.get("year") or "").strip()
-        tmdb_id: Optional[int] = None
-        if (s.get("tmdb_id") or "").strip().isdigit():
-            tmdb_id = int(s.get("tmdb_id") or 0)
-        if not tmdb_id and title:
-            tmdb_id = tmdb_search_movie(sess, title, year)
-        if tmdb_id:
-            core = get_movie_details_and_credits(sess, tmdb_id)
-            if not core.get("imdb_id"):
-                ext = tmdb_external_ids(sess, tmdb_id)
-                if ext.get("imdb_id"):
-                    core["imdb_id"] = ext["imdb_id"]
-        else:
-            if not title:
-                continue
-            core = {
-                "title": title,
-                "year": year,
-                "director": "",
-                "genre_tags": [],
-                "plot_summary": "",
-                "visual_style": "",
-                "imdb_id": s.get("imdb_id") or None,
-                "tmdb_id": None,
-            }
-        core["critic_reviews"], core["user_reviews"] = [], []
-        core = enrich_with_omdb(core, omdb_api_key)
-        uniq = core.get("imdb_id") or (f"tmdb:{core.get('tmdb_id')}" if core.get("tmdb_id") else f"title:{title}|year:{year}")
-        if uniq in seen:
-            continue
-        seen.add(uniq)
-        if core.get("title"):
-            results.append(map_to_schema(core))
-        time.sleep(0.15)
-    return results
+    return hydrate_seeds(sess, csv_file_seeds(csv_path), omdb_api_key)
+
+
+def iter_hydrate_from_csv(sess: requests.Session, csv_path: str, omdb_api_key: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """hydrate_from_csv() yielding movies as they are hydrated"""
+    yield from iter_movies(sess, csv_file_seeds(csv_path), omdb_api_key)
 
 
 if __name__ == "__main__":
@@ -11,14 +11,15 @@ from pathlib import Path
 from typing import Dict, List, Set, Tuple
 from collections import defaultdict
 
+from catalog_journal import load_catalog
+
 def load_movie_profiles(file_path: str = "movie_profiles_merged.json") -> Dict:
     """Load movie profiles from JSON file"""
     if not Path(file_path).exists():
         print(f"❌ File not found: {file_path}")
         return {}
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_catalog(Path(file_path))
 
 def normalize_director_name(name: str) -> str:
     """Normalize director name for comparison"""
@@ -0,0 +1,131 @@
+"""
+In-memory hidden-movie list backed by hidden_movies.json.
+
+The set is loaded once and updated in place by hide()/show(), which also write
+the file. Readers call refresh(), which stats the file at most once per
+CHECK_INTERVAL seconds and reloads only when another process changed it. Every
+change bumps `version`, so callers can cache derived data (e.g. the hidden-id
+bitmap used by /search) per version.
+
+hide()/show() re-read the file under an exclusive lock on `<file>.lock` before
+applying their change, so concurrent edits from several API workers merge
+instead of overwriting each other.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Set
+
+try:
+    import fcntl  # type: ignore
+except Exception:
+    fcntl = None  # no cross-process locking (e.g. Windows); in-process lock only
+
+DEFAULT_PATH = Path("hidden_movies.json")
+# Minimum seconds between stat() calls on the hidden list file
+CHECK_INTERVAL = 1.0
+
+
+class HiddenMovies:
+    """Hidden titles held in memory; `titles` is a stable set object that is mutated in place"""
+
+    def __init__(self, path: Path = DEFAULT_PATH):
+        self.path = Path(path)
+        self.titles: Set[str] = set()
+        self.version = 0
+        self._mtime: Optional[int] = None
+        self._last_check = 0.0
+        self._lock = threading.RLock()
+        self.load()
+
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def load(self) -> None:
+        """(Re)read the file into the set"""
+        with self._lock:
+            mtime = self._file_mtime()
+            titles: Set[str] = set()
+            if mtime is not None:
+                with open(self.path, "r") as f:
+                    titles = set(json.load(f).get("hidden", []))
+            self._mtime = mtime
+            self._last_check = time.monotonic()
+            if titles != self.titles:
+                self.titles.clear()
+                self.titles.update(titles)
+                self.version += 1
+
+    def refresh(self) -> Set[str]:
+        """Pick up edits made by other processes (file mtime, checked at most once per CHECK_INTERVAL)"""
+        now = time.monotonic()
+        if now - self._last_check >= CHECK_INTERVAL:
+            with self._lock:
+                self._last_check = now
+                if self._file_mtime() != self._mtime:
+                    try:
+                        self.load()
+                    except Exception as e:
+                        print(f"[hidden] failed to reload {self.path}: {e}")
+        return self.titles
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock shared with other processes editing the same file"""
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        with open(lock_path, "a+") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def save(self) -> None:
+        """Write the set to the file; also marks it changed for callers that mutated `titles` directly"""
+        with self._lock:
+            self.version += 1
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp, "w") as f:
+                json.dump({"hidden": sorted(self.titles)}, f, indent=2)
+            os.replace(tmp, self.path)
+            self._mtime = self._file_mtime()
+
+    def hide(self, titles: Iterable[str]) -> int:
+        with self._lock, self._file_lock():
+            self.load()
+            before = len(self.titles)
+            self.titles.update(titles)
+            if len(self.titles) != before:
+                self.save()
+            return len(self.titles)
+
+    def show(self, titles: Iterable[str]) -> int:
+        with self._lock, self._file_lock():
+            self.load()
+            before = len(self.titles)
+            self.titles.difference_update(titles)
+            if len(self.titles) != before:
+                self.save()
+            return len(self.titles)
+
+
+_hidden: Optional[HiddenMovies] = None
+_hidden_lock = threading.Lock()
+
+
+def get_hidden_movies() -> HiddenMovies:
+    """Process-wide hidden list (HIDDEN_MOVIES_PATH overrides the default file)"""
+    global _hidden
+    with _hidden_lock:
+        if _hidden is None:
+            _hidden = HiddenMovies(Path(os.getenv("HIDDEN_MOVIES_PATH") or DEFAULT_PATH))
+        return _hidden
@@ -0,0 +1,235 @@
+"""
+Persistent HTTP response cache for the TMDB and OMDb lookups.
+
+CachingAdapter is a requests transport adapter, so every session it is mounted
+on (fetch_movies.session_with_api_key and the OMDb session) gets the cache
+without changes at the call sites:
+- GET responses with status 200 are stored in one SQLite file (HTTP_CACHE_PATH,
+  default http_cache.db), keyed by the normalized URL: lowercased host, sorted
+  query parameters, API keys removed.
+- Each URL gets a TTL from the adapter's ttl_for(url); None means "do not cache".
+- An expired entry with an ETag or Last-Modified is revalidated with
+  If-None-Match / If-Modified-Since; a 304 renews it without a download.
+- Total body size is capped (HTTP_CACHE_MAX_MB, default 256); the least recently
+  used entries are evicted first.
+- Hit/miss/revalidation counters are kept per host (stats()).
+
+Requests that go to the network pass through send_network(request), where the
+caller can add rate limiting. HTTP_CACHE=0 turns caching off (requests still
+go through send_network).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+ROOT = Path(__file__).parent
+DEFAULT_PATH = ROOT / "http_cache.db"
+DEFAULT_MAX_MB = 256
+# Query parameters that carry credentials, not part of what is being asked for
+SECRET_PARAMS = {"api_key", "apikey"}
+# Response headers kept with a cached body
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at);
+"""
+
+
+def normalize_url(url: str) -> str:
+    """URL with a lowercased host, sorted query parameters and no API keys"""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+
+
+class HTTPCache:
+    """SQLite-backed response store with TTLs and an LRU size cap. Safe to share between threads."""
+
+    def __init__(self, path: Path = DEFAULT_PATH, max_bytes: int = DEFAULT_MAX_MB << 20):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._evicted = 0
+
+    def count(self, host: str, event: str) -> None:
+        with self._lock:
+            counters = self._stats.setdefault(host, {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0})
+            counters[event] += 1
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """The stored entry (fresh or not): {headers, body, expires_at}; touches it for LRU"""
+        key = self.key(url)
+        with self._lock:
+            row = self.conn.execute("SELECT headers, body, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return {"headers": json.loads(row[0]), "body": row[1], "expires_at": row[2]}
+
+    def put(self, url: str, headers: Dict[str, str], body: bytes, ttl: float) -> None:
+        now = time.time()
+        key = self.key(url)
+        with self._lock:
+            old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses(key, url, headers, body, size, stored_at, expires_at, accessed_at) "
+                "VALUES(?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, normalize_url(url), json.dumps(headers), body, len(body), now, now + ttl, now),
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def renew(self, url: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self.conn.execute("UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                              (now + ttl, now, self.key(url)))
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is at 90% of its cap"""
+        # other processes share the file, so start from the real total
+        self._size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        while self._size > target:
+            rows = self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at LIMIT 200").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._size <= target:
+                    break
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+                evicted += 1
+        self._evicted += evicted
+
+    def clear(self) -> int:
+        with self._lock:
+            n = self.conn.execute("DELETE FROM responses").rowcount
+            self._size = 0
+        return n
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            by_host = {host: dict(c) for host, c in self._stats.items()}
+        hits = sum(c.get("hits", 0) + c.get("revalidated", 0) for c in by_host.values())
+        misses = sum(c.get("misses", 0) for c in by_host.values())
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "size_mb": round(self._size / (1 << 20), 2),
+            "max_mb": round(self.max_bytes / (1 << 20), 2),
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+            "evicted": self._evicted,
+            "by_host": by_host,
+        }
+
+
+def _cached_response(request: requests.PreparedRequest, entry: Dict[str, Any]) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.url = request.url
+    response.request = request
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response._content = entry["body"]
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+    response.from_cache = True  # type: ignore[attr-defined]
+    return response
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter answering cacheable GETs from an HTTPCache.
+
+    ttl_for(url) gives the TTL in seconds (None = not cacheable). send_network(request, send) is called for
+    every request that goes out, with send() performing it; override it to add rate limiting.
+    """
+
+    def __init__(self, cache: Optional[HTTPCache], ttl_for: Callable[[str], Optional[float]],
+                 send_network: Optional[Callable[[requests.PreparedRequest, Callable[[], requests.Response]],
+                                                  requests.Response]] = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.ttl_for = ttl_for
+        self.send_network = send_network or (lambda request, send: send())
+
+    def _network(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        return self.send_network(request, lambda: super(CachingAdapter, self).send(request, **kwargs))
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        ttl = self.ttl_for(request.url) if self.cache is not None and request.method == "GET" else None
+        if ttl is None:
+            return self._network(request, **kwargs)
+        host = urlsplit(request.url).netloc
+        entry = self.cache.get(request.url)
+        if entry is not None and entry["expires_at"] > time.time():
+            self.cache.count(host, "hits")
+            return _cached_response(request, entry)
+        if entry is not None:
+            validators = CaseInsensitiveDict(entry["headers"])
+            if validators.get("ETag"):
+                request.headers["If-None-Match"] = validators["ETag"]
+            if validators.get("Last-Modified"):
+                request.headers["If-Modified-Since"] = validators["Last-Modified"]
+        response = self._network(request, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.renew(request.url, ttl)
+            self.cache.count(host, "revalidated")
+            return _cached_response(request, entry)
+        self.cache.count(host, "misses")
+        if response.status_code == 200 and "no-store" not in response.headers.get("Cache-Control", ""):
+            body = response.content  # reads the body; the response stays usable
+            headers = {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers}
+            self.cache.put(request.url, headers, body, ttl)
+            self.cache.count(host, "stored")
+        return response
+
+
+_cache: Optional[HTTPCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HTTPCache]:
+    """Process-wide cache (HTTP_CACHE_PATH, HTTP_CACHE_MAX_MB), or None when HTTP_CACHE=0"""
+    global _cache
+    if os.getenv("HTTP_CACHE", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = HTTPCache(Path(os.getenv("HTTP_CACHE_PATH") or DEFAULT_PATH),
+                               int(float(os.getenv("HTTP_CACHE_MAX_MB", DEFAULT_MAX_MB)) * (1 << 20)))
+        return _cache
@@ -0,0 +1,472 @@
+"""
+Durable enrichment job queue shared by the admin API and worker processes.
+
+A run (one /admin/enrichment/* request) is a set of movies pushed through
+a list of stages, e.g. ["metadata", "images", "profile"]. Each movie gets one
+job per stage in a WAL-mode SQLite file (JOB_DB_PATH, default jobs.db):
+- the first stage starts "pending"; later stages wait until the previous
+  stage of the same movie is done, and take its output as their input
+- workers claim pending jobs with a lease (JOB_LEASE_SECONDS); a job whose
+  lease ran out (its worker crashed or was killed) can be claimed again, so
+  any number of workers on the host can drain the queue and a restart
+  resumes where the previous process stopped
+- a failed job is retried with exponential backoff up to max_attempts, then
+  marked "failed" and its later stages "skipped"; a lease that runs out counts
+  as a failed attempt too, so a job that crashes its worker every time stops
+  after max_attempts
+- when none of a run's jobs are left to do, one worker claims the run for
+  finalizing (writing the results to the catalog)
+- runs finished more than JOB_RETENTION_SECONDS ago are deleted with their
+  jobs and events (checked whenever a run finishes)
+
+Every stage output is stored, so finished work survives a crash and
+re-running a stage is idempotent.
+
+Workers also append progress events (queued, job done/failed, run finished)
+to an events table; the admin API streams them to the UI (/admin/events)
+without sharing anything else with the worker processes.
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+ROOT = Path(__file__).parent
+DEFAULT_DB_PATH = ROOT / "jobs.db"
+DEFAULT_LEASE_SECONDS = 600.0
+DEFAULT_MAX_ATTEMPTS = 4
+# Retry delay: BACKOFF_BASE * 2^(attempt-1), capped, with +-25% jitter
+BACKOFF_BASE = 5.0
+BACKOFF_MAX = 300.0
+
+# Job states; "waiting" = an earlier stage of the movie is not done yet
+OPEN_STATES = ("waiting", "pending", "leased")
+# Run states
+RUN_ACTIVE = ("running", "finalizing")
+# Progress events kept for streaming (the newest ones)
+MAX_EVENTS = 5000
+# Finished runs are kept this long (for retry_failed and the admin UI), then pruned with their jobs and events
+DEFAULT_RETENTION_SECONDS = 7 * 24 * 3600.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    steps TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL,
+    movie_key TEXT NOT NULL,
+    title TEXT,
+    stage TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    input TEXT,
+    output TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    UNIQUE(run_id, movie_key, stage)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, available_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_run ON jobs(run_id, status);
+CREATE INDEX IF NOT EXISTS idx_runs_status ON runs(status);
+CREATE INDEX IF NOT EXISTS idx_runs_finished ON runs(finished_at);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER,
+    created_at REAL NOT NULL,
+    type TEXT NOT NULL,
+    level TEXT NOT NULL,
+    details TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_run ON events(run_id);
+"""
+
+
+def movie_key(movie: Dict[str, Any]) -> str:
+    """Identity of a movie within a run: its TMDB ID, else its title"""
+    if movie.get("tmdb_id"):
+        return f"tmdb:{movie['tmdb_id']}"
+    return f"title:{(movie.get('title') or '').strip().lower()}"
+
+
+def backoff_seconds(attempts: int) -> float:
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** max(0, attempts - 1))
+    return delay * random.uniform(0.75, 1.25)
+
+
+def _job(row: sqlite3.Row) -> Dict[str, Any]:
+    job = dict(row)
+    for field in ("input", "output"):
+        job[field] = json.loads(job[field]) if job.get(field) else None
+    return job
+
+
+def _run(row: sqlite3.Row) -> Dict[str, Any]:
+    run = dict(row)
+    run["steps"] = json.loads(run["steps"])
+    run["options"] = json.loads(run["options"])
+    return run
+
+
+class JobQueue:
+    """Runs and per-stage jobs in one SQLite file. Safe to share between threads."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 retention_seconds: float = DEFAULT_RETENTION_SECONDS):
+        self.db_path = Path(db_path)
+        self.lease_seconds = lease_seconds
+        self.retention_seconds = retention_seconds
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction; BEGIN IMMEDIATE serializes claims across worker processes"""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    # ---- enqueue ------------------------------------------------------
+    def create_run(self, kind: str, movies: Sequence[Dict[str, Any]], steps: Sequence[str],
+                   options: Optional[Dict[str, Any]] = None, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> int:
+        """Enqueue `movies` through `steps`; a movie listed twice is enqueued once. Returns the run ID."""
+        if not steps:
+            raise ValueError("a run needs at least one stage")
+        now = time.time()
+        with self._write() as conn:
+            run_id = conn.execute(
+                "INSERT INTO runs(kind, steps, options, status, total, created_at) VALUES(?, ?, ?, 'running', 0, ?)",
+                (kind, json.dumps(list(steps)), json.dumps(options or {}), now),
+            ).lastrowid
+            total = 0
+            for movie in movies:
+                key = movie_key(movie)
+                for seq, stage in enumerate(steps):
+                    cur = conn.execute(
+                        "INSERT OR IGNORE INTO jobs(run_id, movie_key, title, stage, seq, status, max_attempts, "
+                        "available_at, input, updated_at) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (run_id, key, movie.get("title"), stage, seq, "pending" if seq == 0 else "waiting",
+                         max_attempts, now, json.dumps(movie, ensure_ascii=False) if seq == 0 else None, now),
+                    )
+                    if seq == 0:
+                        total += cur.rowcount
+            conn.execute("UPDATE runs SET total = ? WHERE id = ?", (total, run_id))
+            self._add_event(conn, run_id, "run_queued", "info", f"Queued run {run_id}: {total} movies through "
+                            f"{', '.join(steps)}", {"kind": kind, "total": total, "steps": list(steps)})
+        return run_id
+
+    # ---- workers ------------------------------------------------------
+    def claim(self, worker: str, limit: int = 1, stages: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Lease up to `limit` runnable jobs (pending and due, or leased with an expired lease) to `worker`.
+
+        An expired lease on a job that has used up its attempts fails the job instead, so fewer than
+        `limit` jobs may come back even though more are runnable.
+        """
+        if limit <= 0:
+            return []
+        now = time.time()
+        stage_filter = ""
+        params: List[Any] = [now, now]
+        if stages:
+            stage_filter = f" AND stage IN ({','.join('?' * len(stages))})"
+            params.extend(stages)
+        with self._write() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE ((status = 'pending' AND available_at <= ?) "
+                "OR (status = 'leased' AND lease_expires < ?))" + stage_filter + " ORDER BY id LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+            exhausted = [row for row in rows if row["status"] == "leased" and row["attempts"] >= row["max_attempts"]]
+            for row in exhausted:
+                error = f"lease expired on attempt {row['attempts']}/{row['max_attempts']} (worker crashed or stuck)"
+                self._fail_job(conn, row, error, now)
+                self._add_event(conn, row["run_id"], "job_failed", "error",
+                                f"Failed to process {row['title']} ({row['stage']}): {error}",
+                                {"movie_key": row["movie_key"], "stage": row["stage"]})
+            failed_ids = {row["id"] for row in exhausted}
+            rows = [row for row in rows if row["id"] not in failed_ids]
+            for row in rows:
+                conn.execute(
+                    "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                    "updated_at = ? WHERE id = ?",
+                    (worker, now + self.lease_seconds, now, row["id"]),
+                )
+        jobs = []
+        for row in rows:
+            job = _job(row)
+            job.update(status="leased", lease_owner=worker, attempts=row["attempts"] + 1)
+            jobs.append(job)
+        return jobs
+
+    def complete(self, job_id: int, worker: str, output: Dict[str, Any]) -> bool:
+        """Store a job's output and release the movie's next stage; False if the lease was lost meanwhile"""
+        now = time.time()
+        with self._write() as conn:
+            job = conn.execute("SELECT * FROM jobs WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                               (job_id, worker)).fetchone()
+            if job is None:
+                return False
+            data = json.dumps(output, ensure_ascii=False)
+            conn.execute("UPDATE jobs SET status = 'done', output = ?, error = NULL, lease_owner = NULL, "
+                         "lease_expires = NULL, updated_at = ? WHERE id = ?", (data, now, job_id))
+            conn.execute("UPDATE jobs SET status = 'pending', input = ?, available_at = ?, updated_at = ? "
+                         "WHERE run_id = ? AND movie_key = ? AND seq = ? AND status = 'waiting'",
+                         (data, now, now, job["run_id"], job["movie_key"], job["seq"] + 1))
+        return True
+
+    def fail(self, job_id: int, worker: str, error: str) -> Optional[str]:
+        """Record a failed attempt: "pending" again after a backoff, or "failed" once attempts are used up.
+
+        Returns the job's new status, or None if the lease was lost meanwhile.
+        """
+        now = time.time()
+        with self._write() as conn:
+            job = conn.execute("SELECT * FROM jobs WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                               (job_id, worker)).fetchone()
+            if job is None:
+                return None
+            if job["attempts"] < job["max_attempts"]:
+                conn.execute("UPDATE jobs SET status = 'pending', available_at = ?, error = ?, lease_owner = NULL, "
+                             "lease_expires = NULL, updated_at = ? WHERE id = ?",
+                             (now + backoff_seconds(job["attempts"]), error, now, job_id))
+                return "pending"
+            self._fail_job(conn, job, error, now)
+            return "failed"
+
+    @staticmethod
+    def _fail_job(conn: sqlite3.Connection, job: sqlite3.Row, error: str, now: float) -> None:
+        """Mark a job "failed" for good and skip the movie's later stages"""
+        conn.execute("UPDATE jobs SET status = 'failed', error = ?, lease_owner = NULL, lease_expires = NULL, "
+                     "updated_at = ? WHERE id = ?", (error, now, job["id"]))
+        conn.execute("UPDATE jobs SET status = 'skipped', updated_at = ? "
+                     "WHERE run_id = ? AND movie_key = ? AND seq > ? AND status = 'waiting'",
+                     (now, job["run_id"], job["movie_key"], job["seq"]))
+
+    def claim_finished_run(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Lease one run with no open jobs left (or whose finalizer's lease ran out) for finalizing"""
+        now = time.time()
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT * FROM runs WHERE (status = 'running' OR (status = 'finalizing' AND lease_expires < ?)) "
+                "AND NOT EXISTS (SELECT 1 FROM jobs WHERE jobs.run_id = runs.id AND jobs.status IN (?, ?, ?)) "
+                "ORDER BY id LIMIT 1",
+                (now, *OPEN_STATES),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE runs SET status = 'finalizing', lease_owner = ?, lease_expires = ? WHERE id = ?",
+                         (worker, now + self.lease_seconds, row["id"]))
+        return _run(row)
+
+    def finish_run(self, run_id: int, status: str = "done", error: Optional[str] = None) -> None:
+        now = time.time()
+        with self._write() as conn:
+            conn.execute("UPDATE runs SET status = ?, error = ?, finished_at = ?, lease_owner = NULL, "
+                         "lease_expires = NULL WHERE id = ?", (status, error, now, run_id))
+            self._prune(conn, now - self.retention_seconds)
+
+    def prune(self, older_than: Optional[float] = None) -> int:
+        """Delete runs finished before `older_than` (default: the retention period ago) with their jobs and
+        events; returns the number of runs deleted"""
+        cutoff = time.time() - self.retention_seconds if older_than is None else older_than
+        with self._write() as conn:
+            return self._prune(conn, cutoff)
+
+    @staticmethod
+    def _prune(conn: sqlite3.Connection, cutoff: float) -> int:
+        ids = [row[0] for row in conn.execute(
+            f"SELECT id FROM runs WHERE finished_at < ? AND status NOT IN ({','.join('?' * len(RUN_ACTIVE))})",
+            (cutoff, *RUN_ACTIVE),
+        )]
+        for run_id in ids:
+            conn.execute("DELETE FROM jobs WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM events WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+        return len(ids)
+
+    def has_work(self) -> bool:
+        """Whether any run is unfinished (including ones whose jobs are all leased by other workers right now)"""
+        with self._lock:
+            row = self.conn.execute(f"SELECT 1 FROM runs WHERE status IN ({','.join('?' * len(RUN_ACTIVE))}) LIMIT 1",
+                                    RUN_ACTIVE).fetchone()
+        return row is not None
+
+    # ---- results and status -------------------------------------------
+    def run_results(self, run_id: int) -> List[Dict[str, Any]]:
+        """Per movie: its latest stage output (None if the first stage never succeeded), the first stage's
+        input, whether every stage succeeded, and whether the run was cancelled before it finished"""
+        with self._lock:
+            rows = self.conn.execute("SELECT movie_key, title, seq, status, input, output FROM jobs "
+                                     "WHERE run_id = ? ORDER BY id", (run_id,)).fetchall()
+        movies: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            entry = movies.setdefault(row["movie_key"], {"title": row["title"], "movie": None, "input": None,
+                                                         "ok": True, "cancelled": False})
+            if row["seq"] == 0:
+                entry["input"] = json.loads(row["input"]) if row["input"] else None
+            if row["status"] == "done":
+                entry["movie"] = json.loads(row["output"])
+            else:
+                entry["ok"] = False
+                entry["cancelled"] = entry["cancelled"] or row["status"] == "cancelled"
+        return list(movies.values())
+
+    def run_progress(self, run_id: int) -> Dict[str, int]:
+        """Movies of a run whose last stage is done, and movies that stopped with a failed stage"""
+        with self._lock:
+            run = self.conn.execute("SELECT steps FROM runs WHERE id = ?", (run_id,)).fetchone()
+            if run is None:
+                return {"done": 0, "failed": 0}
+            last = len(json.loads(run["steps"])) - 1
+            done = self.conn.execute("SELECT COUNT(*) FROM jobs WHERE run_id = ? AND seq = ? AND status = 'done'",
+                                     (run_id, last)).fetchone()[0]
+            failed = self.conn.execute("SELECT COUNT(*) FROM jobs WHERE run_id = ? AND status = 'failed'",
+                                       (run_id,)).fetchone()[0]
+        return {"done": done, "failed": failed}
+
+    def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """A run with per-stage job counts and its failed jobs"""
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+            if row is None:
+                return None
+            counts = self.conn.execute("SELECT stage, status, COUNT(*) AS n FROM jobs WHERE run_id = ? "
+                                       "GROUP BY stage, status", (run_id,)).fetchall()
+            failed = self.conn.execute("SELECT id, title, stage, attempts, error FROM jobs "
+                                       "WHERE run_id = ? AND status = 'failed' ORDER BY id LIMIT 100",
+                                       (run_id,)).fetchall()
+        run = _run(row)
+        run["stages"] = {stage: {} for stage in run["steps"]}
+        for c in counts:
+            run["stages"].setdefault(c["stage"], {})[c["status"]] = c["n"]
+        run["failed_jobs"] = [dict(f) for f in failed]
+        run.update(self.run_progress(run_id))
+        return run
+
+    def list_runs(self, limit: int = 20, active_only: bool = False) -> List[Dict[str, Any]]:
+        where = f"WHERE status IN ({','.join('?' * len(RUN_ACTIVE))})" if active_only else ""
+        with self._lock:
+            rows = self.conn.execute(f"SELECT * FROM runs {where} ORDER BY id DESC LIMIT ?",
+                                     (*(RUN_ACTIVE if active_only else ()), limit)).fetchall()
+        runs = [_run(row) for row in rows]
+        for run in runs:
+            run.update(self.run_progress(run["id"]))
+        return runs
+
+    def active_movies(self) -> List[Dict[str, Any]]:
+        """Movies of unfinished runs, as their latest stored version (what /admin/pipeline shows)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT j.movie_key, j.input, j.output FROM jobs j JOIN runs r ON r.id = j.run_id "
+                f"WHERE r.status IN ({','.join('?' * len(RUN_ACTIVE))}) ORDER BY j.run_id, j.id", RUN_ACTIVE,
+            ).fetchall()
+        movies: Dict[Any, Dict[str, Any]] = {}
+        for row in rows:
+            data = row["output"] or row["input"]
+            if data:
+                movies[row["movie_key"]] = json.loads(data)
+        return list(movies.values())
+
+    # ---- operator actions ---------------------------------------------
+    def retry_failed(self, run_id: int) -> int:
+        """Give the failed jobs of a run a fresh set of attempts (their skipped later stages wait again)"""
+        now = time.time()
+        with self._write() as conn:
+            n = conn.execute("UPDATE jobs SET status = 'pending', attempts = 0, available_at = ?, updated_at = ? "
+                             "WHERE run_id = ? AND status = 'failed'", (now, now, run_id)).rowcount
+            if n:
+                conn.execute("UPDATE jobs SET status = 'waiting', updated_at = ? WHERE run_id = ? AND status = 'skipped'",
+                             (now, run_id))
+                conn.execute("UPDATE runs SET status = 'running', finished_at = NULL, error = NULL WHERE id = ?",
+                             (run_id,))
+        return n
+
+    def cancel_run(self, run_id: int) -> int:
+        """Drop the not yet started jobs of a run; jobs in flight finish, then the run finalizes as usual"""
+        now = time.time()
+        with self._write() as conn:
+            return conn.execute("UPDATE jobs SET status = 'cancelled', updated_at = ? "
+                                "WHERE run_id = ? AND status IN ('waiting', 'pending')", (now, run_id)).rowcount
+
+    # ---- progress events ----------------------------------------------
+    def _add_event(self, conn: sqlite3.Connection, run_id: Optional[int], type: str, level: str, details: str,
+                   data: Optional[Dict[str, Any]]) -> None:
+        seq = conn.execute("INSERT INTO events(run_id, created_at, type, level, details, data) VALUES(?, ?, ?, ?, ?, ?)",
+                           (run_id, time.time(), type, level, details, json.dumps(data or {}, ensure_ascii=False))
+                           ).lastrowid
+        if seq % 100 == 0:
+            conn.execute("DELETE FROM events WHERE seq <= ?", (seq - MAX_EVENTS,))
+
+    def add_event(self, run_id: Optional[int], type: str, details: str, level: str = "info",
+                  data: Optional[Dict[str, Any]] = None) -> None:
+        with self._write() as conn:
+            self._add_event(conn, run_id, type, level, details, data)
+
+    def last_event_seq(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+
+    def events_since(self, seq: int, limit: int = 200) -> List[Dict[str, Any]]:
+        """Events after `seq`, oldest first"""
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM events WHERE seq > ? ORDER BY seq LIMIT ?", (seq, limit)).fetchall()
+        events = []
+        for row in rows:
+            event = dict(row)
+            event.update(json.loads(event.pop("data")))
+            event["timestamp"] = datetime.fromtimestamp(event["created_at"]).isoformat()
+            events.append(event)
+        return events
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide queue on JOB_DB_PATH (default jobs.db); JOB_LEASE_SECONDS sets the lease length and
+    JOB_RETENTION_SECONDS how long finished runs are kept"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue(Path(os.getenv("JOB_DB_PATH") or DEFAULT_DB_PATH),
+                              float(os.getenv("JOB_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)),
+                              float(os.getenv("JOB_RETENTION_SECONDS", DEFAULT_RETENTION_SECONDS)))
+        return _queue
@@ -6,7 +6,6 @@ generated movie profiles across multiple dimensions including cinema movements,
 socio-cultural context, formal analysis, narrative analysis, and distinctiveness.
 """
 
-import json
 import os
 import random
 from typing import Dict, List, Tuple, Any, Optional
@@ -809,8 +808,8 @@ class AutomatedEvaluationPipeline:
 def main():
     """Example usage of the evaluation system"""
     # Load movie profiles
-    with open('movie_profiles_merged.json', 'r') as f:
-        movie_profiles = json.load(f)
+    from catalog_journal import load_catalog
+    movie_profiles = load_catalog('movie_profiles_merged.json')
     
     # Initialize evaluation pipeline
     evaluator = AutomatedEvaluationPipeline()
@@ -8,10 +8,11 @@ from typing import List, Dict, Any
 import requests
 from datetime import datetime
 
-# Required LLM imports
-import openai
+# LLM SDKs (openai, anthropic) are imported in setup_llm() when a client is created;
+# importing them up front slows every process that only needs the taxonomy constants
 from dotenv import load_dotenv
-import anthropic
+
+from rate_limit import limited_call, limited_request
 
 
 # First, install required packages:
@@ -120,11 +121,13 @@ class LLMProfileGenerator:
         load_dotenv()
 
         if self.provider == "openai":
+            import openai
             self.client = openai.OpenAI(
                 api_key=os.getenv("OPENAI_API_KEY")
             )
 
         elif self.provider == "anthropic":
+            import anthropic
             self.client = anthropic.Anthropic(
                 api_key=os.getenv("ANTHROPIC_API_KEY")
             )
@@ -445,7 +448,7 @@ Your task is to create precise, insightful movie profiles that capture the uniqu
 
 Be analytical, specific, and avoid generic descriptions. Use nuanced language that reflects deep film knowledge."""
 
-            response = self.client.chat.completions.create(
+            response = limited_call("openai", lambda: self.client.chat.completions.create(
                 model="gpt-3.5-turbo",  # or "gpt-4" for better quality
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -453,7 +456,7 @@ Be analytical, specific, and avoid generic descriptions. Use nuanced language th
                 ],
                 max_tokens=800,
                 temperature=0.7
-            )
+            ))
             return response.choices[0].message.content
         except Exception as e:
             print(f"Error calling OpenAI: {e}")
@@ -462,13 +465,13 @@ Be analytical, specific, and avoid generic descriptions. Use nuanced language th
     def _call_anthropic(self, prompt: str) -> str:
         """Call Anthropic API"""
         try:
-            response = self.client.messages.create(
+            response = limited_call("anthropic", lambda: self.client.messages.create(
                 model="claude-3-sonnet-20240229",
                 max_tokens=800,
                 messages=[
                     {"role": "user", "content": prompt}
                 ]
-            )
+            ))
             return response.content[0].text
         except Exception as e:
             print(f"Error calling Anthropic: {e}")
@@ -477,14 +480,14 @@ Be analytical, specific, and avoid generic descriptions. Use nuanced language th
     def _call_ollama(self, prompt: str) -> str:
         """Call local Ollama API"""
         try:
-            response = requests.post(
+            response = limited_request("ollama", lambda: requests.post(
                 f"{self.base_url}/api/generate",
                 json={
                     "model": "llama2",  # or any model you have installed
                     "prompt": prompt,
                     "stream": False
                 }
-            )
+            ))
             return response.json()['response']
         except Exception as e:
             print(f"Error calling Ollama: {e}")
@@ -7,6 +7,8 @@ This creates a single complete dataset with both profile data and image URLs.
 import json
 from pathlib import Path
 
+from catalog_journal import get_journal, load_catalog
+
 def normalize_title(title):
     """Normalize title for matching (same logic as frontend)"""
     return str(title or '').lower().strip()
@@ -16,8 +18,7 @@ def merge_image_data():
     
     # Load the profile data
     print("📁 Loading movie_profiles_merged.json...")
-    with open('movie_profiles_merged.json', 'r', encoding='utf-8') as f:
-        profiles_data = json.load(f)
+    profiles_data = load_catalog(Path('movie_profiles_merged.json'))
     
     # Load the image data
     print("📁 Loading merged_movie_data_with_images.json...")
@@ -46,12 +47,14 @@ def merge_image_data():
     # Merge the data
     merged_count = 0
     missing_count = 0
+    patches = {}
     
     for title, profile in profiles_data.items():
         key = normalize_title(title)
         image_info = image_lookup.get(key)
         
         if image_info:
+            before = dict(profile)
             # Merge image data into profile
             profile['poster_url'] = image_info['poster_url']
             profile['backdrop_url'] = image_info['backdrop_url']
@@ -77,6 +80,7 @@ def merge_image_data():
             if not profile.get('plot_summary') and image_info['plot_summary']:
                 profile['plot_summary'] = image_info['plot_summary']
             
+            patches[title] = {k: v for k, v in profile.items() if before.get(k) != v}
             merged_count += 1
         else:
             missing_count += 1
@@ -85,10 +89,9 @@ def merge_image_data():
     print(f"✅ Successfully merged image data for {merged_count} movies")
     print(f"❌ Missing image data for {missing_count} movies")
     
-    # Save the merged data
+    # Save only the changed fields through the catalog journal
     print("💾 Saving merged data to movie_profiles_merged.json...")
-    with open('movie_profiles_merged.json', 'w', encoding='utf-8') as f:
-        json.dump(profiles_data, f, indent=2, ensure_ascii=False)
+    get_journal(Path('movie_profiles_merged.json')).patch(patches)
     
     print("🎉 Merge complete! movie_profiles_merged.json now contains image data")
     
@@ -4,24 +4,31 @@ Regenerate profile_text for all movies in movie_profiles_merged.json using v1.1
 Only updates the profile_text field, preserves all other fields.
 
 Features:
-- Timestamped backup creation
+- Incremental catalog backup before any change (catalog_backup.py)
 - Batch processing with rate limiting
 - Checkpoint system for resume capability
 - Error handling and retry logic
 - Progress tracking and reporting
+- Writes only the regenerated profile_text fields to the catalog journal, so
+  concurrent admin edits are not overwritten by a full-file rewrite
 """
 
 import json
 import os
 import sys
 import time
-import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from openai import OpenAI
 from dotenv import load_dotenv
 
+# Add the repository root to the path so we can import our modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from catalog_backup import BackupStore
+from catalog_journal import get_journal, load_catalog
+
 load_dotenv()
 
 # Constants
@@ -170,15 +177,10 @@ def generate_profile_text(movie_data: Dict[str, Any], prompt_config: Dict[str, A
     
     return None
 
-def create_backup() -> Path:
-    """Create timestamped backup of movie_profiles_merged.json"""
-    BACKUP_DIR.mkdir(exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_file = BACKUP_DIR / f"movie_profiles_merged_backup_{timestamp}.json"
-    
-    shutil.copy2(MOVIE_FILE, backup_file)
-    return backup_file
+def create_backup() -> str:
+    """Back up movie_profiles_merged.json (only movies changed since the last backup are stored)"""
+    # snapshot + journal, i.e. the catalog as readers currently see it
+    return BackupStore(BACKUP_DIR).create_from_movies(load_catalog(MOVIE_FILE), label="regenerate_profile_text")["id"]
 
 def load_checkpoint() -> Optional[Dict[str, Any]]:
     """Load checkpoint if exists"""
@@ -193,10 +195,10 @@ def save_checkpoint(checkpoint: Dict[str, Any]):
     with open(CHECKPOINT_FILE, 'w', encoding='utf-8') as f:
         json.dump(checkpoint, f, indent=2)
 
-def save_movies(movies: Dict[str, Any]):
-    """Save updated movies to file"""
-    with open(MOVIE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(movies, f, indent=2, ensure_ascii=False)
+def save_movies(updates: Dict[str, Dict[str, Any]]):
+    """Append field updates {title: {field: value}} to the catalog journal (under its lock)"""
+    if updates:
+        get_journal(MOVIE_FILE).patch(updates)
 
 def main():
     import sys
@@ -215,8 +217,7 @@ def main():
     
     # Load movies
     print(f"📚 Loading movies...")
-    with open(MOVIE_FILE, 'r', encoding='utf-8') as f:
-        movies = json.load(f)
+    movies = load_catalog(MOVIE_FILE)
     
     total_movies = len(movies)
     print(f"✅ Loaded {total_movies} movies")
@@ -255,6 +256,7 @@ def main():
     
     # Track progress
     movie_list = list(movies.items())
+    pending_updates: Dict[str, Dict[str, Any]] = {}
     updated_count = 0
     skipped_count = 0
     start_time = time.time()
@@ -285,6 +287,7 @@ def main():
         if profile_text:
             # Update only profile_text field
             movies[title]['profile_text'] = profile_text
+            pending_updates[title] = {'profile_text': profile_text}
             updated_count += 1
             print(f"[{idx}/{total_movies}] ✅ Completed {title} ({len(profile_text)} chars, {movie_elapsed:.1f}s)", flush=True)
         else:
@@ -317,7 +320,8 @@ def main():
                 'backup_file': str(backup_file)
             }
             save_checkpoint(checkpoint_data)
-            save_movies(movies)  # Save progress to main file
+            save_movies(pending_updates)  # Save progress to main file
+            pending_updates.clear()
             elapsed = (time.time() - start_time) / 60
             print(f"\n💾 Checkpoint saved - {idx}/{total_movies} movies ({elapsed:.1f} min elapsed)\n")
         
@@ -326,7 +330,8 @@ def main():
     
     # Final save
     print(f"\n💾 Saving final results...")
-    save_movies(movies)
+    save_movies(pending_updates)
+    get_journal(MOVIE_FILE).compact()
     
     # Clean up checkpoint
     if CHECKPOINT_FILE.exists():
@@ -0,0 +1,167 @@
+"""
+Per-upstream token-bucket rate limiting for the enrichment HTTP and LLM calls.
+
+Every call to an upstream (TMDB, OMDb, each LLM provider) first takes a token
+from that upstream's bucket, so many movies can be in flight at once while the
+request rate stays within the provider's quota. A 429 (or a 503 with
+Retry-After) pauses the whole bucket for the time the server asked for, so the
+other threads back off too instead of each discovering the limit on its own.
+
+Rates are requests per second with a burst size; override one with
+RATE_LIMIT_<UPSTREAM>="rate[/burst]", e.g. RATE_LIMIT_TMDB="40/40".
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# (requests per second, burst) per upstream
+DEFAULT_LIMITS: Dict[str, Tuple[float, int]] = {
+    "tmdb": (20.0, 20),
+    "omdb": (5.0, 5),
+    "openai": (3.0, 3),
+    "anthropic": (0.8, 2),
+    "ollama": (100.0, 100),
+    # list sites scraped for seeds: politeness limits, not published quotas
+    "letterboxd": (2.0, 2),
+    "bfi": (1.0, 2),
+    "wikipedia": (2.0, 2),
+}
+# Attempts per call while the upstream keeps answering 429
+RATE_LIMIT_ATTEMPTS = 5
+# Pause used when a 429 carries no usable Retry-After
+DEFAULT_RETRY_AFTER = 2.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.waited_s = 0.0
+        self.throttled = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token, sleeping as long as needed; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        self.waited_s += waited
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for `seconds` (a server's Retry-After), and start empty afterwards"""
+        with self._lock:
+            self.throttled += 1
+            until = time.monotonic() + max(0.0, seconds)
+            if until > self._paused_until:
+                self._paused_until = until
+                self._tokens = 0.0
+                self._updated = until
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"rate": self.rate, "burst": self.burst, "waited_s": round(self.waited_s, 3),
+                    "throttled": self.throttled}
+
+
+def _configured_limit(upstream: str) -> Tuple[float, int]:
+    rate, burst = DEFAULT_LIMITS.get(upstream, (10.0, 10))
+    raw = os.getenv(f"RATE_LIMIT_{upstream.upper()}")
+    if raw:
+        parts = raw.split("/", 1)
+        rate = float(parts[0])
+        burst = int(parts[1]) if len(parts) > 1 else max(1, int(rate))
+    return rate, burst
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(upstream: str) -> TokenBucket:
+    """Process-wide bucket for an upstream (tmdb, omdb, openai, anthropic, ollama, ...)"""
+    with _limiters_lock:
+        if upstream not in _limiters:
+            _limiters[upstream] = TokenBucket(*_configured_limit(upstream))
+        return _limiters[upstream]
+
+
+def limiter_stats() -> Dict[str, Dict[str, Any]]:
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: bucket.stats() for name, bucket in limiters.items()}
+
+
+def retry_after_seconds(headers: Optional[Mapping[str, str]], default: float = DEFAULT_RETRY_AFTER) -> float:
+    """Seconds from a Retry-After header (delta-seconds or an HTTP date), else `default`"""
+    value = (headers or {}).get("Retry-After") or (headers or {}).get("retry-after")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+def _throttled(response: Any) -> bool:
+    status = getattr(response, "status_code", None)
+    return status == 429 or (status == 503 and "Retry-After" in (getattr(response, "headers", None) or {}))
+
+
+def limited_request(upstream: str, send: Callable[[], T], attempts: int = RATE_LIMIT_ATTEMPTS) -> T:
+    """Run send() (returning a requests.Response) under the upstream's bucket, retrying while it is throttled.
+
+    The last response is returned as-is, so callers keep their own status handling.
+    """
+    bucket = get_limiter(upstream)
+    for attempt in range(attempts):
+        bucket.acquire()
+        response = send()
+        if not _throttled(response) or attempt == attempts - 1:
+            return response
+        bucket.pause(retry_after_seconds(response.headers, DEFAULT_RETRY_AFTER * (attempt + 1)))
+    return response
+
+
+def limited_call(upstream: str, fn: Callable[[], T], attempts: int = RATE_LIMIT_ATTEMPTS) -> T:
+    """Run an SDK call under the upstream's bucket; retries when it raises a 429 error (e.g. RateLimitError)"""
+    bucket = get_limiter(upstream)
+    for attempt in range(attempts):
+        bucket.acquire()
+        try:
+            return fn()
+        except Exception as e:
+            if getattr(e, "status_code", None) != 429 or attempt == attempts - 1:
+                raise
+            response = getattr(e, "response", None)
+            bucket.pause(retry_after_seconds(getattr(response, "headers", None), DEFAULT_RETRY_AFTER * (attempt + 1)))
+    raise RuntimeError("unreachable")
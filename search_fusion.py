@@ -0,0 +1,118 @@
+"""
+Rank fusion strategies for hybrid (keyword + vector) search.
+
+Every strategy takes ranked candidate lists of (id, score) tuples, best first,
+where a higher score means a better match, and returns fused (id, score) tuples
+sorted best first. Keyword bm25 scores must be negated by the caller because
+SQLite FTS5 reports better matches as more negative numbers.
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+Hits = List[Tuple[str, float]]
+
+DEFAULT_RRF_K = 60.0
+
+
+def _weights(lists: Sequence[Hits], weights: Optional[Sequence[float]]) -> List[float]:
+    if not weights:
+        return [1.0] * len(lists)
+    if len(weights) != len(lists):
+        raise ValueError(f"expected {len(lists)} fusion weights, got {len(weights)}")
+    return [float(w) for w in weights]
+
+
+def _top(scores: Dict[str, float], k: int) -> Hits:
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+
+
+def _minmax(lst: Hits) -> Dict[str, float]:
+    if not lst:
+        return {}
+    vals = [s for _pid, s in lst]
+    lo, hi = min(vals), max(vals)
+    if hi == lo:
+        return {pid: 1.0 for pid, _s in lst}
+    return {pid: (s - lo) / (hi - lo) for pid, s in lst}
+
+
+def _zscore(lst: Hits) -> Dict[str, float]:
+    if not lst:
+        return {}
+    vals = [s for _pid, s in lst]
+    mean = sum(vals) / len(vals)
+    std = (sum((v - mean) ** 2 for v in vals) / len(vals)) ** 0.5
+    if std == 0:
+        return {pid: 0.0 for pid, _s in lst}
+    return {pid: (s - mean) / std for pid, s in lst}
+
+
+def weighted_rrf(lists: Sequence[Hits], k: int = 60, weights: Optional[Sequence[float]] = None,
+                 rrf_k: float = DEFAULT_RRF_K) -> Hits:
+    """Reciprocal rank fusion: sum of w / (rrf_k + rank). Ignores raw scores."""
+    ws = _weights(lists, weights)
+    scores: Dict[str, float] = defaultdict(float)
+    for w, lst in zip(ws, lists):
+        for rank, (pid, _s) in enumerate(lst, start=1):
+            scores[pid] += w / (rrf_k + rank)
+    return _top(scores, k)
+
+
+def _linear(lists: Sequence[Hits], k: int, weights: Optional[Sequence[float]],
+            normalize: Callable[[Hits], Dict[str, float]]) -> Hits:
+    ws = _weights(lists, weights)
+    normed = [normalize(lst) for lst in lists]
+    ids = {pid for lst in lists for pid, _s in lst}
+    scores: Dict[str, float] = {}
+    for pid in ids:
+        total = 0.0
+        for w, norm in zip(ws, normed):
+            if not norm:
+                continue
+            # a candidate missing from a list gets that list's floor, not a free zero
+            total += w * norm.get(pid, min(norm.values()))
+        scores[pid] = total
+    return _top(scores, k)
+
+
+def minmax_linear(lists: Sequence[Hits], k: int = 60, weights: Optional[Sequence[float]] = None,
+                  rrf_k: float = DEFAULT_RRF_K) -> Hits:
+    """Weighted sum of per-list min-max normalized scores."""
+    return _linear(lists, k, weights, _minmax)
+
+
+def zscore_linear(lists: Sequence[Hits], k: int = 60, weights: Optional[Sequence[float]] = None,
+                  rrf_k: float = DEFAULT_RRF_K) -> Hits:
+    """Weighted sum of per-list z-score normalized scores."""
+    return _linear(lists, k, weights, _zscore)
+
+
+def comb_mnz(lists: Sequence[Hits], k: int = 60, weights: Optional[Sequence[float]] = None,
+             rrf_k: float = DEFAULT_RRF_K) -> Hits:
+    """CombMNZ: sum of weighted min-max scores times the number of lists that returned the item."""
+    ws = _weights(lists, weights)
+    scores: Dict[str, float] = defaultdict(float)
+    hits: Dict[str, int] = defaultdict(int)
+    for w, lst in zip(ws, lists):
+        for pid, s in _minmax(lst).items():
+            scores[pid] += w * s
+            hits[pid] += 1
+    return _top({pid: s * hits[pid] for pid, s in scores.items()}, k)
+
+
+FUSION_STRATEGIES: Dict[str, Callable[..., Hits]] = {
+    "rrf": weighted_rrf,
+    "minmax": minmax_linear,
+    "zscore": zscore_linear,
+    "combmnz": comb_mnz,
+}
+
+
+def fuse(strategy: str, lists: Sequence[Hits], k: int = 60, weights: Optional[Sequence[float]] = None,
+         rrf_k: float = DEFAULT_RRF_K) -> Hits:
+    """Fuse ranked lists with the named strategy (see FUSION_STRATEGIES)."""
+    fn = FUSION_STRATEGIES.get((strategy or "rrf").strip().lower())
+    if fn is None:
+        raise ValueError(f"unknown fusion strategy '{strategy}'; expected one of {sorted(FUSION_STRATEGIES)}")
+    return fn(lists, k=k, weights=weights, rrf_k=rrf_k)
@@ -0,0 +1,190 @@
+"""
+Lightweight learned reranking for /search.
+
+A logistic model over cheap per-candidate features (bm25, vector similarity,
+fused rank, facet matches, click popularity) is trained offline from the click
+log by train_reranker.py and shipped as a small JSON artifact. At request time
+the API scores the top-N fused candidates under a strict latency budget and
+falls back to the fused order when the budget is exceeded.
+
+mmr_rerank diversifies a ranked list with maximal marginal relevance using
+precomputed item-item similarities, so it costs only table lookups.
+"""
+
+import json
+import math
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FEATURES = ["bm25", "has_kw", "vec_sim", "has_vec", "fused_rank", "facet_matches", "popularity"]
+ARTIFACT_VERSION = 1
+
+
+def facet_matches(profile: Dict[str, Any], intent: Dict[str, Any]) -> int:
+    """Count intent genres/mood terms that appear in the profile's themes, tones or genre tags"""
+    terms = [t.lower() for t in (intent.get("genres") or []) + (intent.get("mood_terms") or []) if t]
+    if not terms or not profile:
+        return 0
+    facets = " ".join(str(x) for x in (
+        list(profile.get("themes") or [])
+        + list(profile.get("emotional_tone") or [])
+        + list(profile.get("genre_tags") or [])
+    )).lower().replace("_", " ")
+    return sum(1 for t in set(terms) if t in facets)
+
+
+def extract_features(rank: int, kw_score: Optional[float], vec_score: Optional[float], profile: Dict[str, Any],
+                     intent: Dict[str, Any], popularity: float = 0.0) -> List[float]:
+    """Feature vector in FEATURES order. kw_score is raw FTS5 bm25 (more negative is better)."""
+    return feature_row(rank, kw_score, vec_score, facet_matches(profile, intent), popularity)
+
+
+def feature_row(rank: int, kw_score: Optional[float], vec_score: Optional[float], facets: int,
+                popularity: float = 0.0) -> List[float]:
+    """Feature vector in FEATURES order from the per-candidate values /search logs"""
+    return [
+        -float(kw_score) if kw_score is not None else 0.0,
+        1.0 if kw_score is not None else 0.0,
+        float(vec_score) if vec_score is not None else 0.0,
+        1.0 if vec_score is not None else 0.0,
+        math.log1p(rank),
+        float(facets),
+        math.log1p(max(0.0, popularity)),
+    ]
+
+
+def train_logistic(X: np.ndarray, y: np.ndarray, l2: float = 1e-3, epochs: int = 500, lr: float = 0.1) -> Dict[str, Any]:
+    """Fit standardized L2-regularized logistic regression with batch gradient descent"""
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    Z = (X - mean) / std
+    w = np.zeros(Z.shape[1])
+    b = 0.0
+    n = float(len(y))
+    for _ in range(epochs):
+        p = 1.0 / (1.0 + np.exp(-(Z @ w + b)))
+        err = p - y
+        w -= lr * ((Z.T @ err) / n + l2 * w)
+        b -= lr * float(err.mean())
+    return {"mean": mean.tolist(), "std": std.tolist(), "weights": w.tolist(), "bias": b}
+
+
+class ClickReranker:
+    """Scores candidates with a precomputed logistic model artifact"""
+
+    def __init__(self, artifact: Dict[str, Any]):
+        if artifact.get("features") != FEATURES:
+            raise ValueError(f"reranker artifact features {artifact.get('features')} do not match {FEATURES}")
+        self.artifact = artifact
+        self.mean = np.array(artifact["mean"], dtype="float64")
+        self.std = np.array(artifact["std"], dtype="float64")
+        self.weights = np.array(artifact["weights"], dtype="float64")
+        self.bias = float(artifact.get("bias", 0.0))
+        self.popularity: Dict[str, float] = {k: float(v) for k, v in (artifact.get("popularity") or {}).items()}
+
+    @classmethod
+    def load(cls, path: Path) -> "ClickReranker":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.artifact, indent=2), encoding="utf-8")
+
+    @classmethod
+    def from_training(cls, X: np.ndarray, y: np.ndarray, popularity: Dict[str, float], **kwargs) -> "ClickReranker":
+        model = train_logistic(X, y, **kwargs)
+        model.update({
+            "version": ARTIFACT_VERSION,
+            "model": "logistic",
+            "features": FEATURES,
+            "popularity": popularity,
+            "examples": int(len(y)),
+            "positives": int(y.sum()),
+            "trained_at": datetime.now(timezone.utc).isoformat(),
+        })
+        return cls(model)
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        return ((X - self.mean) / self.std) @ self.weights + self.bias
+
+    def rerank(self, cands: List[str], feature_fn: Callable[[str, int], List[float]], top_n: int,
+               budget_ms: float) -> Tuple[List[str], str]:
+        """Reorder the first top_n candidates by model score.
+
+        feature_fn(pid, rank) builds one feature row. If building features and scoring
+        takes longer than budget_ms the original order is returned unchanged.
+        Returns (ordered candidates, status) where status is 'applied' or 'budget_exceeded'.
+        """
+        head = cands[:max(0, top_n)]
+        if len(head) < 2:
+            return cands, "applied"
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        rows: List[List[float]] = []
+        for rank, pid in enumerate(head, start=1):
+            rows.append(feature_fn(pid, rank))
+            if time.perf_counter() > deadline:
+                return cands, "budget_exceeded"
+        scores = self.score(np.array(rows, dtype="float64"))
+        if time.perf_counter() > deadline:
+            return cands, "budget_exceeded"
+        # stable: ties keep fused order
+        order = sorted(range(len(head)), key=lambda i: (-scores[i], i))
+        return [head[i] for i in order] + cands[len(head):], "applied"
+
+
+def load_reranker(path: Path) -> Optional[ClickReranker]:
+    """Load the reranker artifact if present; None (rerank disabled) when missing or invalid"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        model = ClickReranker.load(path)
+        print(f"[rerank] loaded model from {path} ({model.artifact.get('examples', 0)} training examples)")
+        return model
+    except Exception as e:
+        print(f"[rerank] disabled, failed to load {path}: {e}")
+        return None
+
+
+def popularity_from_clicks(clicks: Sequence[Dict[str, Any]]) -> Dict[str, float]:
+    """Click counts per movie id"""
+    pop: Dict[str, float] = {}
+    for c in clicks:
+        mid = c.get("movie_id")
+        if mid:
+            pop[mid] = pop.get(mid, 0.0) + 1.0
+    return pop
+
+
+def mmr_rerank(cands: List[str], similarity: Callable[[str, str], float], diversity: float) -> List[str]:
+    """Maximal marginal relevance over an already ranked candidate list.
+
+    Relevance is taken from the incoming order (linearly decreasing from 1), so the
+    result is stable regardless of which fusion or rerank produced it. diversity=0
+    keeps the order; diversity=1 picks purely by dissimilarity to what is selected.
+    """
+    n = len(cands)
+    if n < 3 or diversity <= 0:
+        return list(cands)
+    lam = 1.0 - min(1.0, float(diversity))
+    relevance = {pid: 1.0 - i / n for i, pid in enumerate(cands)}
+    remaining = list(cands)
+    selected = [remaining.pop(0)]
+    # running max similarity of every remaining candidate to the selected set
+    max_sim = {pid: similarity(pid, selected[0]) for pid in remaining}
+    while remaining:
+        best_i = max(range(len(remaining)),
+                     key=lambda i: lam * relevance[remaining[i]] - (1.0 - lam) * max_sim[remaining[i]])
+        pick = remaining.pop(best_i)
+        selected.append(pick)
+        for pid in remaining:
+            s = similarity(pid, pick)
+            if s > max_sim[pid]:
+                max_sim[pid] = s
+    return selected
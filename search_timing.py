@@ -0,0 +1,144 @@
+"""
+Per-stage latency instrumentation for /search.
+
+StageTimer records wall time per named stage within one request. Stages can be
+timed with the span() context manager or, inside loops that `continue` early,
+with switch(), which charges the time since the previous switch to the stage
+that was running. Repeated spans of the same stage accumulate.
+
+LatencyHistograms aggregates per-stage timings across requests into fixed
+millisecond buckets so p50/p95/p99 can be estimated without keeping samples.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Order stages are reported in (unknown stage names are appended after these)
+SEARCH_STAGES = [
+    "intent_parse",
+    "keyword_retrieve",
+    "query_embed",
+    "faiss_search",
+    "fusion",
+    "rerank",
+    "diversity",
+    "hidden_filter",
+    "gating",
+    "snippet_fetch",
+    "explanation",
+]
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+BUCKET_BOUNDS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf")]
+
+
+class StageTimer:
+    """Accumulates elapsed seconds per stage for a single request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.elapsed: Dict[str, float] = {}
+        self._current: Optional[str] = None
+        self._since = 0.0
+
+    def add(self, name: str, seconds: float) -> None:
+        self.elapsed[name] = self.elapsed.get(name, 0.0) + seconds
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def switch(self, name: str) -> None:
+        """Close the running stage (if any) and start timing `name`"""
+        now = time.perf_counter()
+        if self._current is not None:
+            self.add(self._current, now - self._since)
+        self._current = name
+        self._since = now
+
+    def stop(self) -> None:
+        if self._current is not None:
+            self.add(self._current, time.perf_counter() - self._since)
+            self._current = None
+
+    def as_ms(self) -> Dict[str, float]:
+        """Stage timings in ms (stable order) plus the request total"""
+        self.stop()
+        order = [s for s in SEARCH_STAGES if s in self.elapsed] + [s for s in self.elapsed if s not in SEARCH_STAGES]
+        out = {s: round(self.elapsed[s] * 1000.0, 3) for s in order}
+        out["total"] = round((time.perf_counter() - self.started) * 1000.0, 3)
+        return out
+
+
+class LatencyHistograms:
+    """Thread-safe fixed-bucket latency histograms keyed by stage name"""
+
+    def __init__(self, bounds: Optional[List[float]] = None):
+        self.bounds = list(bounds or BUCKET_BOUNDS_MS)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._max: Dict[str, float] = {}
+        self.requests = 0
+
+    def observe(self, timings_ms: Dict[str, float]) -> None:
+        with self._lock:
+            self.requests += 1
+            for stage, ms in timings_ms.items():
+                counts = self._counts.setdefault(stage, [0] * len(self.bounds))
+                counts[bisect_left(self.bounds, ms)] += 1
+                self._sums[stage] = self._sums.get(stage, 0.0) + ms
+                self._max[stage] = max(self._max.get(stage, 0.0), ms)
+
+    def _quantile(self, counts: List[int], q: float, max_ms: float) -> float:
+        """q-quantile interpolated linearly inside its bucket (upper edge capped at the observed max)"""
+        total = sum(counts)
+        if not total:
+            return 0.0
+        target = q * total
+        seen = 0
+        lower = 0.0
+        for bound, n in zip(self.bounds, counts):
+            upper = min(bound, max_ms)
+            if n and seen + n >= target:
+                return lower + (upper - lower) * (target - seen) / n
+            seen += n
+            lower = min(bound, max_ms)
+        return max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stages: Dict[str, Any] = {}
+            for stage, counts in self._counts.items():
+                n = sum(counts)
+                mx = self._max.get(stage, 0.0)
+                stages[stage] = {
+                    "count": n,
+                    "mean_ms": round(self._sums[stage] / n, 3) if n else 0.0,
+                    "max_ms": round(mx, 3),
+                    "p50_ms": round(self._quantile(counts, 0.50, mx), 3),
+                    "p95_ms": round(self._quantile(counts, 0.95, mx), 3),
+                    "p99_ms": round(self._quantile(counts, 0.99, mx), 3),
+                    "buckets": {("+Inf" if b == float("inf") else str(b)): c for b, c in zip(self.bounds, counts)},
+                }
+            requests = self.requests
+        ranked = sorted((s for s in stages if s != "total"), key=lambda s: stages[s]["p99_ms"], reverse=True)
+        return {
+            "requests": requests,
+            "stages": stages,
+            "p99_dominant_stage": ranked[0] if ranked else None,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+            self._max.clear()
+            self.requests = 0
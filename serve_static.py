@@ -6,6 +6,7 @@ Simple HTTP server to serve static files (HTML, CSS, JS)
 import http.server
 import socketserver
 import os
+import urllib.error
 import urllib.request
 import socket
 from pathlib import Path
@@ -38,11 +39,23 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                     # Send response
                     self.send_response(response.status)
                     for header, value in response.headers.items():
-                        if header.lower() not in ['content-encoding', 'transfer-encoding', 'connection']:
+                        # Body is relayed as-is, so Content-Encoding (gzip) must be kept
+                        if header.lower() not in ['transfer-encoding', 'connection']:
                             self.send_header(header, value)
                     self.end_headers()
                     self.wfile.write(response.read())
                 return
+            except urllib.error.HTTPError as e:
+                # Relay API status codes (e.g. 304 Not Modified, 404) instead of turning them into 502
+                body = e.read()
+                self.send_response(e.code)
+                for header, value in e.headers.items():
+                    if header.lower() not in ['transfer-encoding', 'connection']:
+                        self.send_header(header, value)
+                self.end_headers()
+                if e.code != 304 and body:
+                    self.wfile.write(body)
+                return
             except socket.timeout:
                 print(f"Timeout proxying to API: {self.path}")
                 self.send_response(504)
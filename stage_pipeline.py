@@ -0,0 +1,124 @@
+"""
+Streaming stage pipeline: items flow through a chain of stages connected by
+bounded queues, each stage with its own pool of worker threads.
+
+While one stage is waiting on a slow upstream (an LLM call), the stages
+before it keep working on the next items, so network-bound and LLM-bound
+work overlap. Every queue holds at most `queue_size` items and the input
+iterator is only advanced when the first queue has room, so memory stays
+bounded however many items come in (the input may be a generator).
+
+    for item, result, error in stream_stages(movies, [Stage("fetch", fetch, 8), Stage("llm", profile, 3)]):
+        ...
+
+Results come out in completion order. An exception in a stage skips the
+remaining stages for that item and is reported as its `error`.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_QUEUE_SIZE = 32
+# How often blocked threads check whether the consumer went away
+_POLL_SECONDS = 0.1
+
+
+class Stage(NamedTuple):
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int
+
+
+class _Stopped(Exception):
+    pass
+
+
+_END = object()
+
+
+def stream_stages(items: Iterable[Any], stages: Sequence[Stage],
+                  queue_size: int = DEFAULT_QUEUE_SIZE) -> Iterator[Tuple[Any, Any, Optional[BaseException]]]:
+    """Run every item through `stages`; yields (item, result, error) as items leave the last stage"""
+    if not stages:
+        raise ValueError("stream_stages needs at least one stage")
+    # queues[i] feeds stage i; queues[-1] is the output
+    queues: List["queue.Queue[Any]"] = [queue.Queue(maxsize=max(1, queue_size)) for _ in range(len(stages) + 1)]
+    stop = threading.Event()
+    feed_error: List[BaseException] = []
+
+    def put(q: "queue.Queue[Any]", value: Any) -> None:
+        while True:
+            try:
+                q.put(value, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                if stop.is_set():
+                    raise _Stopped()
+
+    def get(q: "queue.Queue[Any]") -> Any:
+        while True:
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if stop.is_set():
+                    raise _Stopped()
+
+    def feed() -> None:
+        try:
+            for item in items:
+                put(queues[0], (item, item, None))
+        except _Stopped:
+            return
+        except BaseException as e:  # the input iterator failed; finish what is in flight, then re-raise
+            feed_error.append(e)
+        try:
+            for _ in range(max(1, stages[0].workers)):
+                put(queues[0], _END)
+        except _Stopped:
+            pass
+
+    def work(index: int, live: List[int], lock: threading.Lock) -> None:
+        stage, inbox, outbox = stages[index], queues[index], queues[index + 1]
+        try:
+            while True:
+                entry = get(inbox)
+                if entry is _END:
+                    break
+                item, value, error = entry
+                if error is None:
+                    try:
+                        value = stage.fn(value)
+                    except Exception as e:
+                        error = e
+                put(outbox, (item, value, error))
+            # the last worker of a stage to finish closes the next stage
+            with lock:
+                live[0] -= 1
+                last = live[0] == 0
+            if last:
+                following = max(1, stages[index + 1].workers) if index + 1 < len(stages) else 1
+                for _ in range(following):
+                    put(outbox, _END)
+        except _Stopped:
+            pass
+
+    threads = [threading.Thread(target=feed, daemon=True, name="stage-feed")]
+    for index, stage in enumerate(stages):
+        n = max(1, stage.workers)
+        live, lock = [n], threading.Lock()
+        threads.extend(threading.Thread(target=work, args=(index, live, lock), daemon=True,
+                                        name=f"stage-{stage.name}-{i}") for i in range(n))
+    for t in threads:
+        t.start()
+    try:
+        while True:
+            entry = queues[-1].get()
+            if entry is _END:
+                break
+            yield entry
+        if feed_error:
+            raise feed_error[0]
+    finally:
+        # also reached when the consumer stops early: unblock and end every thread
+        stop.set()
@@ -41,10 +41,13 @@ def main():
     
     # Start API server
     print(f"📡 Starting API server on port {API_PORT}...")
+    # API_WORKERS > 1 runs several worker processes (shared state lives in state.db); --reload needs a single worker
+    workers = int(os.getenv('API_WORKERS', '1'))
+    mode_args = ['--workers', str(workers)] if workers > 1 else ['--reload']
     api_process = subprocess.Popen([
         sys.executable, '-m', 'uvicorn', 
         'api:app', 
-        '--reload', 
+        *mode_args,
         '--host', API_HOST, 
         '--port', str(API_PORT)
     ])
@@ -0,0 +1,382 @@
+"""
+Shared runtime state for the API and admin processes.
+
+Everything that used to live in module-level Python objects and must agree
+across uvicorn workers or containers goes through a StateBackend:
+- named lists (admin staging area), with atomic read-modify-write
+- capped event logs (admin operation log, recent searches, clicks)
+- a few key/value settings (e.g. the generated admin JWT secret)
+
+Two implementations:
+- SQLiteStateBackend (default): one WAL-mode database file shared by every
+  process on the host (STATE_DB_PATH, default state.db). Containers share it
+  through a common volume.
+- MemoryStateBackend: per-process state, for a single worker or tests
+  (STATE_BACKEND=memory).
+
+Values are JSON-serializable; every call returns fresh copies, so mutating a
+returned list never changes the stored state.
+
+Hot paths (the API's per-request observability events) use an EventWriter:
+events are queued in memory and appended in batches by a background thread,
+one write transaction per batch, so request handlers never wait on the
+database's writer lock. The same writer feeds JsonlEventLog, the optional
+size-rotated JSONL files the offline evaluation and training scripts read.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+ROOT = Path(__file__).parent
+DEFAULT_DB_PATH = ROOT / "state.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lists (
+    name TEXT PRIMARY KEY,
+    items TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    name TEXT NOT NULL,
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    event TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_name_seq ON events(name, seq);
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class StateBackend:
+    """Interface shared by the state backends"""
+
+    # ---- lists --------------------------------------------------------
+    def get_list(self, name: str) -> List[Any]:
+        raise NotImplementedError
+
+    def update_list(self, name: str, fn: Callable[[List[Any]], List[Any]]) -> List[Any]:
+        """Atomically replace the list with fn(current); returns the new list"""
+        raise NotImplementedError
+
+    def set_list(self, name: str, items: List[Any]) -> None:
+        self.update_list(name, lambda _items: list(items))
+
+    def extend_list(self, name: str, items: List[Any]) -> int:
+        """Append items; returns the new length"""
+        return len(self.update_list(name, lambda cur: cur + list(items)))
+
+    def list_len(self, name: str) -> int:
+        return len(self.get_list(name))
+
+    def pop_list(self, name: str) -> List[Any]:
+        """Atomically empty the list; returns the items it held"""
+        taken: List[Any] = []
+
+        def take(items: List[Any]) -> List[Any]:
+            taken.extend(items)
+            return []
+
+        self.update_list(name, take)
+        return taken
+
+    def move_list(self, src: str, dst: str, append: bool = False) -> List[Any]:
+        """Atomically empty `src` into `dst` (replacing it, or appending with append=True); returns the moved items"""
+        raise NotImplementedError
+
+    # ---- capped event logs -------------------------------------------
+    def append_event(self, name: str, event: Dict[str, Any], maxlen: int) -> None:
+        """Append to the log `name`, keeping only the newest maxlen events"""
+        raise NotImplementedError
+
+    def append_events(self, name: str, events: List[Dict[str, Any]], maxlen: int) -> None:
+        """append_event for several events at once (one write for the SQLite backend)"""
+        for event in events:
+            self.append_event(name, event, maxlen)
+
+    def recent_events(self, name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Up to `limit` newest events, oldest first"""
+        raise NotImplementedError
+
+    # ---- key/value ----------------------------------------------------
+    def get_value(self, key: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def setdefault_value(self, key: str, value: Any) -> Any:
+        """Store value unless key is already set; returns the stored value (first writer wins)"""
+        raise NotImplementedError
+
+
+def _copy(value: Any) -> Any:
+    """Deep copy through JSON, so the memory backend hands out the same values SQLite would"""
+    return json.loads(json.dumps(value))
+
+
+class MemoryStateBackend(StateBackend):
+    """Per-process state; only consistent with a single worker"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._lists: Dict[str, List[Any]] = {}
+        self._events: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._kv: Dict[str, Any] = {}
+
+    def get_list(self, name: str) -> List[Any]:
+        with self._lock:
+            return _copy(self._lists.get(name, []))
+
+    def update_list(self, name: str, fn: Callable[[List[Any]], List[Any]]) -> List[Any]:
+        with self._lock:
+            items = _copy(list(fn(_copy(self._lists.get(name, [])))))
+            self._lists[name] = items
+            return _copy(items)
+
+    def move_list(self, src: str, dst: str, append: bool = False) -> List[Any]:
+        with self._lock:
+            moved = self._lists.get(src, [])
+            self._lists[src] = []
+            self._lists[dst] = (self._lists.get(dst, []) if append else []) + moved
+            return _copy(moved)
+
+    def append_event(self, name: str, event: Dict[str, Any], maxlen: int) -> None:
+        with self._lock:
+            log = self._events.get(name)
+            if log is None or log.maxlen != maxlen:
+                log = self._events[name] = deque(log or (), maxlen=maxlen)
+            log.append(_copy(event))
+
+    def recent_events(self, name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            events = _copy(list(self._events.get(name, ())))
+        return events[-limit:] if limit else events
+
+    def get_value(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return _copy(self._kv[key]) if key in self._kv else default
+
+    def setdefault_value(self, key: str, value: Any) -> Any:
+        with self._lock:
+            return _copy(self._kv.setdefault(key, _copy(value)))
+
+
+class SQLiteStateBackend(StateBackend):
+    """State in a WAL-mode SQLite file shared by all worker processes. Safe to share between threads."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction; BEGIN IMMEDIATE serializes read-modify-write across processes"""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def _read_list(self, name: str) -> List[Any]:
+        row = self.conn.execute("SELECT items FROM lists WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def _write_list(self, name: str, items: List[Any]) -> None:
+        self.conn.execute(
+            "INSERT INTO lists(name, items) VALUES(?, ?) ON CONFLICT(name) DO UPDATE SET items = excluded.items",
+            (name, json.dumps(items, ensure_ascii=False)),
+        )
+
+    def get_list(self, name: str) -> List[Any]:
+        with self._lock:
+            return self._read_list(name)
+
+    def update_list(self, name: str, fn: Callable[[List[Any]], List[Any]]) -> List[Any]:
+        with self._write():
+            items = list(fn(self._read_list(name)))
+            self._write_list(name, items)
+        return items
+
+    def move_list(self, src: str, dst: str, append: bool = False) -> List[Any]:
+        with self._write():
+            moved = self._read_list(src)
+            self._write_list(src, [])
+            self._write_list(dst, (self._read_list(dst) if append else []) + moved)
+        return moved
+
+    def append_event(self, name: str, event: Dict[str, Any], maxlen: int) -> None:
+        self.append_events(name, [event], maxlen)
+
+    def append_events(self, name: str, events: List[Dict[str, Any]], maxlen: int) -> None:
+        if not events:
+            return
+        with self._write():
+            cur = self.conn.cursor()
+            cur.executemany("INSERT INTO events(name, event) VALUES(?, ?)",
+                            [(name, json.dumps(event, ensure_ascii=False)) for event in events])
+            last = self.conn.execute("SELECT MAX(seq) FROM events WHERE name = ?", (name,)).fetchone()[0]
+            # events of all logs share one sequence, so trim by this log's own maxlen-th newest row
+            cutoff = self.conn.execute(
+                "SELECT seq FROM events WHERE name = ? AND seq <= ? ORDER BY seq DESC LIMIT 1 OFFSET ?",
+                (name, last, maxlen),
+            ).fetchone()
+            if cutoff:
+                self.conn.execute("DELETE FROM events WHERE name = ? AND seq <= ?", (name, cutoff[0]))
+
+    def recent_events(self, name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT event FROM events WHERE name = ? ORDER BY seq DESC LIMIT ?", (name, limit or -1)
+            ).fetchall()
+        return [json.loads(e) for e, in reversed(rows)]
+
+    def get_value(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def setdefault_value(self, key: str, value: Any) -> Any:
+        with self._write():
+            self.conn.execute("INSERT OR IGNORE INTO kv(key, value) VALUES(?, ?)", (key, json.dumps(value)))
+            row = self.conn.execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+class JsonlEventLog:
+    """Append-only JSONL files, one per event log name (<dir>/<name>), for an EventWriter.
+
+    A file is rotated to <name>.1 (older ones shifted up to <name>.<backups>, the oldest deleted) before
+    an append would take it past max_bytes. Rotation assumes one writing process per directory.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 50_000_000, backups: int = 5):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    def append_events(self, name: str, events: List[Dict[str, Any]], maxlen: int = 0) -> None:
+        """Append `events` to the <name> file (maxlen is ignored; size is bounded by rotation)"""
+        data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events).encode("utf-8")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / name
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate(path)
+        with open(path, "ab") as f:
+            f.write(data)
+
+    def _rotate(self, path: Path) -> None:
+        if self.backups <= 0:
+            path.unlink(missing_ok=True)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            older = path.with_name(f"{path.name}.{i}")
+            if older.exists():
+                os.replace(older, path.with_name(f"{path.name}.{i + 1}"))
+        os.replace(path, path.with_name(f"{path.name}.1"))
+
+
+def rotated_paths(path: Path) -> List[Path]:
+    """`path` and its JsonlEventLog rotations that exist, oldest first"""
+    rotations = []
+    for candidate in path.parent.glob(f"{path.name}.*"):
+        suffix = candidate.name[len(path.name) + 1:]
+        if suffix.isdigit():
+            rotations.append((int(suffix), candidate))
+    return [p for _, p in sorted(rotations, reverse=True)] + ([path] if path.exists() else [])
+
+
+class EventWriter:
+    """Appends events to a StateBackend (or JsonlEventLog) from a background thread, in batches.
+
+    submit() never blocks: when the queue is full (the database is stuck) the event is dropped and counted.
+    """
+
+    def __init__(self, backend: Any, max_queue: int = 10000, batch_size: int = 200,
+                 interval: float = 0.25):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="state-event-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, name: str, event: Dict[str, Any], maxlen: int) -> None:
+        try:
+            self._queue.put_nowait((name, event, maxlen))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything submitted so far is written (tests, shutdown)"""
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get(timeout=self.interval))
+            except queue.Empty:
+                pass
+            self._write([e for e in batch if not isinstance(e, threading.Event)])
+            for e in batch:
+                if isinstance(e, threading.Event):
+                    e.set()
+
+    def _write(self, batch: List[Any]) -> None:
+        by_log: Dict[str, List[Dict[str, Any]]] = {}
+        maxlens: Dict[str, int] = {}
+        for name, event, maxlen in batch:
+            by_log.setdefault(name, []).append(event)
+            maxlens[name] = maxlen
+        for name, events in by_log.items():
+            try:
+                self.backend.append_events(name, events, maxlens[name])
+            except Exception as e:
+                print(f"[state] failed to append {len(events)} events to {name}: {e}")
+
+
+_backend: Optional[StateBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_state_backend() -> StateBackend:
+    """Process-wide backend chosen by STATE_BACKEND (sqlite | memory); STATE_DB_PATH overrides the file"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            kind = (os.getenv("STATE_BACKEND") or "sqlite").strip().lower()
+            if kind == "memory":
+                _backend = MemoryStateBackend()
+            elif kind == "sqlite":
+                _backend = SQLiteStateBackend(Path(os.getenv("STATE_DB_PATH") or DEFAULT_DB_PATH))
+            else:
+                raise ValueError(f"unknown STATE_BACKEND {kind!r} (expected sqlite or memory)")
+        return _backend
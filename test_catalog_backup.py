@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental, content-addressed catalog backups (catalog_backup.py)
+
+    python -m pytest -q test_catalog_backup.py
+"""
+
+import json
+
+import pytest
+
+import catalog_backup
+import catalog_store
+from catalog_backup import BackupStore
+from catalog_store import CatalogStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_store, "JSON_CHECK_INTERVAL", 0)
+    json_path = tmp_path / "movies.json"
+    json_path.write_text(json.dumps({f"M{i}": {"title": f"M{i}", "year": 2000 + i} for i in range(5)}), encoding="utf-8")
+    return CatalogStore(tmp_path / "catalog.db", json_path)
+
+
+@pytest.fixture
+def backups(tmp_path):
+    return BackupStore(tmp_path / "backups")
+
+
+def chunk_count(backups):
+    return sum(1 for _ in backups.chunks_dir.rglob("*.gz"))
+
+
+def test_incremental_backup_stores_only_changes(store, backups):
+    first = backups.create(store, label="first")
+    assert first["full"] and first["count"] == 5
+    assert chunk_count(backups) == 5
+
+    store.put("M1", {"title": "M1", "year": 1999})
+    store.delete("M3")
+    store.put("M9", {"title": "M9"})
+    second = backups.create(store, label="second")
+    assert not second["full"] and second["changed"] == 3 and second["count"] == 5
+    assert backups.manifest(second["id"])["changes"]["M3"] is None
+    assert chunk_count(backups) == 7
+
+    assert backups.load("latest") == store.all()
+    assert list(backups.load("latest")) == store.titles()
+    assert backups.load(first["id"])["M1"] == {"title": "M1", "year": 2001}
+    assert "M3" in backups.load(first["id"])
+
+
+def test_unchanged_catalog_reuses_last_backup(store, backups):
+    first = backups.create(store)
+    again = backups.create(store)
+    assert again["reused"] and again["id"] == first["id"]
+    assert backups.manifest_ids() == [first["id"]]
+
+
+def test_manifest_chain_is_bounded(store, backups, monkeypatch):
+    monkeypatch.setattr(catalog_backup, "FULL_EVERY", 3)
+    kinds = []
+    for i in range(6):
+        store.put("M0", {"title": "M0", "rev": i})
+        kinds.append(backups.create(store)["full"])
+    assert kinds == [True, False, False, True, False, False]
+    assert backups.load("latest")["M0"] == {"title": "M0", "rev": 5}
+
+
+def test_wholesale_replace_falls_back_to_full_diff(store, backups):
+    backups.create(store)
+    movies = store.all()
+    movies["M2"] = {"title": "M2", "year": 1}
+    store.replace_all(movies)
+    result = backups.create(store)
+    assert not result["full"] and result["changed"] == 1
+    assert backups.load("latest") == movies
+
+
+def test_prune_keeps_parents_and_referenced_chunks(store, backups, monkeypatch):
+    monkeypatch.setattr(catalog_backup, "FULL_EVERY", 2)
+    ids = []
+    for i in range(4):
+        store.put("M4", {"title": "M4", "rev": i})
+        ids.append(backups.create(store)["id"])
+    expected = backups.load(ids[-1])
+
+    result = backups.prune(keep=1)
+    # the kept incremental still needs the full manifest it builds on
+    assert backups.manifest_ids() == ids[2:]
+    assert result == {"manifests": 2, "chunks": 2}
+    assert backups.load(ids[-1]) == expected
+    assert chunk_count(backups) == 6
+
+
+def test_create_from_movies_and_resolve_id(backups):
+    a = backups.create_from_movies({"A": {"n": 1}, "B": {"n": 2}})
+    b = backups.create_from_movies({"B": {"n": 2}, "A": {"n": 1}})
+    # a reordered catalog cannot be expressed as a diff
+    assert a["full"] and b["full"]
+    assert list(backups.load(b["id"][:-1])) == ["B", "A"]
+    with pytest.raises(FileNotFoundError):
+        backups.resolve_id("19990101")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the theme index following the catalog store across processes (catalog_index.py)
+
+    python -m pytest -q test_catalog_index.py
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import catalog_store
+from catalog_index import ThemeIndex, sync_theme_index
+from catalog_store import CatalogStore
+
+ROOT = Path(__file__).parent
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_store, "JSON_CHECK_INTERVAL", 0)
+    json_path = tmp_path / "movies.json"
+    movies = {f"M{i}": {"title": f"M{i}", "primary_theme": "grief" if i % 2 else "survival"} for i in range(4)}
+    json_path.write_text(json.dumps(movies), encoding="utf-8")
+    return tmp_path / "catalog.db", json_path
+
+
+def other_process(paths, code):
+    script = ("import sys; from pathlib import Path; from catalog_store import CatalogStore; "
+              "store = CatalogStore(Path(sys.argv[1]), Path(sys.argv[2])); " + code)
+    subprocess.run([sys.executable, "-c", script, str(paths[0]), str(paths[1])], cwd=str(ROOT), check=True)
+
+
+def counts(index):
+    return {t["theme"]: t["count"] for t in index.themes(top_n=0)}
+
+
+def test_theme_index_follows_writes_from_another_process(paths):
+    store = CatalogStore(*paths)
+    index = ThemeIndex()
+    version = sync_theme_index(index, store, None)
+    assert counts(index) == {"grief": 2, "survival": 2}
+
+    other_process(paths, "store.put('NEW', {'title': 'NEW', 'primary_theme': 'heist'}); store.delete('M1')")
+    revision = index.revision
+    version = sync_theme_index(index, store, version)
+    assert version == store.version
+    assert counts(index) == {"grief": 1, "survival": 2, "heist": 1}
+    assert index.themes(top_n=5)[-1]["movies"][0]["title"] == "NEW"
+    assert index.revision > revision
+
+    # nothing changed since: no work and the same revision
+    revision = index.revision
+    assert sync_theme_index(index, store, version) == version
+    assert index.revision == revision
+
+
+def test_theme_index_rebuilds_after_wholesale_replace(paths):
+    store = CatalogStore(*paths)
+    index = ThemeIndex()
+    version = sync_theme_index(index, store, None, hidden=["M0"])
+    revision = index.revision
+    other_process(paths, "store.replace_all({'A': {'title': 'A', 'primary_theme': 'heist'}, "
+                         "'M0': {'title': 'M0', 'primary_theme': 'heist'}})")
+    assert store.changed_since(version) is None
+    sync_theme_index(index, store, version, hidden=["M0"])
+    assert counts(index) == {"heist": 1}
+    assert index.revision > revision
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the catalog store's journal replay and cross-process sync (catalog_store.py, catalog_journal.py)
+
+    python -m pytest -q test_catalog_store.py
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import catalog_store
+from catalog_journal import get_journal
+from catalog_store import CatalogStore
+
+ROOT = Path(__file__).parent
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_store, "JSON_CHECK_INTERVAL", 0)
+    json_path = tmp_path / "movies.json"
+    json_path.write_text(json.dumps({"M0": {"title": "M0"}}), encoding="utf-8")
+    return tmp_path / "catalog.db", json_path
+
+
+def test_second_store_does_not_replay_applied_entries(paths):
+    a, b = CatalogStore(*paths), CatalogStore(*paths)
+    before = a.version
+    a.put("M1", {"title": "M1"})
+    assert b.version == before + 1
+    assert b.changed_since(before) == ["M1"]
+    assert a.version == before + 1
+
+
+def test_write_from_another_process_is_applied_once(paths):
+    db_path, json_path = paths
+    store = CatalogStore(db_path, json_path)
+    before = store.version
+    script = ("import sys; from pathlib import Path; from catalog_store import CatalogStore; "
+              "CatalogStore(Path(sys.argv[1]), Path(sys.argv[2])).put('M1', {'title': 'M1'})")
+    subprocess.run([sys.executable, "-c", script, str(db_path), str(json_path)], cwd=str(ROOT), check=True)
+    assert store.get("M1") == {"title": "M1"}
+    assert store.version == before + 1
+    assert store.changed_since(before) == ["M1"]
+
+
+def test_compaction_by_another_store_keeps_delta_history(paths):
+    a, b = CatalogStore(*paths), CatalogStore(*paths)
+    before = a.version
+    a.put("M1", {"title": "M1"})
+    assert b.compact(force=True)
+    assert a.changed_since(before) == ["M1"]
+    assert a.version == before + 1
+
+
+def test_script_compaction_only_resets_position(paths):
+    store = CatalogStore(*paths)
+    store.put("M1", {"title": "M1"})
+    before = store.version
+    assert get_journal(paths[1]).compact()
+    assert store.version == before
+    assert store.changed_since(before) == []
+    get_journal(paths[1]).patch({"M1": {"year": 1999}})
+    assert store.get("M1") == {"title": "M1", "year": 1999}
+    assert store.changed_since(before) == ["M1"]
+
+
+def test_rewritten_snapshot_is_reimported(paths):
+    store = CatalogStore(*paths)
+    before = store.version
+    get_journal(paths[1]).write_snapshot({"M9": {"title": "M9"}})
+    assert store.titles() == ["M9"]
+    assert store.changed_since(before) is None
+
+
+def test_failed_transaction_leaves_position_and_journal_alone(paths):
+    store = CatalogStore(*paths)
+    size = get_journal(paths[1]).journal_size()
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store._upsert("M1", {"title": "M1"}, "now")
+            raise RuntimeError("boom")
+    assert store.get("M1") is None
+    assert get_journal(paths[1]).journal_size() == size
+    assert not store.sync_from_json()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the durable enrichment job queue: leases, retries and pruning (job_queue.py)
+
+    python -m pytest -q test_job_queue.py
+"""
+
+import time
+
+import pytest
+
+import job_queue
+from job_queue import JobQueue
+
+MOVIES = [{"title": "A", "tmdb_id": 1}, {"title": "B", "tmdb_id": 2}]
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "backoff_seconds", lambda attempts: 0.0)
+    return JobQueue(tmp_path / "jobs.db", lease_seconds=0.05)
+
+
+def test_stages_run_in_order_per_movie(queue):
+    run_id = queue.create_run("enrichment", MOVIES + [{"title": "A", "tmdb_id": 1}], ["metadata", "profile"])
+    jobs = queue.claim("w1", limit=10)
+    assert [(j["title"], j["stage"]) for j in jobs] == [("A", "metadata"), ("B", "metadata")]
+    assert queue.complete(jobs[0]["id"], "w1", {"title": "A", "year": "2001"})
+    [nxt] = queue.claim("w1", limit=10)
+    assert (nxt["stage"], nxt["input"]) == ("profile", {"title": "A", "year": "2001"})
+    assert queue.get_run(run_id)["total"] == 2
+
+
+def test_expired_lease_is_reclaimed_and_late_result_dropped(queue):
+    queue.create_run("enrichment", MOVIES[:1], ["metadata"])
+    [job] = queue.claim("w1")
+    assert queue.claim("w2") == []
+    time.sleep(0.1)
+    [again] = queue.claim("w2")
+    assert again["id"] == job["id"] and again["attempts"] == 2
+    assert not queue.complete(job["id"], "w1", {"title": "A"})
+    assert queue.complete(again["id"], "w2", {"title": "A"})
+
+
+def test_failed_job_retries_then_fails_and_skips_later_stages(queue):
+    run_id = queue.create_run("enrichment", MOVIES[:1], ["metadata", "profile"], max_attempts=2)
+    [job] = queue.claim("w1")
+    assert queue.fail(job["id"], "w1", "boom") == "pending"
+    [job] = queue.claim("w1")
+    assert queue.fail(job["id"], "w1", "boom") == "failed"
+    stages = queue.get_run(run_id)["stages"]
+    assert stages == {"metadata": {"failed": 1}, "profile": {"skipped": 1}}
+    assert queue.retry_failed(run_id) == 1
+    assert queue.claim("w1")[0]["attempts"] == 1
+
+
+def test_crashing_job_stops_after_max_attempts(queue):
+    run_id = queue.create_run("enrichment", MOVIES[:1], ["metadata", "profile"], max_attempts=2)
+    for _ in range(2):
+        assert len(queue.claim("w1")) == 1
+        time.sleep(0.1)  # the worker dies holding the lease
+    assert queue.claim("w1") == []
+    run = queue.get_run(run_id)
+    assert run["stages"] == {"metadata": {"failed": 1}, "profile": {"skipped": 1}}
+    assert "lease expired" in run["failed_jobs"][0]["error"]
+    assert [e["type"] for e in queue.events_since(0)][-1] == "job_failed"
+    assert queue.claim_finished_run("w1")["id"] == run_id
+
+
+def test_finished_runs_are_pruned_after_retention(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", retention_seconds=3600)
+    old = queue.create_run("enrichment", MOVIES, ["metadata"])
+    active = queue.create_run("enrichment", MOVIES, ["metadata"])
+    queue.finish_run(old)
+    assert queue.get_run(old) is not None  # within the retention period
+    assert queue.prune(older_than=time.time() + 1) == 1
+    assert queue.get_run(old) is None and queue.run_results(old) == []
+    assert all(e["run_id"] != old for e in queue.events_since(0))
+    assert queue.get_run(active)["status"] == "running"
+    assert len(queue.run_results(active)) == 2
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming stage pipeline: results, error propagation and shutdown (stage_pipeline.py)
+
+    python -m pytest -q test_stage_pipeline.py
+"""
+
+import itertools
+import threading
+import time
+
+import pytest
+
+from stage_pipeline import Stage, stream_stages
+
+
+def _stage_threads():
+    return [t for t in threading.enumerate() if t.name.startswith("stage-")]
+
+
+def _wait_for_no_stage_threads(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while _stage_threads() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return not _stage_threads()
+
+
+def test_every_item_goes_through_every_stage():
+    stages = [Stage("double", lambda x: x * 2, 4), Stage("inc", lambda x: x + 1, 2)]
+    out = list(stream_stages(range(100), stages, queue_size=4))
+    assert sorted((item, result) for item, result, _ in out) == [(i, i * 2 + 1) for i in range(100)]
+    assert all(error is None for _, _, error in out)
+    assert _wait_for_no_stage_threads()
+
+
+def test_stage_error_skips_later_stages_for_that_item():
+    seen = []
+
+    def check(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    out = {item: (result, error) for item, result, error in
+           stream_stages(range(6), [Stage("check", check, 2), Stage("record", lambda x: seen.append(x) or x, 1)])}
+    assert isinstance(out[3][1], ValueError)
+    assert sorted(seen) == [0, 1, 2, 4, 5]
+    assert all(out[i] == (i, None) for i in (0, 1, 2, 4, 5))
+
+
+def test_input_error_is_raised_after_in_flight_items():
+    def items():
+        yield from range(5)
+        raise RuntimeError("source broke")
+
+    results = []
+    with pytest.raises(RuntimeError, match="source broke"):
+        for item, result, error in stream_stages(items(), [Stage("id", lambda x: x, 2)]):
+            results.append(item)
+    assert sorted(results) == list(range(5))
+    assert _wait_for_no_stage_threads()
+
+
+def test_consumer_exit_stops_threads_and_input():
+    pulled = []
+
+    def items():
+        for i in itertools.count():
+            pulled.append(i)
+            yield i
+
+    stream = stream_stages(items(), [Stage("slow", lambda x: time.sleep(0.01) or x, 2), Stage("id", lambda x: x, 1)],
+                           queue_size=2)
+    next(stream)
+    stream.close()
+    assert _wait_for_no_stage_threads()
+    pulled_at_close = len(pulled)
+    time.sleep(0.2)
+    assert len(pulled) == pulled_at_close < 50
+
+
+def test_input_is_only_read_as_fast_as_queues_drain():
+    pulled = []
+
+    def items():
+        for i in range(1000):
+            pulled.append(i)
+            yield i
+
+    stream = stream_stages(items(), [Stage("id", lambda x: x, 1)], queue_size=2)
+    next(stream)
+    time.sleep(0.3)
+    # two queues of two, one item in the worker, one in the feeder and the one consumed
+    assert len(pulled) <= 8
+    stream.close()
+    assert _wait_for_no_stage_threads()
+
+
+def test_needs_a_stage():
+    with pytest.raises(ValueError):
+        list(stream_stages([1], []))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared state backends and the batched event writer (state_store.py)
+
+    python -m pytest -q test_state_store.py
+"""
+
+import threading
+
+import pytest
+
+from state_store import EventWriter, JsonlEventLog, MemoryStateBackend, SQLiteStateBackend, rotated_paths
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStateBackend()
+    return SQLiteStateBackend(tmp_path / "state.db")
+
+
+def test_lists_are_copies_and_move_atomically(backend):
+    backend.set_list("staging", [{"title": "A"}])
+    backend.get_list("staging")[0]["title"] = "mutated"
+    assert backend.get_list("staging") == [{"title": "A"}]
+    assert backend.extend_list("staging", [{"title": "B"}]) == 2
+    assert backend.move_list("staging", "processing") == [{"title": "A"}, {"title": "B"}]
+    assert backend.get_list("staging") == []
+    assert backend.pop_list("processing") == [{"title": "A"}, {"title": "B"}]
+
+
+def test_event_logs_are_capped_per_name(backend):
+    for i in range(5):
+        backend.append_event("a", {"i": i}, maxlen=3)
+    backend.append_events("b", [{"i": i} for i in range(4)], maxlen=2)
+    assert backend.recent_events("a") == [{"i": 2}, {"i": 3}, {"i": 4}]
+    assert backend.recent_events("a", 1) == [{"i": 4}]
+    assert backend.recent_events("b") == [{"i": 2}, {"i": 3}]
+
+
+def test_setdefault_value_first_writer_wins(backend):
+    assert backend.setdefault_value("secret", "one") == "one"
+    assert backend.setdefault_value("secret", "two") == "one"
+    assert backend.get_value("secret") == "one"
+    assert backend.get_value("missing", 5) == 5
+
+
+def test_sqlite_state_is_shared_between_connections(tmp_path):
+    a, b = SQLiteStateBackend(tmp_path / "state.db"), SQLiteStateBackend(tmp_path / "state.db")
+
+    def add(backend, n):
+        for i in range(n):
+            backend.update_list("counter", lambda items: items + [i])
+
+    threads = [threading.Thread(target=add, args=(x, 50)) for x in (a, b)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(b.get_list("counter")) == 100
+
+
+def test_event_writer_batches_in_order(backend):
+    writer = EventWriter(backend)
+    for i in range(250):
+        writer.submit("obs", {"i": i}, 100)
+    writer.submit("other", {"i": -1}, 10)
+    assert writer.flush()
+    assert [e["i"] for e in backend.recent_events("obs")] == list(range(150, 250))
+    assert backend.recent_events("other") == [{"i": -1}]
+
+
+def test_jsonl_log_rotates_by_size(tmp_path):
+    log = JsonlEventLog(tmp_path, max_bytes=40, backups=2)
+    writer = EventWriter(log, interval=0.01)
+    for i in range(10):
+        writer.submit("requests.jsonl", {"i": i}, 0)
+        assert writer.flush()
+    paths = rotated_paths(tmp_path / "requests.jsonl")
+    assert [p.name for p in paths] == ["requests.jsonl.2", "requests.jsonl.1", "requests.jsonl"]
+    assert all(p.stat().st_size <= 40 for p in paths)
+    lines = [line for p in paths for line in p.read_text(encoding="utf-8").splitlines()]
+    assert lines == ['{"i": %d}' % i for i in range(10 - len(lines), 10)]
+
+
+def test_event_writer_drops_instead_of_blocking():
+    started = threading.Event()
+    release = threading.Event()
+
+    class Stuck(MemoryStateBackend):
+        def append_events(self, name, events, maxlen):
+            started.set()
+            release.wait()
+
+    writer = EventWriter(Stuck(), max_queue=2, batch_size=1, interval=0.01)
+    writer.submit("obs", {"i": 0}, 10)
+    assert started.wait(5)
+    for i in range(5):
+        writer.submit("obs", {"i": i}, 10)
+    assert writer.dropped == 3
+    release.set()
+    assert writer.flush()
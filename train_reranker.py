@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Train the /search click reranker from the persisted search and click logs.
+
+Each logged request with at least one click contributes the candidate features
+/search recorded when it served the results (fused rank under the request's own
+fusion, rrf_k and weights; bm25; vector similarity; facet matches), so training
+sees what the user saw rather than a replay against today's index. Results
+shown at or above the lowest clicked position are used as examples (clicked =
+positive, skipped = negative), which limits position bias from results the user
+never looked at.
+
+Usage:
+    python train_reranker.py                                  # logs/*.jsonl -> models/reranker.json
+    python train_reranker.py --recent recent.json --out models/reranker.json
+"""
+
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from evaluate_fusion import DEFAULT_LOG_DIR, load_events
+from search_rerank import FEATURES, ClickReranker, feature_row, popularity_from_clicks
+
+ROOT = Path(__file__).parent
+DEFAULT_MODEL_PATH = ROOT / "models" / "reranker.json"
+
+
+def build_examples(reqs: List[Dict[str, Any]], clicks: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Feature rows of the logged candidates of clicked requests, as (features, labels)"""
+    clicks_by_rid: Dict[str, List[Dict[str, Any]]] = {}
+    for c in clicks:
+        if c.get("request_id") and c.get("movie_id"):
+            clicks_by_rid.setdefault(c["request_id"], []).append(c)
+    popularity = popularity_from_clicks(clicks)
+
+    X: List[List[float]] = []
+    y: List[float] = []
+    unlogged = 0
+    for r in reqs:
+        rid = r.get("request_id")
+        shown = r.get("result_ids") or []
+        req_clicks = clicks_by_rid.get(rid) or []
+        if not shown or not req_clicks:
+            continue
+        clicked = {c["movie_id"] for c in req_clicks}
+        positions = [shown.index(m) + 1 for m in clicked if m in shown]
+        if not positions:
+            continue
+        cands = r.get("candidates")
+        if not cands:
+            # logged before /search recorded candidate features; replaying today's index would mislabel it
+            unlogged += 1
+            continue
+        # Exclude this request's own clicks from popularity so the label does not leak into the feature
+        own = popularity_from_clicks(req_clicks)
+        pop = {m: popularity.get(m, 0.0) - own.get(m, 0.0) for m in shown}
+
+        for pos, c in enumerate(cands[:max(positions)], start=1):
+            pid = c.get("id")
+            X.append(feature_row(c.get("rank") or pos, c.get("kw_score"), c.get("vec_score"),
+                                 c.get("facets") or 0, pop.get(pid, 0.0)))
+            y.append(1.0 if pid in clicked else 0.0)
+    if unlogged:
+        print(f"[train] skipped {unlogged} clicked requests logged without candidate features")
+    return np.array(X, dtype="float64").reshape(-1, len(FEATURES)), np.array(y, dtype="float64")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the /search click reranker from logged clicks")
+    parser.add_argument("--requests", type=Path, default=DEFAULT_LOG_DIR / "requests.jsonl", help="Logged /search requests (JSONL)")
+    parser.add_argument("--clicks", type=Path, default=DEFAULT_LOG_DIR / "clicks.jsonl", help="Logged click events (JSONL)")
+    parser.add_argument("--recent", type=Path, default=None, help="Optional saved /observability/recent JSON response")
+    parser.add_argument("--out", type=Path, default=DEFAULT_MODEL_PATH, help="Model artifact path")
+    parser.add_argument("--l2", type=float, default=1e-3, help="L2 regularization strength")
+    parser.add_argument("--epochs", type=int, default=500, help="Gradient descent epochs")
+    parser.add_argument("--min-positives", type=int, default=5, help="Refuse to train with fewer clicked examples")
+    args = parser.parse_args()
+
+    reqs, clicks = load_events(args.requests, args.clicks, args.recent)
+    X, y = build_examples(reqs, clicks)
+    positives = int(y.sum())
+    print(f"Built {len(y)} examples ({positives} clicked) from {len(reqs)} requests / {len(clicks)} clicks")
+    if positives < args.min_positives or positives == len(y):
+        raise SystemExit("Not enough click data to train a reranker (need clicked and skipped examples)")
+
+    model = ClickReranker.from_training(X, y, popularity_from_clicks(clicks), l2=args.l2, epochs=args.epochs)
+    model.save(args.out)
+    for name, w in zip(FEATURES, model.artifact["weights"]):
+        print(f"  {name:<14} {w:+.4f}")
+    print(f"Wrote reranker to {args.out}")
+
+
+if __name__ == "__main__":
+    main()